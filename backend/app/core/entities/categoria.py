@@ -7,13 +7,16 @@ from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Categoria:
     """Entidad de dominio que representa una categoría"""
     nombre: str
     descripcion: str
     id: Optional[int] = None
     fecha_creacion: Optional[datetime] = None
+    fecha_actualizacion: Optional[datetime] = None
+    # Versión leída por el cliente al actualizar (ver Producto.version)
+    version: Optional[int] = None
     
     def validar(self) -> tuple[bool, Optional[str]]:
         """Valida las reglas de negocio de la categoría"""
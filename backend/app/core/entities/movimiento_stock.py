@@ -0,0 +1,36 @@
+"""
+Entidad MovimientoStock - Capa de Dominio
+No depende de ninguna tecnología externa
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class MovimientoStock:
+    """Entidad de dominio que representa un ajuste de stock (positivo o negativo)"""
+    producto_id: int
+    cantidad: int
+    
+    def validar(self) -> tuple[bool, Optional[str]]:
+        """Valida las reglas de negocio del movimiento"""
+        if not isinstance(self.producto_id, int) or isinstance(self.producto_id, bool) or self.producto_id <= 0:
+            return False, "El producto_id debe ser un entero positivo"
+        
+        if not isinstance(self.cantidad, int) or isinstance(self.cantidad, bool):
+            return False, "El delta debe ser un entero"
+        
+        if self.cantidad == 0:
+            return False, "La cantidad a ajustar no puede ser cero"
+        
+        return True, None
+
+
+@dataclass(slots=True)
+class ResultadoMovimiento:
+    """Resultado de aplicar un movimiento dentro de un lote"""
+    indice: int
+    producto_id: Optional[int]
+    cantidad: Optional[int]
+    aplicado: bool
+    error: Optional[str] = None
@@ -7,7 +7,7 @@ from typing import Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Producto:
     """Entidad de dominio que representa un producto"""
     nombre: str
@@ -20,6 +20,12 @@ class Producto:
     id: Optional[int] = None
     fecha_creacion: Optional[datetime] = None
     fecha_actualizacion: Optional[datetime] = None
+    # Versión de la fila (control de concurrencia optimista): al actualizar es la
+    # versión que leyó el cliente; None actualiza sin comprobarla
+    version: Optional[int] = None
+    # Datos de solo lectura resueltos por el repositorio (no se persisten)
+    categoria_nombre: Optional[str] = None
+    proveedor_nombre: Optional[str] = None
     
     def necesita_reabastecimiento(self) -> bool:
         """
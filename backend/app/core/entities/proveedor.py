@@ -8,7 +8,7 @@ from datetime import datetime
 import re
 
 
-@dataclass
+@dataclass(slots=True)
 class Proveedor:
     """Entidad de dominio que representa un proveedor"""
     nombre: str
@@ -18,6 +18,9 @@ class Proveedor:
     direccion: str
     id: Optional[int] = None
     fecha_creacion: Optional[datetime] = None
+    fecha_actualizacion: Optional[datetime] = None
+    # Versión leída por el cliente al actualizar (ver Producto.version)
+    version: Optional[int] = None
     
     def validar(self) -> tuple[bool, Optional[str]]:
         """Valida las reglas de negocio del proveedor"""
@@ -0,0 +1,25 @@
+"""
+Entidad ResumenInventario - Capa de Dominio
+No depende de ninguna tecnología externa
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class ProductosPorCategoria:
+    """Cantidad de productos agrupados en una categoría"""
+    categoria_id: int
+    categoria_nombre: Optional[str]
+    total_productos: int
+
+
+@dataclass(slots=True)
+class ResumenInventario:
+    """Indicadores agregados del inventario para el dashboard"""
+    total_productos: int
+    total_categorias: int
+    total_proveedores: int
+    productos_bajo_stock: int
+    valor_inventario: float
+    productos_por_categoria: List[ProductosPorCategoria] = field(default_factory=list)
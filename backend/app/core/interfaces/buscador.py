@@ -0,0 +1,31 @@
+"""
+Interfaz de Buscador de texto - Puerto (Port)
+Permite cambiar el motor de búsqueda (índice en memoria, FULLTEXT, etc.)
+sin modificar los casos de uso
+"""
+from abc import ABC, abstractmethod
+from typing import Any, List
+
+
+class IBuscador(ABC):
+    """Interfaz para un índice de búsqueda de texto sobre una entidad"""
+    
+    @abstractmethod
+    def buscar(self, consulta: str, limite: int) -> List[int]:
+        """Retorna hasta `limite` IDs ordenados por relevancia"""
+        pass
+    
+    @abstractmethod
+    def indexar(self, entidad: Any) -> None:
+        """Agrega o actualiza una entidad en el índice"""
+        pass
+    
+    @abstractmethod
+    def eliminar(self, id: int) -> None:
+        """Quita una entidad del índice"""
+        pass
+    
+    @abstractmethod
+    def sincronizar(self) -> None:
+        """Incorpora los cambios hechos fuera de este proceso (p. ej. cargas masivas)"""
+        pass
@@ -2,7 +2,7 @@
 Interfaz de Repositorio de Categorías - Puerto (Port)
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 from app.core.entities.categoria import Categoria
 
 
@@ -24,17 +24,110 @@ class ICategoriaRepository(ABC):
         """Obtiene todas las categorías"""
         pass
     
+    @abstractmethod
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Categoria]:
+        """Obtiene hasta `limit` registros con ID mayor que `after_id`, ordenados por ID"""
+        pass
+    
+    @abstractmethod
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene solo los campos indicados de los registros con ID mayor que `after_id`,
+        ordenados por ID (hasta `limit` si se indica); cada fila es un diccionario {campo: valor}
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_ids(self) -> Set[int]:
+        """Obtiene el conjunto de IDs de las categorías existentes"""
+        pass
+    
+    @abstractmethod
+    def obtener_huella(self) -> tuple:
+        """
+        Obtiene una huella barata de la tabla (conteo, ID máximo, última modificación)
+        que cambia cada vez que cambia el listado; se usa para ETags
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Obtiene (versión de la fila, fecha de última modificación) del registro (None si no existe)"""
+        pass
+    
     @abstractmethod
     def actualizar(self, categoria: Categoria) -> bool:
-        """Actualiza una categoría existente"""
+        """
+        Actualiza una categoría existente; retorna False si no existe o si su versión
+        ya no es la indicada en la entidad (concurrencia optimista)
+        """
         pass
     
     @abstractmethod
     def eliminar(self, id: int) -> bool:
-        """Elimina una categoría"""
+        """Elimina una categoría; retorna False si no existe"""
         pass
     
     @abstractmethod
     def existe_nombre(self, nombre: str) -> bool:
         """Verifica si existe una categoría con el nombre dado"""
         pass
+
+
+class ICategoriaRepositoryAsync(ABC):
+    """Interfaz asyncio del repositorio de categorías (variante ASGI de la API)"""
+    
+    @abstractmethod
+    async def crear(self, categoria: Categoria) -> Categoria:
+        """Crea una nueva categoría"""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_id(self, id: int) -> Optional[Categoria]:
+        """Obtiene una categoría por su ID"""
+        pass
+    
+    @abstractmethod
+    async def obtener_todos(self) -> List[Categoria]:
+        """Obtiene todas las categorías"""
+        pass
+    
+    @abstractmethod
+    async def obtener_pagina(self, after_id: int, limit: int) -> List[Categoria]:
+        """Obtiene hasta `limit` registros con ID mayor que `after_id`, ordenados por ID"""
+        pass
+    
+    @abstractmethod
+    async def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtiene solo los campos indicados (ver ICategoriaRepository.obtener_proyeccion)"""
+        pass
+    
+    @abstractmethod
+    async def obtener_huella(self) -> tuple:
+        """Obtiene la huella del listado (conteo, ID máximo, última modificación) para ETags"""
+        pass
+    
+    @abstractmethod
+    async def obtener_version(self, id: int) -> Optional[tuple]:
+        """Obtiene (versión de la fila, fecha de última modificación) del registro (None si no existe)"""
+        pass
+    
+    @abstractmethod
+    async def actualizar(self, categoria: Categoria) -> bool:
+        """
+        Actualiza una categoría existente; retorna False si no existe o si su versión
+        ya no es la indicada en la entidad (concurrencia optimista)
+        """
+        pass
+    
+    @abstractmethod
+    async def eliminar(self, id: int) -> bool:
+        """Elimina una categoría; retorna False si no existe"""
+        pass
+    
+    @abstractmethod
+    async def existe_nombre(self, nombre: str) -> bool:
+        """Verifica si existe una categoría con el nombre dado"""
+        pass
@@ -0,0 +1,23 @@
+"""
+Interfaz de Repositorio del Dashboard - Puerto (Port)
+"""
+from abc import ABC, abstractmethod
+from app.core.entities.resumen_inventario import ResumenInventario
+
+
+class IDashboardRepository(ABC):
+    """Interfaz para el repositorio de indicadores del dashboard"""
+    
+    @abstractmethod
+    def obtener_resumen(self) -> ResumenInventario:
+        """Obtiene los indicadores agregados del inventario"""
+        pass
+
+
+class IDashboardRepositoryAsync(ABC):
+    """Interfaz asyncio del repositorio del dashboard (variante ASGI de la API)"""
+    
+    @abstractmethod
+    async def obtener_resumen(self) -> ResumenInventario:
+        """Obtiene los indicadores agregados del inventario"""
+        pass
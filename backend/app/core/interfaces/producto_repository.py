@@ -4,7 +4,7 @@ Define el contrato que debe cumplir cualquier implementación de repositorio
 La capa de dominio define la interfaz, la capa de datos la implementa (inversión de dependencias)
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from app.core.entities.producto import Producto
 
 
@@ -16,6 +16,11 @@ class IProductoRepository(ABC):
         """Crea un nuevo producto"""
         pass
     
+    @abstractmethod
+    def crear_lote(self, productos: List[Producto]) -> int:
+        """Inserta varios productos con una sola sentencia y retorna cuántos se insertaron"""
+        pass
+    
     @abstractmethod
     def obtener_por_id(self, id: int) -> Optional[Producto]:
         """Obtiene un producto por su ID"""
@@ -26,14 +31,97 @@ class IProductoRepository(ABC):
         """Obtiene todos los productos"""
         pass
     
+    @abstractmethod
+    def obtener_por_id_con_relaciones(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID con los nombres de categoría y proveedor"""
+        pass
+    
+    @abstractmethod
+    def obtener_todos_con_relaciones(self) -> List[Producto]:
+        """Obtiene todos los productos con los nombres de categoría y proveedor en una sola consulta"""
+        pass
+    
+    @abstractmethod
+    def obtener_por_ids_con_relaciones(self, ids: List[int]) -> List[Producto]:
+        """Obtiene los productos indicados (con nombres de relaciones) en el mismo orden que `ids`"""
+        pass
+    
+    @abstractmethod
+    def iterar_todos_con_relaciones(self, tamano_lote: int = 1000) -> Iterator[Producto]:
+        """
+        Recorre todos los productos (con nombres de relaciones) en streaming,
+        trayendo `tamano_lote` filas por vez sin materializar la tabla completa
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Producto]:
+        """Obtiene hasta `limit` registros con ID mayor que `after_id`, ordenados por ID"""
+        pass
+    
+    @abstractmethod
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene solo los campos indicados de los productos con ID mayor que `after_id`,
+        ordenados por ID (hasta `limit` si se indica); cada fila es un diccionario {campo: valor}
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_huella(self) -> tuple:
+        """
+        Obtiene una huella barata de la tabla (conteo, ID máximo, última modificación)
+        que cambia cada vez que cambia el listado; se usa para ETags
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Obtiene (versión de la fila, fecha de última modificación) del registro (None si no existe)"""
+        pass
+    
     @abstractmethod
     def actualizar(self, producto: Producto) -> bool:
-        """Actualiza un producto existente"""
+        """
+        Actualiza un producto existente; retorna False si no existe, si su versión
+        ya no es la indicada en la entidad (concurrencia optimista) o, cuando el stock
+        solo cambia con ajustes (libro de movimientos), si el stock indicado no es el actual
+        """
+        pass
+    
+    @abstractmethod
+    def ajustar_stock(self, id: int, cantidad: int) -> bool:
+        """
+        Suma `cantidad` al stock de forma atómica si el resultado no queda negativo
+        Retorna False si el producto no existe o el stock es insuficiente
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_stock_por_ids(self, ids: List[int]) -> Dict[int, int]:
+        """
+        Obtiene {id: cantidad_stock} de los productos indicados, bloqueando las filas
+        hasta el final de la transacción (los IDs inexistentes no aparecen)
+        """
+        pass
+    
+    @abstractmethod
+    def aplicar_ajustes_stock(self, ajustes: Dict[int, int]) -> bool:
+        """
+        Aplica {id: delta} en lote dentro de la transacción actual
+        Retorna False si algún ajuste no pudo aplicarse (el llamador debe deshacer)
+        """
+        pass
+    
+    @abstractmethod
+    def existe(self, id: int) -> bool:
+        """Verifica si existe un producto con el ID dado"""
         pass
     
     @abstractmethod
     def eliminar(self, id: int) -> bool:
-        """Elimina un producto"""
+        """Elimina un producto; retorna False si no existe"""
         pass
     
     @abstractmethod
@@ -45,3 +133,93 @@ class IProductoRepository(ABC):
     def obtener_productos_bajo_stock(self) -> List[Producto]:
         """Obtiene productos que necesitan reabastecimiento"""
         pass
+
+
+class IProductoRepositoryAsync(ABC):
+    """
+    Interfaz asyncio del repositorio de productos (variante ASGI de la API)
+    Cubre el CRUD, los listados y el ajuste de stock; las importaciones, exportaciones,
+    lotes de movimientos y la búsqueda siguen en IProductoRepository
+    """
+    
+    @abstractmethod
+    async def crear(self, producto: Producto) -> Producto:
+        """Crea un nuevo producto"""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_id(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID"""
+        pass
+    
+    @abstractmethod
+    async def obtener_todos(self) -> List[Producto]:
+        """Obtiene todos los productos"""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_id_con_relaciones(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID con los nombres de categoría y proveedor"""
+        pass
+    
+    @abstractmethod
+    async def obtener_todos_con_relaciones(self) -> List[Producto]:
+        """Obtiene todos los productos con los nombres de categoría y proveedor en una sola consulta"""
+        pass
+    
+    @abstractmethod
+    async def obtener_pagina(self, after_id: int, limit: int) -> List[Producto]:
+        """Obtiene hasta `limit` registros con ID mayor que `after_id`, ordenados por ID"""
+        pass
+    
+    @abstractmethod
+    async def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtiene solo los campos indicados (ver IProductoRepository.obtener_proyeccion)"""
+        pass
+    
+    @abstractmethod
+    async def obtener_huella(self) -> tuple:
+        """Obtiene la huella del listado (conteo, ID máximo, última modificación) para ETags"""
+        pass
+    
+    @abstractmethod
+    async def obtener_version(self, id: int) -> Optional[tuple]:
+        """Obtiene (versión de la fila, fecha de última modificación) del registro (None si no existe)"""
+        pass
+    
+    @abstractmethod
+    async def actualizar(self, producto: Producto) -> bool:
+        """
+        Actualiza un producto existente; retorna False si no existe o si su versión
+        ya no es la indicada en la entidad (concurrencia optimista)
+        """
+        pass
+    
+    @abstractmethod
+    async def ajustar_stock(self, id: int, cantidad: int) -> bool:
+        """
+        Suma `cantidad` al stock de forma atómica si el resultado no queda negativo
+        Retorna False si el producto no existe o el stock es insuficiente
+        """
+        pass
+    
+    @abstractmethod
+    async def existe(self, id: int) -> bool:
+        """Verifica si existe un producto con el ID dado"""
+        pass
+    
+    @abstractmethod
+    async def eliminar(self, id: int) -> bool:
+        """Elimina un producto; retorna False si no existe"""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_categoria(self, categoria_id: int) -> List[Producto]:
+        """Obtiene productos por categoría"""
+        pass
+    
+    @abstractmethod
+    async def obtener_productos_bajo_stock(self) -> List[Producto]:
+        """Obtiene productos que necesitan reabastecimiento"""
+        pass
@@ -2,7 +2,7 @@
 Interfaz de Repositorio de Proveedores - Puerto (Port)
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 from app.core.entities.proveedor import Proveedor
 
 
@@ -19,22 +19,115 @@ class IProveedorRepository(ABC):
         """Obtiene un proveedor por su ID"""
         pass
     
+    @abstractmethod
+    def obtener_por_ids(self, ids: List[int]) -> List[Proveedor]:
+        """Obtiene los proveedores indicados en el mismo orden que `ids` (omite los inexistentes)"""
+        pass
+    
     @abstractmethod
     def obtener_todos(self) -> List[Proveedor]:
         """Obtiene todos los proveedores"""
         pass
     
+    @abstractmethod
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Proveedor]:
+        """Obtiene hasta `limit` registros con ID mayor que `after_id`, ordenados por ID"""
+        pass
+    
+    @abstractmethod
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Obtiene solo los campos indicados de los registros con ID mayor que `after_id`,
+        ordenados por ID (hasta `limit` si se indica); cada fila es un diccionario {campo: valor}
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_ids(self) -> Set[int]:
+        """Obtiene el conjunto de IDs de los proveedores existentes"""
+        pass
+    
+    @abstractmethod
+    def obtener_huella(self) -> tuple:
+        """
+        Obtiene una huella barata de la tabla (conteo, ID máximo, última modificación)
+        que cambia cada vez que cambia el listado; se usa para ETags
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Obtiene (versión de la fila, fecha de última modificación) del registro (None si no existe)"""
+        pass
+    
     @abstractmethod
     def actualizar(self, proveedor: Proveedor) -> bool:
-        """Actualiza un proveedor existente"""
+        """
+        Actualiza un proveedor existente; retorna False si no existe o si su versión
+        ya no es la indicada en la entidad (concurrencia optimista)
+        """
         pass
     
     @abstractmethod
     def eliminar(self, id: int) -> bool:
-        """Elimina un proveedor"""
+        """Elimina un proveedor; retorna False si no existe"""
         pass
     
     @abstractmethod
     def buscar_por_nombre(self, nombre: str) -> List[Proveedor]:
         """Busca proveedores por nombre"""
         pass
+
+
+class IProveedorRepositoryAsync(ABC):
+    """Interfaz asyncio del repositorio de proveedores (variante ASGI de la API)"""
+    
+    @abstractmethod
+    async def crear(self, proveedor: Proveedor) -> Proveedor:
+        """Crea un nuevo proveedor"""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_id(self, id: int) -> Optional[Proveedor]:
+        """Obtiene un proveedor por su ID"""
+        pass
+    
+    @abstractmethod
+    async def obtener_todos(self) -> List[Proveedor]:
+        """Obtiene todos los proveedores"""
+        pass
+    
+    @abstractmethod
+    async def obtener_pagina(self, after_id: int, limit: int) -> List[Proveedor]:
+        """Obtiene hasta `limit` registros con ID mayor que `after_id`, ordenados por ID"""
+        pass
+    
+    @abstractmethod
+    async def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtiene solo los campos indicados (ver IProveedorRepository.obtener_proyeccion)"""
+        pass
+    
+    @abstractmethod
+    async def obtener_huella(self) -> tuple:
+        """Obtiene la huella del listado (conteo, ID máximo, última modificación) para ETags"""
+        pass
+    
+    @abstractmethod
+    async def obtener_version(self, id: int) -> Optional[tuple]:
+        """Obtiene (versión de la fila, fecha de última modificación) del registro (None si no existe)"""
+        pass
+    
+    @abstractmethod
+    async def actualizar(self, proveedor: Proveedor) -> bool:
+        """
+        Actualiza un proveedor existente; retorna False si no existe o si su versión
+        ya no es la indicada en la entidad (concurrencia optimista)
+        """
+        pass
+    
+    @abstractmethod
+    async def eliminar(self, id: int) -> bool:
+        """Elimina un proveedor; retorna False si no existe"""
+        pass
@@ -0,0 +1,68 @@
+"""
+Interfaz de Unidad de Trabajo (Unit of Work) - Puerto (Port)
+Los repositorios solo preparan los cambios; el caso de uso decide cuándo
+confirmarlos, de modo que varias escrituras comparten una única transacción
+"""
+from abc import ABC, abstractmethod
+
+
+class IUnitOfWork(ABC):
+    """
+    Delimita una transacción de negocio:
+    
+        with unit_of_work:
+            ...escrituras en repositorios...
+    
+    Al salir del bloque se confirma; si ocurre una excepción se deshace todo
+    """
+    
+    def __enter__(self) -> 'IUnitOfWork':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.rollback()
+        else:
+            self.commit()
+        return False
+    
+    @abstractmethod
+    def commit(self) -> None:
+        """Confirma los cambios pendientes"""
+        pass
+    
+    @abstractmethod
+    def rollback(self) -> None:
+        """Descarta los cambios pendientes"""
+        pass
+
+
+class IUnitOfWorkAsync(ABC):
+    """
+    Unidad de trabajo para los casos de uso asyncio:
+    
+        async with unit_of_work:
+            ...escrituras en repositorios...
+    
+    Mismo contrato que IUnitOfWork: confirma al salir y deshace si hay una excepción
+    """
+    
+    async def __aenter__(self) -> 'IUnitOfWorkAsync':
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            await self.rollback()
+        else:
+            await self.commit()
+        return False
+    
+    @abstractmethod
+    async def commit(self) -> None:
+        """Confirma los cambios pendientes"""
+        pass
+    
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Descarta los cambios pendientes"""
+        pass
@@ -1,16 +1,18 @@
 """
 Casos de Uso de Categorías - Capa de Negocio
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 from app.core.entities.categoria import Categoria
 from app.core.interfaces.categoria_repository import ICategoriaRepository
+from app.core.interfaces.unit_of_work import IUnitOfWork
 
 
 class CategoriaUseCases:
     """Casos de uso relacionados con categorías"""
     
-    def __init__(self, categoria_repository: ICategoriaRepository):
+    def __init__(self, categoria_repository: ICategoriaRepository, unit_of_work: IUnitOfWork):
         self.categoria_repository = categoria_repository
+        self.unit_of_work = unit_of_work
     
     def crear_categoria(self, categoria: Categoria) -> tuple[bool, Optional[str], Optional[Categoria]]:
         """Crea una nueva categoría validando las reglas de negocio"""
@@ -24,7 +26,8 @@ class CategoriaUseCases:
             return False, "Ya existe una categoría con ese nombre", None
         
         # Persistir la categoría
-        categoria_creada = self.categoria_repository.crear(categoria)
+        with self.unit_of_work:
+            categoria_creada = self.categoria_repository.crear(categoria)
         return True, None, categoria_creada
     
     def obtener_categoria(self, id: int) -> Optional[Categoria]:
@@ -35,35 +38,78 @@ class CategoriaUseCases:
         """Lista todas las categorías"""
         return self.categoria_repository.obtener_todos()
     
-    def actualizar_categoria(self, categoria: Categoria) -> tuple[bool, Optional[str]]:
-        """Actualiza una categoría existente"""
+    def listar_categorias_pagina(self, after_id: int, limit: int) -> tuple[List[Categoria], Optional[int]]:
+        """
+        Lista una página de categorías usando paginación por keyset
+        Retorna la página y el cursor de la siguiente (None si no hay más)
+        """
+        # Se pide un registro extra para saber si existe una página siguiente
+        categorias = self.categoria_repository.obtener_pagina(after_id, limit + 1)
+        if len(categorias) > limit:
+            categorias = categorias[:limit]
+            return categorias, categorias[-1].id
+        return categorias, None
+    
+    def listar_categorias_proyeccion(self, campos: List[str], after_id: int = 0,
+                                     limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Lista categorías leyendo solo los campos indicados
+        Con `limit` pagina por keyset igual que listar_categorias_pagina
+        Retorna las filas y el cursor de la siguiente página (None si no hay más o no se pagina)
+        """
+        if limit is None:
+            return self.categoria_repository.obtener_proyeccion(campos, after_id), None
+        
+        # El cursor se calcula con el ID aunque no se haya pedido
+        columnas = campos if 'id' in campos else ['id'] + campos
+        filas = self.categoria_repository.obtener_proyeccion(columnas, after_id, limit + 1)
+        if len(filas) > limit:
+            filas = filas[:limit]
+            return filas, filas[-1]['id']
+        return filas, None
+    
+    def obtener_ids_categorias(self) -> Set[int]:
+        """Obtiene los IDs de las categorías existentes (para validar referencias en lote)"""
+        return self.categoria_repository.obtener_ids()
+    
+    def obtener_huella_categorias(self) -> tuple:
+        """Obtiene la huella del listado de categorías (para validación condicional)"""
+        return self.categoria_repository.obtener_huella()
+    
+    def obtener_version_categoria(self, id: int) -> Optional[tuple]:
+        """Obtiene la versión y la fecha de última modificación de una categoría (None si no existe)"""
+        return self.categoria_repository.obtener_version(id)
+    
+    def actualizar_categoria(self, categoria: Categoria) -> tuple[bool, Optional[str], Optional[tuple]]:
+        """
+        Actualiza una categoría existente (condicionado a categoria.version si se indica)
+        Retorna también la versión nueva (versión, fecha), de la que sale el ETag de la respuesta
+        """
         # Validar reglas de negocio
         es_valido, mensaje_error = categoria.validar()
         if not es_valido:
-            return False, mensaje_error
-        
-        # Verificar que la categoría existe
-        categoria_existente = self.categoria_repository.obtener_por_id(categoria.id)
-        if not categoria_existente:
-            return False, "Categoría no encontrada"
+            return False, mensaje_error, None
         
-        # Actualizar
-        exito = self.categoria_repository.actualizar(categoria)
+        # Actualizar: un único UPDATE, el rowcount indica si existía
+        with self.unit_of_work:
+            exito = self.categoria_repository.actualizar(categoria)
+            # La versión nueva se lee antes del commit, con la fila todavía bloqueada por el UPDATE
+            version = self.categoria_repository.obtener_version(categoria.id) if exito else None
         if not exito:
-            return False, "Error al actualizar la categoría"
+            # Solo en el camino de error se distingue la causa
+            if categoria.version is not None and self.categoria_repository.obtener_version(categoria.id) is not None:
+                return False, "La categoría fue modificada después de la versión leída; vuelva a cargarla", None
+            return False, "Categoría no encontrada", None
+        categoria.version = version[0]
         
-        return True, None
+        return True, None, version
     
     def eliminar_categoria(self, id: int) -> tuple[bool, Optional[str]]:
         """Elimina una categoría"""
-        # Verificar que la categoría existe
-        categoria = self.categoria_repository.obtener_por_id(id)
-        if not categoria:
-            return False, "Categoría no encontrada"
-        
-        # Eliminar
-        exito = self.categoria_repository.eliminar(id)
+        # Eliminar: un único DELETE, el rowcount indica si existía
+        with self.unit_of_work:
+            exito = self.categoria_repository.eliminar(id)
         if not exito:
-            return False, "Error al eliminar la categoría"
+            return False, "Categoría no encontrada"
         
         return True, None
@@ -0,0 +1,96 @@
+"""
+Casos de Uso de Categorías (asyncio) - Capa de Negocio
+Mismas reglas y mensajes que CategoriaUseCases, con puertos asyncio
+"""
+from typing import Any, Dict, List, Optional
+from app.core.entities.categoria import Categoria
+from app.core.interfaces.categoria_repository import ICategoriaRepositoryAsync
+from app.core.interfaces.unit_of_work import IUnitOfWorkAsync
+
+
+class CategoriaUseCasesAsync:
+    """Casos de uso de categorías con repositorio y unidad de trabajo asyncio"""
+    
+    def __init__(self, categoria_repository: ICategoriaRepositoryAsync, unit_of_work: IUnitOfWorkAsync):
+        self.categoria_repository = categoria_repository
+        self.unit_of_work = unit_of_work
+    
+    async def crear_categoria(self, categoria: Categoria) -> tuple[bool, Optional[str], Optional[Categoria]]:
+        """Crea una nueva categoría validando las reglas de negocio"""
+        es_valido, mensaje_error = categoria.validar()
+        if not es_valido:
+            return False, mensaje_error, None
+        
+        # Verificar que no exista una categoría con el mismo nombre
+        if await self.categoria_repository.existe_nombre(categoria.nombre):
+            return False, "Ya existe una categoría con ese nombre", None
+        
+        async with self.unit_of_work:
+            categoria_creada = await self.categoria_repository.crear(categoria)
+        return True, None, categoria_creada
+    
+    async def obtener_categoria(self, id: int) -> Optional[Categoria]:
+        """Obtiene una categoría por su ID"""
+        return await self.categoria_repository.obtener_por_id(id)
+    
+    async def listar_categorias(self) -> List[Categoria]:
+        """Lista todas las categorías"""
+        return await self.categoria_repository.obtener_todos()
+    
+    async def listar_categorias_pagina(self, after_id: int, limit: int) -> tuple[List[Categoria], Optional[int]]:
+        """Lista una página de categorías por keyset; retorna la página y el cursor de la siguiente"""
+        categorias = await self.categoria_repository.obtener_pagina(after_id, limit + 1)
+        if len(categorias) > limit:
+            categorias = categorias[:limit]
+            return categorias, categorias[-1].id
+        return categorias, None
+    
+    async def listar_categorias_proyeccion(self, campos: List[str], after_id: int = 0,
+                                           limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """Lista categorías leyendo solo los campos indicados (con `limit` pagina por keyset)"""
+        if limit is None:
+            return await self.categoria_repository.obtener_proyeccion(campos, after_id), None
+        
+        columnas = campos if 'id' in campos else ['id'] + campos
+        filas = await self.categoria_repository.obtener_proyeccion(columnas, after_id, limit + 1)
+        if len(filas) > limit:
+            filas = filas[:limit]
+            return filas, filas[-1]['id']
+        return filas, None
+    
+    async def obtener_huella_categorias(self) -> tuple:
+        """Obtiene la huella del listado de categorías (para validación condicional)"""
+        return await self.categoria_repository.obtener_huella()
+    
+    async def obtener_version_categoria(self, id: int) -> Optional[tuple]:
+        """Obtiene la versión y la fecha de última modificación de una categoría (None si no existe)"""
+        return await self.categoria_repository.obtener_version(id)
+    
+    async def actualizar_categoria(self, categoria: Categoria) -> tuple[bool, Optional[str], Optional[tuple]]:
+        """
+        Actualiza una categoría existente (condicionado a categoria.version si se indica)
+        Retorna también la versión nueva (versión, fecha), de la que sale el ETag de la respuesta
+        """
+        es_valido, mensaje_error = categoria.validar()
+        if not es_valido:
+            return False, mensaje_error, None
+        
+        async with self.unit_of_work:
+            exito = await self.categoria_repository.actualizar(categoria)
+            # La versión nueva se lee antes del commit, con la fila todavía bloqueada por el UPDATE
+            version = await self.categoria_repository.obtener_version(categoria.id) if exito else None
+        if not exito:
+            # Solo en el camino de error se distingue la causa
+            if categoria.version is not None and await self.categoria_repository.obtener_version(categoria.id) is not None:
+                return False, "La categoría fue modificada después de la versión leída; vuelva a cargarla", None
+            return False, "Categoría no encontrada", None
+        categoria.version = version[0]
+        return True, None, version
+    
+    async def eliminar_categoria(self, id: int) -> tuple[bool, Optional[str]]:
+        """Elimina una categoría"""
+        async with self.unit_of_work:
+            exito = await self.categoria_repository.eliminar(id)
+        if not exito:
+            return False, "Categoría no encontrada"
+        return True, None
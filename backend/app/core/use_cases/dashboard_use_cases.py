@@ -0,0 +1,18 @@
+"""
+Casos de Uso del Dashboard - Capa de Negocio
+"""
+from app.core.entities.resumen_inventario import ResumenInventario
+from app.core.interfaces.dashboard_repository import IDashboardRepository
+
+
+class DashboardUseCases:
+    """Casos de uso relacionados con los indicadores del dashboard"""
+    
+    def __init__(self, dashboard_repository: IDashboardRepository):
+        self.dashboard_repository = dashboard_repository
+    
+    def obtener_resumen(self) -> ResumenInventario:
+        """Obtiene el resumen del inventario calculado en la base de datos"""
+        resumen = self.dashboard_repository.obtener_resumen()
+        resumen.valor_inventario = round(resumen.valor_inventario, 2)
+        return resumen
@@ -0,0 +1,18 @@
+"""
+Casos de Uso del Dashboard (asyncio) - Capa de Negocio
+"""
+from app.core.entities.resumen_inventario import ResumenInventario
+from app.core.interfaces.dashboard_repository import IDashboardRepositoryAsync
+
+
+class DashboardUseCasesAsync:
+    """Casos de uso del dashboard con repositorio asyncio (variante ASGI de la API)"""
+    
+    def __init__(self, dashboard_repository: IDashboardRepositoryAsync):
+        self.dashboard_repository = dashboard_repository
+    
+    async def obtener_resumen(self) -> ResumenInventario:
+        """Obtiene el resumen del inventario calculado en la base de datos"""
+        resumen = await self.dashboard_repository.obtener_resumen()
+        resumen.valor_inventario = round(resumen.valor_inventario, 2)
+        return resumen
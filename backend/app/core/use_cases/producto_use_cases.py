@@ -2,19 +2,27 @@
 Casos de Uso de Productos - Capa de Negocio
 Estos casos de uso orquestan la lógica de negocio sin depender de frameworks
 """
-from typing import List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
 from app.core.entities.producto import Producto
+from app.core.entities.movimiento_stock import MovimientoStock, ResultadoMovimiento
 from app.core.interfaces.producto_repository import IProductoRepository
+from app.core.interfaces.buscador import IBuscador
+from app.core.interfaces.unit_of_work import IUnitOfWork
 
 
 class ProductoUseCases:
     """Casos de uso relacionados con productos"""
     
-    def __init__(self, producto_repository: IProductoRepository):
+    def __init__(self, producto_repository: IProductoRepository, unit_of_work: IUnitOfWork,
+                 buscador: Optional[IBuscador] = None):
         """
         Inyección de dependencias - depende de la interfaz, no de la implementación
+        Los repositorios solo envían cambios a la sesión; el caso de uso decide cuándo
+        se confirma la transacción a través de la unidad de trabajo
         """
         self.producto_repository = producto_repository
+        self.unit_of_work = unit_of_work
+        self.buscador = buscador
     
     def crear_producto(self, producto: Producto) -> tuple[bool, Optional[str], Optional[Producto]]:
         """Crea un nuevo producto validando las reglas de negocio"""
@@ -24,7 +32,10 @@ class ProductoUseCases:
             return False, mensaje_error, None
         
         # Persistir el producto
-        producto_creado = self.producto_repository.crear(producto)
+        with self.unit_of_work:
+            producto_creado = self.producto_repository.crear(producto)
+        if self.buscador:
+            self.buscador.indexar(producto_creado)
         return True, None, producto_creado
     
     def obtener_producto(self, id: int) -> Optional[Producto]:
@@ -35,39 +46,106 @@ class ProductoUseCases:
         """Lista todos los productos"""
         return self.producto_repository.obtener_todos()
     
-    def actualizar_producto(self, producto: Producto) -> tuple[bool, Optional[str]]:
-        """Actualiza un producto existente"""
+    def obtener_producto_con_relaciones(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID incluyendo nombres de categoría y proveedor"""
+        return self.producto_repository.obtener_por_id_con_relaciones(id)
+    
+    def listar_productos_con_relaciones(self) -> List[Producto]:
+        """Lista todos los productos incluyendo nombres de categoría y proveedor"""
+        return self.producto_repository.obtener_todos_con_relaciones()
+    
+    def listar_productos_pagina(self, after_id: int, limit: int) -> tuple[List[Producto], Optional[int]]:
+        """
+        Lista una página de productos usando paginación por keyset
+        Retorna la página y el cursor de la siguiente (None si no hay más)
+        """
+        # Se pide un registro extra para saber si existe una página siguiente
+        productos = self.producto_repository.obtener_pagina(after_id, limit + 1)
+        if len(productos) > limit:
+            productos = productos[:limit]
+            return productos, productos[-1].id
+        return productos, None
+    
+    def listar_productos_proyeccion(self, campos: List[str], after_id: int = 0,
+                                    limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Lista productos leyendo solo los campos indicados
+        Con `limit` pagina por keyset igual que listar_productos_pagina
+        Retorna las filas y el cursor de la siguiente página (None si no hay más o no se pagina)
+        """
+        if limit is None:
+            return self.producto_repository.obtener_proyeccion(campos, after_id), None
+        
+        # El cursor se calcula con el ID aunque no se haya pedido
+        columnas = campos if 'id' in campos else ['id'] + campos
+        filas = self.producto_repository.obtener_proyeccion(columnas, after_id, limit + 1)
+        if len(filas) > limit:
+            filas = filas[:limit]
+            return filas, filas[-1]['id']
+        return filas, None
+    
+    def exportar_productos(self, tamano_lote: int = 1000) -> Iterator[Producto]:
+        """Recorre el catálogo completo en streaming (para exportaciones)"""
+        return self.producto_repository.iterar_todos_con_relaciones(tamano_lote)
+    
+    def obtener_huella_productos(self) -> tuple:
+        """Obtiene la huella del listado de productos (para validación condicional)"""
+        return self.producto_repository.obtener_huella()
+    
+    def obtener_version_producto(self, id: int) -> Optional[tuple]:
+        """Obtiene la versión y la fecha de última modificación de un producto (None si no existe)"""
+        return self.producto_repository.obtener_version(id)
+    
+    def actualizar_producto(self, producto: Producto) -> tuple[bool, Optional[str], Optional[tuple]]:
+        """
+        Actualiza un producto existente
+        Con producto.version el UPDATE solo se aplica si nadie lo modificó desde esa lectura
+        Retorna también la versión nueva (versión, fecha), de la que sale el ETag de la respuesta
+        """
         # Validar reglas de negocio
         es_valido, mensaje_error = producto.validar()
         if not es_valido:
-            return False, mensaje_error
-        
-        # Verificar que el producto existe
-        producto_existente = self.producto_repository.obtener_por_id(producto.id)
-        if not producto_existente:
-            return False, "Producto no encontrado"
+            return False, mensaje_error, None
         
-        # Actualizar
-        exito = self.producto_repository.actualizar(producto)
+        # Actualizar: un único UPDATE, el rowcount indica si existía
+        with self.unit_of_work:
+            exito = self.producto_repository.actualizar(producto)
+            # La versión nueva se lee antes del commit, con la fila todavía bloqueada por el UPDATE
+            version = self.producto_repository.obtener_version(producto.id) if exito else None
         if not exito:
-            return False, "Error al actualizar el producto"
+            # Solo en el camino de error se distingue la causa
+            actual = self.producto_repository.obtener_version(producto.id)
+            if actual is None:
+                return False, "Producto no encontrado", None
+            if producto.version is not None and actual[0] != producto.version:
+                return False, "El producto fue modificado después de la versión leída; vuelva a cargarlo", None
+            # Existe y la versión coincide: el repositorio lleva el stock en movimientos
+            return False, "El stock no se modifica al editar el producto: envíe el stock actual y registre la diferencia como un ajuste de stock", None
+        producto.version = version[0]
         
-        return True, None
+        if self.buscador:
+            self.buscador.indexar(producto)
+        return True, None, version
     
     def eliminar_producto(self, id: int) -> tuple[bool, Optional[str]]:
         """Elimina un producto"""
-        # Verificar que el producto existe
-        producto = self.producto_repository.obtener_por_id(id)
-        if not producto:
-            return False, "Producto no encontrado"
-        
-        # Eliminar
-        exito = self.producto_repository.eliminar(id)
+        # Eliminar: un único DELETE, el rowcount indica si existía
+        with self.unit_of_work:
+            exito = self.producto_repository.eliminar(id)
         if not exito:
-            return False, "Error al eliminar el producto"
+            return False, "Producto no encontrado"
         
+        if self.buscador:
+            self.buscador.eliminar(id)
         return True, None
     
+    def buscar_productos(self, consulta: str, limite: int = 20) -> List[Producto]:
+        """Busca productos por nombre y descripción, ordenados por relevancia"""
+        if not self.buscador:
+            raise ValueError("La búsqueda de productos no está configurada")
+        ids = self.buscador.buscar(consulta, limite)
+        return self.producto_repository.obtener_por_ids_con_relaciones(ids)
+    
     def obtener_productos_por_categoria(self, categoria_id: int) -> List[Producto]:
         """Obtiene productos de una categoría específica"""
         return self.producto_repository.obtener_por_categoria(categoria_id)
@@ -75,24 +153,150 @@ class ProductoUseCases:
     def obtener_productos_bajo_stock(self) -> List[Producto]:
         """
         Obtiene productos que necesitan reabastecimiento
-        Usa la lógica de negocio del dominio
+        El repositorio aplica en SQL la misma regla que Producto.necesita_reabastecimiento()
         """
-        productos = self.producto_repository.obtener_productos_bajo_stock()
-        return [p for p in productos if p.necesita_reabastecimiento()]
+        return self.producto_repository.obtener_productos_bajo_stock()
     
     def ajustar_stock(self, id: int, cantidad: int) -> tuple[bool, Optional[str]]:
-        """Ajusta el stock de un producto"""
-        producto = self.producto_repository.obtener_por_id(id)
-        if not producto:
+        """
+        Ajusta el stock de un producto
+        La regla "el stock no puede quedar negativo" se aplica en la misma sentencia
+        de actualización, por lo que ajustes concurrentes no pierden cambios
+        """
+        if cantidad == 0:
+            return False, "La cantidad a ajustar no puede ser cero"
+        
+        with self.unit_of_work:
+            ajustado = self.producto_repository.ajustar_stock(id, cantidad)
+        if ajustado:
+            return True, None
+        
+        # Solo en el camino de error se distingue la causa
+        if not self.producto_repository.existe(id):
             return False, "Producto no encontrado"
         
-        # Usar la lógica de negocio del dominio
-        if not producto.actualizar_stock(cantidad):
-            return False, "Stock insuficiente para realizar la operación"
+        return False, "Stock insuficiente para realizar la operación"
+    
+    def ajustar_stock_lote(self, movimientos: Iterable[tuple[Optional[MovimientoStock], Optional[str]]]
+                           ) -> tuple[bool, Optional[str], List[ResultadoMovimiento]]:
+        """
+        Aplica un lote de movimientos de stock en una sola transacción
+        `movimientos` genera (movimiento, None) o (None, error) si la entrada no se pudo leer
+        Los movimientos se agregan por producto; si el total de un producto dejaría
+        el stock negativo se rechazan todos sus movimientos y el resto se aplica
+        """
+        resultados: List[ResultadoMovimiento] = []
+        validos: List[tuple[int, MovimientoStock]] = []
+        deltas_por_producto: dict[int, int] = {}
         
-        # Persistir cambios
-        exito = self.producto_repository.actualizar(producto)
-        if not exito:
-            return False, "Error al actualizar el stock"
+        for indice, (movimiento, error_lectura) in enumerate(movimientos):
+            if movimiento is None:
+                resultados.append(ResultadoMovimiento(
+                    indice=indice,
+                    producto_id=None,
+                    cantidad=None,
+                    aplicado=False,
+                    error=error_lectura
+                ))
+                continue
+            
+            es_valido, mensaje_error = movimiento.validar()
+            if not es_valido:
+                resultados.append(ResultadoMovimiento(
+                    indice=indice,
+                    producto_id=movimiento.producto_id,
+                    cantidad=movimiento.cantidad,
+                    aplicado=False,
+                    error=mensaje_error
+                ))
+                continue
+            
+            validos.append((indice, movimiento))
+            deltas_por_producto[movimiento.producto_id] = (
+                deltas_por_producto.get(movimiento.producto_id, 0) + movimiento.cantidad
+            )
         
-        return True, None
+        # Lectura con bloqueo y actualización comparten transacción: un único commit
+        with self.unit_of_work:
+            stock_actual = self.producto_repository.obtener_stock_por_ids(list(deltas_por_producto))
+            
+            rechazos: dict[int, str] = {}
+            ajustes: dict[int, int] = {}
+            for producto_id, delta in deltas_por_producto.items():
+                if producto_id not in stock_actual:
+                    rechazos[producto_id] = "Producto no encontrado"
+                elif stock_actual[producto_id] + delta < 0:
+                    rechazos[producto_id] = "Stock insuficiente para realizar la operación"
+                elif delta != 0:
+                    ajustes[producto_id] = delta
+            
+            if not self.producto_repository.aplicar_ajustes_stock(ajustes):
+                # Aplicación parcial: se descarta el lote completo
+                self.unit_of_work.rollback()
+                return False, "El stock cambió durante la operación, reintente el lote", []
+        
+        for indice, movimiento in validos:
+            error = rechazos.get(movimiento.producto_id)
+            resultados.append(ResultadoMovimiento(
+                indice=indice,
+                producto_id=movimiento.producto_id,
+                cantidad=movimiento.cantidad,
+                aplicado=error is None,
+                error=error
+            ))
+        
+        resultados.sort(key=lambda r: r.indice)
+        return True, None, resultados
+    
+    def importar_productos(self, filas: Iterable[tuple[int, Optional[Producto], Optional[str]]],
+                           categorias_validas: Set[int], proveedores_validos: Set[int],
+                           tamano_lote: int = 500, max_errores: int = 1000
+                           ) -> tuple[int, int, List[tuple[int, str]]]:
+        """
+        Importa productos desde un iterable de (numero_fila, producto, error_de_lectura)
+        Valida cada fila con las reglas del dominio y resuelve las referencias contra
+        los conjuntos de IDs precargados; inserta en bloques de `tamano_lote`
+        Retorna (filas procesadas, filas insertadas, primeros `max_errores` errores)
+        """
+        procesadas = 0
+        insertadas = 0
+        errores: List[tuple[int, str]] = []
+        lote: List[Producto] = []
+        
+        def registrar_error(numero_fila: int, mensaje: str):
+            if len(errores) < max_errores:
+                errores.append((numero_fila, mensaje))
+        
+        for numero_fila, producto, error_lectura in filas:
+            procesadas += 1
+            if error_lectura:
+                registrar_error(numero_fila, error_lectura)
+                continue
+            
+            es_valido, mensaje_error = producto.validar()
+            if not es_valido:
+                registrar_error(numero_fila, mensaje_error)
+                continue
+            
+            if producto.categoria_id not in categorias_validas:
+                registrar_error(numero_fila, f"La categoría {producto.categoria_id} no existe")
+                continue
+            
+            if producto.proveedor_id not in proveedores_validos:
+                registrar_error(numero_fila, f"El proveedor {producto.proveedor_id} no existe")
+                continue
+            
+            lote.append(producto)
+            if len(lote) >= tamano_lote:
+                insertadas += self._insertar_bloque(lote)
+                lote = []
+        
+        insertadas += self._insertar_bloque(lote)
+        if self.buscador and insertadas:
+            self.buscador.sincronizar()
+        return procesadas, insertadas, errores
+    
+    def _insertar_bloque(self, productos: List[Producto]) -> int:
+        """Inserta un bloque de la importación en su propia transacción"""
+        with self.unit_of_work:
+            return self.producto_repository.crear_lote(productos)
@@ -0,0 +1,137 @@
+"""
+Casos de Uso de Productos (asyncio) - Capa de Negocio
+Mismas reglas y mensajes que ProductoUseCases, con puertos asyncio para la variante ASGI de la API
+"""
+from typing import Any, Dict, List, Optional
+from app.core.entities.producto import Producto
+from app.core.interfaces.producto_repository import IProductoRepositoryAsync
+from app.core.interfaces.unit_of_work import IUnitOfWorkAsync
+
+
+class ProductoUseCasesAsync:
+    """Casos de uso de productos con repositorio y unidad de trabajo asyncio"""
+    
+    def __init__(self, producto_repository: IProductoRepositoryAsync, unit_of_work: IUnitOfWorkAsync):
+        self.producto_repository = producto_repository
+        self.unit_of_work = unit_of_work
+    
+    async def crear_producto(self, producto: Producto) -> tuple[bool, Optional[str], Optional[Producto]]:
+        """Crea un nuevo producto validando las reglas de negocio"""
+        es_valido, mensaje_error = producto.validar()
+        if not es_valido:
+            return False, mensaje_error, None
+        
+        async with self.unit_of_work:
+            producto_creado = await self.producto_repository.crear(producto)
+        return True, None, producto_creado
+    
+    async def obtener_producto(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID"""
+        return await self.producto_repository.obtener_por_id(id)
+    
+    async def listar_productos(self) -> List[Producto]:
+        """Lista todos los productos"""
+        return await self.producto_repository.obtener_todos()
+    
+    async def obtener_producto_con_relaciones(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID incluyendo nombres de categoría y proveedor"""
+        return await self.producto_repository.obtener_por_id_con_relaciones(id)
+    
+    async def listar_productos_con_relaciones(self) -> List[Producto]:
+        """Lista todos los productos incluyendo nombres de categoría y proveedor"""
+        return await self.producto_repository.obtener_todos_con_relaciones()
+    
+    async def listar_productos_pagina(self, after_id: int, limit: int) -> tuple[List[Producto], Optional[int]]:
+        """
+        Lista una página de productos usando paginación por keyset
+        Retorna la página y el cursor de la siguiente (None si no hay más)
+        """
+        # Se pide un registro extra para saber si existe una página siguiente
+        productos = await self.producto_repository.obtener_pagina(after_id, limit + 1)
+        if len(productos) > limit:
+            productos = productos[:limit]
+            return productos, productos[-1].id
+        return productos, None
+    
+    async def listar_productos_proyeccion(self, campos: List[str], after_id: int = 0,
+                                          limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Lista productos leyendo solo los campos indicados
+        Retorna las filas y el cursor de la siguiente página (None si no hay más o no se pagina)
+        """
+        if limit is None:
+            return await self.producto_repository.obtener_proyeccion(campos, after_id), None
+        
+        # El cursor se calcula con el ID aunque no se haya pedido
+        columnas = campos if 'id' in campos else ['id'] + campos
+        filas = await self.producto_repository.obtener_proyeccion(columnas, after_id, limit + 1)
+        if len(filas) > limit:
+            filas = filas[:limit]
+            return filas, filas[-1]['id']
+        return filas, None
+    
+    async def obtener_huella_productos(self) -> tuple:
+        """Obtiene la huella del listado de productos (para validación condicional)"""
+        return await self.producto_repository.obtener_huella()
+    
+    async def obtener_version_producto(self, id: int) -> Optional[tuple]:
+        """Obtiene la versión y la fecha de última modificación de un producto (None si no existe)"""
+        return await self.producto_repository.obtener_version(id)
+    
+    async def actualizar_producto(self, producto: Producto) -> tuple[bool, Optional[str], Optional[tuple]]:
+        """
+        Actualiza un producto existente
+        Con producto.version el UPDATE solo se aplica si nadie lo modificó desde esa lectura
+        Retorna también la versión nueva (versión, fecha), de la que sale el ETag de la respuesta
+        """
+        es_valido, mensaje_error = producto.validar()
+        if not es_valido:
+            return False, mensaje_error, None
+        
+        # Actualizar: un único UPDATE, el rowcount indica si existía
+        async with self.unit_of_work:
+            exito = await self.producto_repository.actualizar(producto)
+            # La versión nueva se lee antes del commit, con la fila todavía bloqueada por el UPDATE
+            version = await self.producto_repository.obtener_version(producto.id) if exito else None
+        if not exito:
+            # Solo en el camino de error se distingue la causa
+            if producto.version is not None and await self.producto_repository.existe(producto.id):
+                return False, "El producto fue modificado después de la versión leída; vuelva a cargarlo", None
+            return False, "Producto no encontrado", None
+        producto.version = version[0]
+        return True, None, version
+    
+    async def eliminar_producto(self, id: int) -> tuple[bool, Optional[str]]:
+        """Elimina un producto"""
+        async with self.unit_of_work:
+            exito = await self.producto_repository.eliminar(id)
+        if not exito:
+            return False, "Producto no encontrado"
+        return True, None
+    
+    async def obtener_productos_por_categoria(self, categoria_id: int) -> List[Producto]:
+        """Obtiene productos de una categoría específica"""
+        return await self.producto_repository.obtener_por_categoria(categoria_id)
+    
+    async def obtener_productos_bajo_stock(self) -> List[Producto]:
+        """Obtiene productos que necesitan reabastecimiento"""
+        return await self.producto_repository.obtener_productos_bajo_stock()
+    
+    async def ajustar_stock(self, id: int, cantidad: int) -> tuple[bool, Optional[str]]:
+        """
+        Ajusta el stock de un producto
+        La regla "el stock no puede quedar negativo" se aplica en la misma sentencia de actualización
+        """
+        if cantidad == 0:
+            return False, "La cantidad a ajustar no puede ser cero"
+        
+        async with self.unit_of_work:
+            ajustado = await self.producto_repository.ajustar_stock(id, cantidad)
+        if ajustado:
+            return True, None
+        
+        # Solo en el camino de error se distingue la causa
+        if not await self.producto_repository.existe(id):
+            return False, "Producto no encontrado"
+        
+        return False, "Stock insuficiente para realizar la operación"
@@ -1,16 +1,21 @@
 """
 Casos de Uso de Proveedores - Capa de Negocio
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 from app.core.entities.proveedor import Proveedor
 from app.core.interfaces.proveedor_repository import IProveedorRepository
+from app.core.interfaces.buscador import IBuscador
+from app.core.interfaces.unit_of_work import IUnitOfWork
 
 
 class ProveedorUseCases:
     """Casos de uso relacionados con proveedores"""
     
-    def __init__(self, proveedor_repository: IProveedorRepository):
+    def __init__(self, proveedor_repository: IProveedorRepository, unit_of_work: IUnitOfWork,
+                 buscador: Optional[IBuscador] = None):
         self.proveedor_repository = proveedor_repository
+        self.unit_of_work = unit_of_work
+        self.buscador = buscador
     
     def crear_proveedor(self, proveedor: Proveedor) -> tuple[bool, Optional[str], Optional[Proveedor]]:
         """Crea un nuevo proveedor validando las reglas de negocio"""
@@ -20,7 +25,10 @@ class ProveedorUseCases:
             return False, mensaje_error, None
         
         # Persistir el proveedor
-        proveedor_creado = self.proveedor_repository.crear(proveedor)
+        with self.unit_of_work:
+            proveedor_creado = self.proveedor_repository.crear(proveedor)
+        if self.buscador:
+            self.buscador.indexar(proveedor_creado)
         return True, None, proveedor_creado
     
     def obtener_proveedor(self, id: int) -> Optional[Proveedor]:
@@ -31,39 +39,89 @@ class ProveedorUseCases:
         """Lista todos los proveedores"""
         return self.proveedor_repository.obtener_todos()
     
-    def actualizar_proveedor(self, proveedor: Proveedor) -> tuple[bool, Optional[str]]:
-        """Actualiza un proveedor existente"""
+    def listar_proveedores_pagina(self, after_id: int, limit: int) -> tuple[List[Proveedor], Optional[int]]:
+        """
+        Lista una página de proveedores usando paginación por keyset
+        Retorna la página y el cursor de la siguiente (None si no hay más)
+        """
+        # Se pide un registro extra para saber si existe una página siguiente
+        proveedores = self.proveedor_repository.obtener_pagina(after_id, limit + 1)
+        if len(proveedores) > limit:
+            proveedores = proveedores[:limit]
+            return proveedores, proveedores[-1].id
+        return proveedores, None
+    
+    def listar_proveedores_proyeccion(self, campos: List[str], after_id: int = 0,
+                                      limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Lista proveedores leyendo solo los campos indicados
+        Con `limit` pagina por keyset igual que listar_proveedores_pagina
+        Retorna las filas y el cursor de la siguiente página (None si no hay más o no se pagina)
+        """
+        if limit is None:
+            return self.proveedor_repository.obtener_proyeccion(campos, after_id), None
+        
+        # El cursor se calcula con el ID aunque no se haya pedido
+        columnas = campos if 'id' in campos else ['id'] + campos
+        filas = self.proveedor_repository.obtener_proyeccion(columnas, after_id, limit + 1)
+        if len(filas) > limit:
+            filas = filas[:limit]
+            return filas, filas[-1]['id']
+        return filas, None
+    
+    def obtener_ids_proveedores(self) -> Set[int]:
+        """Obtiene los IDs de los proveedores existentes (para validar referencias en lote)"""
+        return self.proveedor_repository.obtener_ids()
+    
+    def obtener_huella_proveedores(self) -> tuple:
+        """Obtiene la huella del listado de proveedores (para validación condicional)"""
+        return self.proveedor_repository.obtener_huella()
+    
+    def obtener_version_proveedor(self, id: int) -> Optional[tuple]:
+        """Obtiene la versión y la fecha de última modificación de un proveedor (None si no existe)"""
+        return self.proveedor_repository.obtener_version(id)
+    
+    def actualizar_proveedor(self, proveedor: Proveedor) -> tuple[bool, Optional[str], Optional[tuple]]:
+        """
+        Actualiza un proveedor existente (condicionado a proveedor.version si se indica)
+        Retorna también la versión nueva (versión, fecha), de la que sale el ETag de la respuesta
+        """
         # Validar reglas de negocio
         es_valido, mensaje_error = proveedor.validar()
         if not es_valido:
-            return False, mensaje_error
-        
-        # Verificar que el proveedor existe
-        proveedor_existente = self.proveedor_repository.obtener_por_id(proveedor.id)
-        if not proveedor_existente:
-            return False, "Proveedor no encontrado"
+            return False, mensaje_error, None
         
-        # Actualizar
-        exito = self.proveedor_repository.actualizar(proveedor)
+        # Actualizar: un único UPDATE, el rowcount indica si existía
+        with self.unit_of_work:
+            exito = self.proveedor_repository.actualizar(proveedor)
+            # La versión nueva se lee antes del commit, con la fila todavía bloqueada por el UPDATE
+            version = self.proveedor_repository.obtener_version(proveedor.id) if exito else None
         if not exito:
-            return False, "Error al actualizar el proveedor"
+            # Solo en el camino de error se distingue la causa
+            if proveedor.version is not None and self.proveedor_repository.obtener_version(proveedor.id) is not None:
+                return False, "El proveedor fue modificado después de la versión leída; vuelva a cargarlo", None
+            return False, "Proveedor no encontrado", None
+        proveedor.version = version[0]
         
-        return True, None
+        if self.buscador:
+            self.buscador.indexar(proveedor)
+        return True, None, version
     
     def eliminar_proveedor(self, id: int) -> tuple[bool, Optional[str]]:
         """Elimina un proveedor"""
-        # Verificar que el proveedor existe
-        proveedor = self.proveedor_repository.obtener_por_id(id)
-        if not proveedor:
-            return False, "Proveedor no encontrado"
-        
-        # Eliminar
-        exito = self.proveedor_repository.eliminar(id)
+        # Eliminar: un único DELETE, el rowcount indica si existía
+        with self.unit_of_work:
+            exito = self.proveedor_repository.eliminar(id)
         if not exito:
-            return False, "Error al eliminar el proveedor"
+            return False, "Proveedor no encontrado"
         
+        if self.buscador:
+            self.buscador.eliminar(id)
         return True, None
     
-    def buscar_proveedores(self, nombre: str) -> List[Proveedor]:
-        """Busca proveedores por nombre"""
-        return self.proveedor_repository.buscar_por_nombre(nombre)
+    def buscar_proveedores(self, nombre: str, limite: int = 20) -> List[Proveedor]:
+        """Busca proveedores por nombre, ordenados por relevancia si hay buscador configurado"""
+        if not self.buscador:
+            return self.proveedor_repository.buscar_por_nombre(nombre)[:limite]
+        ids = self.buscador.buscar(nombre, limite)
+        return self.proveedor_repository.obtener_por_ids(ids)
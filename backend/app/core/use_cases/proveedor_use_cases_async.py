@@ -0,0 +1,92 @@
+"""
+Casos de Uso de Proveedores (asyncio) - Capa de Negocio
+Mismas reglas y mensajes que ProveedorUseCases, con puertos asyncio
+"""
+from typing import Any, Dict, List, Optional
+from app.core.entities.proveedor import Proveedor
+from app.core.interfaces.proveedor_repository import IProveedorRepositoryAsync
+from app.core.interfaces.unit_of_work import IUnitOfWorkAsync
+
+
+class ProveedorUseCasesAsync:
+    """Casos de uso de proveedores con repositorio y unidad de trabajo asyncio"""
+    
+    def __init__(self, proveedor_repository: IProveedorRepositoryAsync, unit_of_work: IUnitOfWorkAsync):
+        self.proveedor_repository = proveedor_repository
+        self.unit_of_work = unit_of_work
+    
+    async def crear_proveedor(self, proveedor: Proveedor) -> tuple[bool, Optional[str], Optional[Proveedor]]:
+        """Crea un nuevo proveedor validando las reglas de negocio"""
+        es_valido, mensaje_error = proveedor.validar()
+        if not es_valido:
+            return False, mensaje_error, None
+        
+        async with self.unit_of_work:
+            proveedor_creado = await self.proveedor_repository.crear(proveedor)
+        return True, None, proveedor_creado
+    
+    async def obtener_proveedor(self, id: int) -> Optional[Proveedor]:
+        """Obtiene un proveedor por su ID"""
+        return await self.proveedor_repository.obtener_por_id(id)
+    
+    async def listar_proveedores(self) -> List[Proveedor]:
+        """Lista todos los proveedores"""
+        return await self.proveedor_repository.obtener_todos()
+    
+    async def listar_proveedores_pagina(self, after_id: int, limit: int) -> tuple[List[Proveedor], Optional[int]]:
+        """Lista una página de proveedores por keyset; retorna la página y el cursor de la siguiente"""
+        proveedores = await self.proveedor_repository.obtener_pagina(after_id, limit + 1)
+        if len(proveedores) > limit:
+            proveedores = proveedores[:limit]
+            return proveedores, proveedores[-1].id
+        return proveedores, None
+    
+    async def listar_proveedores_proyeccion(self, campos: List[str], after_id: int = 0,
+                                            limit: Optional[int] = None) -> tuple[List[Dict[str, Any]], Optional[int]]:
+        """Lista proveedores leyendo solo los campos indicados (con `limit` pagina por keyset)"""
+        if limit is None:
+            return await self.proveedor_repository.obtener_proyeccion(campos, after_id), None
+        
+        columnas = campos if 'id' in campos else ['id'] + campos
+        filas = await self.proveedor_repository.obtener_proyeccion(columnas, after_id, limit + 1)
+        if len(filas) > limit:
+            filas = filas[:limit]
+            return filas, filas[-1]['id']
+        return filas, None
+    
+    async def obtener_huella_proveedores(self) -> tuple:
+        """Obtiene la huella del listado de proveedores (para validación condicional)"""
+        return await self.proveedor_repository.obtener_huella()
+    
+    async def obtener_version_proveedor(self, id: int) -> Optional[tuple]:
+        """Obtiene la versión y la fecha de última modificación de un proveedor (None si no existe)"""
+        return await self.proveedor_repository.obtener_version(id)
+    
+    async def actualizar_proveedor(self, proveedor: Proveedor) -> tuple[bool, Optional[str], Optional[tuple]]:
+        """
+        Actualiza un proveedor existente (condicionado a proveedor.version si se indica)
+        Retorna también la versión nueva (versión, fecha), de la que sale el ETag de la respuesta
+        """
+        es_valido, mensaje_error = proveedor.validar()
+        if not es_valido:
+            return False, mensaje_error, None
+        
+        async with self.unit_of_work:
+            exito = await self.proveedor_repository.actualizar(proveedor)
+            # La versión nueva se lee antes del commit, con la fila todavía bloqueada por el UPDATE
+            version = await self.proveedor_repository.obtener_version(proveedor.id) if exito else None
+        if not exito:
+            # Solo en el camino de error se distingue la causa
+            if proveedor.version is not None and await self.proveedor_repository.obtener_version(proveedor.id) is not None:
+                return False, "El proveedor fue modificado después de la versión leída; vuelva a cargarlo", None
+            return False, "Proveedor no encontrado", None
+        proveedor.version = version[0]
+        return True, None, version
+    
+    async def eliminar_proveedor(self, id: int) -> tuple[bool, Optional[str]]:
+        """Elimina un proveedor"""
+        async with self.unit_of_work:
+            exito = await self.proveedor_repository.eliminar(id)
+        if not exito:
+            return False, "Proveedor no encontrado"
+        return True, None
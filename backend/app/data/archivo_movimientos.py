@@ -0,0 +1,44 @@
+"""
+Archivo del libro de movimientos de stock
+Antes de borrar productos (directamente o con su categoría) sus movimientos se
+mueven a movimientos_stock_archivo para conservar la auditoría: un INSERT ... SELECT
+y un DELETE que los repositorios síncronos y asíncronos ejecutan en la misma
+transacción que el DELETE de los productos (no se depende del ON DELETE CASCADE,
+que SQLite solo aplica con PRAGMA foreign_keys). Los cupos de stock de esos productos
+se borran también: SQLite puede reutilizar el ID y el producto nuevo heredaría sus cupos
+"""
+from datetime import datetime
+from typing import Tuple
+from sqlalchemy import DateTime, delete, insert, literal, select
+from sqlalchemy.sql.dml import Delete, Insert
+from app.data.models.movimiento_stock_model import CupoStockModel, MovimientoStockArchivadoModel, MovimientoStockModel
+from app.data.models.producto_model import ProductoModel
+
+_productos = ProductoModel.__table__
+_movimientos = MovimientoStockModel.__table__
+_archivo = MovimientoStockArchivadoModel.__table__
+_cupos = CupoStockModel.__table__
+
+
+def archivar_movimientos(condicion_productos) -> Tuple[Insert, Delete, Delete]:
+    """
+    Sentencias que mueven al archivo los movimientos de los productos que cumplen la
+    condición (p. ej. productos.id = :id o productos.categoria_id = :id) y borran sus
+    cupos de stock, en ese orden
+    """
+    copiar = insert(_archivo).from_select(
+        ['id', 'producto_id', 'producto_nombre', 'cantidad', 'fecha', 'compactado', 'fecha_archivo'],
+        select(
+            _movimientos.c.id, _movimientos.c.producto_id, _productos.c.nombre, _movimientos.c.cantidad,
+            _movimientos.c.fecha, _movimientos.c.compactado, literal(datetime.utcnow(), DateTime)
+        )
+        .select_from(_movimientos.join(_productos, _movimientos.c.producto_id == _productos.c.id))
+        .where(condicion_productos)
+    )
+    quitar = delete(_movimientos).where(
+        _movimientos.c.producto_id.in_(select(_productos.c.id).where(condicion_productos))
+    )
+    quitar_cupos = delete(_cupos).where(
+        _cupos.c.producto_id.in_(select(_productos.c.id).where(condicion_productos))
+    )
+    return copiar, quitar, quitar_cupos
@@ -0,0 +1 @@
+# Motores de búsqueda de texto
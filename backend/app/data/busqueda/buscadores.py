@@ -0,0 +1,243 @@
+"""
+Implementaciones del Buscador sobre tablas de la base de datos
+- BuscadorMemoria: índice invertido en el proceso, sincronizado por fecha_actualizacion
+- BuscadorFulltext: delega en un índice FULLTEXT de MySQL (MATCH ... AGAINST)
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from flask import Flask
+from sqlalchemy import and_, inspect, or_, select, text
+from app.core.interfaces.buscador import IBuscador
+from app.data.busqueda.indice_texto import IndiceTexto, normalizar
+from app.data.database import db
+
+
+class BuscadorMemoria(IBuscador):
+    """
+    Buscador con índice en memoria por worker
+    El índice se construye leyendo la tabla en streaming; después incorpora las
+    escrituras propias al instante y las de otros workers leyendo cada
+    `intervalo_sincronizacion` segundos las filas con fecha_actualizacion reciente.
+    Los borrados de otros workers y los productos eliminados en cascada con su categoría
+    no pasan por eliminar(): cada búsqueda pide el doble de IDs al índice, comprueba en la
+    base cuáles siguen existiendo y quita del índice los que no, repitiendo hasta completar
+    `limite` o agotar las coincidencias
+    
+    Con `app` la construcción corre en un hilo de fondo por proceso (iniciar(); con
+    cientos de miles de filas tarda más que el timeout de un worker) y, mientras no
+    termina, las búsquedas se resuelven con LIKE en la base de datos. Sin `app`
+    (scripts) el índice se construye en la primera búsqueda
+    """
+    
+    def __init__(self, modelo, campos: Sequence[tuple[str, float]], intervalo_sincronizacion: float = 30,
+                 app: Optional[Flask] = None):
+        self.modelo = modelo
+        self.campos = [nombre for nombre, _ in campos]
+        self.intervalo_sincronizacion = intervalo_sincronizacion
+        self.app = app
+        self.indice = IndiceTexto([peso for _, peso in campos])
+        self._marca: Optional[datetime] = None
+        self._ultima_sincronizacion: Optional[float] = None
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._lock_inicio = threading.Lock()
+    
+    def buscar(self, consulta: str, limite: int) -> List[int]:
+        """Busca en el índice tras incorporar los cambios pendientes (sin esperar a otro hilo)"""
+        if self.app is not None and self._ultima_sincronizacion is None:
+            self.iniciar()
+            return self._buscar_sin_indice(consulta, limite)
+        self._sincronizar_si_corresponde()
+        pedidos = limite * 2
+        while True:
+            ids = self.indice.buscar(consulta, pedidos)
+            existentes = self._existentes(ids)
+            for id in ids:
+                if id not in existentes:
+                    self.indice.quitar(id)
+            vigentes = [id for id in ids if id in existentes]
+            # Si hubo IDs borrados se vuelve a buscar: ya no ocupan lugar en el índice
+            if len(vigentes) >= limite or len(ids) < pedidos:
+                return vigentes[:limite]
+    
+    def _existentes(self, ids: List[int]) -> set:
+        if not ids:
+            return set()
+        tabla = self.modelo.__table__
+        return set(db.session.execute(select(tabla.c.id).where(tabla.c.id.in_(ids))).scalars())
+    
+    def iniciar(self):
+        """Inicia la construcción del índice en un hilo de fondo si no empezó en este proceso"""
+        if self.app is None or self._pid == os.getpid():
+            return
+        with self._lock_inicio:
+            if self._pid == os.getpid():
+                return
+            threading.Thread(
+                target=self._construir, name=f'indice-{self.modelo.__tablename__}', daemon=True
+            ).start()
+            self._pid = os.getpid()
+    
+    def _construir(self):
+        try:
+            with self.app.app_context():
+                inicio = time.perf_counter()
+                self.sincronizar()
+                self.app.logger.info('Índice de búsqueda de %s listo: %d filas en %.1f s',
+                                     self.modelo.__tablename__, len(self.indice), time.perf_counter() - inicio)
+        except Exception:
+            # La próxima búsqueda vuelve a intentarlo; mientras tanto se usa LIKE
+            self.app.logger.exception('Error al construir el índice de búsqueda de %s', self.modelo.__tablename__)
+            self._pid = None
+    
+    def _buscar_sin_indice(self, consulta: str, limite: int) -> List[int]:
+        """
+        Mientras el índice se construye: filas en las que cada término es el comienzo de una
+        palabra de algún campo (LIKE 'x%' o LIKE '% x%'), ordenadas por ID y sin ranking
+        Se aproxima a la búsqueda por prefijo del índice sin su insensibilidad a acentos;
+        el patrón con comodín inicial no usa índices de la base y recorre la tabla
+        """
+        palabras = consulta.split()
+        if not palabras or limite <= 0:
+            return []
+        tabla = self.modelo.__table__
+        condicion = and_(*[
+            or_(*[
+                condicion_campo
+                for campo in self.campos
+                for condicion_campo in (
+                    tabla.c[campo].istartswith(palabra, autoescape=True),
+                    tabla.c[campo].icontains(' ' + palabra, autoescape=True)
+                )
+            ])
+            for palabra in palabras
+        ])
+        return list(db.session.execute(
+            select(tabla.c.id).where(condicion).order_by(tabla.c.id).limit(limite)
+        ).scalars())
+    
+    def indexar(self, entidad: Any) -> None:
+        """Reindexa una entidad recién escrita por este proceso"""
+        if self._ultima_sincronizacion is None:
+            return  # el índice aún no se construyó; la carga inicial la incluirá
+        self.indice.agregar(entidad.id, [getattr(entidad, campo) or '' for campo in self.campos])
+    
+    def eliminar(self, id: int) -> None:
+        """Quita una entidad borrada por este proceso"""
+        self.indice.quitar(id)
+    
+    def sincronizar(self) -> None:
+        """Fuerza la lectura de los cambios pendientes"""
+        with self._lock:
+            self._sincronizar()
+    
+    def _sincronizar_si_corresponde(self):
+        ahora = time.monotonic()
+        if self._ultima_sincronizacion is not None and \
+                ahora - self._ultima_sincronizacion < self.intervalo_sincronizacion:
+            return
+        if self._ultima_sincronizacion is not None:
+            # Si otro hilo ya está leyendo los cambios se busca en el índice tal como está
+            if not self._lock.acquire(blocking=False):
+                return
+        else:
+            self._lock.acquire()
+        try:
+            if self._ultima_sincronizacion is None or \
+                    ahora - self._ultima_sincronizacion >= self.intervalo_sincronizacion:
+                self._sincronizar()
+        finally:
+            self._lock.release()
+    
+    def _sincronizar(self):
+        tabla = self.modelo.__table__
+        columnas = [tabla.c.id] + [tabla.c[campo] for campo in self.campos] + [tabla.c.fecha_actualizacion]
+        consulta = select(*columnas)
+        if self._marca is not None:
+            # >= para no perder filas escritas en el mismo instante que la marca
+            consulta = consulta.where(tabla.c.fecha_actualizacion >= self._marca)
+        consulta = consulta.execution_options(stream_results=True, yield_per=5000)
+        
+        inicio = time.monotonic()
+        marca = self._marca
+        
+        def documentos():
+            nonlocal marca
+            for fila in db.session.execute(consulta):
+                fecha = fila[-1]
+                if fecha is not None and (marca is None or fecha > marca):
+                    marca = fecha
+                yield fila[0], [valor or '' for valor in fila[1:-1]]
+        
+        if self._marca is None:
+            self.indice.cargar(documentos())
+        else:
+            for id, textos in documentos():
+                self.indice.agregar(id, textos)
+        
+        self._marca = marca
+        self._ultima_sincronizacion = inicio
+
+
+class BuscadorFulltext(IBuscador):
+    """Buscador sobre un índice FULLTEXT de MySQL en modo booleano con prefijos"""
+    
+    def __init__(self, modelo, campos: Sequence[tuple[str, float]]):
+        self.tabla = modelo.__tablename__
+        self.campos = [nombre for nombre, _ in campos]
+        self.nombre_indice = f'ft_{self.tabla}_texto'
+    
+    def asegurar_indice(self):
+        """Crea el índice FULLTEXT si no existe; requiere contexto de aplicación"""
+        indices = {i['name'] for i in inspect(db.engine).get_indexes(self.tabla)}
+        if self.nombre_indice not in indices:
+            with db.engine.begin() as conexion:
+                conexion.execute(text(
+                    f'CREATE FULLTEXT INDEX {self.nombre_indice} ON {self.tabla} ({", ".join(self.campos)})'
+                ))
+    
+    def buscar(self, consulta: str, limite: int) -> List[int]:
+        """Busca con MATCH ... AGAINST exigiendo todos los términos como prefijo"""
+        terminos = normalizar(consulta)
+        if not terminos or limite <= 0:
+            return []
+        expresion = ' '.join(f'+{t}*' for t in terminos)
+        columnas = ', '.join(self.campos)
+        filas = db.session.execute(text(
+            f'SELECT id, MATCH({columnas}) AGAINST (:expresion IN BOOLEAN MODE) AS puntaje '
+            f'FROM {self.tabla} WHERE MATCH({columnas}) AGAINST (:expresion IN BOOLEAN MODE) '
+            f'ORDER BY puntaje DESC, id LIMIT :limite'
+        ), {'expresion': expresion, 'limite': limite})
+        return [fila[0] for fila in filas]
+    
+    def indexar(self, entidad: Any) -> None:
+        """El motor mantiene el índice FULLTEXT"""
+        pass
+    
+    def eliminar(self, id: int) -> None:
+        """El motor mantiene el índice FULLTEXT"""
+        pass
+    
+    def sincronizar(self) -> None:
+        """El motor mantiene el índice FULLTEXT"""
+        pass
+
+
+def crear_buscador(backend: str, modelo, campos: Sequence[tuple[str, float]],
+                   intervalo_sincronizacion: float = 30, app: Optional[Flask] = None) -> Optional[IBuscador]:
+    """
+    Crea el buscador configurado ('memoria', 'fulltext' o 'ninguno', que retorna None)
+    `app` habilita la construcción en segundo plano del índice en memoria
+    """
+    if backend == 'ninguno':
+        return None
+    if backend == 'fulltext':
+        buscador = BuscadorFulltext(modelo, campos)
+        buscador.asegurar_indice()
+        return buscador
+    if backend == 'memoria':
+        return BuscadorMemoria(modelo, campos, intervalo_sincronizacion, app)
+    raise ValueError(f"Backend de búsqueda desconocido: {backend}")
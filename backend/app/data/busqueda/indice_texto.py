@@ -0,0 +1,169 @@
+"""
+Índice invertido en memoria por palabras con búsqueda por prefijo
+Insensible a mayúsculas y acentos; pensado para nombres y descripciones cortas
+"""
+import bisect
+import heapq
+import re
+import sys
+import threading
+import unicodedata
+from typing import Dict, List, Sequence, Set, Tuple
+
+PALABRAS_VACIAS = frozenset({
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'la', 'las', 'los', 'o', 'para',
+    'por', 'sin', 'un', 'una', 'y'
+})
+
+_PATRON_PALABRA = re.compile(r'[a-z0-9]+')
+
+# Camino rápido para los acentos del español; el resto se resuelve con NFKD
+_SIN_ACENTOS = str.maketrans('áéíóúüñàèìòùâêîôûäëïö', 'aeiouunaeiouaeiouaeio')
+
+
+def normalizar(texto: str) -> List[str]:
+    """Convierte un texto en palabras en minúsculas, sin acentos ni palabras vacías"""
+    if not texto:
+        return []
+    sin_acentos = texto.lower().translate(_SIN_ACENTOS)
+    if not sin_acentos.isascii():
+        sin_acentos = ''.join(
+            c for c in unicodedata.normalize('NFKD', sin_acentos) if not unicodedata.combining(c)
+        )
+    return [p for p in _PATRON_PALABRA.findall(sin_acentos) if p not in PALABRAS_VACIAS]
+
+
+class IndiceTexto:
+    """
+    Índice invertido: palabra -> IDs, un diccionario por campo (con peso propio)
+    El vocabulario se mantiene ordenado para expandir prefijos con bisect
+    """
+    
+    # Bonificación por coincidencia exacta de la palabra frente a coincidencia por prefijo
+    PESO_PREFIJO = 0.5
+    # Máximo de palabras del vocabulario en que se expande un prefijo
+    MAX_EXPANSIONES = 64
+    # Longitud mínima para expandir un término como prefijo
+    MIN_PREFIJO = 2
+    
+    def __init__(self, pesos: Sequence[float]):
+        self.pesos = tuple(pesos)
+        self._postings: List[Dict[str, Set[int]]] = [{} for _ in self.pesos]
+        self._documentos: Dict[int, Tuple[Tuple[str, ...], ...]] = {}
+        self._vocabulario: List[str] = []
+        self._conteo_palabras: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        return len(self._documentos)
+    
+    def agregar(self, id: int, textos: Sequence[str]):
+        """Indexa (o reindexa) un documento; `textos` va en el mismo orden que los pesos"""
+        palabras_por_campo = tuple(
+            tuple(sys.intern(p) for p in dict.fromkeys(normalizar(texto)))
+            for texto in textos
+        )
+        with self._lock:
+            if id in self._documentos:
+                self._quitar(id)
+            self._documentos[id] = palabras_por_campo
+            for campo, palabras in enumerate(palabras_por_campo):
+                postings = self._postings[campo]
+                for palabra in palabras:
+                    ids = postings.get(palabra)
+                    if ids is None:
+                        postings[palabra] = ids = set()
+                    ids.add(id)
+                    self._sumar_palabra(palabra)
+    
+    def cargar(self, documentos):
+        """Carga masiva de (id, textos) ordenando el vocabulario una sola vez al final"""
+        with self._lock:
+            vocabulario = self._vocabulario
+            self._vocabulario = None  # evita el insort por palabra durante la carga
+            try:
+                for id, textos in documentos:
+                    self.agregar(id, textos)
+            finally:
+                self._vocabulario = vocabulario
+                self._vocabulario[:] = sorted(self._conteo_palabras)
+    
+    def quitar(self, id: int):
+        """Elimina un documento del índice"""
+        with self._lock:
+            if id in self._documentos:
+                self._quitar(id)
+    
+    def buscar(self, consulta: str, limite: int) -> List[int]:
+        """Retorna los IDs de los documentos que contienen todos los términos, por puntaje"""
+        terminos = list(dict.fromkeys(normalizar(consulta)))
+        if not terminos or limite <= 0:
+            return []
+        
+        with self._lock:
+            puntajes_por_termino = [self._puntuar_termino(t) for t in terminos]
+        
+        # Intersección comenzando por el término más selectivo
+        puntajes_por_termino.sort(key=len)
+        acumulado = puntajes_por_termino[0]
+        for puntajes in puntajes_por_termino[1:]:
+            acumulado = {id: p + puntajes[id] for id, p in acumulado.items() if id in puntajes}
+            if not acumulado:
+                return []
+        
+        mejores = heapq.nlargest(limite, acumulado.items(), key=lambda item: (item[1], -item[0]))
+        return [id for id, _ in mejores]
+    
+    def _puntuar_termino(self, termino: str) -> Dict[int, float]:
+        """Puntaje por documento para un término: mejor campo y tipo de coincidencia"""
+        puntajes: Dict[int, float] = {}
+        for palabra in self._expandir(termino):
+            factor = 1.0 if palabra == termino else self.PESO_PREFIJO
+            for campo, postings in enumerate(self._postings):
+                ids = postings.get(palabra)
+                if not ids:
+                    continue
+                puntaje = self.pesos[campo] * factor
+                for id in ids:
+                    if puntajes.get(id, 0) < puntaje:
+                        puntajes[id] = puntaje
+        return puntajes
+    
+    def _expandir(self, termino: str) -> List[str]:
+        """Palabras del vocabulario que empiezan con el término (incluye la exacta)"""
+        if len(termino) < self.MIN_PREFIJO:
+            return [termino] if termino in self._conteo_palabras else []
+        inicio = bisect.bisect_left(self._vocabulario, termino)
+        palabras = []
+        for palabra in self._vocabulario[inicio:inicio + self.MAX_EXPANSIONES]:
+            if not palabra.startswith(termino):
+                break
+            palabras.append(palabra)
+        return palabras
+    
+    def _quitar(self, id: int):
+        for campo, palabras in enumerate(self._documentos.pop(id)):
+            postings = self._postings[campo]
+            for palabra in palabras:
+                ids = postings[palabra]
+                ids.discard(id)
+                if not ids:
+                    del postings[palabra]
+                self._restar_palabra(palabra)
+    
+    def _sumar_palabra(self, palabra: str):
+        conteo = self._conteo_palabras.get(palabra, 0)
+        self._conteo_palabras[palabra] = conteo + 1
+        if conteo == 0 and self._vocabulario is not None:
+            bisect.insort(self._vocabulario, palabra)
+    
+    def _restar_palabra(self, palabra: str):
+        conteo = self._conteo_palabras[palabra] - 1
+        if conteo:
+            self._conteo_palabras[palabra] = conteo
+            return
+        del self._conteo_palabras[palabra]
+        if self._vocabulario is not None:
+            posicion = bisect.bisect_left(self._vocabulario, palabra)
+            if posicion < len(self._vocabulario) and self._vocabulario[posicion] == palabra:
+                del self._vocabulario[posicion]
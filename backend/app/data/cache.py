@@ -0,0 +1,72 @@
+"""
+Caché en memoria del proceso con política LRU y expiración por TTL
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class CacheLRU:
+    """
+    Caché acotada (LRU) con expiración por tiempo y contadores de aciertos/fallos
+    `observador` (opcional) se llama con True/False en cada acierto/fallo (métricas)
+    """
+    
+    def __init__(self, max_entradas: int = 1024, ttl_segundos: float = 300,
+                 observador: Optional[Callable[[bool], None]] = None):
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self.observador = observador
+        self.hits = 0
+        self.misses = 0
+        self._entradas: OrderedDict = OrderedDict()
+        self._generacion = 0
+        self._lock = threading.Lock()
+    
+    def obtener_o_cargar(self, clave: Hashable, cargar: Callable[[], Any]) -> Any:
+        """
+        Retorna el valor en caché o lo carga con `cargar()` y lo almacena
+        Si la caché se invalidó mientras se cargaba, el valor se retorna pero no se
+        guarda: pudo leerse antes de la escritura que provocó la invalidación
+        """
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            acierto = entrada is not None and entrada[0] > ahora
+            if acierto:
+                self._entradas.move_to_end(clave)
+                self.hits += 1
+            else:
+                self.misses += 1
+            generacion = self._generacion
+        if self.observador is not None:
+            self.observador(acierto)
+        if acierto:
+            return entrada[1]
+        
+        # La carga se hace fuera del lock para no serializar consultas a la BD
+        valor = cargar()
+        with self._lock:
+            if generacion != self._generacion:
+                return valor
+            self._entradas[clave] = (ahora + self.ttl_segundos, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return valor
+    
+    def invalidar(self):
+        """Elimina todas las entradas y descarta las cargas en curso"""
+        with self._lock:
+            self._entradas.clear()
+            self._generacion += 1
+    
+    def estadisticas(self) -> dict:
+        """Retorna los contadores de la caché"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entradas': len(self._entradas)
+            }
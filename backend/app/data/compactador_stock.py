@@ -0,0 +1,116 @@
+"""
+Compactador del libro de movimientos de stock (STOCK_MODO=libro)
+Suma periódicamente los movimientos pendientes a productos.cantidad_stock para que
+el stock actual (snapshot + pendientes) se calcule sobre pocas filas
+
+Corre en un hilo de fondo por proceso, iniciado en la primera petición de cada worker
+(con preload_app el maestro hace fork después de create_app y los hilos no se heredan).
+Varios compactadores a la vez son seguros: cada lote se marca con un UPDATE condicional
+y, si otro proceso tomó alguno de sus movimientos, el lote se descarta
+"""
+import os
+import threading
+from typing import Dict, Optional
+from flask import Flask
+from sqlalchemy import bindparam, select, update
+from app.data.database import db
+from app.data.models.movimiento_stock_model import MovimientoStockModel
+from app.data.models.producto_model import ProductoModel
+
+_productos = ProductoModel.__table__
+_movimientos = MovimientoStockModel.__table__
+
+
+def compactar_movimientos(tamano_lote: int = 1000) -> int:
+    """
+    Suma al snapshot un lote de movimientos pendientes y los marca como compactados en
+    una sola transacción (una lectura ve cada delta en el snapshot o en los pendientes,
+    nunca en ambos). Retorna la cantidad de movimientos compactados (0 si no había o si
+    otro compactador tomó el lote); requiere contexto de aplicación
+    """
+    filas = db.session.execute(
+        select(_movimientos.c.id, _movimientos.c.producto_id, _movimientos.c.cantidad)
+        .where(_movimientos.c.compactado == False)  # noqa: E712
+        .order_by(_movimientos.c.id).limit(tamano_lote)
+    ).all()
+    if not filas:
+        db.session.rollback()
+        return 0
+    
+    ids = [fila.id for fila in filas]
+    marcados = db.session.execute(
+        update(_movimientos)
+        .where(_movimientos.c.id.in_(ids), _movimientos.c.compactado == False)  # noqa: E712
+        .values(compactado=True)
+    ).rowcount
+    if marcados != len(ids):
+        db.session.rollback()
+        return 0
+    
+    deltas: Dict[int, int] = {}
+    for fila in filas:
+        deltas[fila.producto_id] = deltas.get(fila.producto_id, 0) + fila.cantidad
+    ajustes = [{'b_id': id, 'b_delta': delta} for id, delta in deltas.items() if delta]
+    if ajustes:
+        # fecha_actualizacion se conserva: compactar no cambia el stock visible
+        db.session.execute(
+            update(_productos)
+            .where(_productos.c.id == bindparam('b_id'))
+            .values(
+                cantidad_stock=_productos.c.cantidad_stock + bindparam('b_delta'),
+                fecha_actualizacion=_productos.c.fecha_actualizacion
+            ),
+            ajustes
+        )
+    db.session.commit()
+    return len(ids)
+
+
+class CompactadorStock:
+    """Hilo de fondo que compacta el libro cada `intervalo` segundos"""
+    
+    def __init__(self, app: Flask, intervalo: float, tamano_lote: int = 1000):
+        self.app = app
+        self.intervalo = intervalo
+        self.tamano_lote = tamano_lote
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+    
+    def compactar(self) -> int:
+        """Compacta lotes hasta que no queden movimientos pendientes; retorna el total"""
+        total = 0
+        with self.app.app_context():
+            while True:
+                compactados = compactar_movimientos(self.tamano_lote)
+                total += compactados
+                if compactados < self.tamano_lote:
+                    return total
+    
+    def iniciar(self):
+        """Inicia el hilo si no está corriendo en este proceso (idempotente, barato por petición)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._detener.clear()
+            self._hilo = threading.Thread(target=self._ciclo, name='compactador-stock', daemon=True)
+            self._hilo.start()
+            self._pid = os.getpid()
+    
+    def detener(self):
+        """Detiene el hilo (espera a que termine el lote en curso)"""
+        self._detener.set()
+        if self._hilo is not None and self._pid == os.getpid():
+            self._hilo.join()
+        self._pid = None
+    
+    def _ciclo(self):
+        while not self._detener.wait(self.intervalo):
+            try:
+                self.compactar()
+            except Exception:
+                # Un fallo (p. ej. la base no disponible) no detiene el hilo: se reintenta
+                self.app.logger.exception('Error al compactar el libro de movimientos de stock')
@@ -3,12 +3,15 @@ Configuración de SQLAlchemy
 """
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
+from app.data.enrutamiento import SesionEnrutada
 
-db = SQLAlchemy()
+# La sesión envía las lecturas marcadas a la réplica si hay una configurada (ver enrutamiento.py)
+db = SQLAlchemy(session_options={'class_': SesionEnrutada})
 
 
 def init_db(app):
     """Inicializa la base de datos con la aplicación Flask"""
     db.init_app(app)
     with app.app_context():
-        db.create_all()
+        from app.data.migraciones import migrar
+        migrar()
@@ -0,0 +1,33 @@
+"""
+Configuración de SQLAlchemy asyncio (variante ASGI de la API)
+Usa los mismos modelos y tablas que database.py; solo cambia el driver (aiomysql / aiosqlite)
+"""
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncEngine, async_scoped_session, async_sessionmaker, create_async_engine
+
+# Driver síncrono de la URI -> driver asyncio equivalente
+DRIVERS_ASYNC = {
+    'mysql': 'mysql+aiomysql',
+    'mysql+pymysql': 'mysql+aiomysql',
+    'sqlite': 'sqlite+aiosqlite'
+}
+
+
+def url_async(uri: str) -> str:
+    """Traduce la URI configurada (p. ej. mysql+pymysql://...) a su driver asyncio"""
+    esquema, separador, resto = uri.partition('://')
+    return f"{DRIVERS_ASYNC.get(esquema, esquema)}{separador}{resto}"
+
+
+def crear_motor_async(uri: str, opciones: dict) -> AsyncEngine:
+    """Crea el engine asyncio con las mismas opciones de pool y SSL que el engine síncrono"""
+    return create_async_engine(url_async(uri), **opciones)
+
+
+def crear_sesion_async(motor: AsyncEngine) -> async_scoped_session:
+    """
+    Sesión con alcance de tarea: cada petición (una tarea de asyncio en Quart) usa su propia AsyncSession
+    expire_on_commit=False evita recargas implícitas (I/O) al leer atributos tras el commit
+    """
+    fabrica = async_sessionmaker(motor, expire_on_commit=False)
+    return async_scoped_session(fabrica, scopefunc=asyncio.current_task)
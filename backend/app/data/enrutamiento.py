@@ -0,0 +1,76 @@
+"""
+Separación de lecturas y escrituras entre la base primaria y una réplica de lectura
+
+Los métodos de lectura de los repositorios se marcan con @lectura_en_replica; mientras
+se ejecutan, la sesión envía sus sentencias al engine 'replica' (SQLALCHEMY_BINDS).
+Todo lo demás (escrituras, SELECT ... FOR UPDATE, validaciones previas a una escritura)
+va a la primaria. Regla de permanencia: en cuanto la sesión escribe, el resto de la
+petición (la sesión de Flask-SQLAlchemy vive lo que el contexto de aplicación) lee de
+la primaria, así una petición siempre ve sus propias escrituras
+
+Sin réplica configurada el engine 'replica' no existe y todo va a la primaria
+"""
+import functools
+import inspect
+from contextvars import ContextVar
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+BIND_REPLICA = 'replica'
+
+_lectura: ContextVar[bool] = ContextVar('lectura_en_replica', default=False)
+
+
+def lectura_en_replica(metodo):
+    """
+    Marca un método de repositorio como lectura que tolera el retraso de la réplica
+    En funciones generadoras (exportaciones en streaming) la marca se aplica en cada
+    avance, porque las consultas se ejecutan al consumir el iterador
+    """
+    if inspect.isgeneratorfunction(metodo):
+        @functools.wraps(metodo)
+        def generador(*args, **kwargs):
+            iterador = metodo(*args, **kwargs)
+            while True:
+                token = _lectura.set(True)
+                try:
+                    valor = next(iterador)
+                except StopIteration:
+                    return
+                finally:
+                    _lectura.reset(token)
+                yield valor
+        return generador
+    
+    @functools.wraps(metodo)
+    def envoltura(*args, **kwargs):
+        token = _lectura.set(True)
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            _lectura.reset(token)
+    return envoltura
+
+
+class SesionEnrutada(Session):
+    """Sesión de Flask-SQLAlchemy que envía las lecturas marcadas a la réplica"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _lectura.get() and not self.info.get('escritura'):
+            replica = self._db.engines.get(BIND_REPLICA)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(SesionEnrutada, 'do_orm_execute')
+def _marcar_dml(estado):
+    """INSERT/UPDATE/DELETE ejecutados con session.execute (lotes, ajustes de stock)"""
+    if estado.is_insert or estado.is_update or estado.is_delete:
+        estado.session.info['escritura'] = True
+
+
+@event.listens_for(SesionEnrutada, 'after_flush')
+def _marcar_flush(sesion, contexto_flush):
+    """Escrituras del ORM (add/delete de modelos)"""
+    sesion.info['escritura'] = True
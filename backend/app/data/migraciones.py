@@ -0,0 +1,199 @@
+"""
+Migraciones de esquema versionadas
+La versión aplicada se guarda en la tabla esquema_version. Las migraciones se
+ejecutan una sola vez como paso del despliegue (python migrar.py); al iniciar,
+la aplicación solo lee la versión (una consulta) y la compara con VERSION_ESQUEMA
+
+Cada migración es idempotente: una base creada desde cero con la versión 1
+(create_all de los modelos actuales) ya incluye los cambios de las siguientes
+"""
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from app.data.database import db
+
+_metadata_versiones = MetaData()
+esquema_version = Table(
+    'esquema_version', _metadata_versiones,
+    Column('version', Integer, primary_key=True, autoincrement=False),
+    Column('descripcion', String(200), nullable=False)
+)
+
+
+class EsquemaDesactualizadoError(RuntimeError):
+    """La base de datos no tiene aplicadas todas las migraciones que requiere el código"""
+
+# (tabla, columna, definición SQL, sentencia de relleno para filas existentes)
+COLUMNAS_AGREGADAS = [
+    ('categorias', 'fecha_actualizacion', 'DATETIME NULL',
+     'UPDATE categorias SET fecha_actualizacion = fecha_creacion WHERE fecha_actualizacion IS NULL'),
+    ('proveedores', 'fecha_actualizacion', 'DATETIME NULL',
+     'UPDATE proveedores SET fecha_actualizacion = fecha_creacion WHERE fecha_actualizacion IS NULL'),
+]
+
+# (tabla, columna, tipo, expresión)
+COLUMNAS_GENERADAS = [
+    ('productos', 'deficit', 'INTEGER', 'stock_minimo - cantidad_stock'),
+]
+
+# (tabla, nombre del índice, columnas)
+INDICES = [
+    ('productos', 'ix_productos_categoria_id', ['categoria_id']),
+    ('productos', 'ix_productos_proveedor_id', ['proveedor_id']),
+    ('productos', 'ix_productos_deficit', ['deficit']),
+    ('productos', 'ix_productos_fecha_actualizacion', ['fecha_actualizacion']),
+]
+
+
+def _crear_tablas():
+    """Tablas de los modelos que aún no existen"""
+    from app.data.models import categoria_model, proveedor_model, producto_model, movimiento_stock_model  # noqa: F401
+    db.create_all()
+
+
+def aplicar_migraciones():
+    """Agrega las columnas e índices faltantes (idempotente); requiere contexto de aplicación"""
+    inspector = inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    
+    with db.engine.begin() as conexion:
+        for tabla, columna, definicion, relleno in COLUMNAS_AGREGADAS:
+            if tabla not in tablas or _tiene_columna(inspector, tabla, columna):
+                continue
+            conexion.execute(text(f'ALTER TABLE {tabla} ADD COLUMN {columna} {definicion}'))
+            if relleno:
+                conexion.execute(text(relleno))
+    
+    for tabla, columna, tipo, expresion in COLUMNAS_GENERADAS:
+        if tabla not in tablas or _tiene_columna(inspector, tabla, columna):
+            continue
+        _agregar_columna_generada(tabla, columna, tipo, expresion)
+    
+    with db.engine.begin() as conexion:
+        for tabla, nombre, columnas in INDICES:
+            if tabla not in tablas or _tiene_indice(inspector, tabla, columnas):
+                continue
+            conexion.execute(text(f'CREATE INDEX {nombre} ON {tabla} ({", ".join(columnas)})'))
+
+
+def _agregar_columna_generada(tabla: str, columna: str, tipo: str, expresion: str):
+    """
+    Agrega una columna generada STORED; SQLite y TiDB no admiten agregar columnas
+    STORED con ALTER TABLE, en ese caso se agrega VIRTUAL (el índice la materializa)
+    """
+    for almacenamiento in ('STORED', 'VIRTUAL'):
+        try:
+            with db.engine.begin() as conexion:
+                conexion.execute(text(
+                    f'ALTER TABLE {tabla} ADD COLUMN {columna} {tipo} '
+                    f'GENERATED ALWAYS AS ({expresion}) {almacenamiento}'
+                ))
+            return
+        except DBAPIError:
+            if almacenamiento == 'VIRTUAL':
+                raise
+
+
+def _tiene_columna(inspector, tabla: str, columna: str) -> bool:
+    """Verifica si la tabla ya tiene la columna (incluye columnas generadas)"""
+    inspector.clear_cache()
+    return columna in {c['name'] for c in inspector.get_columns(tabla)}
+
+
+def _tiene_indice(inspector, tabla: str, columnas: list) -> bool:
+    """Verifica si existe algún índice cuyo prefijo sean las columnas dadas"""
+    inspector.clear_cache()
+    for indice in inspector.get_indexes(tabla):
+        if indice['column_names'][:len(columnas)] == columnas:
+            return True
+    for restriccion in (inspector.get_pk_constraint(tabla), *inspector.get_unique_constraints(tabla)):
+        if (restriccion.get('constrained_columns') or restriccion.get('column_names') or [])[:len(columnas)] == columnas:
+            return True
+    return False
+
+
+def _crear_movimientos_stock():
+    """Tabla del libro de movimientos de stock con sus índices (si no existe)"""
+    from app.data.models import categoria_model, proveedor_model, producto_model  # noqa: F401
+    from app.data.models.movimiento_stock_model import MovimientoStockModel
+    MovimientoStockModel.__table__.create(db.engine, checkfirst=True)
+
+
+def _agregar_columnas_version():
+    """Columna version (concurrencia optimista) en las tablas editables; las filas existentes quedan en 1"""
+    inspector = inspect(db.engine)
+    tablas = set(inspector.get_table_names())
+    with db.engine.begin() as conexion:
+        for tabla in ('productos', 'categorias', 'proveedores'):
+            if tabla not in tablas or _tiene_columna(inspector, tabla, 'version'):
+                continue
+            conexion.execute(text(f'ALTER TABLE {tabla} ADD COLUMN version INTEGER NOT NULL DEFAULT 1'))
+
+
+def _crear_archivo_movimientos():
+    """Tabla de movimientos de productos eliminados (si no existe)"""
+    from app.data.models import categoria_model, proveedor_model, producto_model  # noqa: F401
+    from app.data.models.movimiento_stock_model import MovimientoStockArchivadoModel
+    MovimientoStockArchivadoModel.__table__.create(db.engine, checkfirst=True)
+
+
+def _crear_cupos_stock():
+    """Tabla de cupos de stock del libro (si no existe); los cupos se crean en el primer descuento"""
+    from app.data.models import categoria_model, proveedor_model, producto_model  # noqa: F401
+    from app.data.models.movimiento_stock_model import CupoStockModel
+    CupoStockModel.__table__.create(db.engine, checkfirst=True)
+
+
+# (versión, descripción, función); las versiones son consecutivas y nunca se reescriben
+MIGRACIONES: List[Tuple[int, str, Callable[[], None]]] = [
+    (1, 'Esquema base: tablas de los modelos', _crear_tablas),
+    (2, 'fecha_actualizacion, columna generada deficit e índices de productos', aplicar_migraciones),
+    (3, 'Libro de movimientos de stock (movimientos_stock)', _crear_movimientos_stock),
+    (4, 'Columna version para el control de concurrencia optimista', _agregar_columnas_version),
+    (5, 'Archivo de movimientos de stock de productos eliminados', _crear_archivo_movimientos),
+    (6, 'Cupos de stock para descuentos sin bloqueo de fila (stock_cupos)', _crear_cupos_stock),
+]
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+
+def version_aplicada() -> int:
+    """Versión registrada en la base (0 si nunca se migró); una sola consulta"""
+    try:
+        with db.engine.connect() as conexion:
+            return conexion.execute(select(func.max(esquema_version.c.version))).scalar() or 0
+    except DBAPIError:
+        return 0  # la tabla esquema_version aún no existe
+
+
+def migrar() -> List[int]:
+    """Aplica las migraciones pendientes en orden y retorna las versiones aplicadas"""
+    _metadata_versiones.create_all(db.engine)
+    actual = version_aplicada()
+    aplicadas = []
+    for version, descripcion, funcion in MIGRACIONES:
+        if version <= actual:
+            continue
+        funcion()
+        with db.engine.begin() as conexion:
+            conexion.execute(esquema_version.insert().values(version=version, descripcion=descripcion))
+        aplicadas.append(version)
+    return aplicadas
+
+
+def verificar_esquema() -> int:
+    """Comprueba que la base esté en la versión que requiere el código"""
+    actual = version_aplicada()
+    if actual < VERSION_ESQUEMA:
+        raise EsquemaDesactualizadoError(
+            f"El esquema está en la versión {actual} y la aplicación requiere la {VERSION_ESQUEMA}: "
+            f"ejecute 'python migrar.py' antes de iniciar los workers"
+        )
+    return actual
+
+
+def reiniciar_esquema() -> List[int]:
+    """Elimina todas las tablas (incluida esquema_version) y migra desde cero"""
+    from app.data.models import categoria_model, proveedor_model, producto_model, movimiento_stock_model  # noqa: F401
+    db.drop_all()
+    _metadata_versiones.drop_all(db.engine)
+    return migrar()
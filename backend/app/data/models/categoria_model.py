@@ -15,6 +15,9 @@ class CategoriaModel(db.Model):
     nombre = db.Column(db.String(100), nullable=False, unique=True)
     descripcion = db.Column(db.Text, nullable=False)
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Control de concurrencia optimista (ver ProductoModel.version)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relación con productos
     productos = db.relationship('ProductoModel', backref='categoria', lazy=True, cascade='all, delete-orphan')
@@ -25,7 +28,9 @@ class CategoriaModel(db.Model):
             id=self.id,
             nombre=self.nombre,
             descripcion=self.descripcion,
-            fecha_creacion=self.fecha_creacion
+            fecha_creacion=self.fecha_creacion,
+            fecha_actualizacion=self.fecha_actualizacion,
+            version=self.version
         )
     
     @staticmethod
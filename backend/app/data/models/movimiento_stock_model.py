@@ -0,0 +1,57 @@
+"""
+Modelo del libro de movimientos de stock para SQLAlchemy
+Cada ajuste es una fila que solo se inserta; el compactador la suma a
+productos.cantidad_stock y la marca como compactada (la fila se conserva como auditoría)
+"""
+from datetime import datetime
+from app.data.database import db
+
+
+class MovimientoStockModel(db.Model):
+    """Modelo de base de datos para un movimiento de stock"""
+    __tablename__ = 'movimientos_stock'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    producto_id = db.Column(db.Integer, db.ForeignKey('productos.id', ondelete='CASCADE'), nullable=False)
+    cantidad = db.Column(db.Integer, nullable=False)
+    fecha = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    compactado = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    
+    __table_args__ = (
+        # Deltas pendientes de un producto (stock actual = snapshot + pendientes)
+        db.Index('ix_movimientos_stock_producto_compactado', 'producto_id', 'compactado'),
+        # Lotes del compactador (WHERE compactado = 0 ORDER BY id)
+        db.Index('ix_movimientos_stock_compactado', 'compactado', 'id'),
+    )
+
+
+class MovimientoStockArchivadoModel(db.Model):
+    """
+    Movimientos de productos eliminados: al borrar un producto (o su categoría) sus
+    movimientos se mueven aquí (app/data/archivo_movimientos.py), con el nombre del
+    producto porque la fila de productos ya no existe
+    """
+    __tablename__ = 'movimientos_stock_archivo'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    producto_id = db.Column(db.Integer, nullable=False, index=True)
+    producto_nombre = db.Column(db.String(200), nullable=False)
+    cantidad = db.Column(db.Integer, nullable=False)
+    fecha = db.Column(db.DateTime, nullable=False)
+    compactado = db.Column(db.Boolean, nullable=False)
+    fecha_archivo = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class CupoStockModel(db.Model):
+    """
+    Cupo de stock de un producto para descontar sin bloquear su fila (STOCK_MODO=libro)
+    El stock disponible se reparte en N cupos; un descuento resta de un cupo al azar con
+    un UPDATE condicional y solo compite con los descuentos que eligieron el mismo cupo.
+    La suma de los cupos nunca supera el stock actual (los ingresos no los aumentan: se
+    reparten de nuevo cuando un descuento encuentra su cupo agotado)
+    """
+    __tablename__ = 'stock_cupos'
+    
+    producto_id = db.Column(db.Integer, db.ForeignKey('productos.id', ondelete='CASCADE'), primary_key=True)
+    cupo = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    cantidad = db.Column(db.Integer, nullable=False)
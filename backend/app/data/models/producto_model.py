@@ -2,6 +2,7 @@
 Modelo de Producto para SQLAlchemy
 """
 from datetime import datetime
+from typing import Optional
 from app.data.database import db
 from app.core.entities.producto import Producto
 
@@ -16,12 +17,19 @@ class ProductoModel(db.Model):
     precio = db.Column(db.Float, nullable=False)
     cantidad_stock = db.Column(db.Integer, nullable=False)
     stock_minimo = db.Column(db.Integer, nullable=False)
-    categoria_id = db.Column(db.Integer, db.ForeignKey('categorias.id'), nullable=False)
-    proveedor_id = db.Column(db.Integer, db.ForeignKey('proveedores.id'), nullable=False)
+    categoria_id = db.Column(db.Integer, db.ForeignKey('categorias.id'), nullable=False, index=True)
+    proveedor_id = db.Column(db.Integer, db.ForeignKey('proveedores.id'), nullable=False, index=True)
+    # Columna generada e indexada: deficit >= 0 equivale a cantidad_stock <= stock_minimo,
+    # pero permite un range scan sobre el índice en lugar de recorrer la tabla
+    deficit = db.Column(db.Integer, db.Computed('stock_minimo - cantidad_stock', persisted=True), index=True)
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
-    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Se incrementa en cada UPDATE; los UPDATE condicionados a la versión leída
+    # (WHERE id = :id AND version = :v) detectan escrituras concurrentes sin bloqueos
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
-    def to_entity(self) -> Producto:
+    def to_entity(self, categoria_nombre: Optional[str] = None,
+                  proveedor_nombre: Optional[str] = None) -> Producto:
         """Convierte el modelo de BD a entidad de dominio"""
         return Producto(
             id=self.id,
@@ -33,7 +41,10 @@ class ProductoModel(db.Model):
             categoria_id=self.categoria_id,
             proveedor_id=self.proveedor_id,
             fecha_creacion=self.fecha_creacion,
-            fecha_actualizacion=self.fecha_actualizacion
+            fecha_actualizacion=self.fecha_actualizacion,
+            version=self.version,
+            categoria_nombre=categoria_nombre,
+            proveedor_nombre=proveedor_nombre
         )
     
     @staticmethod
@@ -17,6 +17,9 @@ class ProveedorModel(db.Model):
     email = db.Column(db.String(100), nullable=False)
     direccion = db.Column(db.Text, nullable=False)
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Control de concurrencia optimista (ver ProductoModel.version)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     # Relación con productos
     productos = db.relationship('ProductoModel', backref='proveedor', lazy=True)
@@ -30,7 +33,9 @@ class ProveedorModel(db.Model):
             telefono=self.telefono,
             email=self.email,
             direccion=self.direccion,
-            fecha_creacion=self.fecha_creacion
+            fecha_creacion=self.fecha_creacion,
+            fecha_actualizacion=self.fecha_actualizacion,
+            version=self.version
         )
     
     @staticmethod
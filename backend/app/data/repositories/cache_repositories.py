@@ -0,0 +1,197 @@
+"""
+Decoradores con caché para los repositorios de Categorías y Proveedores
+Envuelven cualquier implementación de la interfaz (patrón Decorator) y la
+caché se invalida completa ante cualquier escritura; son tablas pequeñas
+que cambian poco
+
+La escritura invalida al ejecutarse y otra vez cuando termina la transacción
+(commit o rollback): mientras la transacción está abierta otro hilo puede volver a
+cargar la caché con los datos previos al commit. Hasta entonces la sesión que
+escribió lee sin caché, para ver sus propias escrituras
+
+Las claves incluyen el validador que la petición consultó antes en la base de datos
+(la huella del listado o la versión de la fila, que es de donde sale el ETag): si
+otro worker modificó la tabla, la clave cambia y el cuerpo se vuelve a leer, así
+nunca se envía un cuerpo anterior con el ETag de una versión más nueva. Las lecturas
+sin validador en la transacción (validaciones de los casos de uso, scripts) no usan la
+caché: no hay con qué detectar los cambios de otros workers
+"""
+import copy
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set
+from sqlalchemy import event
+from app.core.entities.categoria import Categoria
+from app.core.entities.proveedor import Proveedor
+from app.core.interfaces.categoria_repository import ICategoriaRepository
+from app.core.interfaces.proveedor_repository import IProveedorRepository
+from app.data.cache import CacheLRU
+from app.data.database import db
+from app.data.enrutamiento import SesionEnrutada
+
+
+@event.listens_for(SesionEnrutada, 'after_transaction_end')
+def _invalidar_al_terminar(sesion, transaccion):
+    """Invalida las cachés escritas en la transacción cuando esta termina"""
+    if transaccion.parent is not None:
+        return
+    sesion.info.pop('validadores_cache', None)
+    for cache in sesion.info.pop('caches_pendientes', ()):
+        cache.invalidar()
+
+
+class _LecturaConCache:
+    """Lectura e invalidación compartidas por los decoradores con caché"""
+    
+    cache: CacheLRU
+    
+    def _validadores(self) -> dict:
+        """Huella y versiones leídas en la transacción en curso para esta caché"""
+        return db.session.info.setdefault('validadores_cache', {}).setdefault(id(self.cache), {})
+    
+    def _leer(self, clave, cargar: Callable[[], Any], validador: Hashable = 'huella') -> Any:
+        if self.cache in db.session.info.get('caches_pendientes', ()):
+            return cargar()
+        validadores = self._validadores()
+        if validador not in validadores:
+            return cargar()
+        return self.cache.obtener_o_cargar((clave, validadores[validador]), cargar)
+    
+    def _invalidar(self):
+        db.session.info.setdefault('caches_pendientes', set()).add(self.cache)
+        db.session.info.get('validadores_cache', {}).pop(id(self.cache), None)
+        self.cache.invalidar()
+    
+    def obtener_huella(self) -> tuple:
+        """La huella se consulta siempre: es la que detecta cambios de otros workers"""
+        huella = self.repositorio.obtener_huella()
+        self._validadores()['huella'] = huella
+        return huella
+    
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Se consulta siempre contra la base de datos"""
+        version = self.repositorio.obtener_version(id)
+        self._validadores()[('version', id)] = version
+        return version
+
+
+class CategoriaRepositoryCache(_LecturaConCache, ICategoriaRepository):
+    """Repositorio de categorías con caché LRU/TTL de lecturas"""
+    
+    def __init__(self, repositorio: ICategoriaRepository, cache: CacheLRU):
+        self.repositorio = repositorio
+        self.cache = cache
+    
+    def crear(self, categoria: Categoria) -> Categoria:
+        """Crea una categoría e invalida la caché"""
+        resultado = self.repositorio.crear(categoria)
+        self._invalidar()
+        return resultado
+    
+    def obtener_por_id(self, id: int) -> Optional[Categoria]:
+        """Obtiene una categoría por su ID desde la caché"""
+        return copy.copy(self._leer(
+            ('id', id), lambda: self.repositorio.obtener_por_id(id), ('version', id)
+        ))
+    
+    def obtener_todos(self) -> List[Categoria]:
+        """Obtiene todas las categorías desde la caché"""
+        return [copy.copy(c) for c in self._leer('todos', self.repositorio.obtener_todos)]
+    
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Categoria]:
+        """Obtiene una página de categorías desde la caché"""
+        categorias = self._leer(
+            ('pagina', after_id, limit), lambda: self.repositorio.obtener_pagina(after_id, limit)
+        )
+        return [copy.copy(c) for c in categorias]
+    
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtiene una proyección de categorías desde la caché"""
+        filas = self._leer(
+            ('proyeccion', tuple(campos), after_id, limit),
+            lambda: self.repositorio.obtener_proyeccion(campos, after_id, limit)
+        )
+        return [dict(fila) for fila in filas]
+    
+    def obtener_ids(self) -> Set[int]:
+        """Valida claves foráneas de importaciones: siempre contra la base de datos"""
+        return self.repositorio.obtener_ids()
+    
+    def actualizar(self, categoria: Categoria) -> bool:
+        """Actualiza una categoría e invalida la caché"""
+        resultado = self.repositorio.actualizar(categoria)
+        self._invalidar()
+        return resultado
+    
+    def eliminar(self, id: int) -> bool:
+        """Elimina una categoría e invalida la caché"""
+        resultado = self.repositorio.eliminar(id)
+        self._invalidar()
+        return resultado
+    
+    def existe_nombre(self, nombre: str) -> bool:
+        """Verificación de unicidad: siempre contra la base de datos"""
+        return self.repositorio.existe_nombre(nombre)
+
+
+class ProveedorRepositoryCache(_LecturaConCache, IProveedorRepository):
+    """Repositorio de proveedores con caché LRU/TTL de lecturas"""
+    
+    def __init__(self, repositorio: IProveedorRepository, cache: CacheLRU):
+        self.repositorio = repositorio
+        self.cache = cache
+    
+    def crear(self, proveedor: Proveedor) -> Proveedor:
+        """Crea un proveedor e invalida la caché"""
+        resultado = self.repositorio.crear(proveedor)
+        self._invalidar()
+        return resultado
+    
+    def obtener_por_id(self, id: int) -> Optional[Proveedor]:
+        """Obtiene un proveedor por su ID desde la caché"""
+        return copy.copy(self._leer(
+            ('id', id), lambda: self.repositorio.obtener_por_id(id), ('version', id)
+        ))
+    
+    def obtener_por_ids(self, ids: List[int]) -> List[Proveedor]:
+        """Resultados de búsqueda: se consultan siempre contra la base de datos"""
+        return self.repositorio.obtener_por_ids(ids)
+    
+    def obtener_todos(self) -> List[Proveedor]:
+        """Obtiene todos los proveedores desde la caché"""
+        return [copy.copy(p) for p in self._leer('todos', self.repositorio.obtener_todos)]
+    
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Proveedor]:
+        """Obtiene una página de proveedores desde la caché"""
+        proveedores = self._leer(
+            ('pagina', after_id, limit), lambda: self.repositorio.obtener_pagina(after_id, limit)
+        )
+        return [copy.copy(p) for p in proveedores]
+    
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtiene una proyección de proveedores desde la caché"""
+        filas = self._leer(
+            ('proyeccion', tuple(campos), after_id, limit),
+            lambda: self.repositorio.obtener_proyeccion(campos, after_id, limit)
+        )
+        return [dict(fila) for fila in filas]
+    
+    def obtener_ids(self) -> Set[int]:
+        """Valida claves foráneas de importaciones: siempre contra la base de datos"""
+        return self.repositorio.obtener_ids()
+    
+    def actualizar(self, proveedor: Proveedor) -> bool:
+        """Actualiza un proveedor e invalida la caché"""
+        resultado = self.repositorio.actualizar(proveedor)
+        self._invalidar()
+        return resultado
+    
+    def eliminar(self, id: int) -> bool:
+        """Elimina un proveedor e invalida la caché"""
+        resultado = self.repositorio.eliminar(id)
+        self._invalidar()
+        return resultado
+    
+    def buscar_por_nombre(self, nombre: str) -> List[Proveedor]:
+        """Las búsquedas no se cachean (claves de baja repetición)"""
+        return self.repositorio.buscar_por_nombre(nombre)
@@ -2,54 +2,194 @@
 Implementación del Repositorio de Categorías
 Este adaptador implementa la interfaz definida en el dominio
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import delete, func, select, update
 from app.core.entities.categoria import Categoria
 from app.core.interfaces.categoria_repository import ICategoriaRepository
 from app.data.models.categoria_model import CategoriaModel
+from app.data.models.producto_model import ProductoModel
 from app.data.database import db
+from app.data.enrutamiento import lectura_en_replica
+from app.data.archivo_movimientos import archivar_movimientos
 
 
-class CategoriaRepository(ICategoriaRepository):
-    """Implementación del repositorio de categorías usando SQLAlchemy"""
+class SentenciasCategoria:
+    """
+    Sentencias del repositorio de categorías, compartidas por la implementación síncrona
+    y la asyncio (CategoriaRepositoryAsync): las dos solo cambian la forma de ejecutarlas
+    """
+    
+    # Columnas en el orden de los campos de la entidad: cada fila se convierte con Categoria(*fila)
+    COLUMNAS_ENTIDAD = (
+        CategoriaModel.__table__.c.nombre,
+        CategoriaModel.__table__.c.descripcion,
+        CategoriaModel.__table__.c.id,
+        CategoriaModel.__table__.c.fecha_creacion,
+        CategoriaModel.__table__.c.fecha_actualizacion,
+        CategoriaModel.__table__.c.version
+    )
+    
+    # Campos admitidos por obtener_proyeccion (atributo de la entidad -> columna)
+    COLUMNAS_PROYECCION = {columna.name: columna for columna in CategoriaModel.__table__.columns}
+    
+    def _select_entidades(self):
+        """SELECT de Core con las columnas de la entidad"""
+        return select(*self.COLUMNAS_ENTIDAD)
+    
+    def _consulta_pagina(self, after_id: int, limit: int):
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n)"""
+        tabla = CategoriaModel.__table__
+        return self._select_entidades().where(tabla.c.id > after_id).order_by(tabla.c.id).limit(limit)
+    
+    def _consulta_proyeccion(self, campos: List[str], after_id: int, limit: Optional[int]):
+        """
+        SELECT solo de las columnas pedidas (WHERE id > :cursor ORDER BY id [LIMIT n])
+        Lanza ValueError si algún campo no es proyectable
+        """
+        desconocidos = [campo for campo in campos if campo not in self.COLUMNAS_PROYECCION]
+        if desconocidos:
+            raise ValueError(f"Campos no proyectables: {', '.join(desconocidos)}")
+        
+        consulta = select(
+            *[self.COLUMNAS_PROYECCION[campo].label(campo) for campo in campos]
+        ).where(CategoriaModel.id > after_id).order_by(CategoriaModel.id)
+        if limit is not None:
+            consulta = consulta.limit(limit)
+        return consulta
+    
+    def _consulta_huella(self):
+        """
+        Huella del listado con una sola consulta de agregados
+        La suma de versiones detecta dos ediciones en el mismo segundo (DATETIME de MySQL)
+        """
+        return select(
+            func.count(CategoriaModel.id),
+            func.max(CategoriaModel.id),
+            func.max(CategoriaModel.fecha_actualizacion),
+            func.sum(CategoriaModel.version)
+        )
+    
+    def _consulta_version(self, id: int):
+        """Solo las columnas version y fecha_actualizacion del registro"""
+        return select(CategoriaModel.version, CategoriaModel.fecha_actualizacion).where(CategoriaModel.id == id)
+    
+    @staticmethod
+    def _version_desde_fila(fila) -> Optional[tuple]:
+        """(versión, fecha de última modificación) a partir de la fila de _consulta_version"""
+        if not fila:
+            return None
+        return fila[0], fila[1] or datetime.min
+    
+    def _sentencia_actualizar(self, categoria: Categoria):
+        """UPDATE ... WHERE id = :id [AND version = :v] que incrementa la versión"""
+        return (
+            self._condicion_version(update(CategoriaModel), categoria)
+            .values(nombre=categoria.nombre, descripcion=categoria.descripcion,
+                    version=CategoriaModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _condicion_version(self, sentencia, categoria: Categoria):
+        """WHERE id = :id, y AND version = :v si se conoce la versión leída"""
+        sentencia = sentencia.where(CategoriaModel.id == categoria.id)
+        if categoria.version is not None:
+            sentencia = sentencia.where(CategoriaModel.version == categoria.version)
+        return sentencia
+    
+    def _sentencias_eliminar(self, id: int) -> list:
+        """
+        DELETE de la categoría y sus productos (la cascada 'all, delete-orphan' sin cargar
+        los objetos); el rowcount de la última indica si la categoría existía
+        """
+        # Primero los productos: la clave foránea impide borrar antes la categoría;
+        # sus movimientos de stock se mueven antes al archivo
+        return [
+            *archivar_movimientos(ProductoModel.__table__.c.categoria_id == id),
+            delete(ProductoModel)
+            .where(ProductoModel.categoria_id == id)
+            .execution_options(synchronize_session=False),
+            delete(CategoriaModel)
+            .where(CategoriaModel.id == id)
+            .execution_options(synchronize_session=False)
+        ]
+    
+    def _consulta_existe_nombre(self, nombre: str):
+        """SELECT del ID de la categoría con ese nombre"""
+        return select(CategoriaModel.id).where(CategoriaModel.nombre == nombre).limit(1)
+
+
+class CategoriaRepository(SentenciasCategoria, ICategoriaRepository):
+    """
+    Implementación del repositorio de categorías usando SQLAlchemy
+    Las escrituras usan el ORM; las lecturas usan select() de Core y construyen
+    las entidades directamente desde las filas
+    """
     
     def crear(self, categoria: Categoria) -> Categoria:
         """Crea una nueva categoría en la base de datos"""
         modelo = CategoriaModel.from_entity(categoria)
         db.session.add(modelo)
-        db.session.commit()
+        db.session.flush()
         return modelo.to_entity()
     
+    @lectura_en_replica
     def obtener_por_id(self, id: int) -> Optional[Categoria]:
         """Obtiene una categoría por su ID"""
-        modelo = CategoriaModel.query.get(id)
-        return modelo.to_entity() if modelo else None
+        categorias = self._entidades(self._select_entidades().where(CategoriaModel.__table__.c.id == id))
+        return categorias[0] if categorias else None
     
+    @lectura_en_replica
     def obtener_todos(self) -> List[Categoria]:
         """Obtiene todas las categorías"""
-        modelos = CategoriaModel.query.all()
-        return [modelo.to_entity() for modelo in modelos]
+        return self._entidades(self._select_entidades())
+    
+    @lectura_en_replica
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Categoria]:
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n)"""
+        return self._entidades(self._consulta_pagina(after_id, limit))
+    
+    @lectura_en_replica
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """SELECT solo de las columnas pedidas; lanza ValueError si algún campo no es proyectable"""
+        consulta = self._consulta_proyeccion(campos, after_id, limit)
+        return [dict(fila) for fila in db.session.execute(consulta).mappings()]
+    
+    def obtener_ids(self) -> Set[int]:
+        """Obtiene los IDs existentes leyendo solo la columna de clave primaria"""
+        return {id for (id,) in db.session.query(CategoriaModel.id).all()}
+    
+    @lectura_en_replica
+    def obtener_huella(self) -> tuple:
+        """Huella del listado con una sola consulta de agregados"""
+        return tuple(db.session.execute(self._consulta_huella()).one())
+    
+    @lectura_en_replica
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Lee solo las columnas version y fecha_actualizacion del registro"""
+        return self._version_desde_fila(db.session.execute(self._consulta_version(id)).first())
+    
+    def _entidades(self, consulta) -> List[Categoria]:
+        """Ejecuta la consulta y construye las entidades directamente desde las tuplas"""
+        return [Categoria(*fila) for fila in db.session.execute(consulta)]
     
     def actualizar(self, categoria: Categoria) -> bool:
-        """Actualiza una categoría existente"""
-        modelo = CategoriaModel.query.get(categoria.id)
-        if not modelo:
-            return False
-        
-        modelo.nombre = categoria.nombre
-        modelo.descripcion = categoria.descripcion
-        db.session.commit()
-        return True
+        """
+        Actualiza una categoría con un único UPDATE ... WHERE id = :id [AND version = :v]
+        Retorna False si no existe o si cambió desde la versión leída (rowcount 0)
+        """
+        return db.session.execute(self._sentencia_actualizar(categoria)).rowcount == 1
     
     def eliminar(self, id: int) -> bool:
-        """Elimina una categoría"""
-        modelo = CategoriaModel.query.get(id)
-        if not modelo:
-            return False
-        
-        db.session.delete(modelo)
-        db.session.commit()
-        return True
+        """
+        Elimina una categoría y sus productos con sentencias DELETE directas
+        Retorna False si no existe (rowcount 0)
+        """
+        for sentencia in self._sentencias_eliminar(id):
+            resultado = db.session.execute(sentencia)
+        return resultado.rowcount == 1
     
     def existe_nombre(self, nombre: str) -> bool:
         """Verifica si existe una categoría con el nombre dado"""
-        return CategoriaModel.query.filter_by(nombre=nombre).first() is not None
+        return db.session.execute(self._consulta_existe_nombre(nombre)).first() is not None
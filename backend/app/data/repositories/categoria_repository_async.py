@@ -0,0 +1,80 @@
+"""
+Implementación asyncio del Repositorio de Categorías (variante ASGI de la API)
+Las sentencias son las del repositorio síncrono (SentenciasCategoria); cambia solo la ejecución
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import async_scoped_session
+from app.core.entities.categoria import Categoria
+from app.core.interfaces.categoria_repository import ICategoriaRepositoryAsync
+from app.data.models.categoria_model import CategoriaModel
+from app.data.repositories.categoria_repository import SentenciasCategoria
+
+
+class CategoriaRepositoryAsync(SentenciasCategoria, ICategoriaRepositoryAsync):
+    """
+    Repositorio de categorías sobre SQLAlchemy asyncio
+    Recibe la sesión con alcance de petición (async_scoped_session) por inyección
+    """
+    
+    def __init__(self, sesion: async_scoped_session):
+        self.sesion = sesion
+    
+    async def crear(self, categoria: Categoria) -> Categoria:
+        """Crea una nueva categoría en la base de datos"""
+        modelo = CategoriaModel.from_entity(categoria)
+        self.sesion.add(modelo)
+        await self.sesion.flush()
+        return modelo.to_entity()
+    
+    async def obtener_por_id(self, id: int) -> Optional[Categoria]:
+        """Obtiene una categoría por su ID"""
+        categorias = await self._entidades(
+            self._select_entidades().where(CategoriaModel.__table__.c.id == id)
+        )
+        return categorias[0] if categorias else None
+    
+    async def obtener_todos(self) -> List[Categoria]:
+        """Obtiene todas las categorías"""
+        return await self._entidades(self._select_entidades())
+    
+    async def obtener_pagina(self, after_id: int, limit: int) -> List[Categoria]:
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n)"""
+        return await self._entidades(self._consulta_pagina(after_id, limit))
+    
+    async def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """SELECT solo de las columnas pedidas; lanza ValueError si algún campo no es proyectable"""
+        consulta = self._consulta_proyeccion(campos, after_id, limit)
+        return [dict(fila) for fila in (await self.sesion.execute(consulta)).mappings()]
+    
+    async def obtener_huella(self) -> tuple:
+        """Huella del listado con una sola consulta de agregados"""
+        return tuple((await self.sesion.execute(self._consulta_huella())).one())
+    
+    async def obtener_version(self, id: int) -> Optional[tuple]:
+        """Lee solo las columnas version y fecha_actualizacion del registro"""
+        return self._version_desde_fila((await self.sesion.execute(self._consulta_version(id))).first())
+    
+    async def _entidades(self, consulta) -> List[Categoria]:
+        """Ejecuta la consulta y construye las entidades directamente desde las tuplas"""
+        return [Categoria(*fila) for fila in await self.sesion.execute(consulta)]
+    
+    async def actualizar(self, categoria: Categoria) -> bool:
+        """
+        Actualiza una categoría con un único UPDATE ... WHERE id = :id [AND version = :v]
+        Retorna False si no existe o si cambió desde la versión leída (rowcount 0)
+        """
+        return (await self.sesion.execute(self._sentencia_actualizar(categoria))).rowcount == 1
+    
+    async def eliminar(self, id: int) -> bool:
+        """
+        Elimina una categoría y sus productos con sentencias DELETE directas
+        Retorna False si no existe (rowcount 0)
+        """
+        for sentencia in self._sentencias_eliminar(id):
+            resultado = await self.sesion.execute(sentencia)
+        return resultado.rowcount == 1
+    
+    async def existe_nombre(self, nombre: str) -> bool:
+        """Verifica si existe una categoría con el nombre dado"""
+        return (await self.sesion.execute(self._consulta_existe_nombre(nombre))).first() is not None
@@ -0,0 +1,77 @@
+"""
+Implementación del Repositorio del Dashboard
+Calcula los indicadores con agregados SQL (COUNT/SUM/GROUP BY) sin cargar filas
+"""
+from sqlalchemy import func, case, select
+from app.core.entities.resumen_inventario import ResumenInventario, ProductosPorCategoria
+from app.core.interfaces.dashboard_repository import IDashboardRepository
+from app.data.models.producto_model import ProductoModel
+from app.data.models.categoria_model import CategoriaModel
+from app.data.models.proveedor_model import ProveedorModel
+from app.data.database import db
+from app.data.enrutamiento import lectura_en_replica
+
+
+class SentenciasDashboard:
+    """
+    Consultas del dashboard, compartidas por la implementación síncrona y la asyncio
+    (DashboardRepositoryAsync): las dos solo cambian la forma de ejecutarlas
+    """
+    
+    # Expresión del stock actual (el libro de movimientos la reemplaza por snapshot + pendientes)
+    STOCK = ProductoModel.__table__.c.cantidad_stock
+    
+    def _consulta_totales(self):
+        """Totales de productos en una sola pasada: cantidad, bajo stock y valor del inventario"""
+        return select(
+            func.count(ProductoModel.id),
+            func.sum(case((self.STOCK <= ProductoModel.stock_minimo, 1), else_=0)),
+            func.sum(ProductoModel.precio * self.STOCK)
+        )
+    
+    def _consulta_total_proveedores(self):
+        """Cantidad de proveedores"""
+        return select(func.count(ProveedorModel.id))
+    
+    def _consulta_por_categoria(self):
+        """Conteo por categoría (incluye categorías sin productos)"""
+        return select(
+            CategoriaModel.id,
+            CategoriaModel.nombre,
+            func.count(ProductoModel.id)
+        ).outerjoin(
+            ProductoModel, ProductoModel.categoria_id == CategoriaModel.id
+        ).group_by(
+            CategoriaModel.id, CategoriaModel.nombre
+        ).order_by(CategoriaModel.id)
+    
+    @staticmethod
+    def _resumen(totales, total_proveedores, filas_por_categoria) -> ResumenInventario:
+        """Arma el resumen a partir de los resultados de las tres consultas"""
+        total_productos, bajo_stock, valor_inventario = totales
+        productos_por_categoria = [
+            ProductosPorCategoria(categoria_id=id, categoria_nombre=nombre, total_productos=total)
+            for id, nombre, total in filas_por_categoria
+        ]
+        
+        return ResumenInventario(
+            total_productos=total_productos or 0,
+            total_categorias=len(productos_por_categoria),
+            total_proveedores=total_proveedores or 0,
+            productos_bajo_stock=int(bajo_stock or 0),
+            valor_inventario=float(valor_inventario or 0),
+            productos_por_categoria=productos_por_categoria
+        )
+
+
+class DashboardRepository(SentenciasDashboard, IDashboardRepository):
+    """Implementación del repositorio del dashboard usando SQLAlchemy"""
+    
+    @lectura_en_replica
+    def obtener_resumen(self) -> ResumenInventario:
+        """Obtiene los indicadores del inventario con un puñado de consultas escalares"""
+        return self._resumen(
+            db.session.execute(self._consulta_totales()).one(),
+            db.session.scalar(self._consulta_total_proveedores()),
+            db.session.execute(self._consulta_por_categoria()).all()
+        )
@@ -0,0 +1,23 @@
+"""
+Implementación asyncio del Repositorio del Dashboard (variante ASGI de la API)
+Las consultas son las del repositorio síncrono (SentenciasDashboard); cambia solo la ejecución
+"""
+from sqlalchemy.ext.asyncio import async_scoped_session
+from app.core.entities.resumen_inventario import ResumenInventario
+from app.core.interfaces.dashboard_repository import IDashboardRepositoryAsync
+from app.data.repositories.dashboard_repository import SentenciasDashboard
+
+
+class DashboardRepositoryAsync(SentenciasDashboard, IDashboardRepositoryAsync):
+    """Repositorio del dashboard sobre SQLAlchemy asyncio"""
+    
+    def __init__(self, sesion: async_scoped_session):
+        self.sesion = sesion
+    
+    async def obtener_resumen(self) -> ResumenInventario:
+        """Obtiene los indicadores del inventario con un puñado de consultas escalares"""
+        return self._resumen(
+            (await self.sesion.execute(self._consulta_totales())).one(),
+            await self.sesion.scalar(self._consulta_total_proveedores()),
+            (await self.sesion.execute(self._consulta_por_categoria())).all()
+        )
@@ -0,0 +1,261 @@
+"""
+Repositorios con libro de movimientos de stock (STOCK_MODO=libro)
+Cada ajuste inserta una fila en movimientos_stock en lugar de actualizar la fila del
+producto, así los ajustes concurrentes de un producto popular no compiten por su
+bloqueo (ni generan conflictos de escritura y reintentos en TiDB). El stock actual
+es el snapshot (productos.cantidad_stock) más los deltas aún no compactados; el
+compactador (app/data/compactador_stock.py) los suma periódicamente al snapshot
+
+La regla "el stock no puede quedar negativo" usa cupos (stock_cupos): el stock
+disponible se reparte en N filas por producto y un descuento resta de un cupo al azar
+con un UPDATE condicional, sin leer la suma de pendientes ni bloquear la fila del
+producto; dos descuentos solo compiten si eligieron el mismo cupo. Cuando el cupo no
+alcanza (stock cerca de cero o cupos desactualizados por los ingresos) el descuento
+bloquea todos los cupos del producto, verifica contra snapshot + pendientes en la
+sentencia INSERT ... SELECT y los vuelve a repartir. Los ingresos no pueden dejar el
+stock negativo y se registran sin bloquear
+"""
+import random
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import DateTime, Integer, bindparam, exists, func, insert, literal, or_, select, update
+from app.core.entities.producto import Producto
+from app.data.models.producto_model import ProductoModel
+from app.data.models.movimiento_stock_model import CupoStockModel, MovimientoStockModel
+from app.data.database import db
+from app.data.enrutamiento import lectura_en_replica
+from app.data.repositories.producto_repository import ProductoRepository
+from app.data.repositories.dashboard_repository import DashboardRepository
+
+_productos = ProductoModel.__table__
+_movimientos = MovimientoStockModel.__table__
+_cupos = CupoStockModel.__table__
+
+# Suma de los movimientos sin compactar del producto de la fila externa (índice producto_id, compactado)
+DELTAS_PENDIENTES = select(
+    func.coalesce(func.sum(_movimientos.c.cantidad), 0)
+).where(
+    _movimientos.c.producto_id == _productos.c.id,
+    _movimientos.c.compactado == False  # noqa: E712
+).correlate(_productos).scalar_subquery()
+
+# Stock actual: snapshot + deltas pendientes
+STOCK_ACTUAL = _productos.c.cantidad_stock + DELTAS_PENDIENTES
+
+
+class ProductoRepositoryLibro(ProductoRepository):
+    """
+    Repositorio de productos cuyo stock se lleva en el libro de movimientos
+    Las lecturas devuelven el stock actual; el resto del comportamiento es el del repositorio base
+    """
+    
+    def __init__(self, cupos: int = 8):
+        self.cupos = cupos
+    
+    COLUMNAS_ENTIDAD = tuple(
+        STOCK_ACTUAL.label('cantidad_stock') if columna is _productos.c.cantidad_stock else columna
+        for columna in ProductoRepository.COLUMNAS_ENTIDAD
+    )
+    
+    COLUMNAS_PROYECCION = {
+        **ProductoRepository.COLUMNAS_PROYECCION,
+        'cantidad_stock': STOCK_ACTUAL,
+        'necesita_reabastecimiento': _productos.c.stock_minimo - STOCK_ACTUAL >= 0
+    }
+    
+    @lectura_en_replica
+    def obtener_huella(self) -> tuple:
+        """Huella del listado más el último movimiento (los ajustes no modifican la fila del producto)"""
+        return super().obtener_huella() + (db.session.execute(select(func.max(_movimientos.c.id))).scalar(),)
+    
+    @lectura_en_replica
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Versión de la fila y última modificación del producto, de sus relaciones o de su último movimiento"""
+        actual = super().obtener_version(id)
+        if actual is None:
+            return None
+        version, fecha = actual
+        ultimo_movimiento = db.session.execute(
+            select(func.max(_movimientos.c.fecha)).where(_movimientos.c.producto_id == id)
+        ).scalar()
+        return version, max(fecha, ultimo_movimiento) if ultimo_movimiento else fecha
+    
+    def _sentencia_actualizar(self, producto: Producto):
+        """
+        UPDATE de los datos de un producto sin escribir su stock: en el libro el stock solo
+        cambia con movimientos, que no incrementan la versión (no tocan la fila), y un PUT
+        que escribiera el stock reemplazaría ajustes que el cliente no vio aunque enviara
+        If-Match. El UPDATE exige además que el stock enviado sea el actual (rowcount 0 si
+        difiere): un cambio de stock en el PUT se rechaza en lugar de perderse
+        """
+        return (
+            self._condicion_version(update(ProductoModel), producto)
+            .where(STOCK_ACTUAL == producto.cantidad_stock)
+            .values(
+                nombre=producto.nombre,
+                descripcion=producto.descripcion,
+                precio=producto.precio,
+                stock_minimo=producto.stock_minimo,
+                categoria_id=producto.categoria_id,
+                proveedor_id=producto.proveedor_id,
+                version=ProductoModel.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    def ajustar_stock(self, id: int, cantidad: int) -> bool:
+        """
+        Registra el ajuste como un movimiento
+        Un ingreso es un INSERT ... SELECT sobre la fila del producto (rowcount 0 si no existe).
+        Un descuento que inicia la transacción resta de un cupo al azar; si el cupo no alcanza
+        (o la transacción ya tenía otras escrituras) pasa por la verificación con todos los
+        cupos bloqueados:
+        INSERT INTO movimientos_stock SELECT :id, :delta, ... FROM productos
+        WHERE id = :id AND snapshot + pendientes + :delta >= 0
+        Retorna False si el producto no existe o el stock quedaría negativo
+        """
+        ahora = datetime.utcnow()
+        if cantidad > 0:
+            resultado = db.session.execute(
+                insert(_movimientos).from_select(
+                    ['producto_id', 'cantidad', 'fecha'],
+                    select(
+                        _productos.c.id, literal(cantidad, Integer), literal(ahora, DateTime)
+                    ).where(_productos.c.id == id)
+                )
+            )
+            return resultado.rowcount == 1
+        
+        if not db.session().in_transaction():
+            descontado = db.session.execute(
+                update(_cupos)
+                .where(_cupos.c.producto_id == id, _cupos.c.cupo == random.randrange(self.cupos),
+                       _cupos.c.cantidad >= -cantidad)
+                .values(cantidad=_cupos.c.cantidad + cantidad)
+            ).rowcount
+            if descontado == 1:
+                db.session.execute(insert(_movimientos).values(producto_id=id, cantidad=cantidad, fecha=ahora))
+                return True
+            # El cupo que no alcanzó puede quedar bloqueado (PostgreSQL lo bloquea al reevaluar
+            # la condición después de esperarlo) y bloquear los demás en orden provocaría
+            # interbloqueos: se descarta la transacción, que solo tenía este intento
+            db.session.rollback()
+        
+        self._bloquear_cupos([id])
+        resultado = db.session.execute(
+            insert(_movimientos).from_select(
+                ['producto_id', 'cantidad', 'fecha'],
+                select(
+                    _productos.c.id, literal(cantidad, Integer), literal(ahora, DateTime)
+                ).where(_productos.c.id == id).where(STOCK_ACTUAL + cantidad >= 0)
+            )
+        )
+        if resultado.rowcount != 1:
+            return False
+        self._repartir_cupos([id])
+        return True
+    
+    def obtener_stock_por_ids(self, ids: List[int]) -> Dict[int, int]:
+        """
+        Stock actual de varios productos (snapshot + pendientes)
+        Bloquea antes los cupos de los productos (por bloques) para que la verificación del
+        lote no se cruce con otros descuentos; aplicar_ajustes_stock los vuelve a repartir
+        """
+        stock = {}
+        for inicio in range(0, len(ids), self.TAMANO_LOTE_IN):
+            bloque = ids[inicio:inicio + self.TAMANO_LOTE_IN]
+            self._bloquear_cupos(bloque)
+            filas = db.session.execute(
+                select(_productos.c.id, STOCK_ACTUAL).where(_productos.c.id.in_(bloque))
+            )
+            stock.update({id: cantidad for id, cantidad in filas})
+        return stock
+    
+    def aplicar_ajustes_stock(self, ajustes: Dict[int, int]) -> bool:
+        """Inserta un movimiento por producto con un único executemany y reparte sus cupos"""
+        if not ajustes:
+            return True
+        
+        ahora = datetime.utcnow()
+        db.session.execute(insert(_movimientos), [
+            {'producto_id': id, 'cantidad': delta, 'fecha': ahora}
+            for id, delta in ajustes.items()
+        ])
+        ids = list(ajustes)
+        for inicio in range(0, len(ids), self.TAMANO_LOTE_IN):
+            self._repartir_cupos(ids[inicio:inicio + self.TAMANO_LOTE_IN])
+        return True
+    
+    def _bloquear_cupos(self, ids: List[int]):
+        """
+        Bloquea los cupos de los productos (SELECT ... FOR UPDATE, siempre en el mismo orden)
+        Espera a los descuentos en curso: después de esto el stock leído ya los incluye y
+        ninguno nuevo puede restar hasta el commit. Un producto sin cupos (primer descuento)
+        se serializa con su fila; la fila se bloquea sin excluir las claves (FOR NO KEY
+        UPDATE en PostgreSQL) para no detener los ingresos, que la leen por la clave foránea
+        """
+        con_cupos = set(db.session.execute(
+            select(_cupos.c.producto_id).where(_cupos.c.producto_id.in_(ids))
+            .order_by(_cupos.c.producto_id, _cupos.c.cupo).with_for_update()
+        ).scalars())
+        sin_cupos = [id for id in ids if id not in con_cupos]
+        if sin_cupos:
+            db.session.execute(
+                select(_productos.c.id).where(_productos.c.id.in_(sin_cupos))
+                .order_by(_productos.c.id).with_for_update(key_share=True)
+            )
+            # Otra transacción pudo crearlos mientras se esperaba la fila
+            db.session.execute(
+                select(_cupos.c.producto_id).where(_cupos.c.producto_id.in_(sin_cupos))
+                .order_by(_cupos.c.producto_id, _cupos.c.cupo).with_for_update()
+            )
+    
+    def _repartir_cupos(self, ids: List[int]):
+        """
+        Reparte el stock actual de los productos en sus cupos (requiere _bloquear_cupos en la
+        misma transacción): un UPDATE y un INSERT de los cupos que faltan, ambos executemany
+        """
+        stock = db.session.execute(
+            select(_productos.c.id, STOCK_ACTUAL).where(_productos.c.id.in_(ids))
+        ).all()
+        filas = [
+            {'b_id': id, 'b_cupo': cupo, 'b_cantidad': cantidad // self.cupos + (cupo < cantidad % self.cupos)}
+            for id, cantidad in stock for cupo in range(self.cupos)
+        ]
+        if not filas:
+            return
+        
+        db.session.execute(
+            update(_cupos)
+            .where(_cupos.c.producto_id == bindparam('b_id'), _cupos.c.cupo == bindparam('b_cupo'))
+            .values(cantidad=bindparam('b_cantidad')),
+            filas
+        )
+        db.session.execute(
+            insert(_cupos).from_select(
+                ['producto_id', 'cupo', 'cantidad'],
+                select(_productos.c.id, bindparam('b_cupo', type_=Integer), bindparam('b_cantidad', type_=Integer))
+                .where(_productos.c.id == bindparam('b_id'))
+                .where(~exists().where(_cupos.c.producto_id == bindparam('b_id'), _cupos.c.cupo == bindparam('b_cupo')))
+            ),
+            filas
+        )
+    
+    def _consulta_bajo_stock(self):
+        """
+        Productos con stock actual <= stock mínimo: candidatos por el índice deficit
+        (snapshot) más los que tienen movimientos pendientes, filtrados por el stock actual
+        """
+        pendientes = select(_movimientos.c.producto_id).where(_movimientos.c.compactado == False)  # noqa: E712
+        return (
+            self._select_entidades()
+            .where(or_(_productos.c.deficit >= 0, _productos.c.id.in_(pendientes)))
+            .where(_productos.c.stock_minimo - STOCK_ACTUAL >= 0)
+        )
+
+
+class DashboardRepositoryLibro(DashboardRepository):
+    """Dashboard cuyos indicadores de stock usan snapshot + movimientos pendientes"""
+    
+    STOCK = STOCK_ACTUAL
+
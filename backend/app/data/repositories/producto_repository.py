@@ -1,67 +1,403 @@
 """
 Implementación del Repositorio de Productos
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import delete, func, insert, select, update, bindparam
 from app.core.entities.producto import Producto
 from app.core.interfaces.producto_repository import IProductoRepository
 from app.data.models.producto_model import ProductoModel
+from app.data.models.categoria_model import CategoriaModel
+from app.data.models.proveedor_model import ProveedorModel
 from app.data.database import db
+from app.data.enrutamiento import lectura_en_replica
+from app.data.archivo_movimientos import archivar_movimientos
 
 
-class ProductoRepository(IProductoRepository):
-    """Implementación del repositorio de productos usando SQLAlchemy"""
+class SentenciasProducto:
+    """
+    Sentencias del repositorio de productos, compartidas por la implementación síncrona
+    y la asyncio (ProductoRepositoryAsync): las dos solo cambian la forma de ejecutarlas
+    """
+    
+    # Columnas en el orden de los campos de la entidad: cada fila se convierte con Producto(*fila)
+    COLUMNAS_ENTIDAD = (
+        ProductoModel.__table__.c.nombre,
+        ProductoModel.__table__.c.descripcion,
+        ProductoModel.__table__.c.precio,
+        ProductoModel.__table__.c.cantidad_stock,
+        ProductoModel.__table__.c.stock_minimo,
+        ProductoModel.__table__.c.categoria_id,
+        ProductoModel.__table__.c.proveedor_id,
+        ProductoModel.__table__.c.id,
+        ProductoModel.__table__.c.fecha_creacion,
+        ProductoModel.__table__.c.fecha_actualizacion,
+        ProductoModel.__table__.c.version
+    )
+    
+    # Campos admitidos por obtener_proyeccion (atributo de la entidad -> expresión SQL);
+    # necesita_reabastecimiento usa la columna generada deficit, la misma regla que la entidad
+    COLUMNAS_PROYECCION = {
+        'id': ProductoModel.id,
+        'nombre': ProductoModel.nombre,
+        'descripcion': ProductoModel.descripcion,
+        'precio': ProductoModel.precio,
+        'cantidad_stock': ProductoModel.cantidad_stock,
+        'stock_minimo': ProductoModel.stock_minimo,
+        'categoria_id': ProductoModel.categoria_id,
+        'proveedor_id': ProductoModel.proveedor_id,
+        'necesita_reabastecimiento': ProductoModel.deficit >= 0,
+        'fecha_creacion': ProductoModel.fecha_creacion,
+        'fecha_actualizacion': ProductoModel.fecha_actualizacion,
+        'version': ProductoModel.version,
+        'categoria_nombre': CategoriaModel.nombre,
+        'proveedor_nombre': ProveedorModel.nombre
+    }
+    
+    def _select_entidades(self, con_relaciones: bool = False):
+        """SELECT de Core con las columnas de la entidad y, si se piden, los nombres de relaciones (LEFT JOIN)"""
+        if not con_relaciones:
+            return select(*self.COLUMNAS_ENTIDAD)
+        
+        tabla = ProductoModel.__table__
+        categorias = CategoriaModel.__table__
+        proveedores = ProveedorModel.__table__
+        return select(
+            *self.COLUMNAS_ENTIDAD, categorias.c.nombre, proveedores.c.nombre
+        ).select_from(
+            tabla.outerjoin(categorias, tabla.c.categoria_id == categorias.c.id)
+                 .outerjoin(proveedores, tabla.c.proveedor_id == proveedores.c.id)
+        )
+    
+    def _consulta_pagina(self, after_id: int, limit: int):
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n) con nombres de relaciones"""
+        tabla = ProductoModel.__table__
+        return (
+            self._select_entidades(con_relaciones=True)
+            .where(tabla.c.id > after_id).order_by(tabla.c.id).limit(limit)
+        )
+    
+    def _consulta_proyeccion(self, campos: List[str], after_id: int, limit: Optional[int]):
+        """
+        SELECT solo de las columnas pedidas (WHERE id > :cursor ORDER BY id [LIMIT n])
+        Los JOIN a categorías y proveedores se agregan solo si se pide su nombre
+        Lanza ValueError si algún campo no es proyectable
+        """
+        desconocidos = [campo for campo in campos if campo not in self.COLUMNAS_PROYECCION]
+        if desconocidos:
+            raise ValueError(f"Campos no proyectables: {', '.join(desconocidos)}")
+        
+        origen = ProductoModel.__table__
+        if 'categoria_nombre' in campos:
+            origen = origen.outerjoin(CategoriaModel.__table__, ProductoModel.categoria_id == CategoriaModel.id)
+        if 'proveedor_nombre' in campos:
+            origen = origen.outerjoin(ProveedorModel.__table__, ProductoModel.proveedor_id == ProveedorModel.id)
+        
+        consulta = select(
+            *[self.COLUMNAS_PROYECCION[campo].label(campo) for campo in campos]
+        ).select_from(origen).where(ProductoModel.id > after_id).order_by(ProductoModel.id)
+        if limit is not None:
+            consulta = consulta.limit(limit)
+        return consulta
+    
+    def _consulta_huella(self):
+        """
+        Huella del listado en una sola consulta; incluye la última modificación de
+        categorías y proveedores porque sus nombres forman parte de la respuesta
+        Las sumas de versiones detectan dos ediciones en el mismo segundo (DATETIME de MySQL)
+        """
+        return select(
+            func.count(ProductoModel.id),
+            func.max(ProductoModel.id),
+            func.max(ProductoModel.fecha_actualizacion),
+            func.sum(ProductoModel.version),
+            select(func.max(CategoriaModel.fecha_actualizacion)).scalar_subquery(),
+            select(func.sum(CategoriaModel.version)).scalar_subquery(),
+            select(func.max(ProveedorModel.fecha_actualizacion)).scalar_subquery(),
+            select(func.sum(ProveedorModel.version)).scalar_subquery()
+        )
+    
+    def _consulta_version(self, id: int):
+        """
+        Versión de la fila y última modificación del producto y de su categoría/proveedor
+        (los nombres de las relaciones se incluyen en el detalle)
+        """
+        return select(
+            ProductoModel.version,
+            ProductoModel.fecha_actualizacion,
+            CategoriaModel.fecha_actualizacion,
+            ProveedorModel.fecha_actualizacion
+        ).outerjoin(
+            CategoriaModel, ProductoModel.categoria_id == CategoriaModel.id
+        ).outerjoin(
+            ProveedorModel, ProductoModel.proveedor_id == ProveedorModel.id
+        ).where(ProductoModel.id == id)
+    
+    @staticmethod
+    def _version_desde_fila(fila) -> Optional[tuple]:
+        """(versión, fecha más reciente) a partir de la fila de _consulta_version"""
+        if not fila:
+            return None
+        version, *fechas = fila
+        fechas = [f for f in fechas if f is not None]
+        return version, max(fechas) if fechas else datetime.min
+    
+    def _sentencia_actualizar(self, producto: Producto):
+        """UPDATE ... WHERE id = :id [AND version = :v] que incrementa la versión"""
+        return (
+            self._condicion_version(update(ProductoModel), producto)
+            .values(
+                nombre=producto.nombre,
+                descripcion=producto.descripcion,
+                precio=producto.precio,
+                cantidad_stock=producto.cantidad_stock,
+                stock_minimo=producto.stock_minimo,
+                categoria_id=producto.categoria_id,
+                proveedor_id=producto.proveedor_id,
+                version=ProductoModel.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _condicion_version(self, sentencia, producto: Producto):
+        """WHERE id = :id, y AND version = :v si se conoce la versión leída (concurrencia optimista)"""
+        sentencia = sentencia.where(ProductoModel.id == producto.id)
+        if producto.version is not None:
+            sentencia = sentencia.where(ProductoModel.version == producto.version)
+        return sentencia
+    
+    def _sentencia_ajustar_stock(self, id: int, cantidad: int):
+        """
+        SET cantidad_stock = cantidad_stock + :delta WHERE id = :id AND cantidad_stock + :delta >= 0
+        La versión se incrementa: un PUT basado en una lectura anterior no pisa el ajuste
+        """
+        return (
+            update(ProductoModel)
+            .where(ProductoModel.id == id)
+            .where(ProductoModel.cantidad_stock + cantidad >= 0)
+            .values(
+                cantidad_stock=ProductoModel.cantidad_stock + cantidad,
+                fecha_actualizacion=datetime.utcnow(),
+                version=ProductoModel.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _consulta_existe(self, id: int):
+        """SELECT de la clave primaria del producto"""
+        return select(ProductoModel.id).where(ProductoModel.id == id)
+    
+    def _sentencias_eliminar(self, id: int) -> list:
+        """
+        Archivo de los movimientos de stock y DELETE ... WHERE id = :id; el rowcount de
+        la última indica si el producto existía
+        """
+        return [
+            *archivar_movimientos(ProductoModel.__table__.c.id == id),
+            delete(ProductoModel)
+            .where(ProductoModel.id == id)
+            .execution_options(synchronize_session=False)
+        ]
+    
+    def _consulta_por_categoria(self, categoria_id: int):
+        """Productos de una categoría"""
+        return self._select_entidades().where(ProductoModel.__table__.c.categoria_id == categoria_id)
+    
+    def _consulta_bajo_stock(self):
+        """
+        Productos por debajo o igual al stock mínimo: filtra por la columna indexada
+        deficit (stock_minimo - cantidad_stock >= 0)
+        """
+        return self._select_entidades().where(ProductoModel.__table__.c.deficit >= 0)
+
+
+class ProductoRepository(SentenciasProducto, IProductoRepository):
+    """
+    Implementación del repositorio de productos usando SQLAlchemy
+    Las escrituras usan el ORM; las lecturas usan select() de Core y construyen
+    las entidades directamente desde las filas, sin identity map ni instrumentación
+    """
+    
+    # Máximo de parámetros por cláusula IN (...) al consultar en lote
+    TAMANO_LOTE_IN = 500
     
     def crear(self, producto: Producto) -> Producto:
         """Crea un nuevo producto en la base de datos"""
         modelo = ProductoModel.from_entity(producto)
         db.session.add(modelo)
-        db.session.commit()
+        db.session.flush()
         return modelo.to_entity()
     
+    def crear_lote(self, productos: List[Producto]) -> int:
+        """Inserta un bloque de productos con un INSERT multi-fila (executemany)"""
+        if not productos:
+            return 0
+        
+        ahora = datetime.utcnow()
+        filas = [
+            {
+                'nombre': p.nombre,
+                'descripcion': p.descripcion,
+                'precio': p.precio,
+                'cantidad_stock': p.cantidad_stock,
+                'stock_minimo': p.stock_minimo,
+                'categoria_id': p.categoria_id,
+                'proveedor_id': p.proveedor_id,
+                'fecha_creacion': ahora,
+                'fecha_actualizacion': ahora
+            }
+            for p in productos
+        ]
+        db.session.execute(insert(ProductoModel.__table__), filas)
+        return len(filas)
+    
+    @lectura_en_replica
     def obtener_por_id(self, id: int) -> Optional[Producto]:
         """Obtiene un producto por su ID"""
-        modelo = ProductoModel.query.get(id)
-        return modelo.to_entity() if modelo else None
+        productos = self._entidades(self._select_entidades().where(ProductoModel.__table__.c.id == id))
+        return productos[0] if productos else None
     
+    @lectura_en_replica
     def obtener_todos(self) -> List[Producto]:
         """Obtiene todos los productos"""
-        modelos = ProductoModel.query.all()
-        return [modelo.to_entity() for modelo in modelos]
+        return self._entidades(self._select_entidades())
+    
+    @lectura_en_replica
+    def obtener_por_id_con_relaciones(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID junto con los nombres de sus relaciones"""
+        productos = self._entidades(
+            self._select_entidades(con_relaciones=True).where(ProductoModel.__table__.c.id == id)
+        )
+        return productos[0] if productos else None
+    
+    @lectura_en_replica
+    def obtener_todos_con_relaciones(self) -> List[Producto]:
+        """Obtiene todos los productos y los nombres de sus relaciones con un único JOIN"""
+        return self._entidades(self._select_entidades(con_relaciones=True))
+    
+    @lectura_en_replica
+    def obtener_por_ids_con_relaciones(self, ids: List[int]) -> List[Producto]:
+        """Obtiene varios productos con una consulta IN y respeta el orden recibido"""
+        if not ids:
+            return []
+        productos = self._entidades(
+            self._select_entidades(con_relaciones=True).where(ProductoModel.__table__.c.id.in_(ids))
+        )
+        por_id = {producto.id: producto for producto in productos}
+        return [por_id[id] for id in ids if id in por_id]
+    
+    @lectura_en_replica
+    def iterar_todos_con_relaciones(self, tamano_lote: int = 1000) -> Iterator[Producto]:
+        """Recorre la tabla con un cursor del lado del servidor (stream_results + yield_per)"""
+        consulta = self._select_entidades(con_relaciones=True).order_by(
+            ProductoModel.__table__.c.id
+        ).execution_options(stream_results=True, yield_per=tamano_lote)
+        
+        for fila in db.session.execute(consulta):
+            yield Producto(*fila)
+    
+    @lectura_en_replica
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Producto]:
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n) con nombres de relaciones"""
+        return self._entidades(self._consulta_pagina(after_id, limit))
+    
+    def _entidades(self, consulta) -> List[Producto]:
+        """Ejecuta la consulta y construye las entidades directamente desde las tuplas"""
+        return [Producto(*fila) for fila in db.session.execute(consulta)]
+    
+    @lectura_en_replica
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """SELECT solo de las columnas pedidas; lanza ValueError si algún campo no es proyectable"""
+        consulta = self._consulta_proyeccion(campos, after_id, limit)
+        return [dict(fila) for fila in db.session.execute(consulta).mappings()]
+    
+    @lectura_en_replica
+    def obtener_huella(self) -> tuple:
+        """Huella del listado en una sola consulta (incluye categorías y proveedores)"""
+        return tuple(db.session.execute(self._consulta_huella()).one())
+    
+    @lectura_en_replica
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Versión de la fila y última modificación del producto o de su categoría/proveedor"""
+        return self._version_desde_fila(db.session.execute(self._consulta_version(id)).first())
     
     def actualizar(self, producto: Producto) -> bool:
-        """Actualiza un producto existente"""
-        modelo = ProductoModel.query.get(producto.id)
-        if not modelo:
-            return False
+        """
+        Actualiza un producto con un único UPDATE ... WHERE id = :id [AND version = :v]
+        e incrementa la versión. Retorna False si no existe o si, con producto.version,
+        otra escritura cambió la fila desde que se leyó (rowcount 0)
+        """
+        return db.session.execute(self._sentencia_actualizar(producto)).rowcount == 1
+    
+    def ajustar_stock(self, id: int, cantidad: int) -> bool:
+        """
+        Ajusta el stock con un único UPDATE condicional (ver _sentencia_ajustar_stock)
+        El éxito se deriva del rowcount, sin lectura previa ni condiciones de carrera
+        """
+        return db.session.execute(self._sentencia_ajustar_stock(id, cantidad)).rowcount == 1
+    
+    def obtener_stock_por_ids(self, ids: List[int]) -> Dict[int, int]:
+        """Obtiene el stock actual de varios productos con SELECT ... FOR UPDATE por bloques"""
+        stock = {}
+        for inicio in range(0, len(ids), self.TAMANO_LOTE_IN):
+            bloque = ids[inicio:inicio + self.TAMANO_LOTE_IN]
+            filas = db.session.query(
+                ProductoModel.id, ProductoModel.cantidad_stock
+            ).filter(ProductoModel.id.in_(bloque)).with_for_update().all()
+            stock.update({id: cantidad for id, cantidad in filas})
+        return stock
+    
+    def aplicar_ajustes_stock(self, ajustes: Dict[int, int]) -> bool:
+        """
+        Aplica los ajustes con un único executemany del UPDATE condicional
+        """
+        if not ajustes:
+            return True
+        
+        tabla = ProductoModel.__table__
+        sentencia = (
+            update(tabla)
+            .where(tabla.c.id == bindparam('b_id'))
+            .where(tabla.c.cantidad_stock + bindparam('b_delta') >= 0)
+            .values(
+                cantidad_stock=tabla.c.cantidad_stock + bindparam('b_delta'),
+                fecha_actualizacion=bindparam('b_fecha'),
+                version=tabla.c.version + 1
+            )
+        )
+        ahora = datetime.utcnow()
+        parametros = [
+            {'b_id': id, 'b_delta': delta, 'b_fecha': ahora}
+            for id, delta in ajustes.items()
+        ]
         
-        modelo.nombre = producto.nombre
-        modelo.descripcion = producto.descripcion
-        modelo.precio = producto.precio
-        modelo.cantidad_stock = producto.cantidad_stock
-        modelo.stock_minimo = producto.stock_minimo
-        modelo.categoria_id = producto.categoria_id
-        modelo.proveedor_id = producto.proveedor_id
-        db.session.commit()
+        resultado = db.session.execute(sentencia, parametros)
+        # Algunos drivers no reportan el rowcount acumulado de un executemany
+        if db.engine.dialect.supports_sane_multi_rowcount and resultado.rowcount != len(parametros):
+            return False
         return True
     
+    def existe(self, id: int) -> bool:
+        """Verifica si existe un producto con el ID dado"""
+        return db.session.execute(self._consulta_existe(id)).first() is not None
+    
     def eliminar(self, id: int) -> bool:
-        """Elimina un producto"""
-        modelo = ProductoModel.query.get(id)
-        if not modelo:
-            return False
-        
-        db.session.delete(modelo)
-        db.session.commit()
-        return True
+        """
+        Elimina un producto con un único DELETE ... WHERE id = :id
+        Sus movimientos de stock se mueven antes al archivo
+        Retorna False si no existe (rowcount 0)
+        """
+        for sentencia in self._sentencias_eliminar(id):
+            resultado = db.session.execute(sentencia)
+        return resultado.rowcount == 1
     
+    @lectura_en_replica
     def obtener_por_categoria(self, categoria_id: int) -> List[Producto]:
         """Obtiene productos por categoría"""
-        modelos = ProductoModel.query.filter_by(categoria_id=categoria_id).all()
-        return [modelo.to_entity() for modelo in modelos]
+        return self._entidades(self._consulta_por_categoria(categoria_id))
     
+    @lectura_en_replica
     def obtener_productos_bajo_stock(self) -> List[Producto]:
         """Obtiene productos que están por debajo o igual al stock mínimo"""
-        modelos = ProductoModel.query.filter(
-            ProductoModel.cantidad_stock <= ProductoModel.stock_minimo
-        ).all()
-        return [modelo.to_entity() for modelo in modelos]
+        return self._entidades(self._consulta_bajo_stock())
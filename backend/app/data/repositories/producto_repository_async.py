@@ -0,0 +1,103 @@
+"""
+Implementación asyncio del Repositorio de Productos (variante ASGI de la API)
+Las sentencias son las del repositorio síncrono (SentenciasProducto); cambia solo la ejecución
+(await sobre AsyncSession)
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import async_scoped_session
+from app.core.entities.producto import Producto
+from app.core.interfaces.producto_repository import IProductoRepositoryAsync
+from app.data.models.producto_model import ProductoModel
+from app.data.repositories.producto_repository import SentenciasProducto
+
+
+class ProductoRepositoryAsync(SentenciasProducto, IProductoRepositoryAsync):
+    """
+    Repositorio de productos sobre SQLAlchemy asyncio
+    Recibe la sesión con alcance de petición (async_scoped_session) por inyección
+    """
+    
+    def __init__(self, sesion: async_scoped_session):
+        self.sesion = sesion
+    
+    async def crear(self, producto: Producto) -> Producto:
+        """Crea un nuevo producto en la base de datos"""
+        modelo = ProductoModel.from_entity(producto)
+        self.sesion.add(modelo)
+        await self.sesion.flush()
+        return modelo.to_entity()
+    
+    async def obtener_por_id(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID"""
+        productos = await self._entidades(self._select_entidades().where(ProductoModel.__table__.c.id == id))
+        return productos[0] if productos else None
+    
+    async def obtener_todos(self) -> List[Producto]:
+        """Obtiene todos los productos"""
+        return await self._entidades(self._select_entidades())
+    
+    async def obtener_por_id_con_relaciones(self, id: int) -> Optional[Producto]:
+        """Obtiene un producto por su ID junto con los nombres de sus relaciones"""
+        productos = await self._entidades(
+            self._select_entidades(con_relaciones=True).where(ProductoModel.__table__.c.id == id)
+        )
+        return productos[0] if productos else None
+    
+    async def obtener_todos_con_relaciones(self) -> List[Producto]:
+        """Obtiene todos los productos y los nombres de sus relaciones con un único JOIN"""
+        return await self._entidades(self._select_entidades(con_relaciones=True))
+    
+    async def obtener_pagina(self, after_id: int, limit: int) -> List[Producto]:
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n) con nombres de relaciones"""
+        return await self._entidades(self._consulta_pagina(after_id, limit))
+    
+    async def _entidades(self, consulta) -> List[Producto]:
+        """Ejecuta la consulta y construye las entidades directamente desde las tuplas"""
+        return [Producto(*fila) for fila in await self.sesion.execute(consulta)]
+    
+    async def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """SELECT solo de las columnas pedidas; lanza ValueError si algún campo no es proyectable"""
+        consulta = self._consulta_proyeccion(campos, after_id, limit)
+        return [dict(fila) for fila in (await self.sesion.execute(consulta)).mappings()]
+    
+    async def obtener_huella(self) -> tuple:
+        """Huella del listado en una sola consulta (incluye categorías y proveedores)"""
+        return tuple((await self.sesion.execute(self._consulta_huella())).one())
+    
+    async def obtener_version(self, id: int) -> Optional[tuple]:
+        """Versión de la fila y última modificación del producto o de su categoría/proveedor"""
+        return self._version_desde_fila((await self.sesion.execute(self._consulta_version(id))).first())
+    
+    async def actualizar(self, producto: Producto) -> bool:
+        """
+        Actualiza un producto con un único UPDATE ... WHERE id = :id [AND version = :v]
+        Retorna False si no existe o si cambió desde la versión leída (rowcount 0)
+        """
+        return (await self.sesion.execute(self._sentencia_actualizar(producto))).rowcount == 1
+    
+    async def ajustar_stock(self, id: int, cantidad: int) -> bool:
+        """Ajusta el stock con un único UPDATE condicional (ver _sentencia_ajustar_stock)"""
+        return (await self.sesion.execute(self._sentencia_ajustar_stock(id, cantidad))).rowcount == 1
+    
+    async def existe(self, id: int) -> bool:
+        """Verifica si existe un producto con el ID dado"""
+        return (await self.sesion.execute(self._consulta_existe(id))).first() is not None
+    
+    async def eliminar(self, id: int) -> bool:
+        """
+        Elimina un producto con un único DELETE ... WHERE id = :id
+        Sus movimientos de stock se mueven antes al archivo
+        Retorna False si no existe (rowcount 0)
+        """
+        for sentencia in self._sentencias_eliminar(id):
+            resultado = await self.sesion.execute(sentencia)
+        return resultado.rowcount == 1
+    
+    async def obtener_por_categoria(self, categoria_id: int) -> List[Producto]:
+        """Obtiene productos por categoría"""
+        return await self._entidades(self._consulta_por_categoria(categoria_id))
+    
+    async def obtener_productos_bajo_stock(self) -> List[Producto]:
+        """Obtiene productos con stock bajo filtrando por la columna indexada deficit"""
+        return await self._entidades(self._consulta_bajo_stock())
@@ -1,60 +1,200 @@
 """
 Implementación del Repositorio de Proveedores
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import delete, func, select, update
 from app.core.entities.proveedor import Proveedor
 from app.core.interfaces.proveedor_repository import IProveedorRepository
 from app.data.models.proveedor_model import ProveedorModel
 from app.data.database import db
+from app.data.enrutamiento import lectura_en_replica
 
 
-class ProveedorRepository(IProveedorRepository):
-    """Implementación del repositorio de proveedores usando SQLAlchemy"""
+class SentenciasProveedor:
+    """
+    Sentencias del repositorio de proveedores, compartidas por la implementación síncrona
+    y la asyncio (ProveedorRepositoryAsync): las dos solo cambian la forma de ejecutarlas
+    """
+    
+    # Columnas en el orden de los campos de la entidad: cada fila se convierte con Proveedor(*fila)
+    COLUMNAS_ENTIDAD = (
+        ProveedorModel.__table__.c.nombre,
+        ProveedorModel.__table__.c.contacto,
+        ProveedorModel.__table__.c.telefono,
+        ProveedorModel.__table__.c.email,
+        ProveedorModel.__table__.c.direccion,
+        ProveedorModel.__table__.c.id,
+        ProveedorModel.__table__.c.fecha_creacion,
+        ProveedorModel.__table__.c.fecha_actualizacion,
+        ProveedorModel.__table__.c.version
+    )
+    
+    # Campos admitidos por obtener_proyeccion (atributo de la entidad -> columna)
+    COLUMNAS_PROYECCION = {columna.name: columna for columna in ProveedorModel.__table__.columns}
+    
+    def _select_entidades(self):
+        """SELECT de Core con las columnas de la entidad"""
+        return select(*self.COLUMNAS_ENTIDAD)
+    
+    def _consulta_pagina(self, after_id: int, limit: int):
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n)"""
+        tabla = ProveedorModel.__table__
+        return self._select_entidades().where(tabla.c.id > after_id).order_by(tabla.c.id).limit(limit)
+    
+    def _consulta_proyeccion(self, campos: List[str], after_id: int, limit: Optional[int]):
+        """
+        SELECT solo de las columnas pedidas (WHERE id > :cursor ORDER BY id [LIMIT n])
+        Lanza ValueError si algún campo no es proyectable
+        """
+        desconocidos = [campo for campo in campos if campo not in self.COLUMNAS_PROYECCION]
+        if desconocidos:
+            raise ValueError(f"Campos no proyectables: {', '.join(desconocidos)}")
+        
+        consulta = select(
+            *[self.COLUMNAS_PROYECCION[campo].label(campo) for campo in campos]
+        ).where(ProveedorModel.id > after_id).order_by(ProveedorModel.id)
+        if limit is not None:
+            consulta = consulta.limit(limit)
+        return consulta
+    
+    def _consulta_huella(self):
+        """
+        Huella del listado con una sola consulta de agregados
+        La suma de versiones detecta dos ediciones en el mismo segundo (DATETIME de MySQL)
+        """
+        return select(
+            func.count(ProveedorModel.id),
+            func.max(ProveedorModel.id),
+            func.max(ProveedorModel.fecha_actualizacion),
+            func.sum(ProveedorModel.version)
+        )
+    
+    def _consulta_version(self, id: int):
+        """Solo las columnas version y fecha_actualizacion del registro"""
+        return select(ProveedorModel.version, ProveedorModel.fecha_actualizacion).where(ProveedorModel.id == id)
+    
+    @staticmethod
+    def _version_desde_fila(fila) -> Optional[tuple]:
+        """(versión, fecha de última modificación) a partir de la fila de _consulta_version"""
+        if not fila:
+            return None
+        return fila[0], fila[1] or datetime.min
+    
+    def _sentencia_actualizar(self, proveedor: Proveedor):
+        """UPDATE ... WHERE id = :id [AND version = :v] que incrementa la versión"""
+        return (
+            self._condicion_version(update(ProveedorModel), proveedor)
+            .values(
+                nombre=proveedor.nombre,
+                contacto=proveedor.contacto,
+                telefono=proveedor.telefono,
+                email=proveedor.email,
+                direccion=proveedor.direccion,
+                version=ProveedorModel.version + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    def _condicion_version(self, sentencia, proveedor: Proveedor):
+        """WHERE id = :id, y AND version = :v si se conoce la versión leída"""
+        sentencia = sentencia.where(ProveedorModel.id == proveedor.id)
+        if proveedor.version is not None:
+            sentencia = sentencia.where(ProveedorModel.version == proveedor.version)
+        return sentencia
+    
+    def _sentencia_eliminar(self, id: int):
+        """DELETE ... WHERE id = :id (el rowcount indica si existía)"""
+        return (
+            delete(ProveedorModel)
+            .where(ProveedorModel.id == id)
+            .execution_options(synchronize_session=False)
+        )
+
+
+class ProveedorRepository(SentenciasProveedor, IProveedorRepository):
+    """
+    Implementación del repositorio de proveedores usando SQLAlchemy
+    Las escrituras usan el ORM; las lecturas usan select() de Core y construyen
+    las entidades directamente desde las filas
+    """
     
     def crear(self, proveedor: Proveedor) -> Proveedor:
         """Crea un nuevo proveedor en la base de datos"""
         modelo = ProveedorModel.from_entity(proveedor)
         db.session.add(modelo)
-        db.session.commit()
+        db.session.flush()
         return modelo.to_entity()
     
+    @lectura_en_replica
     def obtener_por_id(self, id: int) -> Optional[Proveedor]:
         """Obtiene un proveedor por su ID"""
-        modelo = ProveedorModel.query.get(id)
-        return modelo.to_entity() if modelo else None
+        proveedores = self._entidades(self._select_entidades().where(ProveedorModel.__table__.c.id == id))
+        return proveedores[0] if proveedores else None
+    
+    @lectura_en_replica
+    def obtener_por_ids(self, ids: List[int]) -> List[Proveedor]:
+        """Obtiene varios proveedores con una consulta IN y respeta el orden recibido"""
+        if not ids:
+            return []
+        por_id = {
+            proveedor.id: proveedor
+            for proveedor in self._entidades(self._select_entidades().where(ProveedorModel.__table__.c.id.in_(ids)))
+        }
+        return [por_id[id] for id in ids if id in por_id]
     
+    @lectura_en_replica
     def obtener_todos(self) -> List[Proveedor]:
         """Obtiene todos los proveedores"""
-        modelos = ProveedorModel.query.all()
-        return [modelo.to_entity() for modelo in modelos]
+        return self._entidades(self._select_entidades())
+    
+    @lectura_en_replica
+    def obtener_pagina(self, after_id: int, limit: int) -> List[Proveedor]:
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n)"""
+        return self._entidades(self._consulta_pagina(after_id, limit))
+    
+    @lectura_en_replica
+    def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                           limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """SELECT solo de las columnas pedidas; lanza ValueError si algún campo no es proyectable"""
+        consulta = self._consulta_proyeccion(campos, after_id, limit)
+        return [dict(fila) for fila in db.session.execute(consulta).mappings()]
+    
+    def obtener_ids(self) -> Set[int]:
+        """Obtiene los IDs existentes leyendo solo la columna de clave primaria"""
+        return {id for (id,) in db.session.query(ProveedorModel.id).all()}
+    
+    @lectura_en_replica
+    def obtener_huella(self) -> tuple:
+        """Huella del listado con una sola consulta de agregados"""
+        return tuple(db.session.execute(self._consulta_huella()).one())
+    
+    @lectura_en_replica
+    def obtener_version(self, id: int) -> Optional[tuple]:
+        """Lee solo las columnas version y fecha_actualizacion del registro"""
+        return self._version_desde_fila(db.session.execute(self._consulta_version(id)).first())
+    
+    def _entidades(self, consulta) -> List[Proveedor]:
+        """Ejecuta la consulta y construye las entidades directamente desde las tuplas"""
+        return [Proveedor(*fila) for fila in db.session.execute(consulta)]
     
     def actualizar(self, proveedor: Proveedor) -> bool:
-        """Actualiza un proveedor existente"""
-        modelo = ProveedorModel.query.get(proveedor.id)
-        if not modelo:
-            return False
-        
-        modelo.nombre = proveedor.nombre
-        modelo.contacto = proveedor.contacto
-        modelo.telefono = proveedor.telefono
-        modelo.email = proveedor.email
-        modelo.direccion = proveedor.direccion
-        db.session.commit()
-        return True
+        """
+        Actualiza un proveedor con un único UPDATE ... WHERE id = :id [AND version = :v]
+        Retorna False si no existe o si cambió desde la versión leída (rowcount 0)
+        """
+        return db.session.execute(self._sentencia_actualizar(proveedor)).rowcount == 1
     
     def eliminar(self, id: int) -> bool:
-        """Elimina un proveedor"""
-        modelo = ProveedorModel.query.get(id)
-        if not modelo:
-            return False
-        
-        db.session.delete(modelo)
-        db.session.commit()
-        return True
+        """
+        Elimina un proveedor con un único DELETE ... WHERE id = :id
+        Retorna False si no existe (rowcount 0)
+        """
+        return db.session.execute(self._sentencia_eliminar(id)).rowcount == 1
     
+    @lectura_en_replica
     def buscar_por_nombre(self, nombre: str) -> List[Proveedor]:
         """Busca proveedores por nombre"""
-        modelos = ProveedorModel.query.filter(
-            ProveedorModel.nombre.ilike(f'%{nombre}%')
-        ).all()
-        return [modelo.to_entity() for modelo in modelos]
+        return self._entidades(
+            self._select_entidades().where(ProveedorModel.__table__.c.nombre.ilike(f'%{nombre}%'))
+        )
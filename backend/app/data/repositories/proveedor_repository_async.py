@@ -0,0 +1,74 @@
+"""
+Implementación asyncio del Repositorio de Proveedores (variante ASGI de la API)
+Las sentencias son las del repositorio síncrono (SentenciasProveedor); cambia solo la ejecución
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import async_scoped_session
+from app.core.entities.proveedor import Proveedor
+from app.core.interfaces.proveedor_repository import IProveedorRepositoryAsync
+from app.data.models.proveedor_model import ProveedorModel
+from app.data.repositories.proveedor_repository import SentenciasProveedor
+
+
+class ProveedorRepositoryAsync(SentenciasProveedor, IProveedorRepositoryAsync):
+    """
+    Repositorio de proveedores sobre SQLAlchemy asyncio
+    Recibe la sesión con alcance de petición (async_scoped_session) por inyección
+    """
+    
+    def __init__(self, sesion: async_scoped_session):
+        self.sesion = sesion
+    
+    async def crear(self, proveedor: Proveedor) -> Proveedor:
+        """Crea un nuevo proveedor en la base de datos"""
+        modelo = ProveedorModel.from_entity(proveedor)
+        self.sesion.add(modelo)
+        await self.sesion.flush()
+        return modelo.to_entity()
+    
+    async def obtener_por_id(self, id: int) -> Optional[Proveedor]:
+        """Obtiene un proveedor por su ID"""
+        proveedores = await self._entidades(
+            self._select_entidades().where(ProveedorModel.__table__.c.id == id)
+        )
+        return proveedores[0] if proveedores else None
+    
+    async def obtener_todos(self) -> List[Proveedor]:
+        """Obtiene todos los proveedores"""
+        return await self._entidades(self._select_entidades())
+    
+    async def obtener_pagina(self, after_id: int, limit: int) -> List[Proveedor]:
+        """Página por keyset (WHERE id > :cursor ORDER BY id LIMIT n)"""
+        return await self._entidades(self._consulta_pagina(after_id, limit))
+    
+    async def obtener_proyeccion(self, campos: List[str], after_id: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """SELECT solo de las columnas pedidas; lanza ValueError si algún campo no es proyectable"""
+        consulta = self._consulta_proyeccion(campos, after_id, limit)
+        return [dict(fila) for fila in (await self.sesion.execute(consulta)).mappings()]
+    
+    async def obtener_huella(self) -> tuple:
+        """Huella del listado con una sola consulta de agregados"""
+        return tuple((await self.sesion.execute(self._consulta_huella())).one())
+    
+    async def obtener_version(self, id: int) -> Optional[tuple]:
+        """Lee solo las columnas version y fecha_actualizacion del registro"""
+        return self._version_desde_fila((await self.sesion.execute(self._consulta_version(id))).first())
+    
+    async def _entidades(self, consulta) -> List[Proveedor]:
+        """Ejecuta la consulta y construye las entidades directamente desde las tuplas"""
+        return [Proveedor(*fila) for fila in await self.sesion.execute(consulta)]
+    
+    async def actualizar(self, proveedor: Proveedor) -> bool:
+        """
+        Actualiza un proveedor con un único UPDATE ... WHERE id = :id [AND version = :v]
+        Retorna False si no existe o si cambió desde la versión leída (rowcount 0)
+        """
+        return (await self.sesion.execute(self._sentencia_actualizar(proveedor))).rowcount == 1
+    
+    async def eliminar(self, id: int) -> bool:
+        """
+        Elimina un proveedor con un único DELETE ... WHERE id = :id
+        Retorna False si no existe (rowcount 0)
+        """
+        return (await self.sesion.execute(self._sentencia_eliminar(id))).rowcount == 1
@@ -0,0 +1,33 @@
+"""
+Implementación de la Unidad de Trabajo sobre la sesión de SQLAlchemy
+"""
+from sqlalchemy.ext.asyncio import async_scoped_session
+from app.core.interfaces.unit_of_work import IUnitOfWork, IUnitOfWorkAsync
+from app.data.database import db
+
+
+class SQLAlchemyUnitOfWork(IUnitOfWork):
+    """Unidad de trabajo que confirma o descarta la sesión actual de Flask-SQLAlchemy"""
+    
+    def commit(self) -> None:
+        """Confirma la transacción de la sesión (un único commit por operación de negocio)"""
+        db.session.commit()
+    
+    def rollback(self) -> None:
+        """Deshace la transacción de la sesión"""
+        db.session.rollback()
+
+
+class SQLAlchemyUnitOfWorkAsync(IUnitOfWorkAsync):
+    """Unidad de trabajo sobre la AsyncSession de la petición actual"""
+    
+    def __init__(self, sesion: async_scoped_session):
+        self.sesion = sesion
+    
+    async def commit(self) -> None:
+        """Confirma la transacción de la sesión (un único commit por operación de negocio)"""
+        await self.sesion.commit()
+    
+    async def rollback(self) -> None:
+        """Deshace la transacción de la sesión"""
+        await self.sesion.rollback()
@@ -0,0 +1,27 @@
+"""
+Utilidades para los endpoints de búsqueda de texto
+"""
+from flask import request
+
+LIMITE_BUSQUEDA_POR_DEFECTO = 20
+LIMITE_BUSQUEDA_MAXIMO = 100
+
+
+def obtener_parametros_busqueda() -> tuple[str, int]:
+    """
+    Lee y valida ?q= y ?limite= de la petición actual
+    Retorna (consulta, limite); lanza ValueError si los valores no son válidos
+    """
+    consulta = request.args.get('q', '').strip()
+    if not consulta:
+        raise ValueError("El parámetro 'q' es requerido")
+    
+    try:
+        limite = int(request.args.get('limite', LIMITE_BUSQUEDA_POR_DEFECTO))
+    except ValueError:
+        raise ValueError("El parámetro 'limite' debe ser un entero")
+    
+    if limite < 1 or limite > LIMITE_BUSQUEDA_MAXIMO:
+        raise ValueError(f"El parámetro 'limite' debe estar entre 1 y {LIMITE_BUSQUEDA_MAXIMO}")
+    
+    return consulta, limite
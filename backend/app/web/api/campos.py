@@ -0,0 +1,42 @@
+"""
+Utilidades para listados con selección de campos (?fields=)
+"""
+from typing import Any, Dict, List
+from flask import request
+
+
+def solicita_campos(args=None) -> bool:
+    """
+    Indica si la petición usa el parámetro ?fields=
+    `args` permite pasar la query string de una petición que no es de Flask (API ASGI)
+    """
+    args = request.args if args is None else args
+    return 'fields' in args
+
+
+def obtener_campos(permitidos: Dict[str, str], args=None) -> List[str]:
+    """
+    Lee ?fields= (de la petición actual o de `args`) y lo valida contra la lista blanca `permitidos`
+    (campo de la API -> campo de la proyección del repositorio)
+    Retorna los campos en el orden pedido y sin repetidos; lanza ValueError si alguno no es válido
+    """
+    args = request.args if args is None else args
+    campos = list(dict.fromkeys(
+        campo.strip() for campo in args.get('fields', '').split(',') if campo.strip()
+    ))
+    if not campos:
+        raise ValueError("El parámetro 'fields' no puede estar vacío")
+    
+    desconocidos = [campo for campo in campos if campo not in permitidos]
+    if desconocidos:
+        raise ValueError(
+            f"Campos no válidos en 'fields': {', '.join(desconocidos)}. "
+            f"Permitidos: {', '.join(permitidos)}"
+        )
+    
+    return campos
+
+
+def fila_to_dict(fila: Dict[str, Any], campos: List[str], permitidos: Dict[str, str]) -> Dict[str, Any]:
+    """Convierte una fila proyectada al diccionario de la API con solo los campos pedidos (las fechas las codifica el proveedor JSON)"""
+    return {campo: fila[permitidos[campo]] for campo in campos}
@@ -1,28 +1,70 @@
 from flask import Blueprint, jsonify, request
 from app.core.use_cases.categoria_use_cases import CategoriaUseCases
 from app.core.entities.categoria import Categoria
+from app.web.api.etag import (
+    calcular_etag, etag_versionado, version_if_match, codigo_error_actualizacion, no_modificado, con_etag
+)
+from app.web.api.listados import leer_parametros_listado, campos_proyeccion, cuerpo_proyeccion, cuerpo_listado
+from app.web.api.serializadores import compilar_serializador
+
+# Campos admitidos en ?fields= (campo de la API -> campo de la proyección del repositorio)
+CAMPOS_CATEGORIA = {
+    campo: campo
+    for campo in ('id', 'nombre', 'descripcion', 'fecha_creacion', 'fecha_actualizacion', 'version')
+}
+
+# Serializador precompilado (las fechas las codifica el proveedor JSON)
+serializar_categoria = compilar_serializador(CAMPOS_CATEGORIA)
+
+
+def categoria_desde_dict(data, id=None, version=None) -> Categoria:
+    """Construye una Categoria a partir del cuerpo JSON de la petición (también la usa la API ASGI)"""
+    return Categoria(
+        id=id,
+        nombre=data['nombre'],
+        descripcion=data.get('descripcion', ''),
+        version=version
+    )
+
 
 def create_categoria_api(categoria_use_cases: CategoriaUseCases):
     api = Blueprint('categoria_api', __name__, url_prefix='/api/categorias')
     
     def categoria_to_dict(categoria):
         """Convierte una categoría a diccionario"""
-        return {
-            'id': categoria.id,
-            'nombre': categoria.nombre,
-            'descripcion': categoria.descripcion,
-            'fecha_creacion': categoria.fecha_creacion.isoformat() if categoria.fecha_creacion else None
-        }
+        return serializar_categoria(categoria)
     
     @api.route('/', methods=['GET'])
     def listar():
-        """Obtiene todas las categorías"""
+        """Obtiene todas las categorías (paginado por cursor con ?limit=&cursor=, campos con ?fields=)"""
         try:
-            categorias = categoria_use_cases.listar_categorias()
-            return jsonify({
-                'success': True,
-                'data': [categoria_to_dict(c) for c in categorias]
-            }), 200
+            # Validación condicional: si el listado no cambió no se cargan filas
+            etag = calcular_etag(*categoria_use_cases.obtener_huella_categorias())
+            respuesta_no_modificada = no_modificado(etag)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            try:
+                campos, after_id, limit = leer_parametros_listado(request.args, CAMPOS_CATEGORIA)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            if campos:
+                # Solo las columnas pedidas se leen y se serializan
+                filas, next_cursor = categoria_use_cases.listar_categorias_proyeccion(
+                    campos_proyeccion(campos, CAMPOS_CATEGORIA), after_id, limit
+                )
+                respuesta = cuerpo_proyeccion(filas, campos, CAMPOS_CATEGORIA, limit, next_cursor)
+            elif limit is not None:
+                categorias, next_cursor = categoria_use_cases.listar_categorias_pagina(after_id, limit)
+                respuesta = cuerpo_listado([categoria_to_dict(c) for c in categorias], limit, next_cursor)
+            else:
+                categorias = categoria_use_cases.listar_categorias()
+                respuesta = cuerpo_listado([categoria_to_dict(c) for c in categorias], None, None)
+            return con_etag(jsonify(respuesta), etag), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -33,6 +75,18 @@ def create_categoria_api(categoria_use_cases: CategoriaUseCases):
     def obtener(id):
         """Obtiene una categoría por ID"""
         try:
+            version = categoria_use_cases.obtener_version_categoria(id)
+            if version is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Categoría no encontrada'
+                }), 404
+            
+            etag = etag_versionado(*version)
+            respuesta_no_modificada = no_modificado(etag, debil=False)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
             categoria = categoria_use_cases.obtener_categoria(id)
             if not categoria:
                 return jsonify({
@@ -40,10 +94,10 @@ def create_categoria_api(categoria_use_cases: CategoriaUseCases):
                     'error': 'Categoría no encontrada'
                 }), 404
             
-            return jsonify({
+            return con_etag(jsonify({
                 'success': True,
                 'data': categoria_to_dict(categoria)
-            }), 200
+            }), etag, debil=False), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -54,12 +108,7 @@ def create_categoria_api(categoria_use_cases: CategoriaUseCases):
     def crear():
         """Crea una nueva categoría"""
         try:
-            data = request.get_json()
-            
-            categoria = Categoria(
-                nombre=data['nombre'],
-                descripcion=data.get('descripcion', '')
-            )
+            categoria = categoria_desde_dict(request.get_json())
             
             exito, mensaje, categoria_creada = categoria_use_cases.crear_categoria(categoria)
             
@@ -82,29 +131,24 @@ def create_categoria_api(categoria_use_cases: CategoriaUseCases):
     
     @api.route('/<int:id>', methods=['PUT'])
     def actualizar(id):
-        """Actualiza una categoría existente"""
+        """Actualiza una categoría existente (con If-Match, 412 si cambió desde esa versión)"""
         try:
-            data = request.get_json()
+            categoria = categoria_desde_dict(request.get_json(), id, version_if_match())
             
-            categoria = Categoria(
-                id=id,
-                nombre=data['nombre'],
-                descripcion=data.get('descripcion', '')
-            )
-            
-            exito, mensaje = categoria_use_cases.actualizar_categoria(categoria)
+            exito, mensaje, version = categoria_use_cases.actualizar_categoria(categoria)
             
             if not exito:
                 return jsonify({
                     'success': False,
                     'error': mensaje or 'Error al actualizar categoría'
-                }), 404 if mensaje and 'no encontrada' in mensaje.lower() else 400
+                }), codigo_error_actualizacion(mensaje)
             
-            return jsonify({
+            # Mismo ETag que el detalle: sirve como If-Match de la siguiente edición sin volver a leer
+            return con_etag(jsonify({
                 'success': True,
                 'message': 'Categoría actualizada exitosamente',
                 'data': categoria_to_dict(categoria)
-            }), 200
+            }), etag_versionado(*version), debil=False), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -0,0 +1,42 @@
+from flask import Blueprint, jsonify
+from app.core.use_cases.dashboard_use_cases import DashboardUseCases
+
+
+def resumen_to_dict(resumen):
+    """Convierte el resumen del inventario a diccionario"""
+    return {
+        'total_productos': resumen.total_productos,
+        'total_categorias': resumen.total_categorias,
+        'total_proveedores': resumen.total_proveedores,
+        'productos_bajo_stock': resumen.productos_bajo_stock,
+        'valor_inventario': resumen.valor_inventario,
+        'productos_por_categoria': [
+            {
+                'categoria_id': c.categoria_id,
+                'categoria_nombre': c.categoria_nombre,
+                'total_productos': c.total_productos
+            }
+            for c in resumen.productos_por_categoria
+        ]
+    }
+
+
+def create_dashboard_api(dashboard_use_cases: DashboardUseCases):
+    api = Blueprint('dashboard_api', __name__, url_prefix='/api/dashboard')
+    
+    @api.route('/resumen', methods=['GET'])
+    def resumen():
+        """Obtiene los indicadores agregados del inventario"""
+        try:
+            resumen = dashboard_use_cases.obtener_resumen()
+            return jsonify({
+                'success': True,
+                'data': resumen_to_dict(resumen)
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    return api
@@ -0,0 +1,83 @@
+"""
+Utilidades para peticiones condicionales: GET con ETag / If-None-Match y
+PUT con If-Match (control de concurrencia optimista)
+"""
+import hashlib
+from typing import Optional
+from flask import Response, request
+
+
+def calcular_etag(*partes, ruta: Optional[str] = None) -> str:
+    """
+    Calcula un ETag a partir de una huella y la URL solicitada (incluye query string)
+    `ruta` permite indicar la URL de una petición que no es de Flask (API ASGI)
+    """
+    ruta = request.full_path if ruta is None else ruta
+    contenido = '|'.join(str(p) for p in (ruta,) + partes)
+    return hashlib.sha1(contenido.encode('utf-8')).hexdigest()
+
+
+def etag_versionado(version: int, *partes, ruta: Optional[str] = None) -> str:
+    """
+    ETag del detalle de un recurso editable: '<versión>-<hash>'
+    El hash cubre todo lo que cambia la representación (p. ej. los nombres de las
+    relaciones); la versión de la fila es lo que PUT compara con If-Match
+    """
+    return f'{version}-{calcular_etag(*partes, ruta=ruta)}'
+
+
+def version_if_match(condicion=None) -> Optional[int]:
+    """
+    Versión exigida por If-Match en un PUT (`condicion`: request.if_match de Flask por defecto)
+    None si no se envía o es '*' (basta con que el recurso exista). Admite el ETag del
+    detalle o solo la versión ("7"); una etiqueta débil o que no es de este servidor
+    retorna 0, que nunca coincide con una versión y termina en 412
+    """
+    condicion = request.if_match if condicion is None else condicion
+    if not condicion or condicion.star_tag:
+        return None
+    for etiqueta in condicion.as_set():
+        version = etiqueta.split('-', 1)[0]
+        if version.isdigit():
+            return int(version)
+    return 0
+
+
+def codigo_error_actualizacion(mensaje: Optional[str]) -> int:
+    """
+    Código de un PUT rechazado: 404 si no existe, 412 si cambió desde la versión de If-Match,
+    409 si pide un cambio que se hace por otra ruta (el stock en el libro), 400 si no es válido
+    """
+    if mensaje and 'no encontrad' in mensaje.lower():
+        return 404
+    if mensaje and 'versión leída' in mensaje:
+        return 412
+    if mensaje and 'ajuste de stock' in mensaje:
+        return 409
+    return 400
+
+
+def codigo_error_ajuste(mensaje: Optional[str]) -> int:
+    """Código de un ajuste de stock rechazado: 404 si el producto no existe, 400 si no es válido"""
+    if mensaje and 'no encontrad' in mensaje.lower():
+        return 404
+    return 400
+
+
+def no_modificado(etag: str, debil: bool = True):
+    """Retorna una respuesta 304 si el cliente ya tiene esta versión, o None"""
+    if request.if_none_match.contains_weak(etag):
+        respuesta = Response(status=304)
+        return con_etag(respuesta, etag, debil)
+    return None
+
+
+def con_etag(respuesta, etag: str, debil: bool = True):
+    """
+    Agrega el ETag y obliga al navegador a revalidar en cada uso
+    Los listados usan ETags débiles; el detalle de un recurso editable usa uno fuerte,
+    porque If-Match solo admite la comparación fuerte
+    """
+    respuesta.set_etag(etag, weak=debil)
+    respuesta.headers['Cache-Control'] = 'no-cache'
+    return respuesta
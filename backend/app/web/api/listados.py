@@ -0,0 +1,42 @@
+"""
+Parámetros y cuerpo de los listados (?fields=, ?limit=&cursor=)
+Los usan la API WSGI y la ASGI: reciben la query string y retornan diccionarios,
+cada variante solo ejecuta el caso de uso y arma la respuesta con su framework
+"""
+from typing import Any, Dict, List, Optional
+from app.web.api.campos import fila_to_dict, obtener_campos, solicita_campos
+from app.web.api.paginacion import obtener_parametros_paginacion, solicita_paginacion
+
+
+def leer_parametros_listado(args, permitidos: Dict[str, str]) -> tuple[Optional[List[str]], int, Optional[int]]:
+    """
+    Lee y valida ?fields=, ?cursor= y ?limit= de la query string `args`
+    Retorna (campos pedidos o None, after_id, limit o None si no se pidió paginación);
+    lanza ValueError si algún parámetro no es válido
+    """
+    campos = obtener_campos(permitidos, args) if solicita_campos(args) else None
+    after_id, limit = obtener_parametros_paginacion(args) if solicita_paginacion(args) else (0, None)
+    return campos, after_id, limit
+
+
+def campos_proyeccion(campos: List[str], permitidos: Dict[str, str]) -> List[str]:
+    """Campos de la proyección del repositorio que corresponden a los campos pedidos"""
+    return [permitidos[campo] for campo in campos]
+
+
+def cuerpo_proyeccion(filas, campos: List[str], permitidos: Dict[str, str],
+                      limit: Optional[int], next_cursor: Optional[int]) -> Dict[str, Any]:
+    """Cuerpo de un listado con ?fields= (solo los campos pedidos de cada fila)"""
+    return cuerpo_listado([fila_to_dict(fila, campos, permitidos) for fila in filas], limit, next_cursor)
+
+
+def cuerpo_listado(datos: List[Dict[str, Any]], limit: Optional[int],
+                   next_cursor: Optional[int]) -> Dict[str, Any]:
+    """Cuerpo de un listado; next_cursor solo se incluye si se pidió paginación"""
+    respuesta = {
+        'success': True,
+        'data': datos
+    }
+    if limit is not None:
+        respuesta['next_cursor'] = next_cursor
+    return respuesta
@@ -0,0 +1,37 @@
+"""
+Utilidades de paginación por keyset (cursor) para las APIs REST
+"""
+from flask import request
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+
+
+def solicita_paginacion(args=None) -> bool:
+    """
+    Indica si la petición usa los parámetros ?limit= o ?cursor=
+    `args` permite pasar la query string de una petición que no es de Flask (API ASGI)
+    """
+    args = request.args if args is None else args
+    return 'limit' in args or 'cursor' in args
+
+
+def obtener_parametros_paginacion(args=None) -> tuple[int, int]:
+    """
+    Lee y valida ?cursor= y ?limit= de la petición actual (o de `args`)
+    Retorna (after_id, limit); lanza ValueError si los valores no son válidos
+    """
+    args = request.args if args is None else args
+    try:
+        after_id = int(args.get('cursor', 0))
+        limit = int(args.get('limit', LIMITE_POR_DEFECTO))
+    except ValueError:
+        raise ValueError("Los parámetros 'cursor' y 'limit' deben ser enteros")
+    
+    if after_id < 0:
+        raise ValueError("El parámetro 'cursor' no puede ser negativo")
+    
+    if limit < 1 or limit > LIMITE_MAXIMO:
+        raise ValueError(f"El parámetro 'limit' debe estar entre 1 y {LIMITE_MAXIMO}")
+    
+    return after_id, limit
@@ -1,44 +1,132 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context, url_for
 from app.core.use_cases.producto_use_cases import ProductoUseCases
 from app.core.use_cases.categoria_use_cases import CategoriaUseCases
 from app.core.use_cases.proveedor_use_cases import ProveedorUseCases
 from app.core.entities.producto import Producto
-from datetime import datetime
+from app.core.entities.movimiento_stock import MovimientoStock
+from app.web.api.etag import (
+    calcular_etag, etag_versionado, version_if_match, codigo_error_actualizacion, codigo_error_ajuste,
+    no_modificado, con_etag
+)
+from app.web.api.busqueda import obtener_parametros_busqueda
+from app.web.api.listados import leer_parametros_listado, campos_proyeccion, cuerpo_proyeccion, cuerpo_listado
+from app.web.api.serializadores import compilar_serializador
+import csv
+import io
+
+# Campos de la respuesta (campo de la API -> atributo de la entidad / campo de la proyección)
+# Es también la lista blanca de ?fields=
+CAMPOS_PRODUCTO = {
+    'id': 'id',
+    'nombre': 'nombre',
+    'descripcion': 'descripcion',
+    'precio': 'precio',
+    'stock': 'cantidad_stock',
+    'stock_minimo': 'stock_minimo',
+    'categoria_id': 'categoria_id',
+    'proveedor_id': 'proveedor_id',
+    'necesita_reabastecimiento': 'necesita_reabastecimiento',
+    'fecha_creacion': 'fecha_creacion',
+    'fecha_actualizacion': 'fecha_actualizacion',
+    'version': 'version',
+    'categoria_nombre': 'categoria_nombre',
+    'proveedor_nombre': 'proveedor_nombre'
+}
+
+CAMPOS_RELACIONES = ('categoria_nombre', 'proveedor_nombre')
+
+# Serializadores precompilados (los nombres de relaciones ya vienen resueltos por el repositorio)
+serializar_producto = compilar_serializador(
+    {campo: atributo for campo, atributo in CAMPOS_PRODUCTO.items() if campo not in CAMPOS_RELACIONES},
+    derivados={'necesita_reabastecimiento': Producto.necesita_reabastecimiento}
+)
+serializar_producto_con_relaciones = compilar_serializador(
+    CAMPOS_PRODUCTO,
+    derivados={'necesita_reabastecimiento': Producto.necesita_reabastecimiento}
+)
+
+
+def producto_desde_dict(data, id=None, version=None) -> Producto:
+    """
+    Construye un Producto a partir de un objeto con los campos de la API
+    (cuerpo JSON, fila de importación CSV/NDJSON; también la usa la API ASGI)
+    """
+    return Producto(
+        id=id,
+        nombre=data['nombre'],
+        descripcion=data.get('descripcion') or '',
+        precio=float(data['precio']),
+        cantidad_stock=int(data['stock']),
+        stock_minimo=int(data['stock_minimo']),
+        categoria_id=int(data['categoria_id']),
+        proveedor_id=int(data['proveedor_id']),
+        version=version
+    )
+
+
+def producto_to_dict(producto, incluir_relaciones=False):
+    """Convierte un producto a diccionario (las fechas las codifica el proveedor JSON)"""
+    if incluir_relaciones:
+        return serializar_producto_con_relaciones(producto)
+    return serializar_producto(producto)
+
 
 def create_producto_api(producto_use_cases: ProductoUseCases, 
                         categoria_use_cases: CategoriaUseCases,
-                        proveedor_use_cases: ProveedorUseCases):
+                        proveedor_use_cases: ProveedorUseCases,
+                        operaciones_lote: bool = True):
     api = Blueprint('producto_api', __name__, url_prefix='/api/productos')
     
-    def producto_to_dict(producto, incluir_relaciones=False):
-        """Convierte un producto a diccionario"""
-        data = {
-            'id': producto.id,
-            'nombre': producto.nombre,
-            'descripcion': producto.descripcion,
-            'precio': float(producto.precio),
-            'stock': producto.cantidad_stock,
-            'stock_minimo': producto.stock_minimo,
-            'categoria_id': producto.categoria_id,
-            'proveedor_id': producto.proveedor_id,
-            'necesita_reabastecimiento': producto.necesita_reabastecimiento(),
-            'fecha_creacion': producto.fecha_creacion.isoformat() if producto.fecha_creacion else None,
-            'fecha_actualizacion': producto.fecha_actualizacion.isoformat() if producto.fecha_actualizacion else None
-        }
-        
-        if incluir_relaciones:
-            categoria = categoria_use_cases.obtener_categoria(producto.categoria_id) if producto.categoria_id else None
-            proveedor = proveedor_use_cases.obtener_proveedor(producto.proveedor_id) if producto.proveedor_id else None
-            data['categoria_nombre'] = categoria.nombre if categoria else None
-            data['proveedor_nombre'] = proveedor.nombre if proveedor else None
-        
-        return data
-    
     @api.route('/', methods=['GET'])
     def listar():
-        """Obtiene todos los productos"""
+        """Obtiene todos los productos (paginado por cursor con ?limit=&cursor=, campos con ?fields=)"""
+        try:
+            # Validación condicional: si el listado no cambió no se cargan filas
+            etag = calcular_etag(*producto_use_cases.obtener_huella_productos())
+            respuesta_no_modificada = no_modificado(etag)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            try:
+                campos, after_id, limit = leer_parametros_listado(request.args, CAMPOS_PRODUCTO)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            if campos:
+                # Solo las columnas pedidas se leen y se serializan
+                filas, next_cursor = producto_use_cases.listar_productos_proyeccion(
+                    campos_proyeccion(campos, CAMPOS_PRODUCTO), after_id, limit
+                )
+                respuesta = cuerpo_proyeccion(filas, campos, CAMPOS_PRODUCTO, limit, next_cursor)
+            elif limit is not None:
+                productos, next_cursor = producto_use_cases.listar_productos_pagina(after_id, limit)
+                respuesta = cuerpo_listado([producto_to_dict(p, incluir_relaciones=True) for p in productos], limit, next_cursor)
+            else:
+                productos = producto_use_cases.listar_productos_con_relaciones()
+                respuesta = cuerpo_listado([producto_to_dict(p, incluir_relaciones=True) for p in productos], None, None)
+            return con_etag(jsonify(respuesta), etag), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/buscar', methods=['GET'])
+    def buscar():
+        """Busca productos por nombre y descripción (?q=&limite=)"""
         try:
-            productos = producto_use_cases.listar_productos()
+            try:
+                consulta, limite = obtener_parametros_busqueda()
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            productos = producto_use_cases.buscar_productos(consulta, limite)
             return jsonify({
                 'success': True,
                 'data': [producto_to_dict(p, incluir_relaciones=True) for p in productos]
@@ -53,7 +141,19 @@ def create_producto_api(producto_use_cases: ProductoUseCases,
     def obtener(id):
         """Obtiene un producto por ID"""
         try:
-            producto = producto_use_cases.obtener_producto(id)
+            version = producto_use_cases.obtener_version_producto(id)
+            if version is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Producto no encontrado'
+                }), 404
+            
+            etag = etag_versionado(*version)
+            respuesta_no_modificada = no_modificado(etag, debil=False)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            producto = producto_use_cases.obtener_producto_con_relaciones(id)
             if not producto:
                 return jsonify({
                     'success': False,
@@ -62,10 +162,10 @@ def create_producto_api(producto_use_cases: ProductoUseCases,
             
             data = producto_to_dict(producto, incluir_relaciones=True)
             
-            return jsonify({
+            return con_etag(jsonify({
                 'success': True,
                 'data': data
-            }), 200
+            }), etag, debil=False), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -76,17 +176,7 @@ def create_producto_api(producto_use_cases: ProductoUseCases,
     def crear():
         """Crea un nuevo producto"""
         try:
-            data = request.get_json()
-            
-            producto = Producto(
-                nombre=data['nombre'],
-                descripcion=data.get('descripcion', ''),
-                precio=float(data['precio']),
-                cantidad_stock=int(data['stock']),
-                stock_minimo=int(data['stock_minimo']),
-                categoria_id=int(data['categoria_id']),
-                proveedor_id=int(data['proveedor_id'])
-            )
+            producto = producto_desde_dict(request.get_json())
             
             exito, mensaje, producto_creado = producto_use_cases.crear_producto(producto)
             
@@ -109,34 +199,33 @@ def create_producto_api(producto_use_cases: ProductoUseCases,
     
     @api.route('/<int:id>', methods=['PUT'])
     def actualizar(id):
-        """Actualiza un producto existente"""
+        """
+        Actualiza un producto existente
+        Con If-Match (ETag del detalle o la versión) solo se aplica si el producto no cambió
+        desde esa lectura; si cambió responde 412 y el cliente debe volver a leerlo
+        Con STOCK_MODO=libro un stock distinto del actual responde 409: el stock se cambia
+        con POST /api/productos/<id>/stock
+        """
         try:
-            data = request.get_json()
+            producto = producto_desde_dict(request.get_json(), id, version_if_match())
             
-            producto = Producto(
-                id=id,
-                nombre=data['nombre'],
-                descripcion=data.get('descripcion', ''),
-                precio=float(data['precio']),
-                cantidad_stock=int(data['stock']),
-                stock_minimo=int(data['stock_minimo']),
-                categoria_id=int(data['categoria_id']),
-                proveedor_id=int(data['proveedor_id'])
-            )
-            
-            exito, mensaje = producto_use_cases.actualizar_producto(producto)
+            exito, mensaje, version = producto_use_cases.actualizar_producto(producto)
             
             if not exito:
+                codigo = codigo_error_actualizacion(mensaje)
+                if codigo == 409:
+                    mensaje = f"{mensaje} (POST {url_for('.ajustar_stock', id=id)})"
                 return jsonify({
                     'success': False,
                     'error': mensaje or 'Error al actualizar producto'
-                }), 404 if mensaje and 'no encontrado' in mensaje.lower() else 400
+                }), codigo
             
-            return jsonify({
+            # Mismo ETag que el detalle: sirve como If-Match de la siguiente edición sin volver a leer
+            return con_etag(jsonify({
                 'success': True,
                 'message': 'Producto actualizado exitosamente',
                 'data': producto_to_dict(producto)
-            }), 200
+            }), etag_versionado(*version), debil=False), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -165,6 +254,31 @@ def create_producto_api(producto_use_cases: ProductoUseCases,
                 'error': str(e)
             }), 400
     
+    @api.route('/<int:id>/stock', methods=['POST'])
+    def ajustar_stock(id):
+        """Ajusta el stock de un producto sumando `delta` (puede ser negativo), igual que un movimiento del lote"""
+        try:
+            data = request.get_json()
+            cantidad = int(data['delta'])
+            
+            exito, mensaje = producto_use_cases.ajustar_stock(id, cantidad)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), codigo_error_ajuste(mensaje)
+            
+            return jsonify({
+                'success': True,
+                'message': 'Stock ajustado exitosamente'
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
     @api.route('/bajo-stock', methods=['GET'])
     def bajo_stock():
         """Obtiene productos con stock bajo"""
@@ -180,4 +294,220 @@ def create_producto_api(producto_use_cases: ProductoUseCases,
                 'error': str(e)
             }), 500
     
+    # Importación/exportación y lotes de movimientos (no existen en la variante ASGI)
+    if operaciones_lote:
+        registrar_operaciones_lote(api, producto_use_cases, categoria_use_cases, proveedor_use_cases)
+    
     return api
+
+
+def lineas_en_bloques(flujo, tamano_bloque: int = 64 * 1024):
+    """
+    Genera las líneas (bytes, sin el salto de línea) de un flujo leyéndolo en bloques
+    request.stream no tiene búfer: iterarlo por líneas hace una lectura por cada byte
+    """
+    resto = b''
+    while True:
+        bloque = flujo.read(tamano_bloque)
+        if not bloque:
+            break
+        lineas = (resto + bloque).split(b'\n')
+        resto = lineas.pop()
+        yield from lineas
+    if resto:
+        yield resto
+
+
+def registrar_operaciones_lote(api: Blueprint, producto_use_cases: ProductoUseCases,
+                               categoria_use_cases: CategoriaUseCases,
+                               proveedor_use_cases: ProveedorUseCases):
+    """Rutas de operaciones masivas: /ajustes/lote, /importar y /export (opción OPERACIONES_LOTE_HABILITADAS)"""
+    
+    def leer_movimientos():
+        """
+        Genera (movimiento, error de lectura) por cada movimiento del cuerpo de la petición
+        Acepta un arreglo JSON o NDJSON (application/x-ndjson, un objeto por línea) leído en streaming;
+        una línea que no es JSON se reporta con su número y no detiene el lote
+        """
+        if request.mimetype == 'application/x-ndjson':
+            loads = current_app.json.loads
+            for numero, linea in enumerate(lineas_en_bloques(request.stream), start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    item = loads(linea)
+                except ValueError as e:
+                    yield None, f"Línea {numero}: JSON inválido ({e})"
+                    continue
+                movimiento, error = movimiento_desde_dict(item)
+                yield movimiento, error and f"Línea {numero}: {error}"
+        else:
+            data = request.get_json()
+            if not isinstance(data, list):
+                raise ValueError('Se esperaba un arreglo de movimientos')
+            for item in data:
+                yield movimiento_desde_dict(item)
+    
+    def movimiento_desde_dict(item):
+        """
+        Convierte un objeto {producto_id, delta} en (MovimientoStock, None), o (None, error) si no es
+        un objeto; la validación de los valores es del dominio
+        """
+        if not isinstance(item, dict):
+            return None, "Se esperaba un objeto {producto_id, delta}"
+        return MovimientoStock(producto_id=item.get('producto_id'), cantidad=item.get('delta')), None
+    
+    @api.route('/ajustes/lote', methods=['POST'])
+    def ajustar_stock_lote():
+        """Aplica un lote de movimientos de stock (sincronización de terminales POS)"""
+        try:
+            exito, mensaje, resultados = producto_use_cases.ajustar_stock_lote(leer_movimientos())
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 409
+            
+            aplicados = sum(1 for r in resultados if r.aplicado)
+            return jsonify({
+                'success': True,
+                'data': {
+                    'aplicados': aplicados,
+                    'rechazados': len(resultados) - aplicados,
+                    'resultados': [
+                        {
+                            'indice': r.indice,
+                            'producto_id': r.producto_id,
+                            'delta': r.cantidad,
+                            'aplicado': r.aplicado,
+                            'error': r.error
+                        }
+                        for r in resultados
+                    ]
+                }
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    def fecha_iso(fecha):
+        """Fecha en ISO 8601 para formatos que no pasan por el proveedor JSON (CSV)"""
+        return fecha.isoformat() if fecha else None
+    
+    def leer_filas_importacion():
+        """
+        Genera (numero_fila, producto, error) leyendo el archivo en streaming
+        Acepta un archivo multipart en el campo 'archivo' o el cuerpo crudo;
+        el formato se deduce de la extensión o del Content-Type (CSV por defecto)
+        """
+        archivo = request.files.get('archivo')
+        if archivo:
+            flujo = archivo.stream
+            es_ndjson = (archivo.filename or '').lower().endswith(('.ndjson', '.jsonl')) \
+                or archivo.mimetype == 'application/x-ndjson'
+        else:
+            flujo = request.stream
+            es_ndjson = request.mimetype == 'application/x-ndjson'
+        
+        texto = io.TextIOWrapper(flujo, encoding='utf-8-sig', newline='')
+        if es_ndjson:
+            filas = (
+                (numero, linea) for numero, linea in enumerate(texto, start=1) if linea.strip()
+            )
+            for numero, linea in filas:
+                try:
+                    data = current_app.json.loads(linea)
+                    if not isinstance(data, dict):
+                        raise ValueError('Se esperaba un objeto JSON')
+                    yield numero, producto_desde_dict(data), None
+                except KeyError as e:
+                    yield numero, None, f"Falta el campo {e}"
+                except (TypeError, ValueError) as e:
+                    yield numero, None, f"Fila inválida: {e}"
+        else:
+            # La fila 1 es el encabezado
+            for numero, data in enumerate(csv.DictReader(texto), start=2):
+                try:
+                    yield numero, producto_desde_dict(data), None
+                except KeyError as e:
+                    yield numero, None, f"Falta el campo {e}"
+                except (TypeError, ValueError) as e:
+                    yield numero, None, f"Fila inválida: {e}"
+    
+    @api.route('/importar', methods=['POST'])
+    def importar():
+        """Importa productos desde CSV o NDJSON insertando en bloques"""
+        try:
+            procesadas, insertadas, errores = producto_use_cases.importar_productos(
+                leer_filas_importacion(),
+                categoria_use_cases.obtener_ids_categorias(),
+                proveedor_use_cases.obtener_ids_proveedores()
+            )
+            
+            return jsonify({
+                'success': True,
+                'message': f'{insertadas} de {procesadas} productos importados',
+                'data': {
+                    'procesadas': procesadas,
+                    'insertadas': insertadas,
+                    'rechazadas': procesadas - insertadas,
+                    'errores': [{'fila': fila, 'error': error} for fila, error in errores]
+                }
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/export', methods=['GET'])
+    def exportar():
+        """Exporta el catálogo completo como CSV o NDJSON en streaming (?format=csv|ndjson)"""
+        formato = request.args.get('format', 'csv').lower()
+        if formato not in ('csv', 'ndjson'):
+            return jsonify({
+                'success': False,
+                'error': "El formato debe ser 'csv' o 'ndjson'"
+            }), 400
+        
+        def generar_ndjson(filas_por_bloque=1000):
+            lineas = []
+            for producto in producto_use_cases.exportar_productos():
+                lineas.append(current_app.json.dumps(producto_to_dict(producto, incluir_relaciones=True)))
+                if len(lineas) == filas_por_bloque:
+                    yield '\n'.join(lineas) + '\n'
+                    lineas = []
+            if lineas:
+                yield '\n'.join(lineas) + '\n'
+        
+        def generar_csv(filas_por_bloque=1000):
+            buffer = io.StringIO()
+            writer = None
+            for i, producto in enumerate(producto_use_cases.exportar_productos(), start=1):
+                data = producto_to_dict(producto, incluir_relaciones=True)
+                data['fecha_creacion'] = fecha_iso(data['fecha_creacion'])
+                data['fecha_actualizacion'] = fecha_iso(data['fecha_actualizacion'])
+                if writer is None:
+                    writer = csv.DictWriter(buffer, fieldnames=list(data.keys()))
+                    writer.writeheader()
+                writer.writerow(data)
+                # Se vacía el buffer por bloques para mantener la memoria constante
+                if i % filas_por_bloque == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate(0)
+            yield buffer.getvalue()
+        
+        if formato == 'ndjson':
+            generador, mimetype = generar_ndjson(), 'application/x-ndjson'
+        else:
+            generador, mimetype = generar_csv(), 'text/csv'
+        
+        return Response(
+            stream_with_context(generador),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename=productos.{formato}'}
+        )
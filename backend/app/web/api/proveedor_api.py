@@ -1,27 +1,94 @@
 from flask import Blueprint, jsonify, request
 from app.core.use_cases.proveedor_use_cases import ProveedorUseCases
 from app.core.entities.proveedor import Proveedor
+from app.web.api.etag import (
+    calcular_etag, etag_versionado, version_if_match, codigo_error_actualizacion, no_modificado, con_etag
+)
+from app.web.api.busqueda import obtener_parametros_busqueda
+from app.web.api.listados import leer_parametros_listado, campos_proyeccion, cuerpo_proyeccion, cuerpo_listado
+from app.web.api.serializadores import compilar_serializador
+
+# Campos admitidos en ?fields= (campo de la API -> campo de la proyección del repositorio)
+CAMPOS_PROVEEDOR = {
+    campo: campo
+    for campo in ('id', 'nombre', 'contacto', 'telefono', 'email', 'direccion',
+                  'fecha_creacion', 'fecha_actualizacion', 'version')
+}
+
+# Serializador precompilado (las fechas las codifica el proveedor JSON)
+serializar_proveedor = compilar_serializador(CAMPOS_PROVEEDOR)
+
+
+def proveedor_desde_dict(data, id=None, version=None) -> Proveedor:
+    """Construye un Proveedor a partir del cuerpo JSON de la petición (también la usa la API ASGI)"""
+    return Proveedor(
+        id=id,
+        nombre=data['nombre'],
+        contacto=data.get('contacto', ''),
+        telefono=data.get('telefono', ''),
+        email=data.get('email', ''),
+        direccion=data.get('direccion', ''),
+        version=version
+    )
+
 
 def create_proveedor_api(proveedor_use_cases: ProveedorUseCases):
     api = Blueprint('proveedor_api', __name__, url_prefix='/api/proveedores')
     
     def proveedor_to_dict(proveedor):
         """Convierte un proveedor a diccionario"""
-        return {
-            'id': proveedor.id,
-            'nombre': proveedor.nombre,
-            'contacto': proveedor.contacto,
-            'telefono': proveedor.telefono,
-            'email': proveedor.email,
-            'direccion': proveedor.direccion,
-            'fecha_creacion': proveedor.fecha_creacion.isoformat() if proveedor.fecha_creacion else None
-        }
+        return serializar_proveedor(proveedor)
     
     @api.route('/', methods=['GET'])
     def listar():
-        """Obtiene todos los proveedores"""
+        """Obtiene todos los proveedores (paginado por cursor con ?limit=&cursor=, campos con ?fields=)"""
         try:
-            proveedores = proveedor_use_cases.listar_proveedores()
+            # Validación condicional: si el listado no cambió no se cargan filas
+            etag = calcular_etag(*proveedor_use_cases.obtener_huella_proveedores())
+            respuesta_no_modificada = no_modificado(etag)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            try:
+                campos, after_id, limit = leer_parametros_listado(request.args, CAMPOS_PROVEEDOR)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            if campos:
+                # Solo las columnas pedidas se leen y se serializan
+                filas, next_cursor = proveedor_use_cases.listar_proveedores_proyeccion(
+                    campos_proyeccion(campos, CAMPOS_PROVEEDOR), after_id, limit
+                )
+                respuesta = cuerpo_proyeccion(filas, campos, CAMPOS_PROVEEDOR, limit, next_cursor)
+            elif limit is not None:
+                proveedores, next_cursor = proveedor_use_cases.listar_proveedores_pagina(after_id, limit)
+                respuesta = cuerpo_listado([proveedor_to_dict(p) for p in proveedores], limit, next_cursor)
+            else:
+                proveedores = proveedor_use_cases.listar_proveedores()
+                respuesta = cuerpo_listado([proveedor_to_dict(p) for p in proveedores], None, None)
+            return con_etag(jsonify(respuesta), etag), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/buscar', methods=['GET'])
+    def buscar():
+        """Busca proveedores por nombre (?q=&limite=)"""
+        try:
+            try:
+                consulta, limite = obtener_parametros_busqueda()
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            proveedores = proveedor_use_cases.buscar_proveedores(consulta, limite)
             return jsonify({
                 'success': True,
                 'data': [proveedor_to_dict(p) for p in proveedores]
@@ -36,6 +103,18 @@ def create_proveedor_api(proveedor_use_cases: ProveedorUseCases):
     def obtener(id):
         """Obtiene un proveedor por ID"""
         try:
+            version = proveedor_use_cases.obtener_version_proveedor(id)
+            if version is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Proveedor no encontrado'
+                }), 404
+            
+            etag = etag_versionado(*version)
+            respuesta_no_modificada = no_modificado(etag, debil=False)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
             proveedor = proveedor_use_cases.obtener_proveedor(id)
             if not proveedor:
                 return jsonify({
@@ -43,10 +122,10 @@ def create_proveedor_api(proveedor_use_cases: ProveedorUseCases):
                     'error': 'Proveedor no encontrado'
                 }), 404
             
-            return jsonify({
+            return con_etag(jsonify({
                 'success': True,
                 'data': proveedor_to_dict(proveedor)
-            }), 200
+            }), etag, debil=False), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -57,15 +136,7 @@ def create_proveedor_api(proveedor_use_cases: ProveedorUseCases):
     def crear():
         """Crea un nuevo proveedor"""
         try:
-            data = request.get_json()
-            
-            proveedor = Proveedor(
-                nombre=data['nombre'],
-                contacto=data.get('contacto', ''),
-                telefono=data.get('telefono', ''),
-                email=data.get('email', ''),
-                direccion=data.get('direccion', '')
-            )
+            proveedor = proveedor_desde_dict(request.get_json())
             
             exito, mensaje, proveedor_creado = proveedor_use_cases.crear_proveedor(proveedor)
             
@@ -88,32 +159,24 @@ def create_proveedor_api(proveedor_use_cases: ProveedorUseCases):
     
     @api.route('/<int:id>', methods=['PUT'])
     def actualizar(id):
-        """Actualiza un proveedor existente"""
+        """Actualiza un proveedor existente (con If-Match, 412 si cambió desde esa versión)"""
         try:
-            data = request.get_json()
-            
-            proveedor = Proveedor(
-                id=id,
-                nombre=data['nombre'],
-                contacto=data.get('contacto', ''),
-                telefono=data.get('telefono', ''),
-                email=data.get('email', ''),
-                direccion=data.get('direccion', '')
-            )
+            proveedor = proveedor_desde_dict(request.get_json(), id, version_if_match())
             
-            exito, mensaje = proveedor_use_cases.actualizar_proveedor(proveedor)
+            exito, mensaje, version = proveedor_use_cases.actualizar_proveedor(proveedor)
             
             if not exito:
                 return jsonify({
                     'success': False,
                     'error': mensaje or 'Error al actualizar proveedor'
-                }), 404 if mensaje and 'no encontrado' in mensaje.lower() else 400
+                }), codigo_error_actualizacion(mensaje)
             
-            return jsonify({
+            # Mismo ETag que el detalle: sirve como If-Match de la siguiente edición sin volver a leer
+            return con_etag(jsonify({
                 'success': True,
                 'message': 'Proveedor actualizado exitosamente',
                 'data': proveedor_to_dict(proveedor)
-            }), 200
+            }), etag_versionado(*version), debil=False), 200
         except Exception as e:
             return jsonify({
                 'success': False,
@@ -0,0 +1,31 @@
+"""
+Serializadores precompilados de entidades para las respuestas de la API
+Cada serializador se genera una sola vez como una función que arma el diccionario
+con un literal (sin bucles ni getattr por campo); las fechas se dejan como datetime
+y las codifica el proveedor JSON de la aplicación
+"""
+from typing import Any, Callable, Dict, Optional
+
+
+def compilar_serializador(campos: Dict[str, str],
+                          derivados: Optional[Dict[str, Callable[[Any], Any]]] = None
+                          ) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Genera un serializador a partir de {campo de la API: atributo de la entidad}
+    Los campos presentes en `derivados` se calculan llamando a la función con la entidad
+    """
+    derivados = derivados or {}
+    espacio: Dict[str, Any] = {}
+    partes = []
+    for indice, (campo, atributo) in enumerate(campos.items()):
+        if campo in derivados:
+            espacio[f'_derivado_{indice}'] = derivados[campo]
+            partes.append(f'{campo!r}: _derivado_{indice}(entidad)')
+        else:
+            if not atributo.isidentifier():
+                raise ValueError(f"Atributo no válido para serializar: {atributo!r}")
+            partes.append(f'{campo!r}: entidad.{atributo}')
+    
+    codigo = 'def serializar(entidad):\n    return {' + ', '.join(partes) + '}\n'
+    exec(compile(codigo, '<serializador>', 'exec'), espacio)
+    return espacio['serializar']
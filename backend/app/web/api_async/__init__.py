@@ -0,0 +1 @@
+# API Module (variante ASGI con Quart)
@@ -0,0 +1,158 @@
+"""
+API de categorías para la variante ASGI (Quart)
+Mismas rutas, respuestas y ETags que app.web.api.categoria_api
+"""
+from quart import Blueprint, jsonify, request
+from app.core.use_cases.categoria_use_cases_async import CategoriaUseCasesAsync
+from app.web.api.categoria_api import CAMPOS_CATEGORIA, categoria_desde_dict, serializar_categoria
+from app.web.api.etag import codigo_error_actualizacion
+from app.web.api.listados import leer_parametros_listado, campos_proyeccion, cuerpo_proyeccion, cuerpo_listado
+from app.web.api_async.peticion import calcular_etag, con_etag, etag_versionado, no_modificado, version_if_match
+
+
+def create_categoria_api_async(categoria_use_cases: CategoriaUseCasesAsync):
+    api = Blueprint('categoria_api', __name__, url_prefix='/api/categorias')
+    
+    @api.route('/', methods=['GET'])
+    async def listar():
+        """Obtiene todas las categorías (paginado por cursor con ?limit=&cursor=, campos con ?fields=)"""
+        try:
+            # Validación condicional: si el listado no cambió no se cargan filas
+            etag = calcular_etag(*await categoria_use_cases.obtener_huella_categorias())
+            respuesta_no_modificada = no_modificado(etag)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            try:
+                campos, after_id, limit = leer_parametros_listado(request.args, CAMPOS_CATEGORIA)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            if campos:
+                filas, next_cursor = await categoria_use_cases.listar_categorias_proyeccion(
+                    campos_proyeccion(campos, CAMPOS_CATEGORIA), after_id, limit
+                )
+                respuesta = cuerpo_proyeccion(filas, campos, CAMPOS_CATEGORIA, limit, next_cursor)
+            elif limit is not None:
+                categorias, next_cursor = await categoria_use_cases.listar_categorias_pagina(after_id, limit)
+                respuesta = cuerpo_listado([serializar_categoria(c) for c in categorias], limit, next_cursor)
+            else:
+                categorias = await categoria_use_cases.listar_categorias()
+                respuesta = cuerpo_listado([serializar_categoria(c) for c in categorias], None, None)
+            return con_etag(jsonify(respuesta), etag), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/<int:id>', methods=['GET'])
+    async def obtener(id):
+        """Obtiene una categoría por ID"""
+        try:
+            version = await categoria_use_cases.obtener_version_categoria(id)
+            if version is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Categoría no encontrada'
+                }), 404
+            
+            etag = etag_versionado(*version)
+            respuesta_no_modificada = no_modificado(etag, debil=False)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            categoria = await categoria_use_cases.obtener_categoria(id)
+            if not categoria:
+                return jsonify({
+                    'success': False,
+                    'error': 'Categoría no encontrada'
+                }), 404
+            
+            return con_etag(jsonify({
+                'success': True,
+                'data': serializar_categoria(categoria)
+            }), etag, debil=False), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/', methods=['POST'])
+    async def crear():
+        """Crea una nueva categoría"""
+        try:
+            categoria = categoria_desde_dict(await request.get_json())
+            
+            exito, mensaje, categoria_creada = await categoria_use_cases.crear_categoria(categoria)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 400
+            
+            return jsonify({
+                'success': True,
+                'message': 'Categoría creada exitosamente',
+                'data': serializar_categoria(categoria_creada)
+            }), 201
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>', methods=['PUT'])
+    async def actualizar(id):
+        """Actualiza una categoría existente (con If-Match, 412 si cambió desde esa versión)"""
+        try:
+            categoria = categoria_desde_dict(await request.get_json(), id, version_if_match())
+            
+            exito, mensaje, version = await categoria_use_cases.actualizar_categoria(categoria)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje or 'Error al actualizar categoría'
+                }), codigo_error_actualizacion(mensaje)
+            
+            # Mismo ETag que el detalle: sirve como If-Match de la siguiente edición sin volver a leer
+            return con_etag(jsonify({
+                'success': True,
+                'message': 'Categoría actualizada exitosamente',
+                'data': serializar_categoria(categoria)
+            }), etag_versionado(*version), debil=False), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>', methods=['DELETE'])
+    async def eliminar(id):
+        """Elimina una categoría"""
+        try:
+            exito, mensaje = await categoria_use_cases.eliminar_categoria(id)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'message': 'Categoría eliminada exitosamente'
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    return api
@@ -0,0 +1,27 @@
+"""
+API del dashboard para la variante ASGI (Quart)
+"""
+from quart import Blueprint, jsonify
+from app.core.use_cases.dashboard_use_cases_async import DashboardUseCasesAsync
+from app.web.api.dashboard_api import resumen_to_dict
+
+
+def create_dashboard_api_async(dashboard_use_cases: DashboardUseCasesAsync):
+    api = Blueprint('dashboard_api', __name__, url_prefix='/api/dashboard')
+    
+    @api.route('/resumen', methods=['GET'])
+    async def resumen():
+        """Obtiene los indicadores agregados del inventario"""
+        try:
+            resumen = await dashboard_use_cases.obtener_resumen()
+            return jsonify({
+                'success': True,
+                'data': resumen_to_dict(resumen)
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    return api
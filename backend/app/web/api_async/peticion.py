@@ -0,0 +1,31 @@
+"""
+Utilidades de ETag leídas desde la petición de Quart
+Delegan en las de app.web.api (mismos ETags que la API WSGI); los parámetros de los
+listados se leen con app.web.api.listados pasando request.args
+"""
+from typing import Optional
+from quart import Response, request
+from app.web.api import etag
+from app.web.api.etag import con_etag
+
+
+def calcular_etag(*partes) -> str:
+    """ETag a partir de una huella y la URL solicitada"""
+    return etag.calcular_etag(*partes, ruta=request.full_path)
+
+
+def etag_versionado(version: int, *partes) -> str:
+    """ETag del detalle de un recurso editable ('<versión>-<hash>')"""
+    return etag.etag_versionado(version, *partes, ruta=request.full_path)
+
+
+def version_if_match() -> Optional[int]:
+    """Versión exigida por If-Match (None sin encabezado o con '*')"""
+    return etag.version_if_match(request.if_match)
+
+
+def no_modificado(valor_etag: str, debil: bool = True):
+    """Retorna una respuesta 304 si el cliente ya tiene esta versión, o None"""
+    if request.if_none_match.contains_weak(valor_etag):
+        return con_etag(Response('', status=304), valor_etag, debil)
+    return None
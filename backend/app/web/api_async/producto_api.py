@@ -0,0 +1,199 @@
+"""
+API de productos para la variante ASGI (Quart)
+Mismas rutas, respuestas y ETags que app.web.api.producto_api; la búsqueda, las importaciones,
+las exportaciones y los lotes de movimientos solo existen en la API WSGI
+"""
+from quart import Blueprint, jsonify, request
+from app.core.use_cases.producto_use_cases_async import ProductoUseCasesAsync
+from app.web.api.producto_api import CAMPOS_PRODUCTO, producto_desde_dict, producto_to_dict
+from app.web.api.etag import codigo_error_actualizacion, codigo_error_ajuste
+from app.web.api.listados import leer_parametros_listado, campos_proyeccion, cuerpo_proyeccion, cuerpo_listado
+from app.web.api_async.peticion import calcular_etag, con_etag, etag_versionado, no_modificado, version_if_match
+
+
+def create_producto_api_async(producto_use_cases: ProductoUseCasesAsync):
+    api = Blueprint('producto_api', __name__, url_prefix='/api/productos')
+    
+    @api.route('/', methods=['GET'])
+    async def listar():
+        """Obtiene todos los productos (paginado por cursor con ?limit=&cursor=, campos con ?fields=)"""
+        try:
+            # Validación condicional: si el listado no cambió no se cargan filas
+            etag = calcular_etag(*await producto_use_cases.obtener_huella_productos())
+            respuesta_no_modificada = no_modificado(etag)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            try:
+                campos, after_id, limit = leer_parametros_listado(request.args, CAMPOS_PRODUCTO)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            if campos:
+                filas, next_cursor = await producto_use_cases.listar_productos_proyeccion(
+                    campos_proyeccion(campos, CAMPOS_PRODUCTO), after_id, limit
+                )
+                respuesta = cuerpo_proyeccion(filas, campos, CAMPOS_PRODUCTO, limit, next_cursor)
+            elif limit is not None:
+                productos, next_cursor = await producto_use_cases.listar_productos_pagina(after_id, limit)
+                respuesta = cuerpo_listado([producto_to_dict(p, incluir_relaciones=True) for p in productos], limit, next_cursor)
+            else:
+                productos = await producto_use_cases.listar_productos_con_relaciones()
+                respuesta = cuerpo_listado([producto_to_dict(p, incluir_relaciones=True) for p in productos], None, None)
+            return con_etag(jsonify(respuesta), etag), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/<int:id>', methods=['GET'])
+    async def obtener(id):
+        """Obtiene un producto por ID"""
+        try:
+            version = await producto_use_cases.obtener_version_producto(id)
+            if version is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Producto no encontrado'
+                }), 404
+            
+            etag = etag_versionado(*version)
+            respuesta_no_modificada = no_modificado(etag, debil=False)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            producto = await producto_use_cases.obtener_producto_con_relaciones(id)
+            if not producto:
+                return jsonify({
+                    'success': False,
+                    'error': 'Producto no encontrado'
+                }), 404
+            
+            return con_etag(jsonify({
+                'success': True,
+                'data': producto_to_dict(producto, incluir_relaciones=True)
+            }), etag, debil=False), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/', methods=['POST'])
+    async def crear():
+        """Crea un nuevo producto"""
+        try:
+            producto = producto_desde_dict(await request.get_json())
+            
+            exito, mensaje, producto_creado = await producto_use_cases.crear_producto(producto)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 400
+            
+            return jsonify({
+                'success': True,
+                'message': 'Producto creado exitosamente',
+                'data': producto_to_dict(producto_creado)
+            }), 201
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>', methods=['PUT'])
+    async def actualizar(id):
+        """Actualiza un producto existente (If-Match: ver app.web.api.producto_api)"""
+        try:
+            producto = producto_desde_dict(await request.get_json(), id, version_if_match())
+            
+            exito, mensaje, version = await producto_use_cases.actualizar_producto(producto)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje or 'Error al actualizar producto'
+                }), codigo_error_actualizacion(mensaje)
+            
+            # Mismo ETag que el detalle: sirve como If-Match de la siguiente edición sin volver a leer
+            return con_etag(jsonify({
+                'success': True,
+                'message': 'Producto actualizado exitosamente',
+                'data': producto_to_dict(producto)
+            }), etag_versionado(*version), debil=False), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>', methods=['DELETE'])
+    async def eliminar(id):
+        """Elimina un producto"""
+        try:
+            exito, mensaje = await producto_use_cases.eliminar_producto(id)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'message': 'Producto eliminado exitosamente'
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>/stock', methods=['POST'])
+    async def ajustar_stock(id):
+        """Ajusta el stock de un producto sumando `delta` (puede ser negativo), igual que un movimiento del lote"""
+        try:
+            data = await request.get_json()
+            cantidad = int(data['delta'])
+            
+            exito, mensaje = await producto_use_cases.ajustar_stock(id, cantidad)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), codigo_error_ajuste(mensaje)
+            
+            return jsonify({
+                'success': True,
+                'message': 'Stock ajustado exitosamente'
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/bajo-stock', methods=['GET'])
+    async def bajo_stock():
+        """Obtiene productos con stock bajo"""
+        try:
+            productos = await producto_use_cases.obtener_productos_bajo_stock()
+            return jsonify({
+                'success': True,
+                'data': [producto_to_dict(p) for p in productos]
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    return api
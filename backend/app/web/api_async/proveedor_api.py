@@ -0,0 +1,158 @@
+"""
+API de proveedores para la variante ASGI (Quart)
+Mismas rutas, respuestas y ETags que app.web.api.proveedor_api; la búsqueda solo existe en la API WSGI
+"""
+from quart import Blueprint, jsonify, request
+from app.core.use_cases.proveedor_use_cases_async import ProveedorUseCasesAsync
+from app.web.api.proveedor_api import CAMPOS_PROVEEDOR, proveedor_desde_dict, serializar_proveedor
+from app.web.api.etag import codigo_error_actualizacion
+from app.web.api.listados import leer_parametros_listado, campos_proyeccion, cuerpo_proyeccion, cuerpo_listado
+from app.web.api_async.peticion import calcular_etag, con_etag, etag_versionado, no_modificado, version_if_match
+
+
+def create_proveedor_api_async(proveedor_use_cases: ProveedorUseCasesAsync):
+    api = Blueprint('proveedor_api', __name__, url_prefix='/api/proveedores')
+    
+    @api.route('/', methods=['GET'])
+    async def listar():
+        """Obtiene todos los proveedores (paginado por cursor con ?limit=&cursor=, campos con ?fields=)"""
+        try:
+            # Validación condicional: si el listado no cambió no se cargan filas
+            etag = calcular_etag(*await proveedor_use_cases.obtener_huella_proveedores())
+            respuesta_no_modificada = no_modificado(etag)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            try:
+                campos, after_id, limit = leer_parametros_listado(request.args, CAMPOS_PROVEEDOR)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            if campos:
+                filas, next_cursor = await proveedor_use_cases.listar_proveedores_proyeccion(
+                    campos_proyeccion(campos, CAMPOS_PROVEEDOR), after_id, limit
+                )
+                respuesta = cuerpo_proyeccion(filas, campos, CAMPOS_PROVEEDOR, limit, next_cursor)
+            elif limit is not None:
+                proveedores, next_cursor = await proveedor_use_cases.listar_proveedores_pagina(after_id, limit)
+                respuesta = cuerpo_listado([serializar_proveedor(p) for p in proveedores], limit, next_cursor)
+            else:
+                proveedores = await proveedor_use_cases.listar_proveedores()
+                respuesta = cuerpo_listado([serializar_proveedor(p) for p in proveedores], None, None)
+            return con_etag(jsonify(respuesta), etag), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/<int:id>', methods=['GET'])
+    async def obtener(id):
+        """Obtiene un proveedor por ID"""
+        try:
+            version = await proveedor_use_cases.obtener_version_proveedor(id)
+            if version is None:
+                return jsonify({
+                    'success': False,
+                    'error': 'Proveedor no encontrado'
+                }), 404
+            
+            etag = etag_versionado(*version)
+            respuesta_no_modificada = no_modificado(etag, debil=False)
+            if respuesta_no_modificada:
+                return respuesta_no_modificada
+            
+            proveedor = await proveedor_use_cases.obtener_proveedor(id)
+            if not proveedor:
+                return jsonify({
+                    'success': False,
+                    'error': 'Proveedor no encontrado'
+                }), 404
+            
+            return con_etag(jsonify({
+                'success': True,
+                'data': serializar_proveedor(proveedor)
+            }), etag, debil=False), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 500
+    
+    @api.route('/', methods=['POST'])
+    async def crear():
+        """Crea un nuevo proveedor"""
+        try:
+            proveedor = proveedor_desde_dict(await request.get_json())
+            
+            exito, mensaje, proveedor_creado = await proveedor_use_cases.crear_proveedor(proveedor)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 400
+            
+            return jsonify({
+                'success': True,
+                'message': 'Proveedor creado exitosamente',
+                'data': serializar_proveedor(proveedor_creado)
+            }), 201
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>', methods=['PUT'])
+    async def actualizar(id):
+        """Actualiza un proveedor existente (con If-Match, 412 si cambió desde esa versión)"""
+        try:
+            proveedor = proveedor_desde_dict(await request.get_json(), id, version_if_match())
+            
+            exito, mensaje, version = await proveedor_use_cases.actualizar_proveedor(proveedor)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje or 'Error al actualizar proveedor'
+                }), codigo_error_actualizacion(mensaje)
+            
+            # Mismo ETag que el detalle: sirve como If-Match de la siguiente edición sin volver a leer
+            return con_etag(jsonify({
+                'success': True,
+                'message': 'Proveedor actualizado exitosamente',
+                'data': serializar_proveedor(proveedor)
+            }), etag_versionado(*version), debil=False), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    @api.route('/<int:id>', methods=['DELETE'])
+    async def eliminar(id):
+        """Elimina un proveedor"""
+        try:
+            exito, mensaje = await proveedor_use_cases.eliminar_proveedor(id)
+            
+            if not exito:
+                return jsonify({
+                    'success': False,
+                    'error': mensaje
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'message': 'Proveedor eliminado exitosamente'
+            }), 200
+        except Exception as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+    
+    return api
@@ -0,0 +1,139 @@
+"""
+Detector de N+1 y consultas lentas (desarrollo, staging y pruebas)
+Por petición agrupa las sentencias SQL por su forma normalizada (sin literales ni
+parámetros) y al terminar reporta las formas que se repiten más de N veces y las
+sentencias que superan el umbral de tiempo, con el endpoint y un extracto de la pila
+
+En modo de pruebas (app.testing) el reporte se lanza como ConsultasSospechosasError,
+de modo que cualquier petición del cliente de pruebas falla si introduce un N+1
+"""
+import os
+import re
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Solo se muestran en la pila los marcos del código de la aplicación
+_DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_NORMALIZACIONES = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                      # cadenas
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                   # números
+    (re.compile(r'%\(\w+\)s|%s|(?<!:):\w+'), '?'),             # parámetros (format, pyformat, named)
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'),       # listas IN y tuplas de VALUES
+    (re.compile(r'\s+'), ' '),
+]
+
+
+class ConsultasSospechosasError(Exception):
+    """Se lanza en modo de pruebas cuando una petición tiene N+1 o consultas lentas"""
+
+
+@dataclass(slots=True)
+class RegistroConsultas:
+    """Sentencias de la petición en curso (se guarda en flask.g)"""
+    repeticiones: Dict[str, int] = field(default_factory=dict)
+    origenes: Dict[str, str] = field(default_factory=dict)
+    lentas: List[Tuple[str, float, str]] = field(default_factory=list)
+
+
+def normalizar_sql(sentencia: str) -> str:
+    """Forma de la sentencia: sin literales ni parámetros y con listas IN colapsadas"""
+    for patron, reemplazo in _NORMALIZACIONES:
+        sentencia = patron.sub(reemplazo, sentencia)
+    return sentencia.strip()
+
+
+def _extracto_pila(marcos: int = 6) -> str:
+    """Últimos marcos de la pila que pertenecen a la aplicación (sin el propio detector)"""
+    propios = [
+        marco for marco in traceback.extract_stack()
+        if marco.filename.startswith(_DIRECTORIO_APP) and marco.filename != __file__
+    ]
+    return ''.join(traceback.format_list(propios[-marcos:])).rstrip()
+
+
+def _acortar(sentencia: str, largo: int = 300) -> str:
+    return sentencia if len(sentencia) <= largo else sentencia[:largo] + '...'
+
+
+def _sangrar(texto: str, espacios: int) -> str:
+    return '\n'.join(' ' * espacios + linea for linea in texto.splitlines())
+
+
+def instalar_detector_consultas(app: Flask, *engines: Engine):
+    """
+    Activa el detector en la aplicación
+    DETECTOR_CONSULTAS_MAX_REPETICIONES: repeticiones permitidas de una misma forma
+    DETECTOR_CONSULTAS_UMBRAL_MS: duración a partir de la cual una sentencia es lenta
+    Los executemany no cuentan como repeticiones (son lotes a propósito)
+    Se observan todos los engines recibidos (primaria y réplica de lectura si la hay)
+    """
+    max_repeticiones = app.config['DETECTOR_CONSULTAS_MAX_REPETICIONES']
+    umbral = app.config['DETECTOR_CONSULTAS_UMBRAL_MS'] / 1000
+    
+    def instrumentar(engine: Engine):
+        @event.listens_for(engine, 'before_cursor_execute')
+        def antes_de_consulta(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('inicio_detector', []).append(time.perf_counter())
+        
+        @event.listens_for(engine, 'after_cursor_execute')
+        def despues_de_consulta(conn, cursor, statement, parameters, context, executemany):
+            duracion = time.perf_counter() - conn.info['inicio_detector'].pop()
+            if not has_request_context():
+                return
+            registro = g.get('registro_consultas')
+            if registro is None:
+                return
+            
+            if duracion > umbral:
+                registro.lentas.append((statement, duracion, _extracto_pila()))
+            if executemany:
+                return
+            forma = normalizar_sql(statement)
+            cantidad = registro.repeticiones.get(forma, 0) + 1
+            registro.repeticiones[forma] = cantidad
+            # La pila se captura una sola vez, cuando la forma pasa el límite
+            if cantidad == max_repeticiones + 1:
+                registro.origenes[forma] = _extracto_pila()
+    
+    for engine in engines:
+        instrumentar(engine)
+    
+    @app.before_request
+    def iniciar_registro():
+        g.registro_consultas = RegistroConsultas()
+    
+    @app.after_request
+    def revisar_registro(response):
+        registro = g.pop('registro_consultas', None)
+        if registro is None or (not registro.origenes and not registro.lentas):
+            return response
+        
+        hallazgos = []
+        for forma, origen in registro.origenes.items():
+            hallazgos.append(
+                f'  - Posible N+1: la misma consulta se ejecutó {registro.repeticiones[forma]} veces '
+                f'(máximo {max_repeticiones})\n'
+                f'{_sangrar(_acortar(forma), 6)}\n'
+                f'    Origen:\n{_sangrar(origen, 4)}'
+            )
+        for sentencia, duracion, origen in registro.lentas:
+            hallazgos.append(
+                f'  - Consulta lenta: {duracion * 1000:.1f} ms (umbral {umbral * 1000:g} ms)\n'
+                f'{_sangrar(_acortar(normalizar_sql(sentencia)), 6)}\n'
+                f'    Origen:\n{_sangrar(origen, 4)}'
+            )
+        reporte = (
+            f'Consultas sospechosas en {request.method} {request.path} '
+            f'(endpoint {request.endpoint}):\n' + '\n'.join(hallazgos)
+        )
+        
+        if app.testing:
+            raise ConsultasSospechosasError(reporte)
+        app.logger.warning(reporte)
+        return response
@@ -0,0 +1,64 @@
+"""
+Proveedor JSON de la aplicación
+Usa orjson si está instalado (serializa dataclasses y datetime en C, directo a bytes)
+y si no la biblioteca estándar con el mismo formato de salida
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _valor_por_defecto(objeto):
+    """Convierte los tipos que el codificador no soporta de forma nativa"""
+    if isinstance(objeto, (datetime, date)):
+        return objeto.isoformat()
+    if isinstance(objeto, Decimal):
+        return float(objeto)
+    if dataclasses.is_dataclass(objeto) and not isinstance(objeto, type):
+        return dataclasses.asdict(objeto)
+    raise TypeError(f"El objeto de tipo {type(objeto).__name__} no es serializable a JSON")
+
+
+class ProveedorJSONRapido(DefaultJSONProvider):
+    """
+    Proveedor JSON para Flask (app.json)
+    Las fechas se emiten en ISO 8601 y las claves conservan el orden de inserción
+    """
+    sort_keys = False
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """Serializa a str; con argumentos propios de json.dumps se usa la biblioteca estándar"""
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=_valor_por_defecto).decode('utf-8')
+        kwargs.setdefault('default', _valor_por_defecto)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        """Deserializa JSON (str o bytes)"""
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """Arma la respuesta de jsonify sin pasar por str cuando hay orjson"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = self.compact is False or (self.compact is None and self._app.debug)
+        
+        if orjson is not None:
+            opciones = orjson.OPT_INDENT_2 if indentar else 0
+            cuerpo = orjson.dumps(obj, default=_valor_por_defecto, option=opciones)
+        elif indentar:
+            cuerpo = self.dumps(obj, indent=2) + '\n'
+        else:
+            cuerpo = self.dumps(obj, separators=(',', ':'))
+        
+        return self._app.response_class(cuerpo, mimetype=self.mimetype)
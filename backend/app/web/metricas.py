@@ -0,0 +1,159 @@
+"""
+Métricas de la aplicación en formato Prometheus
+Por petición se registra la latencia por endpoint, la cantidad de sentencias SQL,
+el tiempo en SQL y la espera por una conexión del pool; los mismos valores se
+envían al cliente en el encabezado Server-Timing. También se cuentan los aciertos y
+fallos de las cachés de repositorios
+
+Con gunicorn las métricas se agregan entre workers con el modo multiproceso de
+prometheus_client (variable PROMETHEUS_MULTIPROC_DIR, ver gunicorn.conf.py)
+"""
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.data.cache import CacheLRU
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+    from prometheus_client import multiprocess
+except ImportError:
+    Histogram = None
+
+BUCKETS_SEGUNDOS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+BUCKETS_CONSULTAS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+BUCKETS_ESPERA_POOL = (.0001, .0005, .001, .005, .01, .05, .1, .5, 1, 5, 30)
+
+if Histogram is not None:
+    LATENCIA = Histogram(
+        'inventario_http_peticion_segundos', 'Latencia de las peticiones HTTP por endpoint',
+        ['metodo', 'endpoint', 'estado'], buckets=BUCKETS_SEGUNDOS
+    )
+    CONSULTAS_POR_PETICION = Histogram(
+        'inventario_sql_consultas_por_peticion', 'Sentencias SQL ejecutadas por petición',
+        ['metodo', 'endpoint'], buckets=BUCKETS_CONSULTAS
+    )
+    TIEMPO_SQL_POR_PETICION = Histogram(
+        'inventario_sql_segundos_por_peticion', 'Tiempo total en SQL por petición',
+        ['metodo', 'endpoint'], buckets=BUCKETS_SEGUNDOS
+    )
+    ESPERA_POOL = Histogram(
+        'inventario_pool_espera_segundos', 'Espera para obtener una conexión del pool (incluye pre-ping)',
+        buckets=BUCKETS_ESPERA_POOL
+    )
+    CONSULTAS_CACHE = Counter(
+        'inventario_cache_consultas', 'Lecturas de las cachés de repositorios por resultado',
+        ['cache', 'resultado']
+    )
+
+
+@dataclass(slots=True)
+class MedicionPeticion:
+    """Acumulados de la petición en curso (se guarda en flask.g)"""
+    inicio: float
+    consultas: int = 0
+    tiempo_sql: float = 0.0
+    espera_pool: float = 0.0
+
+
+def _medicion_actual():
+    """Medición de la petición en curso, o None fuera de una petición (hilos de fondo, scripts)"""
+    if has_request_context():
+        return g.get('medicion_metricas')
+    return None
+
+
+def _instrumentar_engine(engine: Engine):
+    """Registra los eventos de cursor y mide la espera del pool en el engine"""
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def antes_de_consulta(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('inicio_consultas', []).append(time.perf_counter())
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def despues_de_consulta(conn, cursor, statement, parameters, context, executemany):
+        duracion = time.perf_counter() - conn.info['inicio_consultas'].pop()
+        medicion = _medicion_actual()
+        if medicion is not None:
+            medicion.consultas += 1
+            medicion.tiempo_sql += duracion
+    
+    # SQLAlchemy no tiene un evento previo al checkout del pool: se envuelve raw_connection,
+    # que es por donde toda Connection (y por lo tanto la sesión) obtiene su conexión
+    raw_connection = engine.raw_connection
+    
+    def raw_connection_medida():
+        inicio = time.perf_counter()
+        conexion = raw_connection()
+        espera = time.perf_counter() - inicio
+        if Histogram is not None:
+            ESPERA_POOL.observe(espera)
+        medicion = _medicion_actual()
+        if medicion is not None:
+            medicion.espera_pool += espera
+        return conexion
+    
+    engine.raw_connection = raw_connection_medida
+
+
+def _observar_cache(cache: CacheLRU, nombre: str):
+    """Cuenta los aciertos y fallos de la caché en el contador de Prometheus"""
+    acierto = CONSULTAS_CACHE.labels(nombre, 'acierto')
+    fallo = CONSULTAS_CACHE.labels(nombre, 'fallo')
+    cache.observador = lambda es_acierto: (acierto if es_acierto else fallo).inc()
+
+
+def _registro_metricas():
+    """Registro a exponer: con gunicorn combina los archivos de todos los workers"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+        return registro
+    return REGISTRY
+
+
+def instalar_metricas(app: Flask, *engines: Engine, caches: Optional[Dict[str, CacheLRU]] = None):
+    """
+    Instrumenta la aplicación: hooks de Flask, eventos de SQLAlchemy y la ruta /metrics
+    Se miden todos los engines recibidos (primaria y réplica de lectura si la hay) y
+    las cachés recibidas por nombre
+    Sin prometheus_client instalado solo se agrega el encabezado Server-Timing
+    """
+    for engine in engines:
+        _instrumentar_engine(engine)
+    if Histogram is not None:
+        for nombre, cache in (caches or {}).items():
+            _observar_cache(cache, nombre)
+    
+    @app.before_request
+    def iniciar_medicion():
+        g.medicion_metricas = MedicionPeticion(inicio=time.perf_counter())
+    
+    @app.after_request
+    def registrar_medicion(response):
+        medicion = g.pop('medicion_metricas', None)
+        if medicion is None:
+            return response
+        # En respuestas en streaming (exportaciones) se mide hasta el envío de los encabezados
+        duracion = time.perf_counter() - medicion.inicio
+        
+        response.headers.add('Server-Timing', (
+            f'app;dur={duracion * 1000:.2f}, '
+            f'sql;dur={medicion.tiempo_sql * 1000:.2f};desc="{medicion.consultas} consultas", '
+            f'pool;dur={medicion.espera_pool * 1000:.2f}'
+        ))
+        
+        if Histogram is not None:
+            endpoint = request.url_rule.rule if request.url_rule else 'sin_ruta'
+            LATENCIA.labels(request.method, endpoint, str(response.status_code)).observe(duracion)
+            CONSULTAS_POR_PETICION.labels(request.method, endpoint).observe(medicion.consultas)
+            TIEMPO_SQL_POR_PETICION.labels(request.method, endpoint).observe(medicion.tiempo_sql)
+        return response
+    
+    if Histogram is not None:
+        @app.route('/metrics')
+        def metricas():
+            return Response(generate_latest(_registro_metricas()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,24 @@
+"""
+Punto de entrada ASGI: variante asyncio de la API (Quart + SQLAlchemy asyncio)
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT --workers 2
+
+Usa la misma configuración que run.py (FLASK_ENV, DATABASE_URL, ...) con API_MODO=async;
+el driver de la base de datos se traduce a aiomysql / aiosqlite. Las opciones que solo
+implementa la variante WSGI se desactivan por defecto; si el entorno activa alguna,
+create_app lanza RuntimeError al arrancar
+"""
+import os
+
+# Deben fijarse antes de importar la configuración
+os.environ['API_MODO'] = 'async'
+for opcion, valor in (
+    ('BUSQUEDA_BACKEND', 'ninguno'),
+    ('OPERACIONES_LOTE_HABILITADAS', 'false'),
+    ('METRICAS_HABILITADAS', 'false'),
+    ('DETECTOR_CONSULTAS', 'false'),
+    ('CACHE_REPOSITORIOS_MAX_ENTRADAS', '0')
+):
+    os.environ.setdefault(opcion, valor)
+
+from run import app  # noqa: E402,F401
@@ -0,0 +1,3 @@
+"""
+Benchmarks del backend (se ejecutan desde backend/ con python -m benchmarks.<nombre>)
+"""
@@ -0,0 +1,118 @@
+"""
+Benchmark de arranque de gunicorn: tiempo hasta la primera petición y por worker
+
+Compara dos modos sobre la misma base de datos:
+- antes:   sin preload; cada worker importa todas las capas, ejecuta create_app y
+           las migraciones del esquema (create_all + reflexión) al iniciar
+- despues: preload_app en el maestro, migraciones como paso previo (migrar.py) y
+           los workers solo heredan la aplicación tras el fork
+
+El tiempo por worker (fork -> listo) sale del log 'listo en' de gunicorn.conf.py
+
+Uso (desde backend/):
+    python -m benchmarks.arranque [--workers 4] [--repeticiones 3] [--database-url URL]
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+DIRECTORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATRON_LISTO = re.compile(r'Worker (\d+) listo en ([\d.]+) ms')
+
+MODOS = {
+    'antes': {'GUNICORN_PRELOAD': 'false', 'MIGRAR_AL_INICIAR': 'true'},
+    'despues': {'GUNICORN_PRELOAD': 'true', 'MIGRAR_AL_INICIAR': 'false'},
+}
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _entorno(modo: str, database_url: str) -> dict:
+    return dict(os.environ, FLASK_ENV='production', DATABASE_URL=database_url, **MODOS[modo])
+
+
+def medir(modo: str, workers: int, database_url: str, limite: float = 120) -> dict:
+    """Levanta gunicorn y mide hasta que responde y todos los workers están listos"""
+    puerto = _puerto_libre()
+    listos = []
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'run:app', '-w', str(workers), '--bind', f'127.0.0.1:{puerto}'],
+        cwd=DIRECTORIO_BACKEND, env=_entorno(modo, database_url),
+        stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True
+    )
+    
+    def leer_log():
+        for linea in proceso.stderr:
+            coincidencia = PATRON_LISTO.search(linea)
+            if coincidencia:
+                listos.append(float(coincidencia.group(2)))
+    
+    lector = threading.Thread(target=leer_log, daemon=True)
+    lector.start()
+    
+    primera_peticion = None
+    try:
+        while time.perf_counter() - inicio < limite:
+            if primera_peticion is None:
+                try:
+                    with urllib.request.urlopen(f'http://127.0.0.1:{puerto}/', timeout=1) as respuesta:
+                        if respuesta.status == 200:
+                            primera_peticion = time.perf_counter() - inicio
+                except OSError:
+                    pass
+            if primera_peticion is not None and len(listos) >= workers:
+                break
+            if proceso.poll() is not None:
+                raise RuntimeError(f'gunicorn terminó con código {proceso.returncode} en el modo {modo}')
+            time.sleep(0.01)
+        else:
+            raise RuntimeError(f'gunicorn no quedó listo en {limite} s en el modo {modo}')
+    finally:
+        proceso.terminate()
+        proceso.wait()
+    
+    return {'primera_peticion': primera_peticion, 'workers': list(listos)}
+
+
+def preparar_base(database_url: str):
+    """Aplica las migraciones una vez (lo que hace el paso de despliegue)"""
+    subprocess.run([sys.executable, 'migrar.py'], cwd=DIRECTORIO_BACKEND, check=True,
+                   env=_entorno('despues', database_url), stdout=subprocess.DEVNULL)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tiempo de arranque de gunicorn antes/después de preload')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--database-url', help='Base a usar (por defecto una SQLite temporal)')
+    args = parser.parse_args()
+    
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='arranque_'), 'arranque.db')}"
+    preparar_base(database_url)
+    
+    for modo in MODOS:
+        primeras, por_worker = [], []
+        for _ in range(args.repeticiones):
+            resultado = medir(modo, args.workers, database_url)
+            primeras.append(resultado['primera_peticion'])
+            por_worker.extend(resultado['workers'])
+        print(f'{modo:<8} primera petición {statistics.median(primeras) * 1000:8.1f} ms   '
+              f'worker listo: mediana {statistics.median(por_worker):8.1f} ms, '
+              f'máximo {max(por_worker):8.1f} ms  ({args.workers} workers x {args.repeticiones})')
+
+
+if __name__ == '__main__':
+    main()
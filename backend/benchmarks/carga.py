@@ -0,0 +1,209 @@
+"""
+Prueba de carga: rendimiento con peticiones concurrentes de la API WSGI (Flask + gunicorn,
+workers sync) frente a la ASGI (Quart + uvicorn + SQLAlchemy asyncio)
+
+Ambas variantes se levantan con el mismo número de procesos sobre la misma base SQLite
+(catálogo sintético de init_db.py). Para cada nivel de concurrencia se mantienen N clientes
+haciendo peticiones durante un tiempo fijo y se reportan peticiones por segundo y latencias
+
+Con SQLite local la base responde en microsegundos y el cuello de botella es la CPU; la
+diferencia entre modelos aparece cuando la petición espera E/S. --latencia-bd simula la
+espera de red por sentencia (ver benchmarks/servidor_carga.py); también se puede apuntar
+a una base real con --database-url
+
+Uso (desde backend/):
+    python -m benchmarks.carga                                  # 10.000 productos, 2 procesos
+    python -m benchmarks.carga --latencia-bd 5 --concurrencia 1,16,64
+    python -m benchmarks.carga --salida resultados_carga.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+DIRECTORIO_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Variante -> comando del servidor (mismo número de procesos en ambas)
+SERVIDORES = {
+    'wsgi': lambda puerto, procesos: [
+        sys.executable, '-m', 'gunicorn', 'benchmarks.servidor_carga:app',
+        '-w', str(procesos), '--bind', f'127.0.0.1:{puerto}', '--log-level', 'warning'
+    ],
+    'asgi': lambda puerto, procesos: [
+        sys.executable, '-m', 'uvicorn', 'benchmarks.servidor_carga:app',
+        '--workers', str(procesos), '--host', '127.0.0.1', '--port', str(puerto),
+        '--log-level', 'warning', '--no-access-log'
+    ],
+}
+
+# Rutas por defecto ({id} se reemplaza por un producto aleatorio del catálogo)
+RUTAS_POR_DEFECTO = ['/api/productos/{id}', '/api/productos/?limit=20&cursor={id}']
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def preparar_base(database_url: Optional[str], productos: int, directorio: str) -> str:
+    """Crea y puebla una base SQLite temporal (o usa --database-url tal cual)"""
+    if database_url:
+        return database_url
+    database_url = f"sqlite:///{os.path.join(directorio, 'carga.db')}"
+    # run.py crea una aplicación al importarse: se apunta a la base temporal antes de importarlo
+    os.environ['DATABASE_URL'] = database_url
+    from run import create_app
+    from init_db import generar_catalogo
+    from app.data.database import db
+    app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': database_url, 'DETECTOR_CONSULTAS': False})
+    with app.app_context():
+        generar_catalogo(productos, categorias=10, proveedores=10)
+        db.engine.dispose()
+    return database_url
+
+
+def levantar(variante: str, procesos: int, database_url: str, latencia_ms: float):
+    """Inicia el servidor y espera a que responda; retorna (proceso, puerto)"""
+    puerto = _puerto_libre()
+    entorno = dict(
+        os.environ, FLASK_ENV='production', DATABASE_URL=database_url, MIGRAR_AL_INICIAR='false',
+        METRICAS_HABILITADAS='false', DETECTOR_CONSULTAS='false', CARGA_LATENCIA_MS=str(latencia_ms),
+        API_MODO='async' if variante == 'asgi' else 'sync'
+    )
+    proceso = subprocess.Popen(
+        SERVIDORES[variante](puerto, procesos), cwd=DIRECTORIO_BACKEND, env=entorno,
+        stdout=subprocess.DEVNULL, start_new_session=True
+    )
+    limite = time.perf_counter() + 60
+    while time.perf_counter() < limite:
+        if proceso.poll() is not None:
+            raise RuntimeError(f'El servidor {variante} terminó con código {proceso.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{puerto}/', timeout=1):
+                return proceso, puerto
+        except OSError:
+            time.sleep(0.1)
+    detener(proceso)
+    raise RuntimeError(f'El servidor {variante} no respondió a tiempo')
+
+
+def detener(proceso):
+    """Termina el servidor y sus workers"""
+    try:
+        os.killpg(proceso.pid, signal.SIGTERM)
+        proceso.wait(timeout=15)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(proceso.pid, signal.SIGKILL)
+
+
+async def _peticion(puerto: int, ruta: str) -> int:
+    """GET con una conexión nueva (Connection: close, igual para ambos servidores); retorna el estado"""
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    try:
+        escritor.write(f'GET {ruta} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n'.encode())
+        await escritor.drain()
+        respuesta = await lector.read()
+        return int(respuesta.split(b' ', 2)[1])
+    finally:
+        escritor.close()
+
+
+async def _carga(puerto: int, concurrencia: int, duracion: float, rutas: List[str], productos: int) -> dict:
+    """Mantiene `concurrencia` clientes haciendo peticiones durante `duracion` segundos"""
+    latencias: List[float] = []
+    errores = 0
+    fin = time.perf_counter() + duracion
+    
+    async def cliente(semilla: int):
+        nonlocal errores
+        aleatorio = random.Random(semilla)
+        while time.perf_counter() < fin:
+            ruta = aleatorio.choice(rutas).format(id=aleatorio.randint(1, productos))
+            inicio = time.perf_counter()
+            try:
+                estado = await _peticion(puerto, ruta)
+            except OSError:
+                estado = None
+            if estado == 200:
+                latencias.append(time.perf_counter() - inicio)
+            else:
+                errores += 1
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(i) for i in range(concurrencia)))
+    transcurrido = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        'peticiones': len(latencias),
+        'errores': errores,
+        'peticiones_por_segundo': len(latencias) / transcurrido,
+        'latencia_p50_ms': statistics.median(latencias) * 1000 if latencias else None,
+        'latencia_p95_ms': latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else None
+    }
+
+
+def ejecutar(variantes: List[str], concurrencias: List[int], procesos: int, duracion: float,
+             rutas: List[str], productos: int, database_url: str, latencia_ms: float) -> Dict[str, dict]:
+    """Levanta cada variante y la somete a cada nivel de concurrencia"""
+    resultados = {}
+    for variante in variantes:
+        proceso, puerto = levantar(variante, procesos, database_url, latencia_ms)
+        try:
+            # Calentamiento: conexiones del pool y cachés de compilación de SQLAlchemy
+            asyncio.run(_carga(puerto, max(concurrencias), 1, rutas, productos))
+            for concurrencia in concurrencias:
+                medicion = asyncio.run(_carga(puerto, concurrencia, duracion, rutas, productos))
+                resultados[f'{variante}@{concurrencia}'] = dict(variante=variante, concurrencia=concurrencia, **medicion)
+                print(f'  {variante:<5} c={concurrencia:<4} {medicion["peticiones_por_segundo"]:9.1f} req/s  '
+                      f'p50 {medicion["latencia_p50_ms"] or 0:8.1f} ms  p95 {medicion["latencia_p95_ms"] or 0:8.1f} ms  '
+                      f'errores {medicion["errores"]}')
+        finally:
+            detener(proceso)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prueba de carga WSGI (gunicorn) vs ASGI (uvicorn)')
+    parser.add_argument('--variantes', default='wsgi,asgi')
+    parser.add_argument('--concurrencia', default='1,8,32,64', help='Clientes simultáneos separados por coma')
+    parser.add_argument('--procesos', type=int, default=2, help='Workers de gunicorn / procesos de uvicorn')
+    parser.add_argument('--duracion', type=float, default=10, help='Segundos por nivel de concurrencia')
+    parser.add_argument('--productos', type=int, default=10_000, help='Tamaño del catálogo sintético')
+    parser.add_argument('--rutas', default=','.join(RUTAS_POR_DEFECTO), help='Rutas GET separadas por coma')
+    parser.add_argument('--latencia-bd', type=float, default=0, help='Espera simulada por sentencia SQL (ms, solo SQLite)')
+    parser.add_argument('--database-url', help='Base ya poblada (por defecto una SQLite temporal)')
+    parser.add_argument('--salida', help='Guarda los resultados en JSON')
+    args = parser.parse_args()
+    
+    directorio = tempfile.mkdtemp(prefix='carga_')
+    try:
+        database_url = preparar_base(args.database_url, args.productos, directorio)
+        print(f'{args.procesos} procesos, {args.duracion:g} s por nivel, latencia simulada {args.latencia_bd:g} ms')
+        resultados = ejecutar(
+            [v for v in args.variantes.split(',') if v], [int(c) for c in args.concurrencia.split(',') if c],
+            args.procesos, args.duracion, [r for r in args.rutas.split(',') if r], args.productos,
+            database_url, args.latencia_bd
+        )
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'parametros': vars(args), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f'\nResultados guardados en {args.salida}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+Casos de la suite de benchmarks
+
+Cada caso recibe el contexto (aplicación, cliente de pruebas y datos del catálogo)
+y retorna la operación a cronometrar junto con cuántas veces ejecutarla por ronda
+"""
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple
+from flask import Flask
+from app.core.entities.producto import Producto
+from app.data.repositories.producto_repository import ProductoRepository
+from app.data.unit_of_work import SQLAlchemyUnitOfWork
+from app.web.api.producto_api import serializar_producto_con_relaciones
+from benchmarks.importacion import como_csv
+
+# Filas del archivo del caso http.importar_csv
+FILAS_IMPORTACION = 1000
+
+# Movimientos de los casos http.ajustes_lote_* (sincronización de un día de terminales POS)
+MOVIMIENTOS_LOTE = 10000
+
+
+@dataclass
+class Contexto:
+    """Estado compartido por los casos para un tamaño de catálogo"""
+    app: Flask
+    tamano: int
+    semilla: int = 42
+    ids_creados: List[int] = field(default_factory=list)
+    
+    def __post_init__(self):
+        self.cliente = self.app.test_client()
+        self.repositorio = ProductoRepository()
+        self.unit_of_work = SQLAlchemyUnitOfWork()
+        self.aleatorio = random.Random(self.semilla)
+    
+    def id_aleatorio(self) -> int:
+        """ID de un producto existente del catálogo inicial (IDs 1..tamano)"""
+        return self.aleatorio.randint(1, self.tamano)
+
+
+def nuevo_producto(ctx: Contexto) -> Producto:
+    """Producto válido para las operaciones de escritura"""
+    return Producto(
+        nombre=f'Producto benchmark {ctx.aleatorio.randint(1, 10**9)}',
+        descripcion='Creado por la suite de benchmarks',
+        precio=19.9,
+        cantidad_stock=ctx.aleatorio.randint(0, 100),
+        stock_minimo=10,
+        categoria_id=1,
+        proveedor_id=1
+    )
+
+
+def producto_json(ctx: Contexto) -> dict:
+    """Cuerpo JSON de la API para crear o actualizar un producto"""
+    producto = nuevo_producto(ctx)
+    return {
+        'nombre': producto.nombre,
+        'descripcion': producto.descripcion,
+        'precio': producto.precio,
+        'stock': producto.cantidad_stock,
+        'stock_minimo': producto.stock_minimo,
+        'categoria_id': producto.categoria_id,
+        'proveedor_id': producto.proveedor_id
+    }
+
+
+# --- Repositorio (CRUD) ---
+
+def repositorio_crear(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        with ctx.unit_of_work:
+            ctx.ids_creados.append(ctx.repositorio.crear(nuevo_producto(ctx)).id)
+    return operacion, 200
+
+
+def repositorio_obtener_por_id(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        ctx.repositorio.obtener_por_id_con_relaciones(ctx.id_aleatorio())
+    return operacion, 1000
+
+
+def repositorio_actualizar(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        producto = nuevo_producto(ctx)
+        producto.id = ctx.id_aleatorio()
+        with ctx.unit_of_work:
+            ctx.repositorio.actualizar(producto)
+    return operacion, 200
+
+
+def repositorio_eliminar(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    # Elimina los productos agregados por repositorio.crear (y los repone si se agotan)
+    def operacion():
+        if not ctx.ids_creados:
+            with ctx.unit_of_work:
+                ctx.ids_creados.append(ctx.repositorio.crear(nuevo_producto(ctx)).id)
+        with ctx.unit_of_work:
+            ctx.repositorio.eliminar(ctx.ids_creados.pop())
+    return operacion, 100
+
+
+# --- Lecturas ---
+
+def listado_hidratacion(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        ctx.repositorio.obtener_todos_con_relaciones()
+    return operacion, 1
+
+
+def listado_pagina(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        ctx.repositorio.obtener_pagina(ctx.id_aleatorio(), 100)
+    return operacion, 200
+
+
+def consulta_bajo_stock(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        ctx.repositorio.obtener_productos_bajo_stock()
+    return operacion, 5
+
+
+# --- Serialización ---
+
+def serializacion_listado(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    productos = ctx.repositorio.obtener_todos_con_relaciones()
+    
+    def operacion():
+        ctx.app.json.dumps({
+            'success': True,
+            'data': [serializar_producto_con_relaciones(p) for p in productos]
+        })
+    return operacion, 1
+
+
+# --- Peticiones HTTP completas (cliente de pruebas de Flask) ---
+
+def http_get(ruta: str, iteraciones: int):
+    def caso(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+        def operacion():
+            respuesta = ctx.cliente.get(ruta.format(id=ctx.id_aleatorio()))
+            assert respuesta.status_code == 200, respuesta.status_code
+        return operacion, iteraciones
+    return caso
+
+
+def http_crear(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        respuesta = ctx.cliente.post('/api/productos/', json=producto_json(ctx))
+        assert respuesta.status_code == 201, respuesta.status_code
+    return operacion, 100
+
+
+def http_actualizar(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    def operacion():
+        respuesta = ctx.cliente.put(f'/api/productos/{ctx.id_aleatorio()}', json=producto_json(ctx))
+        assert respuesta.status_code == 200, respuesta.status_code
+    return operacion, 100
+
+
+def http_importar_csv(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+    # Un archivo de FILAS_IMPORTACION filas por operación: filas/s = op/s x FILAS_IMPORTACION
+    cuerpo = como_csv([producto_json(ctx) for _ in range(FILAS_IMPORTACION)])
+    
+    def operacion():
+        respuesta = ctx.cliente.post('/api/productos/importar', data=cuerpo, content_type='text/csv')
+        assert respuesta.get_json()['data']['insertadas'] == FILAS_IMPORTACION, respuesta.get_json()
+    return operacion, 1
+
+
+def http_ajustes_lote(formato: str):
+    # Un lote de MOVIMIENTOS_LOTE ingresos por operación (nunca dejan el stock negativo)
+    def caso(ctx: Contexto) -> Tuple[Callable[[], None], int]:
+        movimientos = [
+            {'producto_id': ctx.id_aleatorio(), 'delta': ctx.aleatorio.randint(1, 5)}
+            for _ in range(MOVIMIENTOS_LOTE)
+        ]
+        if formato == 'ndjson':
+            cuerpo = ''.join(json.dumps(m) + '\n' for m in movimientos)
+            tipo = 'application/x-ndjson'
+        else:
+            cuerpo, tipo = json.dumps(movimientos), 'application/json'
+        
+        def operacion():
+            respuesta = ctx.cliente.post('/api/productos/ajustes/lote', data=cuerpo, content_type=tipo)
+            assert respuesta.get_json()['data']['aplicados'] == MOVIMIENTOS_LOTE, respuesta.get_json()
+        return operacion, 1
+    return caso
+
+
+# Nombre del caso -> función que lo prepara (el orden importa: crear antes que eliminar)
+CASOS = {
+    'repositorio.crear': repositorio_crear,
+    'repositorio.obtener_por_id': repositorio_obtener_por_id,
+    'repositorio.actualizar': repositorio_actualizar,
+    'repositorio.eliminar': repositorio_eliminar,
+    'listado.hidratacion': listado_hidratacion,
+    'listado.pagina': listado_pagina,
+    'consulta.bajo_stock': consulta_bajo_stock,
+    'serializacion.listado': serializacion_listado,
+    'http.listar_pagina': http_get('/api/productos/?limit=100', 100),
+    'http.listar_campos': http_get('/api/productos/?limit=100&fields=id,nombre,precio,stock', 100),
+    'http.listar_completo': http_get('/api/productos/', 1),
+    'http.detalle': http_get('/api/productos/{id}', 300),
+    'http.bajo_stock': http_get('/api/productos/bajo-stock', 5),
+    'http.dashboard': http_get('/api/dashboard/resumen', 50),
+    'http.crear': http_crear,
+    'http.actualizar': http_actualizar,
+    'http.importar_csv': http_importar_csv,
+    'http.ajustes_lote_json': http_ajustes_lote('json'),
+    'http.ajustes_lote_ndjson': http_ajustes_lote('ndjson'),
+}
@@ -0,0 +1,165 @@
+"""
+Benchmark de ediciones concurrentes por HTTP: PUT sin condición (gana la última
+escritura) frente a PUT con If-Match (control de concurrencia optimista)
+
+N hilos repiten lectura-modificación-escritura sobre unos pocos productos "calientes":
+GET /api/productos/<id>, pausa de edición (--pausa), PUT con el stock leído + 1. Con
+If-Match un 412 indica que otro hilo escribió en medio y el ciclo vuelve a empezar
+con una lectura nueva. Al final el stock de cada producto debe ser el inicial más los
+PUT aceptados; la diferencia son actualizaciones perdidas (solo posibles sin If-Match)
+
+Entre la lectura y la escritura no se mantiene ningún bloqueo: la versión se compara
+en el mismo UPDATE ... WHERE id = :id AND version = :v, por lo que la latencia del PUT
+no crece con la pausa de edición de los demás hilos (con SELECT ... FOR UPDATE
+cada editor esperaría a que terminen los anteriores)
+
+Uso (desde backend/):
+    python -m benchmarks.edicion_concurrente                                    # SQLite temporal
+    python -m benchmarks.edicion_concurrente --database-url postgresql+psycopg2://... --hilos 1,8,32
+    python -m benchmarks.edicion_concurrente --pausa 20 --calientes 1 --salida edicion.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from benchmarks.stock_concurrente import STOCK_INICIAL, crear_app, preparar_datos
+
+MODOS = ['sin_condicion', 'if_match']
+
+# Campos que el PUT reenvía tal como se leyeron
+CAMPOS_PUT = ('nombre', 'descripcion', 'precio', 'stock_minimo', 'categoria_id', 'proveedor_id')
+
+
+def medir(app, modo: str, hilos: int, duracion: float, calientes: int, pausa_ms: float) -> dict:
+    """Mantiene `hilos` editores concurrentes durante `duracion` segundos"""
+    from sqlalchemy import select
+    from app.data.database import db
+    from app.data.models.producto_model import ProductoModel
+    
+    latencias: List[float] = []
+    aceptados: Dict[int, int] = {}
+    contadores = {'conflictos': 0, 'errores': 0}
+    candado = threading.Lock()
+    fin = time.perf_counter() + duracion
+    
+    def trabajador(semilla: int):
+        aleatorio = random.Random(semilla)
+        cliente = app.test_client()
+        propias: List[float] = []
+        propios: Dict[int, int] = {}
+        conflictos = errores = 0
+        while time.perf_counter() < fin:
+            id = aleatorio.randint(1, calientes)
+            lectura = cliente.get(f'/api/productos/{id}')
+            if lectura.status_code != 200:
+                errores += 1
+                continue
+            datos = lectura.get_json()['data']
+            if pausa_ms:
+                time.sleep(pausa_ms / 1000)
+            
+            cuerpo = {campo: datos[campo] for campo in CAMPOS_PUT}
+            cuerpo['stock'] = datos['stock'] + 1
+            cabeceras = {'If-Match': lectura.headers['ETag']} if modo == 'if_match' else {}
+            inicio = time.perf_counter()
+            respuesta = cliente.put(f'/api/productos/{id}', json=cuerpo, headers=cabeceras)
+            propias.append(time.perf_counter() - inicio)
+            if respuesta.status_code == 200:
+                propios[id] = propios.get(id, 0) + 1
+            elif respuesta.status_code == 412:
+                conflictos += 1
+            else:
+                # Bloqueo de la base ocupado (SQLite) u otros errores del motor
+                errores += 1
+        with candado:
+            latencias.extend(propias)
+            for id, cantidad in propios.items():
+                aceptados[id] = aceptados.get(id, 0) + cantidad
+            contadores['conflictos'] += conflictos
+            contadores['errores'] += errores
+    
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=trabajador, args=(i,)) for i in range(hilos)]
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+    
+    # Verificación: cada PUT aceptado sumó 1 al stock que había antes de él
+    with app.app_context():
+        finales = dict(db.session.execute(
+            select(ProductoModel.id, ProductoModel.cantidad_stock).where(ProductoModel.id <= calientes)
+        ).all())
+        db.engine.dispose()
+    perdidas = sum(aceptados.values()) - sum(stock - STOCK_INICIAL for stock in finales.values())
+    
+    latencias.sort()
+    return {
+        'aceptados': sum(aceptados.values()),
+        'aceptados_por_segundo': sum(aceptados.values()) / transcurrido,
+        'conflictos': contadores['conflictos'],
+        'errores': contadores['errores'],
+        'actualizaciones_perdidas': perdidas,
+        'latencia_put_p50_ms': statistics.median(latencias) * 1000 if latencias else None,
+        'latencia_put_p95_ms': latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else None
+    }
+
+
+def ejecutar(modos: List[str], concurrencias: List[int], duracion: float, productos: int,
+             calientes: int, database_url: str, latencia_ms: float, pausa_ms: float) -> Dict[str, dict]:
+    """Mide cada modo con cada nivel de concurrencia sobre datos recién preparados"""
+    resultados = {}
+    for modo in modos:
+        for hilos in concurrencias:
+            app = crear_app(database_url, 'directo', hilos, latencia_ms)
+            preparar_datos(app, productos, calientes)
+            medicion = medir(app, modo, hilos, duracion, calientes, pausa_ms)
+            resultados[f'{modo}@{hilos}'] = dict(modo=modo, hilos=hilos, **medicion)
+            print(f'  {modo:<13} h={hilos:<4} {medicion["aceptados_por_segundo"]:8.1f} PUT/s  '
+                  f'412 {medicion["conflictos"]:<6} perdidas {medicion["actualizaciones_perdidas"]:<6} '
+                  f'PUT p50 {medicion["latencia_put_p50_ms"] or 0:7.2f} ms  p95 {medicion["latencia_put_p95_ms"] or 0:7.2f} ms  '
+                  f'errores {medicion["errores"]}')
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ediciones concurrentes: PUT sin condición vs PUT con If-Match')
+    parser.add_argument('--modos', default=','.join(MODOS))
+    parser.add_argument('--hilos', default='1,8,32', help='Hilos simultáneos separados por coma')
+    parser.add_argument('--duracion', type=float, default=5, help='Segundos por medición')
+    parser.add_argument('--productos', type=int, default=1000, help='Tamaño del catálogo sintético')
+    parser.add_argument('--calientes', type=int, default=1, help='Productos que se editan (IDs 1..N)')
+    parser.add_argument('--pausa', type=float, default=0, help='Tiempo de edición entre el GET y el PUT (ms)')
+    parser.add_argument('--latencia-bd', type=float, default=0, help='Espera simulada por sentencia y COMMIT (ms)')
+    parser.add_argument('--database-url', help='Base de pruebas: se BORRA y se vuelve a crear (por defecto una SQLite temporal)')
+    parser.add_argument('--salida', help='Guarda los resultados en JSON')
+    args = parser.parse_args()
+    
+    directorio = tempfile.mkdtemp(prefix='edicion_')
+    try:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directorio, 'edicion.db')}"
+        print(f'{args.calientes} producto(s) editado(s), {args.duracion:g} s por medición, '
+              f'pausa de edición {args.pausa:g} ms, latencia simulada {args.latencia_bd:g} ms')
+        resultados = ejecutar(
+            [m for m in args.modos.split(',') if m], [int(h) for h in args.hilos.split(',') if h],
+            args.duracion, args.productos, args.calientes, database_url, args.latencia_bd, args.pausa
+        )
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'parametros': vars(args), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f'\nResultados guardados en {args.salida}')
+
+
+if __name__ == '__main__':
+    main()
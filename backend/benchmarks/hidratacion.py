@@ -0,0 +1,129 @@
+"""
+Benchmark de hidratación de productos: ORM vs select() de Core
+
+Compara la lectura anterior (filas -> ProductoModel -> to_entity()) con la actual del
+repositorio (filas -> Producto(*fila)) sobre una base SQLite en archivo.
+Reporta filas/s (sin tracemalloc) y el pico de memoria (con tracemalloc, en otra pasada)
+
+Uso (desde backend/):
+    python -m benchmarks.hidratacion [--productos 500000] [--repeticiones 3]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import insert
+from app.data.database import db
+from app.data.models.categoria_model import CategoriaModel
+from app.data.models.proveedor_model import ProveedorModel
+from app.data.models.producto_model import ProductoModel
+from app.data.repositories.producto_repository import ProductoRepository
+
+
+def crear_app(ruta_bd):
+    """Aplicación mínima con la base SQLite en archivo"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{ruta_bd}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def poblar(cantidad, tamano_lote=10_000):
+    """Inserta categorías, proveedores y `cantidad` productos con executemany"""
+    ahora = datetime.utcnow()
+    db.session.execute(insert(CategoriaModel.__table__), [
+        {'nombre': f'Categoría {i}', 'descripcion': 'Descripción', 'fecha_creacion': ahora, 'fecha_actualizacion': ahora}
+        for i in range(1, 11)
+    ])
+    db.session.execute(insert(ProveedorModel.__table__), [
+        {'nombre': f'Proveedor {i}', 'contacto': 'Contacto', 'telefono': '555-0000', 'email': f'p{i}@ejemplo.com',
+         'direccion': 'Dirección', 'fecha_creacion': ahora, 'fecha_actualizacion': ahora}
+        for i in range(1, 11)
+    ])
+    for inicio in range(0, cantidad, tamano_lote):
+        db.session.execute(insert(ProductoModel.__table__), [
+            {'nombre': f'Producto {i}', 'descripcion': f'Descripción del producto {i}', 'precio': 10 + i % 500,
+             'cantidad_stock': i % 120, 'stock_minimo': 10, 'categoria_id': i % 10 + 1, 'proveedor_id': i % 10 + 1,
+             'fecha_creacion': ahora, 'fecha_actualizacion': ahora}
+            for i in range(inicio, min(inicio + tamano_lote, cantidad))
+        ])
+    db.session.commit()
+
+
+def leer_orm():
+    """Camino anterior: consulta ORM con JOIN, objetos del modelo y conversión a entidad"""
+    filas = db.session.query(
+        ProductoModel, CategoriaModel.nombre, ProveedorModel.nombre
+    ).outerjoin(
+        CategoriaModel, ProductoModel.categoria_id == CategoriaModel.id
+    ).outerjoin(
+        ProveedorModel, ProductoModel.proveedor_id == ProveedorModel.id
+    ).all()
+    return [modelo.to_entity(categoria_nombre, proveedor_nombre)
+            for modelo, categoria_nombre, proveedor_nombre in filas]
+
+
+def leer_core():
+    """Camino actual del repositorio: select() de Core y Producto(*fila)"""
+    return ProductoRepository().obtener_todos_con_relaciones()
+
+
+def medir_tiempo(funcion, repeticiones):
+    """Mejor tiempo de varias pasadas; la sesión se limpia entre pasadas"""
+    mejor = None
+    for _ in range(repeticiones):
+        db.session.remove()
+        gc.collect()
+        inicio = time.perf_counter()
+        productos = funcion()
+        duracion = time.perf_counter() - inicio
+        cantidad = len(productos)
+        del productos
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return cantidad, mejor
+
+
+def medir_memoria(funcion):
+    """Pico de memoria asignada mientras se hidrata y se retiene el resultado"""
+    db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    productos = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del productos
+    return pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de hidratación ORM vs Core')
+    parser.add_argument('--productos', type=int, default=500_000)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        app = crear_app(os.path.join(directorio, 'hidratacion.db'))
+        with app.app_context():
+            db.create_all()
+            poblar(args.productos)
+            
+            print(f'Hidratación de {args.productos:,} productos con relaciones (SQLite en archivo)')
+            resultados = {}
+            for nombre, funcion in (('ORM (modelo + to_entity)', leer_orm), ('Core (select + Producto(*fila))', leer_core)):
+                cantidad, duracion = medir_tiempo(funcion, args.repeticiones)
+                pico = medir_memoria(funcion)
+                resultados[nombre] = (duracion, pico)
+                print(f'{nombre:<34} {cantidad / duracion:12,.0f} filas/s  {duracion * 1000:8.0f} ms  pico {pico / 2**20:8.1f} MiB')
+            
+            (t_orm, m_orm), (t_core, m_core) = resultados.values()
+            print(f'Core vs ORM: x{t_orm / t_core:.1f} filas/s, {m_core / m_orm:.0%} de la memoria pico')
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmark de importación masiva: un POST /api/productos/ por fila frente a
+POST /api/productos/importar con el archivo completo (CSV o NDJSON)
+
+Con cada modo se importan las mismas --filas sobre un esquema recién creado con 10
+categorías y 10 proveedores, a través del cliente de pruebas de Flask (la aplicación
+completa, sin red). Reporta filas/s, la mejora respecto de la creación por fila y
+verifica que la tabla tenga exactamente las filas importadas
+
+Uso (desde backend/):
+    python -m benchmarks.importacion                                   # SQLite temporal, 5000 filas
+    python -m benchmarks.importacion --filas 20000 --modos csv,ndjson
+    python -m benchmarks.importacion --database-url mysql+pymysql://... --salida importacion.json
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+MODOS = ['por_fila', 'csv', 'ndjson']
+COLUMNAS = ['nombre', 'descripcion', 'precio', 'stock', 'stock_minimo', 'categoria_id', 'proveedor_id']
+
+
+def crear_app(database_url: str):
+    """Aplicación completa sin detector ni métricas (su costo por sentencia sesgaría la medición)"""
+    # run.py crea una aplicación al importarse: se apunta a la base del benchmark antes de importarlo
+    os.environ['DATABASE_URL'] = database_url
+    from run import create_app
+    
+    return create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'DETECTOR_CONSULTAS': False,
+        'METRICAS_HABILITADAS': False
+    })
+
+
+def preparar_datos(app):
+    """Esquema desde cero con categorías y proveedores y sin productos"""
+    from init_db import generar_catalogo
+    from app.data.database import db
+    from app.data.migraciones import reiniciar_esquema
+    
+    with app.app_context():
+        reiniciar_esquema()
+        generar_catalogo(0, categorias=10, proveedores=10)
+        db.session.remove()
+
+
+def generar_filas(cantidad: int, semilla: int = 42) -> List[dict]:
+    """Filas válidas con los campos de la API (las mismas para todos los modos)"""
+    aleatorio = random.Random(semilla)
+    return [
+        {
+            'nombre': f'Producto importado {numero:07d}',
+            'descripcion': f'Fila {numero} del catálogo del proveedor',
+            'precio': round(aleatorio.uniform(1, 500), 2),
+            'stock': aleatorio.randint(0, 200),
+            'stock_minimo': aleatorio.choice((5, 10, 20)),
+            'categoria_id': aleatorio.randint(1, 10),
+            'proveedor_id': aleatorio.randint(1, 10)
+        }
+        for numero in range(1, cantidad + 1)
+    ]
+
+
+def como_csv(filas: List[dict]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUMNAS)
+    writer.writeheader()
+    writer.writerows(filas)
+    return buffer.getvalue().encode('utf-8')
+
+
+def como_ndjson(filas: List[dict]) -> bytes:
+    return ''.join(json.dumps(fila, ensure_ascii=False) + '\n' for fila in filas).encode('utf-8')
+
+
+def importar(cliente, modo: str, filas: List[dict]) -> int:
+    """Importa las filas con el modo indicado; retorna cuántas se insertaron"""
+    if modo == 'por_fila':
+        insertadas = 0
+        for fila in filas:
+            respuesta = cliente.post('/api/productos/', json=fila)
+            insertadas += respuesta.status_code == 201
+        return insertadas
+    
+    cuerpo, tipo = (como_csv(filas), 'text/csv') if modo == 'csv' else (como_ndjson(filas), 'application/x-ndjson')
+    respuesta = cliente.post('/api/productos/importar', data=cuerpo, content_type=tipo)
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return respuesta.get_json()['data']['insertadas']
+
+
+def medir(app, modo: str, filas: List[dict]) -> dict:
+    """Importa sobre datos recién preparados y verifica el conteo final"""
+    from sqlalchemy import func, select
+    from app.data.database import db
+    from app.data.models.producto_model import ProductoModel
+    
+    preparar_datos(app)
+    cliente = app.test_client()
+    inicio = time.perf_counter()
+    insertadas = importar(cliente, modo, filas)
+    duracion = time.perf_counter() - inicio
+    
+    with app.app_context():
+        en_tabla = db.session.execute(select(func.count(ProductoModel.id))).scalar()
+        db.session.remove()
+    return {
+        'filas': len(filas),
+        'insertadas': insertadas,
+        'segundos': duracion,
+        'filas_por_segundo': insertadas / duracion,
+        'consistente': insertadas == len(filas) == en_tabla
+    }
+
+
+def ejecutar(modos: List[str], cantidad: int, database_url: str) -> Dict[str, dict]:
+    """Mide cada modo con las mismas filas"""
+    from app.data.database import db
+    
+    app = crear_app(database_url)
+    filas = generar_filas(cantidad)
+    resultados = {}
+    for modo in modos:
+        medicion = medir(app, modo, filas)
+        resultados[modo] = medicion
+        print(f'  {modo:<9} {medicion["filas_por_segundo"]:12,.0f} filas/s  {medicion["segundos"]:8.2f} s  '
+              f'{"ok" if medicion["consistente"] else "INCONSISTENTE"}')
+    if 'por_fila' in resultados:
+        base = resultados['por_fila']['filas_por_segundo']
+        for modo, medicion in resultados.items():
+            medicion['mejora_vs_por_fila'] = medicion['filas_por_segundo'] / base
+        print('  Mejora vs por_fila: ' + ', '.join(
+            f'{modo} x{medicion["mejora_vs_por_fila"]:.1f}' for modo, medicion in resultados.items() if modo != 'por_fila'
+        ))
+    with app.app_context():
+        db.engine.dispose()
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Importación masiva: POST por fila vs /importar (CSV/NDJSON)')
+    parser.add_argument('--modos', default=','.join(MODOS))
+    parser.add_argument('--filas', type=int, default=5000, help='Filas a importar en cada modo')
+    parser.add_argument('--database-url', help='Base de pruebas: se BORRA y se vuelve a crear (por defecto una SQLite temporal)')
+    parser.add_argument('--salida', help='Guarda los resultados en JSON')
+    args = parser.parse_args()
+    
+    directorio = tempfile.mkdtemp(prefix='importacion_')
+    try:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directorio, 'importacion.db')}"
+        print(f'Importación de {args.filas:,} filas por modo')
+        resultados = ejecutar([m for m in args.modos.split(',') if m], args.filas, database_url)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'parametros': vars(args), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f'\nResultados guardados en {args.salida}')
+
+
+if __name__ == '__main__':
+    main()
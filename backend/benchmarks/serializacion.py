@@ -0,0 +1,112 @@
+"""
+Microbenchmark de serialización de productos para las respuestas de la API
+
+Compara el camino anterior (diccionario armado campo a campo con .isoformat() y
+json de la biblioteca estándar con las opciones por defecto de Flask) con el actual
+(serializador precompilado + ProveedorJSONRapido, con y sin orjson)
+
+Uso (desde backend/):
+    python -m benchmarks.serializacion [--productos 100000] [--repeticiones 5]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from flask import Flask
+from app.core.entities.producto import Producto
+from app.web import json_provider
+from app.web.json_provider import ProveedorJSONRapido
+from app.web.api.producto_api import serializar_producto_con_relaciones
+
+
+def producto_to_dict_anterior(producto):
+    """Serialización previa: un dict por entidad y dos llamadas a isoformat por fila"""
+    return {
+        'id': producto.id,
+        'nombre': producto.nombre,
+        'descripcion': producto.descripcion,
+        'precio': float(producto.precio),
+        'stock': producto.cantidad_stock,
+        'stock_minimo': producto.stock_minimo,
+        'categoria_id': producto.categoria_id,
+        'proveedor_id': producto.proveedor_id,
+        'necesita_reabastecimiento': producto.necesita_reabastecimiento(),
+        'fecha_creacion': producto.fecha_creacion.isoformat() if producto.fecha_creacion else None,
+        'fecha_actualizacion': producto.fecha_actualizacion.isoformat() if producto.fecha_actualizacion else None,
+        'categoria_nombre': producto.categoria_nombre,
+        'proveedor_nombre': producto.proveedor_nombre
+    }
+
+
+def generar_productos(cantidad):
+    """Genera entidades en memoria (sin base de datos) con datos representativos"""
+    base = datetime(2024, 1, 1, 12, 30, 15, 123456)
+    return [
+        Producto(
+            id=i,
+            nombre=f'Producto {i}',
+            descripcion=f'Descripción del producto número {i} con algo de texto',
+            precio=round(10 + i * 0.37 % 990, 2),
+            cantidad_stock=i % 120,
+            stock_minimo=10,
+            categoria_id=i % 5 + 1,
+            proveedor_id=i % 4 + 1,
+            fecha_creacion=base + timedelta(seconds=i),
+            fecha_actualizacion=base + timedelta(seconds=2 * i),
+            categoria_nombre=f'Categoría {i % 5 + 1}',
+            proveedor_nombre=f'Proveedor {i % 4 + 1}'
+        )
+        for i in range(1, cantidad + 1)
+    ]
+
+
+def medir(nombre, funcion, productos, repeticiones):
+    """Ejecuta la función varias veces y reporta el mejor tiempo y el tamaño de la salida"""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        salida = funcion(productos)
+        tiempos.append(time.perf_counter() - inicio)
+    mejor = min(tiempos)
+    print(f'{nombre:<45} {mejor * 1000:9.1f} ms  {len(productos) / mejor:12,.0f} productos/s  {len(salida) / 1e6:6.1f} MB')
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark de serialización JSON de productos')
+    parser.add_argument('--productos', type=int, default=100_000)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+    
+    productos = generar_productos(args.productos)
+    app = Flask(__name__)
+    proveedor = ProveedorJSONRapido(app)
+    
+    def anterior(items):
+        # Mismas opciones que el DefaultJSONProvider de Flask en modo compacto
+        data = {'success': True, 'data': [producto_to_dict_anterior(p) for p in items]}
+        return json.dumps(data, ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    
+    def actual(items):
+        data = {'success': True, 'data': [serializar_producto_con_relaciones(p) for p in items]}
+        with app.app_context():
+            return proveedor.response(data).get_data()
+    
+    print(f'Serialización de {args.productos:,} productos (mejor de {args.repeticiones})')
+    t_anterior = medir('anterior (dict + isoformat + json)', anterior, productos, args.repeticiones)
+    
+    orjson = json_provider.orjson
+    if orjson is not None:
+        t_actual = medir('actual (precompilado + orjson)', actual, productos, args.repeticiones)
+        print(f'Mejora con orjson: x{t_anterior / t_actual:.1f}')
+    
+    json_provider.orjson = None
+    try:
+        t_respaldo = medir('actual sin orjson (precompilado + json)', actual, productos, args.repeticiones)
+        print(f'Mejora sin orjson: x{t_anterior / t_respaldo:.1f}')
+    finally:
+        json_provider.orjson = orjson
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Aplicación que levanta benchmarks/carga.py (WSGI con gunicorn o ASGI con uvicorn)
+
+Es la misma aplicación de run.py / asgi.py; con CARGA_LATENCIA_MS > 0 cada sentencia SQL
+espera ese tiempo en el hilo que la ejecuta, para simular el viaje de red a la base de
+datos (TiDB Cloud) con SQLite local:
+- WSGI: espera el worker, igual que con un socket bloqueante
+- ASGI: espera el hilo de la conexión de aiosqlite; el event loop sigue atendiendo peticiones
+"""
+import os
+import time
+from sqlalchemy import event
+from sqlalchemy.util import await_only
+
+LATENCIA = float(os.environ.get('CARGA_LATENCIA_MS', 0)) / 1000
+
+if os.environ.get('API_MODO') == 'async':
+    from asgi import app
+    motor = app.extensions['motor_async'].sync_engine
+else:
+    from run import app
+    from app.data.database import db
+    with app.app_context():
+        motor = db.engine
+
+
+def _demora(_sentencia):
+    time.sleep(LATENCIA)
+
+
+@event.listens_for(motor, 'connect')
+def _instalar_demora(dbapi_connection, _registro):
+    """Registra la demora como trace callback de sqlite3 en cada conexión nueva"""
+    if not LATENCIA:
+        return
+    conexion = getattr(dbapi_connection, '_connection', None)
+    if hasattr(conexion, '_execute'):
+        # aiosqlite: la conexión sqlite3 pertenece a su propio hilo y se configura desde él
+        await_only(conexion._execute(conexion._conn.set_trace_callback, _demora))
+    else:
+        dbapi_connection.set_trace_callback(_demora)
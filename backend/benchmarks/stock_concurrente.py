@@ -0,0 +1,217 @@
+"""
+Benchmark de ajustes de stock concurrentes: UPDATE sobre la fila del producto
+(STOCK_MODO=directo) frente al libro de movimientos (STOCK_MODO=libro)
+
+N hilos ajustan durante un tiempo fijo el stock de unos pocos productos "calientes"
+(+1/-1 con el caso de uso ProductoUseCases.ajustar_stock, un contexto de aplicación por
+ajuste como en una petición). En modo libro el compactador corre en segundo plano
+durante la medición. Al final se compacta todo y se verifica que el stock de cada
+producto sea el inicial más la suma de los ajustes aplicados
+
+La contención por el bloqueo de fila solo aparece en motores con bloqueos por fila
+(MySQL/TiDB, PostgreSQL): con SQLite toda escritura toma el bloqueo de la base y ambos
+modos se serializan igual. --latencia-bd simula el viaje de red por sentencia y por
+COMMIT, tiempo durante el cual el UPDATE directo mantiene bloqueada la fila
+
+tests/test_stock_concurrente.py ejecuta este escenario acortado (1 s, 8 hilos) y exige un
+piso de ajustes por segundo
+
+Uso (desde backend/):
+    python -m benchmarks.stock_concurrente                                     # SQLite temporal
+    python -m benchmarks.stock_concurrente --database-url mysql+pymysql://... --latencia-bd 2
+    python -m benchmarks.stock_concurrente --hilos 1,8,32 --calientes 1 --salida stock.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+MODOS = ['directo', 'libro']
+STOCK_INICIAL = 1_000_000
+
+
+def crear_app(database_url: str, modo: str, hilos: int, latencia_ms: float):
+    """Aplicación de pruebas con el modo de stock indicado y un pool con una conexión por hilo (+2:
+    migraciones y compactador)"""
+    # run.py crea una aplicación al importarse: se apunta a la base del benchmark antes de importarlo
+    os.environ['DATABASE_URL'] = database_url
+    from sqlalchemy import event
+    from run import create_app
+    from config.config import opciones_motor
+    from app.data.database import db
+    
+    app = create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'SQLALCHEMY_ENGINE_OPTIONS': {**opciones_motor(database_url), 'pool_size': hilos + 2, 'max_overflow': 0},
+        'STOCK_MODO': modo,
+        'STOCK_COMPACTAR_INTERVALO': 0,
+        'DETECTOR_CONSULTAS': False,
+        'METRICAS_HABILITADAS': False
+    })
+    if latencia_ms:
+        with app.app_context():
+            motor = db.engine
+        
+        @event.listens_for(motor, 'after_cursor_execute')
+        def _demora_sentencia(*_args):
+            time.sleep(latencia_ms / 1000)
+        
+        @event.listens_for(motor, 'commit')
+        def _demora_commit(_conexion):
+            time.sleep(latencia_ms / 1000)
+    return app
+
+
+def preparar_datos(app, productos: int, calientes: int):
+    """Esquema desde cero, catálogo sintético y stock alto en los productos calientes"""
+    from sqlalchemy import update
+    from init_db import generar_catalogo
+    from app.data.database import db
+    from app.data.migraciones import reiniciar_esquema
+    from app.data.models.producto_model import ProductoModel
+    
+    with app.app_context():
+        reiniciar_esquema()
+        generar_catalogo(productos, categorias=10, proveedores=10)
+        db.session.execute(
+            update(ProductoModel).where(ProductoModel.id <= calientes).values(cantidad_stock=STOCK_INICIAL)
+        )
+        db.session.commit()
+
+
+def medir(app, modo: str, hilos: int, duracion: float, calientes: int) -> dict:
+    """Mantiene `hilos` hilos ajustando stock durante `duracion` segundos"""
+    from sqlalchemy import select
+    from app.data.database import db
+    from app.data.compactador_stock import CompactadorStock
+    from app.data.models.producto_model import ProductoModel
+    from app.data.repositories.producto_repository import ProductoRepository
+    from app.data.repositories.libro_stock_repositories import ProductoRepositoryLibro
+    from app.data.unit_of_work import SQLAlchemyUnitOfWork
+    from app.core.use_cases.producto_use_cases import ProductoUseCases
+    
+    repositorio = ProductoRepositoryLibro() if modo == 'libro' else ProductoRepository()
+    casos_de_uso = ProductoUseCases(repositorio, SQLAlchemyUnitOfWork())
+    compactador = CompactadorStock(app, intervalo=0.5) if modo == 'libro' else None
+    
+    latencias: List[float] = []
+    aplicados: Dict[int, int] = {}
+    contadores = {'rechazados': 0, 'errores': 0}
+    candado = threading.Lock()
+    fin = time.perf_counter() + duracion
+    
+    def trabajador(semilla: int):
+        aleatorio = random.Random(semilla)
+        propias: List[float] = []
+        deltas: Dict[int, int] = {}
+        rechazados = errores = 0
+        while time.perf_counter() < fin:
+            id = aleatorio.randint(1, calientes)
+            delta = aleatorio.choice((1, -1))
+            inicio = time.perf_counter()
+            try:
+                with app.app_context():
+                    exito, _ = casos_de_uso.ajustar_stock(id, delta)
+            except Exception:
+                # Deadlocks, conflictos de escritura o timeouts de bloqueo del motor
+                errores += 1
+                continue
+            if exito:
+                propias.append(time.perf_counter() - inicio)
+                deltas[id] = deltas.get(id, 0) + delta
+            else:
+                rechazados += 1
+        with candado:
+            latencias.extend(propias)
+            for id, delta in deltas.items():
+                aplicados[id] = aplicados.get(id, 0) + delta
+            contadores['rechazados'] += rechazados
+            contadores['errores'] += errores
+    
+    if compactador:
+        compactador.iniciar()
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=trabajador, args=(i,)) for i in range(hilos)]
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+    transcurrido = time.perf_counter() - inicio
+    if compactador:
+        compactador.detener()
+        compactador.compactar()
+    
+    # Verificación: snapshot final = inicial + ajustes aplicados (sin movimientos pendientes)
+    with app.app_context():
+        finales = dict(db.session.execute(
+            select(ProductoModel.id, ProductoModel.cantidad_stock).where(ProductoModel.id <= calientes)
+        ).all())
+        db.engine.dispose()
+    consistente = all(finales[id] == STOCK_INICIAL + aplicados.get(id, 0) for id in finales)
+    
+    latencias.sort()
+    return {
+        'ajustes': len(latencias),
+        'ajustes_por_segundo': len(latencias) / transcurrido,
+        'latencia_p50_ms': statistics.median(latencias) * 1000 if latencias else None,
+        'latencia_p95_ms': latencias[int(len(latencias) * 0.95) - 1] * 1000 if latencias else None,
+        'rechazados': contadores['rechazados'],
+        'errores': contadores['errores'],
+        'consistente': consistente
+    }
+
+
+def ejecutar(modos: List[str], concurrencias: List[int], duracion: float, productos: int,
+             calientes: int, database_url: str, latencia_ms: float) -> Dict[str, dict]:
+    """Mide cada modo con cada nivel de concurrencia sobre datos recién preparados"""
+    resultados = {}
+    for modo in modos:
+        for hilos in concurrencias:
+            app = crear_app(database_url, modo, hilos, latencia_ms)
+            preparar_datos(app, productos, calientes)
+            medicion = medir(app, modo, hilos, duracion, calientes)
+            resultados[f'{modo}@{hilos}'] = dict(modo=modo, hilos=hilos, **medicion)
+            print(f'  {modo:<8} h={hilos:<4} {medicion["ajustes_por_segundo"]:9.1f} ajustes/s  '
+                  f'p50 {medicion["latencia_p50_ms"] or 0:8.2f} ms  p95 {medicion["latencia_p95_ms"] or 0:8.2f} ms  '
+                  f'errores {medicion["errores"]}  {"ok" if medicion["consistente"] else "INCONSISTENTE"}')
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ajustes de stock concurrentes: UPDATE directo vs libro de movimientos')
+    parser.add_argument('--modos', default=','.join(MODOS))
+    parser.add_argument('--hilos', default='1,8,32', help='Hilos simultáneos separados por coma')
+    parser.add_argument('--duracion', type=float, default=5, help='Segundos por medición')
+    parser.add_argument('--productos', type=int, default=1000, help='Tamaño del catálogo sintético')
+    parser.add_argument('--calientes', type=int, default=1, help='Productos que reciben los ajustes (IDs 1..N)')
+    parser.add_argument('--latencia-bd', type=float, default=0, help='Espera simulada por sentencia y COMMIT (ms)')
+    parser.add_argument('--database-url', help='Base de pruebas: se BORRA y se vuelve a crear (por defecto una SQLite temporal)')
+    parser.add_argument('--salida', help='Guarda los resultados en JSON')
+    args = parser.parse_args()
+    
+    directorio = tempfile.mkdtemp(prefix='stock_')
+    try:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directorio, 'stock.db')}"
+        print(f'{args.calientes} producto(s) caliente(s), {args.duracion:g} s por medición, '
+              f'latencia simulada {args.latencia_bd:g} ms')
+        resultados = ejecutar(
+            [m for m in args.modos.split(',') if m], [int(h) for h in args.hilos.split(',') if h],
+            args.duracion, args.productos, args.calientes, database_url, args.latencia_bd
+        )
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({'parametros': vars(args), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f'\nResultados guardados en {args.salida}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Suite de benchmarks del backend con baselines en JSON
+
+Para cada tamaño de catálogo crea una base SQLite en archivo, levanta la aplicación
+completa con create_app('testing') y ejecuta los casos de benchmarks/casos.py
+(CRUD del repositorio, hidratación de listados, stock bajo, serialización y
+peticiones HTTP con el cliente de pruebas de Flask)
+
+Uso (desde backend/):
+    python -m benchmarks.suite                                   # ejecuta e imprime
+    python -m benchmarks.suite --guardar-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --comparar benchmarks/baseline.json --umbral 0.25
+
+Con --comparar el proceso termina con código 1 si algún caso es más lento que la
+baseline en más del umbral (0.25 = 25 %). Las baselines dependen de la máquina:
+se deben generar y comparar en el mismo equipo
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List
+
+# run.py crea una aplicación al importarse: se apunta a una base temporal para no
+# tocar la base configurada en .env
+_DIRECTORIO_TEMPORAL = tempfile.mkdtemp(prefix='benchmarks_')
+atexit.register(shutil.rmtree, _DIRECTORIO_TEMPORAL, ignore_errors=True)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DIRECTORIO_TEMPORAL, 'importacion.db')}"
+
+import sqlalchemy  # noqa: E402
+from run import create_app  # noqa: E402
+from init_db import generar_catalogo  # noqa: E402
+from app.data.database import db  # noqa: E402
+from benchmarks.casos import CASOS, Contexto  # noqa: E402
+
+TAMANOS_POR_DEFECTO = [1_000, 10_000]
+UMBRAL_POR_DEFECTO = 0.25
+
+
+def poblar_catalogo(tamano: int, semilla: int = 42):
+    """
+    Catálogo sintético de init_db.py (IDs 1..tamano, 10 categorías, 10 proveedores y
+    10 % de productos con stock bajo); con la misma semilla los datos son idénticos
+    """
+    generar_catalogo(tamano, categorias=10, proveedores=10, semilla=semilla)
+
+
+def cronometrar(operacion, iteraciones: int, repeticiones: int) -> List[float]:
+    """Segundos por operación en cada ronda (tras una ejecución de calentamiento)"""
+    operacion()
+    rondas = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            operacion()
+        rondas.append((time.perf_counter() - inicio) / iteraciones)
+    return rondas
+
+
+def ejecutar(tamanos: List[int], repeticiones: int, filtro: str = '') -> Dict[str, dict]:
+    """Ejecuta los casos para cada tamaño y retorna {'caso@tamaño': métricas}"""
+    resultados = {}
+    for tamano in tamanos:
+        ruta_bd = os.path.join(_DIRECTORIO_TEMPORAL, f'catalogo_{tamano}.db')
+        if os.path.exists(ruta_bd):
+            os.remove(ruta_bd)
+        # El detector de consultas no se activa: su costo sesgaría las mediciones
+        app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': f'sqlite:///{ruta_bd}',
+                                     'DETECTOR_CONSULTAS': False})
+        
+        with app.app_context():
+            poblar_catalogo(tamano)
+            ctx = Contexto(app=app, tamano=tamano)
+            print(f'\nCatálogo de {tamano:,} productos')
+            for nombre, preparar in CASOS.items():
+                if filtro and filtro not in nombre:
+                    continue
+                operacion, iteraciones = preparar(ctx)
+                rondas = cronometrar(operacion, iteraciones, repeticiones)
+                mediana = statistics.median(rondas)
+                resultados[f'{nombre}@{tamano}'] = {
+                    'caso': nombre,
+                    'tamano': tamano,
+                    'segundos_por_op': mediana,
+                    'minimo': min(rondas),
+                    'ops_por_segundo': 1 / mediana if mediana else None,
+                    'iteraciones': iteraciones,
+                    'repeticiones': repeticiones
+                }
+                print(f'  {nombre:<28} {mediana * 1000:10.3f} ms/op  {1 / mediana:12,.1f} op/s')
+            db.session.remove()
+            db.engine.dispose()
+    return resultados
+
+
+def metadatos() -> dict:
+    """Entorno de la ejecución (las comparaciones solo tienen sentido en el mismo equipo)"""
+    return {
+        'fecha': datetime.utcnow().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'plataforma': platform.platform(),
+        'procesador': platform.processor() or platform.machine()
+    }
+
+
+def guardar(ruta: str, resultados: Dict[str, dict]):
+    """Guarda los resultados en JSON junto con los metadatos del entorno"""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump({'metadatos': metadatos(), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+    print(f'\nResultados guardados en {ruta}')
+
+
+def comparar(ruta_baseline: str, resultados: Dict[str, dict], umbral: float) -> List[str]:
+    """
+    Compara segundos por operación contra la baseline
+    Retorna los casos que empeoraron más que `umbral` (proporción, p. ej. 0.25)
+    """
+    with open(ruta_baseline, encoding='utf-8') as archivo:
+        baseline = json.load(archivo)['resultados']
+    
+    regresiones = []
+    print(f'\nComparación contra {ruta_baseline} (umbral +{umbral:.0%})')
+    for clave, actual in resultados.items():
+        anterior = baseline.get(clave)
+        if anterior is None:
+            print(f'  {clave:<38} sin baseline')
+            continue
+        razon = actual['segundos_por_op'] / anterior['segundos_por_op']
+        estado = 'REGRESIÓN' if razon > 1 + umbral else 'ok'
+        if estado != 'ok':
+            regresiones.append(clave)
+        print(f'  {clave:<38} {anterior["segundos_por_op"] * 1000:10.3f} -> '
+              f'{actual["segundos_por_op"] * 1000:10.3f} ms/op  ({razon - 1:+7.1%})  {estado}')
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suite de benchmarks con baselines')
+    parser.add_argument('--tamanos', default=','.join(str(t) for t in TAMANOS_POR_DEFECTO),
+                        help='Tamaños de catálogo separados por coma (por defecto 1000,10000)')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--casos', default='', help='Ejecuta solo los casos cuyo nombre contenga este texto')
+    parser.add_argument('--salida', help='Guarda los resultados de esta ejecución en JSON')
+    parser.add_argument('--guardar-baseline', metavar='RUTA', help='Guarda esta ejecución como baseline')
+    parser.add_argument('--comparar', metavar='RUTA', help='Compara contra una baseline y falla si hay regresiones')
+    parser.add_argument('--umbral', type=float, default=UMBRAL_POR_DEFECTO,
+                        help='Empeoramiento tolerado al comparar (0.25 = 25 %%)')
+    args = parser.parse_args()
+    
+    tamanos = [int(t) for t in args.tamanos.split(',') if t.strip()]
+    resultados = ejecutar(tamanos, args.repeticiones, args.casos)
+    
+    if args.salida:
+        guardar(args.salida, resultados)
+    if args.guardar_baseline:
+        guardar(args.guardar_baseline, resultados)
+    if args.comparar:
+        regresiones = comparar(args.comparar, resultados, args.umbral)
+        if regresiones:
+            print(f'\n{len(regresiones)} caso(s) con regresión: {", ".join(regresiones)}')
+            sys.exit(1)
+        print('\nSin regresiones')
+
+
+if __name__ == '__main__':
+    main()
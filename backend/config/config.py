@@ -5,6 +5,34 @@ import os
 import ssl
 
 
+def opciones_motor(uri: str) -> dict:
+    """
+    Opciones del engine de SQLAlchemy según la base de datos
+    El contexto SSL solo aplica a MySQL/TiDB (otros drivers no aceptan el argumento 'ssl')
+    """
+    opciones = {
+        'pool_pre_ping': True,
+        'pool_recycle': 300
+    }
+    if uri.startswith('mysql'):
+        # Crear contexto SSL para TiDB Cloud
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        opciones['connect_args'] = {'ssl': ssl_context}
+    return opciones
+
+
+def binds_replica(uri) -> dict:
+    """
+    SQLALCHEMY_BINDS con el engine de la réplica de lectura (vacío si no hay réplica)
+    Las lecturas marcadas de los repositorios se envían a este bind (app/data/enrutamiento.py)
+    """
+    if not uri:
+        return {}
+    return {'replica': {'url': uri, **opciones_motor(uri)}}
+
+
 class Config:
     """Configuración base"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
@@ -16,23 +44,58 @@ class Config:
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
-    # Crear contexto SSL para TiDB Cloud
-    ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
+    # Migraciones al iniciar la aplicación; en producción son un paso del despliegue
+    # (python migrar.py) y los workers solo verifican la versión del esquema
+    MIGRAR_AL_INICIAR = os.environ.get('MIGRAR_AL_INICIAR', 'false').lower() == 'true'
     
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        'pool_pre_ping': True,
-        'pool_recycle': 300,
-        'connect_args': {
-            'ssl': ssl_context
-        }
-    }
+    # Caché en proceso de categorías y proveedores (por worker); 0 la desactiva
+    CACHE_REPOSITORIOS_MAX_ENTRADAS = int(os.environ.get('CACHE_REPOSITORIOS_MAX_ENTRADAS', 1024))
+    CACHE_REPOSITORIOS_TTL = float(os.environ.get('CACHE_REPOSITORIOS_TTL', 60))
+    
+    # Búsqueda de texto: 'memoria' (índice por worker), 'fulltext' (índice FULLTEXT de MySQL)
+    # o 'ninguno' (sin /buscar)
+    BUSQUEDA_BACKEND = os.environ.get('BUSQUEDA_BACKEND', 'memoria')
+    BUSQUEDA_INTERVALO_SINCRONIZACION = float(os.environ.get('BUSQUEDA_INTERVALO_SINCRONIZACION', 30))
+    # Índice en memoria construido en un hilo por worker (mientras tanto se busca con LIKE);
+    # con false se construye dentro de la primera búsqueda
+    BUSQUEDA_INDICE_EN_SEGUNDO_PLANO = os.environ.get('BUSQUEDA_INDICE_EN_SEGUNDO_PLANO', 'true').lower() == 'true'
+    
+    # Importación/exportación y lotes de movimientos (/importar, /export, /ajustes/lote)
+    OPERACIONES_LOTE_HABILITADAS = os.environ.get('OPERACIONES_LOTE_HABILITADAS', 'true').lower() == 'true'
+    
+    # Métricas Prometheus en /metrics y encabezado Server-Timing
+    METRICAS_HABILITADAS = os.environ.get('METRICAS_HABILITADAS', 'true').lower() == 'true'
+    
+    # Detector de N+1 y consultas lentas (reporta en el log; en pruebas lanza excepción)
+    DETECTOR_CONSULTAS = os.environ.get('DETECTOR_CONSULTAS', 'false').lower() == 'true'
+    DETECTOR_CONSULTAS_MAX_REPETICIONES = int(os.environ.get('DETECTOR_CONSULTAS_MAX_REPETICIONES', 5))
+    DETECTOR_CONSULTAS_UMBRAL_MS = float(os.environ.get('DETECTOR_CONSULTAS_UMBRAL_MS', 200))
+    
+    # Stock: 'directo' (UPDATE condicional sobre la fila del producto) o 'libro' (cada ajuste se
+    # inserta en movimientos_stock y un hilo por worker compacta los pendientes cada N segundos)
+    STOCK_MODO = os.environ.get('STOCK_MODO', 'directo').lower()
+    STOCK_COMPACTAR_INTERVALO = float(os.environ.get('STOCK_COMPACTAR_INTERVALO', 5))
+    STOCK_COMPACTAR_LOTE = int(os.environ.get('STOCK_COMPACTAR_LOTE', 1000))
+    # Cupos por producto en el libro: los descuentos restan de un cupo al azar y solo compiten
+    # con los que eligieron el mismo (al volver de 'directo' a 'libro' vaciar stock_cupos)
+    STOCK_CUPOS = int(os.environ.get('STOCK_CUPOS', 8))
+    
+    # Variante de la API: 'sync' (Flask/WSGI con gunicorn) o 'async' (Quart/ASGI con uvicorn, ver asgi.py)
+    API_MODO = os.environ.get('API_MODO', 'sync').lower()
+    
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_motor(SQLALCHEMY_DATABASE_URI)
+    
+    # Réplica de lectura: listados, detalle, búsquedas y dashboard se leen de ella y las
+    # escrituras (y lo que lee una petición después de escribir) van a la primaria
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    SQLALCHEMY_BINDS = binds_replica(REPLICA_DATABASE_URL)
 
 
 class DevelopmentConfig(Config):
     """Configuración de desarrollo"""
     DEBUG = True
+    DETECTOR_CONSULTAS = os.environ.get('DETECTOR_CONSULTAS', 'true').lower() == 'true'
+    MIGRAR_AL_INICIAR = os.environ.get('MIGRAR_AL_INICIAR', 'true').lower() == 'true'
 
 
 class ProductionConfig(Config):
@@ -40,8 +103,21 @@ class ProductionConfig(Config):
     DEBUG = False
 
 
+class TestingConfig(Config):
+    """Configuración para pruebas y benchmarks (la URI se indica al crear la app)"""
+    TESTING = True
+    DETECTOR_CONSULTAS = True
+    MIGRAR_AL_INICIAR = True
+    BUSQUEDA_INDICE_EN_SEGUNDO_PLANO = False
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_motor(SQLALCHEMY_DATABASE_URI)
+    REPLICA_DATABASE_URL = None
+    SQLALCHEMY_BINDS = {}
+
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
@@ -0,0 +1,54 @@
+"""
+Configuración de gunicorn
+gunicorn la carga automáticamente desde el directorio de trabajo (backend/)
+"""
+import os
+import shutil
+import tempfile
+import time
+
+# La aplicación se carga una sola vez en el maestro (imports de todas las capas,
+# create_app y verificación del esquema) y los workers se crean con fork ya listos
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() == 'true'
+
+# Métricas de Prometheus agregadas entre workers: cada worker escribe sus valores en
+# archivos de este directorio y /metrics los combina. Se define y se limpia aquí, al
+# cargar la configuración en el maestro, antes de que preload_app importe la aplicación
+directorio_metricas = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'inventario_metricas')
+)
+shutil.rmtree(directorio_metricas, ignore_errors=True)
+os.makedirs(directorio_metricas, exist_ok=True)
+
+
+def post_fork(server, worker):
+    """
+    En el worker recién creado: descarta los pools de conexiones heredados del maestro,
+    de la primaria y de la réplica de lectura si la hay (close=False: los sockets siguen
+    siendo del maestro y no se cierran desde aquí) e inicia la construcción de los
+    índices de búsqueda en segundo plano
+    """
+    worker.inicio_arranque = time.perf_counter()
+    if preload_app:
+        from run import app
+        from app.data.database import db
+        with app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+        for buscador in app.extensions['buscadores']:
+            buscador.iniciar()
+
+
+def post_worker_init(worker):
+    """Registra cuánto tardó el worker desde el fork hasta poder atender peticiones"""
+    worker.log.info('Worker %s listo en %.1f ms', worker.pid,
+                    (time.perf_counter() - worker.inicio_arranque) * 1000)
+
+
+def child_exit(server, worker):
+    """Un worker terminó: sus contadores se conservan, sus gauges en vivo se descartan"""
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,15 +1,87 @@
 """
 Script de inicialización con datos de prueba
 Ejecuta este script para poblar la base de datos con datos de ejemplo
+
+Uso:
+    python init_db.py                         # catálogo de ejemplo (9 productos)
+    python init_db.py --productos 1000000 --categorias 40 --proveedores 200 --seed 7
+        [--bajo-stock 0.12] [--lote 10000]    # catálogo sintético a escala
 """
+import argparse
+import math
+import random
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import insert
 from run import create_app
 from app.data.database import db
+from app.data.migraciones import reiniciar_esquema
 from app.core.entities.categoria import Categoria
 from app.core.entities.proveedor import Proveedor
 from app.core.entities.producto import Producto
 from app.data.repositories.categoria_repository import CategoriaRepository
 from app.data.repositories.proveedor_repository import ProveedorRepository
 from app.data.repositories.producto_repository import ProductoRepository
+from app.data.unit_of_work import SQLAlchemyUnitOfWork
+from app.data.models.categoria_model import CategoriaModel
+from app.data.models.proveedor_model import ProveedorModel
+from app.data.models.producto_model import ProductoModel
+
+# Familias de productos para el generador sintético:
+# (categoría, descripción, artículos, variantes, precio típico)
+FAMILIAS = [
+    ('Electrónica', 'Productos electrónicos y tecnología',
+     ['Laptop', 'Mouse inalámbrico', 'Teclado mecánico', 'Monitor', 'Audífonos', 'Parlante Bluetooth',
+      'Cargador USB-C', 'Disco SSD', 'Memoria USB', 'Tablet', 'Cámara web', 'Router WiFi'],
+     ['64GB', '128GB', '256GB', '512GB', '1TB', 'Negro', 'Blanco', 'Gris'], 60.0),
+    ('Alimentos', 'Productos alimenticios y bebidas',
+     ['Arroz integral', 'Aceite de oliva', 'Café molido', 'Azúcar rubia', 'Harina de trigo', 'Fideos',
+      'Lentejas', 'Avena', 'Leche evaporada', 'Atún en lata', 'Mermelada', 'Galletas'],
+     ['250g', '500g', '1kg', '5kg', '400ml', '1L', 'Pack x6', 'Pack x12'], 5.0),
+    ('Ropa', 'Vestimenta y accesorios',
+     ['Camiseta de algodón', 'Jeans', 'Casaca', 'Polera con capucha', 'Camisa', 'Short deportivo',
+      'Medias', 'Gorra', 'Chompa de lana', 'Vestido', 'Zapatillas', 'Cinturón de cuero'],
+     ['Talla S', 'Talla M', 'Talla L', 'Talla XL', 'Azul', 'Negro', 'Rojo', 'Verde'], 25.0),
+    ('Hogar', 'Artículos para el hogar',
+     ['Juego de sábanas', 'Almohada', 'Sartén antiadherente', 'Olla a presión', 'Toalla de baño',
+      'Lámpara de mesa', 'Cortina', 'Juego de cubiertos', 'Licuadora', 'Hervidor eléctrico'],
+     ['1 plaza', '2 plazas', 'Queen', 'King', '24 cm', '28 cm', 'Set x4', 'Set x6'], 30.0),
+    ('Deportes', 'Equipamiento deportivo y fitness',
+     ['Mancuernas', 'Pelota de fútbol', 'Colchoneta de yoga', 'Cuerda para saltar', 'Guantes de box',
+      'Bicicleta estática', 'Raqueta de tenis', 'Botella térmica', 'Banda elástica'],
+     ['2kg', '5kg', '10kg', 'Talla 5', 'Profesional', 'Entrenamiento', 'Par', 'Unidad'], 35.0),
+    ('Librería', 'Útiles de oficina y escolares',
+     ['Cuaderno', 'Lapicero', 'Resaltador', 'Archivador', 'Papel bond', 'Mochila escolar',
+      'Calculadora', 'Engrapador', 'Corrector', 'Agenda'],
+     ['A4', 'A5', 'Oficio', 'Pack x3', 'Pack x10', 'Azul', 'Negro', '100 hojas'], 6.0),
+    ('Limpieza', 'Productos de limpieza y cuidado del hogar',
+     ['Detergente', 'Lejía', 'Jabón líquido', 'Limpiavidrios', 'Esponja', 'Escoba', 'Trapeador',
+      'Desinfectante', 'Suavizante', 'Bolsas de basura'],
+     ['500ml', '1L', '2L', '5L', 'Pack x3', 'Aroma lavanda', 'Aroma limón', 'Industrial'], 8.0),
+    ('Ferretería', 'Herramientas y materiales',
+     ['Taladro percutor', 'Juego de destornilladores', 'Martillo', 'Cinta métrica', 'Llave inglesa',
+      'Caja de tornillos', 'Pintura látex', 'Brocha', 'Extensión eléctrica', 'Candado'],
+     ['Pequeño', 'Mediano', 'Grande', '1/4 galón', '1 galón', '3 metros', '5 metros', 'Set x12'], 20.0),
+]
+
+MARCAS = ['Andina', 'Nova', 'Inca', 'Sol', 'Pacífico', 'Cóndor', 'Vértice', 'Aurora', 'Titán',
+          'Brisa', 'Lumen', 'Terra', 'Delta', 'Cumbre', 'Rayo', 'Atlas']
+LINEAS = ['Pro', 'Plus', 'Max', 'Eco', 'Ultra', 'Premium', 'Esencial', 'Lite', 'Clásico', 'Deluxe']
+
+PREFIJOS_PROVEEDOR = ['Distribuidora', 'Comercial', 'Importaciones', 'Corporación', 'Inversiones',
+                      'Suministros', 'Grupo', 'Mayorista']
+RAICES_PROVEEDOR = ['Andina', 'del Sur', 'del Norte', 'Pacífico', 'Los Andes', 'San Martín',
+                    'La Unión', 'Central', 'Amazonía', 'Del Valle', 'Santa Rosa', 'El Sol']
+NOMBRES = ['Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Rosa', 'Jorge', 'Lucía', 'Pedro', 'Carmen',
+           'Miguel', 'Elena', 'José', 'Patricia', 'Diego', 'Sofía']
+APELLIDOS = ['Pérez', 'González', 'Rodríguez', 'Martínez', 'García', 'Quispe', 'Flores', 'Torres',
+             'Ramírez', 'Mendoza', 'Vargas', 'Castillo', 'Rojas', 'Chávez']
+CALLES = ['Av. Arequipa', 'Jr. de la Unión', 'Av. Brasil', 'Calle Las Flores', 'Av. Grau',
+          'Av. Universitaria', 'Calle Los Olivos', 'Av. Javier Prado']
+STOCK_MINIMO = [2, 5, 10, 15, 20, 30, 50]
+PESOS_STOCK_MINIMO = [8, 25, 30, 15, 10, 7, 5]
 
 
 def init_data():
@@ -17,9 +89,8 @@ def init_data():
     app = create_app('development')
     
     with app.app_context():
-        # Limpiar datos existentes
-        db.drop_all()
-        db.create_all()
+        # Limpiar datos existentes (recrea todas las tablas en la última versión del esquema)
+        reiniciar_esquema()
         
         print("🗄️  Base de datos creada exitosamente")
         
@@ -27,6 +98,7 @@ def init_data():
         categoria_repo = CategoriaRepository()
         proveedor_repo = ProveedorRepository()
         producto_repo = ProductoRepository()
+        unit_of_work = SQLAlchemyUnitOfWork()
         
         # Crear categorías
         print("\n📁 Creando categorías...")
@@ -39,10 +111,11 @@ def init_data():
         ]
         
         categorias_creadas = []
-        for cat in categorias:
-            cat_creada = categoria_repo.crear(cat)
-            categorias_creadas.append(cat_creada)
-            print(f"   ✓ {cat_creada.nombre}")
+        with unit_of_work:
+            for cat in categorias:
+                cat_creada = categoria_repo.crear(cat)
+                categorias_creadas.append(cat_creada)
+                print(f"   ✓ {cat_creada.nombre}")
         
         # Crear proveedores
         print("\n🏢 Creando proveedores...")
@@ -78,10 +151,11 @@ def init_data():
         ]
         
         proveedores_creados = []
-        for prov in proveedores:
-            prov_creado = proveedor_repo.crear(prov)
-            proveedores_creados.append(prov_creado)
-            print(f"   ✓ {prov_creado.nombre}")
+        with unit_of_work:
+            for prov in proveedores:
+                prov_creado = proveedor_repo.crear(prov)
+                proveedores_creados.append(prov_creado)
+                print(f"   ✓ {prov_creado.nombre}")
         
         # Crear productos
         print("\n📦 Creando productos...")
@@ -176,13 +250,14 @@ def init_data():
         
         productos_creados = []
         bajo_stock = 0
-        for prod in productos:
-            prod_creado = producto_repo.crear(prod)
-            productos_creados.append(prod_creado)
-            status = "⚠️  STOCK BAJO" if prod_creado.necesita_reabastecimiento() else "✓"
-            if prod_creado.necesita_reabastecimiento():
-                bajo_stock += 1
-            print(f"   {status} {prod_creado.nombre} (Stock: {prod_creado.cantidad_stock})")
+        with unit_of_work:
+            for prod in productos:
+                prod_creado = producto_repo.crear(prod)
+                productos_creados.append(prod_creado)
+                status = "⚠️  STOCK BAJO" if prod_creado.necesita_reabastecimiento() else "✓"
+                if prod_creado.necesita_reabastecimiento():
+                    bajo_stock += 1
+                print(f"   {status} {prod_creado.nombre} (Stock: {prod_creado.cantidad_stock})")
         
         print(f"\n✅ Inicialización completada exitosamente!")
         print(f"📊 Resumen:")
@@ -193,5 +268,186 @@ def init_data():
         print(f"\n🚀 Puedes ejecutar la aplicación con: python app.py")
 
 
+def _pesos_zipf(cantidad: int, exponente: float = 0.9) -> List[float]:
+    """Pesos acumulados con sesgo de Zipf (pocas categorías/proveedores concentran el catálogo)"""
+    acumulado, pesos = 0.0, []
+    for rango in range(1, cantidad + 1):
+        acumulado += 1 / rango ** exponente
+        pesos.append(acumulado)
+    return pesos
+
+
+def _slug(texto: str) -> str:
+    """Texto sin tildes ni espacios para armar correos"""
+    sin_tildes = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return ''.join(c for c in sin_tildes.lower() if c.isalnum())
+
+
+def _filas_categorias(cantidad: int, ahora: datetime) -> List[Dict]:
+    """Categorías de FAMILIAS; si se piden más, se numeran líneas adicionales (el nombre es único)"""
+    filas = []
+    for indice in range(cantidad):
+        nombre, descripcion = FAMILIAS[indice % len(FAMILIAS)][:2]
+        vuelta = indice // len(FAMILIAS)
+        if vuelta:
+            nombre = f'{nombre} - Línea {vuelta + 1}'
+        filas.append({'nombre': nombre, 'descripcion': descripcion,
+                      'fecha_creacion': ahora, 'fecha_actualizacion': ahora})
+    return filas
+
+
+def _filas_proveedores(cantidad: int, aleatorio: random.Random, ahora: datetime) -> List[Dict]:
+    """Proveedores con razón social, contacto, teléfono y correo plausibles"""
+    filas = []
+    combinaciones = len(PREFIJOS_PROVEEDOR) * len(RAICES_PROVEEDOR)
+    for indice in range(cantidad):
+        prefijo = PREFIJOS_PROVEEDOR[indice % len(PREFIJOS_PROVEEDOR)]
+        raiz = RAICES_PROVEEDOR[(indice // len(PREFIJOS_PROVEEDOR)) % len(RAICES_PROVEEDOR)]
+        nombre = f'{prefijo} {raiz}'
+        if indice >= combinaciones:
+            nombre = f'{nombre} {indice // combinaciones + 1}'
+        filas.append({
+            'nombre': f'{nombre} S.A.C.',
+            'contacto': f'{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}',
+            'telefono': f'9{aleatorio.randint(10_000_000, 99_999_999)}',
+            'email': f'ventas@{_slug(nombre)}.com.pe',
+            'direccion': f'{aleatorio.choice(CALLES)} {aleatorio.randint(100, 3999)}, Lima',
+            'fecha_creacion': ahora,
+            'fecha_actualizacion': ahora
+        })
+    return filas
+
+
+def _filas_productos(cantidad: int, inicio: int, categorias: int, proveedores: int,
+                     proporcion_bajo_stock: float, aleatorio: random.Random,
+                     pesos_categorias: List[float], pesos_proveedores: List[float],
+                     ahora: datetime) -> List[Dict]:
+    """
+    Lote de productos con distribuciones realistas:
+    - categorías y proveedores con sesgo de Zipf
+    - precio log-normal alrededor del precio típico de la familia
+    - stock con cola larga (Pareto) y una proporción controlada en o bajo stock_minimo
+    - fechas de creación repartidas en los últimos dos años
+    """
+    categoria_ids = aleatorio.choices(range(1, categorias + 1), cum_weights=pesos_categorias, k=cantidad)
+    proveedor_ids = aleatorio.choices(range(1, proveedores + 1), cum_weights=pesos_proveedores, k=cantidad)
+    minimos = aleatorio.choices(STOCK_MINIMO, weights=PESOS_STOCK_MINIMO, k=cantidad)
+    filas = []
+    for numero, categoria_id, proveedor_id, minimo in zip(
+            range(inicio, inicio + cantidad), categoria_ids, proveedor_ids, minimos):
+        _, _, articulos, variantes, precio_tipico = FAMILIAS[(categoria_id - 1) % len(FAMILIAS)]
+        articulo = aleatorio.choice(articulos)
+        marca = aleatorio.choice(MARCAS)
+        linea = aleatorio.choice(LINEAS)
+        variante = aleatorio.choice(variantes)
+        
+        if aleatorio.random() < proporcion_bajo_stock:
+            stock = aleatorio.randint(0, minimo)
+        else:
+            stock = min(int(minimo * aleatorio.paretovariate(1.2)) + 1, 50_000)
+        
+        creado = ahora - timedelta(seconds=aleatorio.randint(0, 730 * 86_400))
+        filas.append({
+            'nombre': f'{articulo} {marca} {linea} {variante}',
+            'descripcion': f'{articulo} de la línea {linea} de {marca}, presentación {variante}. Código {numero:07d}',
+            'precio': round(precio_tipico * math.exp(aleatorio.gauss(0, 0.6)), 2),
+            'cantidad_stock': stock,
+            'stock_minimo': minimo,
+            'categoria_id': categoria_id,
+            'proveedor_id': proveedor_id,
+            'fecha_creacion': creado,
+            'fecha_actualizacion': creado + timedelta(seconds=aleatorio.randint(0, int((ahora - creado).total_seconds())))
+        })
+    return filas
+
+
+def generar_catalogo(productos: int, categorias: int = 10, proveedores: int = 20, semilla: int = 42,
+                     proporcion_bajo_stock: float = 0.1, tamano_lote: int = 10_000,
+                     progreso: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+    """
+    Genera un catálogo sintético reproducible (misma semilla -> mismos datos)
+    Inserta con INSERT masivos por lotes (executemany) y un commit por lote, sin pasar
+    por entidades ni repositorios; requiere contexto de aplicación y tablas vacías
+    (los IDs quedan 1..N). Es el fixture de las pruebas de carga y benchmarks
+    """
+    if productos < 0 or categorias < 1 or proveedores < 1:
+        raise ValueError("Se requiere al menos una categoría y un proveedor")
+    if not 0 <= proporcion_bajo_stock <= 1:
+        raise ValueError("La proporción de stock bajo debe estar entre 0 y 1")
+    
+    aleatorio = random.Random(semilla)
+    ahora = datetime.utcnow().replace(microsecond=0)
+    
+    db.session.execute(insert(CategoriaModel.__table__), _filas_categorias(categorias, ahora))
+    db.session.execute(insert(ProveedorModel.__table__), _filas_proveedores(proveedores, aleatorio, ahora))
+    db.session.commit()
+    
+    pesos_categorias = _pesos_zipf(categorias)
+    pesos_proveedores = _pesos_zipf(proveedores)
+    bajo_stock = 0
+    for inicio in range(1, productos + 1, tamano_lote):
+        cantidad = min(tamano_lote, productos - inicio + 1)
+        filas = _filas_productos(cantidad, inicio, categorias, proveedores, proporcion_bajo_stock,
+                                 aleatorio, pesos_categorias, pesos_proveedores, ahora)
+        bajo_stock += sum(1 for fila in filas if fila['cantidad_stock'] <= fila['stock_minimo'])
+        db.session.execute(insert(ProductoModel.__table__), filas)
+        db.session.commit()
+        if progreso:
+            progreso(inicio + cantidad - 1, productos)
+    
+    return {
+        'categorias': categorias,
+        'proveedores': proveedores,
+        'productos': productos,
+        'bajo_stock': bajo_stock
+    }
+
+
+def init_data_sintetico(productos: int, categorias: int, proveedores: int, semilla: int,
+                        proporcion_bajo_stock: float, tamano_lote: int):
+    """Recrea la base de datos con un catálogo sintético a escala"""
+    app = create_app('development')
+    
+    with app.app_context():
+        reiniciar_esquema()
+        print("🗄️  Base de datos creada exitosamente")
+        print(f"\n📦 Generando {productos:,} productos ({categorias} categorías, "
+              f"{proveedores} proveedores, semilla {semilla})...")
+        
+        inicio = time.perf_counter()
+        
+        def progreso(insertados: int, total: int):
+            transcurrido = time.perf_counter() - inicio
+            print(f"   {insertados:>12,} / {total:,}  ({insertados / transcurrido:,.0f} filas/s)", end='\r')
+        
+        resumen = generar_catalogo(productos, categorias, proveedores, semilla,
+                                   proporcion_bajo_stock, tamano_lote, progreso)
+        
+        print(f"\n\n✅ Catálogo generado en {time.perf_counter() - inicio:.1f} s")
+        print(f"📊 Resumen:")
+        print(f"   - Categorías: {resumen['categorias']}")
+        print(f"   - Proveedores: {resumen['proveedores']}")
+        print(f"   - Productos: {resumen['productos']:,}")
+        print(f"   - Productos con stock bajo: {resumen['bajo_stock']:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inicializa la base de datos con datos de prueba')
+    parser.add_argument('--productos', type=int, help='Genera un catálogo sintético con N productos')
+    parser.add_argument('--categorias', type=int, default=10)
+    parser.add_argument('--proveedores', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42, help='Semilla (misma semilla -> mismos datos)')
+    parser.add_argument('--bajo-stock', type=float, default=0.1,
+                        help='Proporción de productos en o bajo stock_minimo (0.1 = 10 %%)')
+    parser.add_argument('--lote', type=int, default=10_000, help='Filas por INSERT masivo')
+    args = parser.parse_args()
+    
+    if args.productos is None:
+        init_data()
+    else:
+        init_data_sintetico(args.productos, args.categorias, args.proveedores, args.seed,
+                            args.bajo_stock, args.lote)
+
+
 if __name__ == '__main__':
-    init_data()
+    main()
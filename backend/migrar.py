@@ -0,0 +1,65 @@
+"""
+Migraciones de esquema (paso del despliegue)
+Se ejecuta una sola vez antes de iniciar gunicorn; los workers solo verifican la versión
+
+Uso:
+    python migrar.py            # aplica las migraciones pendientes
+    python migrar.py --estado   # muestra la versión actual y las migraciones pendientes
+"""
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from flask import Flask
+from config.config import config
+from app.data.database import db
+from app.data.migraciones import MIGRACIONES, VERSION_ESQUEMA, migrar, version_aplicada
+
+
+def crear_app_migraciones(nombre=None, config_overrides=None) -> Flask:
+    """
+    Aplicación mínima con la base de datos configurada (sin importar las capas de run.py)
+    También la usa la variante ASGI para migrar o verificar el esquema con el engine síncrono
+    """
+    if nombre is None:
+        nombre = os.environ.get('FLASK_ENV', 'development')
+    if nombre not in config:
+        nombre = 'development'
+    app = Flask(__name__)
+    app.config.from_object(config[nombre])
+    if config_overrides:
+        app.config.update(config_overrides)
+    db.init_app(app)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migraciones de esquema versionadas')
+    parser.add_argument('--estado', action='store_true', help='Solo muestra la versión y las pendientes')
+    args = parser.parse_args()
+    
+    app = crear_app_migraciones()
+    with app.app_context():
+        actual = version_aplicada()
+        pendientes = [(v, d) for v, d, _ in MIGRACIONES if v > actual]
+        print(f"🗄️  Esquema en la versión {actual} (la aplicación requiere la {VERSION_ESQUEMA})")
+        
+        if args.estado:
+            for version, descripcion in pendientes:
+                print(f"   ⏳ {version}: {descripcion}")
+            sys.exit(1 if pendientes else 0)
+        
+        if not pendientes:
+            print("✅ No hay migraciones pendientes")
+            return
+        for version in migrar():
+            descripcion = next(d for v, d in pendientes if v == version)
+            print(f"   ✓ {version}: {descripcion}")
+        print(f"✅ Esquema actualizado a la versión {version_aplicada()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,7 @@
 """
 Punto de entrada de la aplicación Flask
 Aquí se ensamblan todas las capas (Dependency Injection)
+La variante ASGI (API_MODO=async) se sirve con uvicorn a través de asgi.py
 """
 import os
 from dotenv import load_dotenv
@@ -8,42 +9,75 @@ from dotenv import load_dotenv
 # Cargar variables de entorno desde .env
 load_dotenv()
 
-from flask import Flask, jsonify
+from flask import Flask
 from flask_cors import CORS
-from config.config import config
+from config.config import binds_replica, config, opciones_motor
 from app.data.database import db, init_db
+from app.data.migraciones import migrar, verificar_esquema
 
 # Importar modelos para que SQLAlchemy los reconozca
 from app.data.models.categoria_model import CategoriaModel
 from app.data.models.proveedor_model import ProveedorModel
 from app.data.models.producto_model import ProductoModel
+from app.data.models.movimiento_stock_model import MovimientoStockModel
 
 # Importar repositorios (adaptadores)
 from app.data.repositories.categoria_repository import CategoriaRepository
 from app.data.repositories.proveedor_repository import ProveedorRepository
 from app.data.repositories.producto_repository import ProductoRepository
+from app.data.repositories.dashboard_repository import DashboardRepository
+from app.data.repositories.cache_repositories import CategoriaRepositoryCache, ProveedorRepositoryCache
+from app.data.repositories.libro_stock_repositories import ProductoRepositoryLibro, DashboardRepositoryLibro
+from app.data.compactador_stock import CompactadorStock
+from app.data.cache import CacheLRU
+from app.data.unit_of_work import SQLAlchemyUnitOfWork
+from app.data.busqueda.buscadores import BuscadorMemoria, crear_buscador
 
 # Importar casos de uso
 from app.core.use_cases.categoria_use_cases import CategoriaUseCases
 from app.core.use_cases.proveedor_use_cases import ProveedorUseCases
 from app.core.use_cases.producto_use_cases import ProductoUseCases
+from app.core.use_cases.dashboard_use_cases import DashboardUseCases
 
 # Importar APIs REST
 from app.web.api.categoria_api import create_categoria_api
 from app.web.api.proveedor_api import create_proveedor_api
 from app.web.api.producto_api import create_producto_api
+from app.web.api.dashboard_api import create_dashboard_api
+from app.web.json_provider import ProveedorJSONRapido
+from app.web.metricas import instalar_metricas
+from app.web.detector_consultas import instalar_detector_consultas
 
 
-def create_app(config_name=None):
-    """Factory para crear la aplicación Flask"""
+def create_app(config_name=None, config_overrides=None):
+    """
+    Factory para crear la aplicación
+    `config_overrides` permite ajustar valores de configuración (p. ej. la URI de la BD en benchmarks)
+    Con API_MODO='async' se arma la variante ASGI (Quart + SQLAlchemy asyncio) con las mismas capas
+    """
     # Detectar entorno automáticamente
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
         if config_name not in ['development', 'production']:
             config_name = 'development'
     
-    app = Flask(__name__)
+    modo = (config_overrides or {}).get('API_MODO', config[config_name].API_MODO)
+    if modo == 'async':
+        # Dependencia opcional: solo se importa al elegir la variante ASGI
+        from quart import Quart
+        app = Quart(__name__)
+    else:
+        app = Flask(__name__)
     app.config.from_object(config[config_name])
+    if config_overrides:
+        app.config.update(config_overrides)
+        # Si cambió la base de datos, las opciones del engine se recalculan para ese driver
+        if 'SQLALCHEMY_DATABASE_URI' in config_overrides and 'SQLALCHEMY_ENGINE_OPTIONS' not in config_overrides:
+            app.config['SQLALCHEMY_ENGINE_OPTIONS'] = opciones_motor(app.config['SQLALCHEMY_DATABASE_URI'])
+        if 'REPLICA_DATABASE_URL' in config_overrides and 'SQLALCHEMY_BINDS' not in config_overrides:
+            app.config['SQLALCHEMY_BINDS'] = binds_replica(app.config['REPLICA_DATABASE_URL'])
+    # Serialización JSON rápida (orjson si está instalado)
+    app.json = ProveedorJSONRapido(app)
     
     # Habilitar CORS para permitir peticiones desde React
     # En desarrollo: localhost, En producción: Railway
@@ -55,47 +89,217 @@ def create_app(config_name=None):
     # Permitir cualquier subdominio de Railway en producción
     if config_name == 'production':
         allowed_origins.append("https://*.railway.app")
+    origenes = [origin for origin in allowed_origins if origin]
     
-    CORS(app, origins=[origin for origin in allowed_origins if origin], supports_credentials=True)
+    if modo == 'async':
+        ensamblar_async(app, config_name, origenes)
+    else:
+        CORS(app, origins=origenes, supports_credentials=True)
+        ensamblar_sync(app)
     
+    # Ruta principal - redirige al frontend React
+    # (app.json.response es el jsonify de ambas variantes)
+    @app.route('/')
+    def index():
+        return app.json.response({
+            'message': 'Tienda Inventario API',
+            'version': '1.0.0',
+            'frontend': 'http://localhost:5173'
+        })
+    
+    return app
+
+
+def ensamblar_sync(app):
+    """Variante WSGI (Flask + Flask-SQLAlchemy): inyección de dependencias de todas las capas"""
     # Inicializar base de datos
     db.init_app(app)
     
     with app.app_context():
-        # Crear tablas si no existen
-        db.create_all()
+        # Esquema: en desarrollo y pruebas se migra al iniciar; en producción las migraciones
+        # son un paso del despliegue (python migrar.py) y aquí solo se verifica la versión
+        if app.config['MIGRAR_AL_INICIAR']:
+            migrar()
+        else:
+            verificar_esquema()
         
         # Inyección de dependencias (Wiring de las capas)
         # Capa de Datos: Repositorios
-        categoria_repo = CategoriaRepository()
-        proveedor_repo = ProveedorRepository()
-        producto_repo = ProductoRepository()
+        # Categorías y proveedores se leen mucho y cambian poco: se envuelven con caché
+        if app.config['CACHE_REPOSITORIOS_MAX_ENTRADAS'] > 0:
+            categoria_repo = CategoriaRepositoryCache(CategoriaRepository(), CacheLRU(
+                app.config['CACHE_REPOSITORIOS_MAX_ENTRADAS'], app.config['CACHE_REPOSITORIOS_TTL']
+            ))
+            proveedor_repo = ProveedorRepositoryCache(ProveedorRepository(), CacheLRU(
+                app.config['CACHE_REPOSITORIOS_MAX_ENTRADAS'], app.config['CACHE_REPOSITORIOS_TTL']
+            ))
+            app.extensions['cache_repositorios'] = {
+                'categorias': categoria_repo.cache,
+                'proveedores': proveedor_repo.cache
+            }
+        else:
+            categoria_repo = CategoriaRepository()
+            proveedor_repo = ProveedorRepository()
+            app.extensions['cache_repositorios'] = {}
+        # Stock en la fila del producto o en el libro de movimientos (snapshot + pendientes)
+        if app.config['STOCK_MODO'] == 'libro':
+            producto_repo = ProductoRepositoryLibro(app.config['STOCK_CUPOS'])
+            dashboard_repo = DashboardRepositoryLibro()
+        else:
+            producto_repo = ProductoRepository()
+            dashboard_repo = DashboardRepository()
+        
+        # Búsqueda de texto (índice en memoria, FULLTEXT o ninguna según configuración)
+        app_indices = app if app.config['BUSQUEDA_INDICE_EN_SEGUNDO_PLANO'] else None
+        buscador_productos = crear_buscador(
+            app.config['BUSQUEDA_BACKEND'], ProductoModel, [('nombre', 3.0), ('descripcion', 1.0)],
+            app.config['BUSQUEDA_INTERVALO_SINCRONIZACION'], app_indices
+        )
+        buscador_proveedores = crear_buscador(
+            app.config['BUSQUEDA_BACKEND'], ProveedorModel, [('nombre', 3.0), ('contacto', 1.0)],
+            app.config['BUSQUEDA_INTERVALO_SINCRONIZACION'], app_indices
+        )
+        # Índices en memoria: se construyen en un hilo por worker (gunicorn post_fork o la
+        # primera petición); hasta entonces las búsquedas usan LIKE y no esperan la carga
+        app.extensions['buscadores'] = [
+            b for b in (buscador_productos, buscador_proveedores) if isinstance(b, BuscadorMemoria)
+        ]
+        for buscador in app.extensions['buscadores']:
+            app.before_request(buscador.iniciar)
         
         # Capa de Negocio: Casos de uso
-        categoria_uc = CategoriaUseCases(categoria_repo)
-        proveedor_uc = ProveedorUseCases(proveedor_repo)
-        producto_uc = ProductoUseCases(producto_repo)
+        unit_of_work = SQLAlchemyUnitOfWork()
+        categoria_uc = CategoriaUseCases(categoria_repo, unit_of_work)
+        proveedor_uc = ProveedorUseCases(proveedor_repo, unit_of_work, buscador_proveedores)
+        producto_uc = ProductoUseCases(producto_repo, unit_of_work, buscador_productos)
+        dashboard_uc = DashboardUseCases(dashboard_repo)
         
         # Capa de API REST (para React)
         categoria_api = create_categoria_api(categoria_uc)
         proveedor_api = create_proveedor_api(proveedor_uc)
-        producto_api = create_producto_api(producto_uc, categoria_uc, proveedor_uc)
+        producto_api = create_producto_api(
+            producto_uc, categoria_uc, proveedor_uc, app.config['OPERACIONES_LOTE_HABILITADAS']
+        )
+        dashboard_api = create_dashboard_api(dashboard_uc)
         
         # Registrar blueprints de APIs REST
         app.register_blueprint(categoria_api)
         app.register_blueprint(proveedor_api)
         app.register_blueprint(producto_api)
+        app.register_blueprint(dashboard_api)
+        
+        # Compactador del libro: un hilo por worker, iniciado en su primera petición
+        if app.config['STOCK_MODO'] == 'libro' and app.config['STOCK_COMPACTAR_INTERVALO'] > 0:
+            compactador = CompactadorStock(
+                app, app.config['STOCK_COMPACTAR_INTERVALO'], app.config['STOCK_COMPACTAR_LOTE']
+            )
+            app.extensions['compactador_stock'] = compactador
+            app.before_request(compactador.iniciar)
+        
+        # Observabilidad: latencia por endpoint, SQL por petición y espera del pool
+        if app.config['METRICAS_HABILITADAS']:
+            instalar_metricas(app, *db.engines.values(), caches=app.extensions['cache_repositorios'])
+        # Desarrollo y pruebas: N+1 y consultas lentas (opción DETECTOR_CONSULTAS)
+        if app.config['DETECTOR_CONSULTAS']:
+            instalar_detector_consultas(app, *db.engines.values())
+
+
+def opciones_no_soportadas_async(configuracion) -> list[str]:
+    """
+    Opciones activas que solo implementa la variante WSGI, como 'OPCION=valor'
+    La variante ASGI se niega a arrancar con ellas en lugar de ignorarlas en silencio
+    """
+    activas = [
+        ('STOCK_MODO', configuracion['STOCK_MODO'] == 'libro'),
+        ('BUSQUEDA_BACKEND', configuracion['BUSQUEDA_BACKEND'] != 'ninguno'),
+        ('OPERACIONES_LOTE_HABILITADAS', configuracion['OPERACIONES_LOTE_HABILITADAS']),
+        ('METRICAS_HABILITADAS', configuracion['METRICAS_HABILITADAS']),
+        ('DETECTOR_CONSULTAS', configuracion['DETECTOR_CONSULTAS']),
+        ('CACHE_REPOSITORIOS_MAX_ENTRADAS', configuracion['CACHE_REPOSITORIOS_MAX_ENTRADAS'] > 0)
+    ]
+    no_soportadas = [
+        f"{opcion}={str(configuracion[opcion]).lower()}" for opcion, activa in activas if activa
+    ]
+    # La URL de la réplica no se muestra: puede incluir la contraseña
+    if configuracion['REPLICA_DATABASE_URL']:
+        no_soportadas.append('REPLICA_DATABASE_URL')
+    return no_soportadas
+
+
+def ensamblar_async(app, config_name, origenes):
+    """
+    Variante ASGI (Quart + SQLAlchemy asyncio): mismas capas con repositorios, unidad de trabajo
+    y casos de uso asyncio. Cubre el CRUD, los listados, el stock y el dashboard; la búsqueda,
+    las importaciones/exportaciones, los lotes de movimientos, el libro de stock, la caché de
+    repositorios, la réplica, /metrics y el detector de consultas siguen solo en la variante WSGI
+    """
+    import fnmatch
+    import re
+    from quart_cors import cors
+    from migrar import crear_app_migraciones
+    from app.data.database_async import crear_motor_async, crear_sesion_async
+    from app.data.repositories.categoria_repository_async import CategoriaRepositoryAsync
+    from app.data.repositories.proveedor_repository_async import ProveedorRepositoryAsync
+    from app.data.repositories.producto_repository_async import ProductoRepositoryAsync
+    from app.data.repositories.dashboard_repository_async import DashboardRepositoryAsync
+    from app.data.unit_of_work import SQLAlchemyUnitOfWorkAsync
+    from app.core.use_cases.categoria_use_cases_async import CategoriaUseCasesAsync
+    from app.core.use_cases.proveedor_use_cases_async import ProveedorUseCasesAsync
+    from app.core.use_cases.producto_use_cases_async import ProductoUseCasesAsync
+    from app.core.use_cases.dashboard_use_cases_async import DashboardUseCasesAsync
+    from app.web.api_async.categoria_api import create_categoria_api_async
+    from app.web.api_async.proveedor_api import create_proveedor_api_async
+    from app.web.api_async.producto_api import create_producto_api_async
+    from app.web.api_async.dashboard_api import create_dashboard_api_async
     
-    # Ruta principal - redirige al frontend React
-    @app.route('/')
-    def index():
-        return jsonify({
-            'message': 'Tienda Inventario API',
-            'version': '1.0.0',
-            'frontend': 'http://localhost:5173'
-        })
+    no_soportadas = opciones_no_soportadas_async(app.config)
+    if no_soportadas:
+        raise RuntimeError(
+            f"La variante ASGI no soporta: {', '.join(no_soportadas)}. "
+            "Use la variante WSGI o desactívelas (los valores por defecto de asgi.py las desactivan)"
+        )
     
-    return app
+    # quart-cors no interpreta comodines: los orígenes con '*' se convierten en expresiones regulares
+    cors(app, allow_origin=[
+        re.compile(fnmatch.translate(origen)) if '*' in origen else origen for origen in origenes
+    ], allow_credentials=True)
+    
+    # Esquema: mismo paso que en la variante WSGI, con el engine síncrono de una app mínima
+    app_esquema = crear_app_migraciones(config_name, {
+        'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'],
+        'SQLALCHEMY_ENGINE_OPTIONS': app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    })
+    with app_esquema.app_context():
+        if app.config['MIGRAR_AL_INICIAR']:
+            migrar()
+        else:
+            verificar_esquema()
+        db.engine.dispose()
+    
+    # Capa de Datos: engine asyncio (aiomysql / aiosqlite) y una AsyncSession por petición
+    motor = crear_motor_async(app.config['SQLALCHEMY_DATABASE_URI'], app.config['SQLALCHEMY_ENGINE_OPTIONS'])
+    sesion = crear_sesion_async(motor)
+    app.extensions['motor_async'] = motor
+    
+    @app.teardown_appcontext
+    async def cerrar_sesion(excepcion):
+        await sesion.remove()
+    
+    @app.after_serving
+    async def cerrar_motor():
+        await motor.dispose()
+    
+    unit_of_work = SQLAlchemyUnitOfWorkAsync(sesion)
+    categoria_uc = CategoriaUseCasesAsync(CategoriaRepositoryAsync(sesion), unit_of_work)
+    proveedor_uc = ProveedorUseCasesAsync(ProveedorRepositoryAsync(sesion), unit_of_work)
+    producto_uc = ProductoUseCasesAsync(ProductoRepositoryAsync(sesion), unit_of_work)
+    dashboard_uc = DashboardUseCasesAsync(DashboardRepositoryAsync(sesion))
+    
+    # Capa de API REST (mismas rutas y respuestas que la variante WSGI)
+    app.register_blueprint(create_categoria_api_async(categoria_uc))
+    app.register_blueprint(create_proveedor_api_async(proveedor_uc))
+    app.register_blueprint(create_producto_api_async(producto_uc))
+    app.register_blueprint(create_dashboard_api_async(dashboard_uc))
 
 
 if __name__ == '__main__':
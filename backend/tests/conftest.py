@@ -0,0 +1,91 @@
+"""
+Fixtures de las pruebas del backend (python -m pytest desde backend/)
+
+Cada prueba usa una base SQLite nueva en un directorio temporal. Con TEST_DATABASE_URL
+las pruebas corren contra esa base (MySQL/TiDB, PostgreSQL): se BORRA y se vuelve a
+crear al inicio de cada prueba
+"""
+import atexit
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import List, Tuple
+
+# run.py crea una aplicación al importarse: se apunta a una base temporal para no
+# tocar la base configurada en .env
+_DIRECTORIO_TEMPORAL = tempfile.mkdtemp(prefix='pruebas_')
+atexit.register(shutil.rmtree, _DIRECTORIO_TEMPORAL, ignore_errors=True)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_DIRECTORIO_TEMPORAL, 'run.db')}"
+
+import pytest  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from run import create_app  # noqa: E402
+from init_db import generar_catalogo  # noqa: E402
+from app.data.database import db  # noqa: E402
+from app.data.migraciones import reiniciar_esquema  # noqa: E402
+
+
+@pytest.fixture
+def crear_app(tmp_path):
+    """
+    Crea aplicaciones de prueba (create_app('testing')) sobre la misma base vacía y migrada
+    Los argumentos son overrides de configuración; varias aplicaciones en una prueba
+    simulan varios workers de gunicorn con la misma base
+    """
+    url = os.environ.get('TEST_DATABASE_URL') or f"sqlite:///{tmp_path / 'inventario.db'}"
+    apps = []
+    
+    def crear(**overrides):
+        app = create_app('testing', {'SQLALCHEMY_DATABASE_URI': url, 'METRICAS_HABILITADAS': False, **overrides})
+        if not apps and os.environ.get('TEST_DATABASE_URL'):
+            with app.app_context():
+                reiniciar_esquema()
+        apps.append(app)
+        return app
+    
+    yield crear
+    
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+
+
+@pytest.fixture
+def app(crear_app):
+    """Aplicación de prueba con la configuración de TestingConfig (detector de consultas activo)"""
+    return crear_app()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+def poblar_catalogo(app, productos: int, categorias: int = 3, proveedores: int = 3, semilla: int = 42) -> dict:
+    """Catálogo sintético de init_db.py (IDs 1..N); requiere tablas vacías"""
+    with app.app_context():
+        resumen = generar_catalogo(productos, categorias, proveedores, semilla)
+        db.session.remove()
+    return resumen
+
+
+@contextmanager
+def sentencias_sql(app):
+    """Registra las sentencias SQL (texto y parámetros) que ejecutan los engines de la aplicación"""
+    sentencias: List[Tuple[str, object]] = []
+    
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append((statement, parameters))
+    
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', registrar)
+    try:
+        yield sentencias
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', registrar)
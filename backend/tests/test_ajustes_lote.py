@@ -0,0 +1,77 @@
+"""
+Lotes de movimientos de stock (POST /api/productos/ajustes/lote) en NDJSON
+Una línea que no es JSON se reporta con su número sin detener el lote, y una sincronización
+de 10 000 movimientos se aplica completa con un número de sentencias que no depende del
+tamaño del lote (el tiempo se mide en benchmarks/casos.py, casos http.ajustes_lote_*)
+"""
+import json
+import random
+import pytest
+from tests.conftest import poblar_catalogo, sentencias_sql
+
+MODOS = ['directo', 'libro']
+
+PRODUCTOS = 50
+MOVIMIENTOS = 10000
+# Lectura con bloqueo + executemany (directo) o reserva por cupos e inserción (libro)
+MAX_SENTENCIAS = 10
+
+
+def stock_por_producto(app) -> dict:
+    """Stock de cada producto según la API (en modo libro incluye los movimientos pendientes)"""
+    productos = app.test_client().get('/api/productos/').get_json()['data']
+    return {producto['id']: producto['stock'] for producto in productos}
+
+
+def enviar_ndjson(cliente, lineas):
+    return cliente.post('/api/productos/ajustes/lote', data='\n'.join(lineas) + '\n',
+                        content_type='application/x-ndjson')
+
+
+def test_linea_que_no_es_json_se_reporta_con_su_numero(app, cliente):
+    poblar_catalogo(app, productos=3)
+    antes = stock_por_producto(app)
+    
+    respuesta = enviar_ndjson(cliente, [
+        '{"producto_id": 1, "delta": 4}',
+        '',
+        '{"producto_id": 2, "delta": ',
+        '[2, 1]',
+        '{"producto_id": "2", "delta": 1}',
+        '{"producto_id": 3, "delta": -1}'
+    ])
+    
+    assert respuesta.status_code == 200
+    datos = respuesta.get_json()['data']
+    assert (datos['aplicados'], datos['rechazados']) == (2, 3)
+    errores = {r['indice']: r['error'] for r in datos['resultados']}
+    assert errores[0] is None and errores[4] is None
+    assert errores[1].startswith('Línea 3: JSON inválido (')
+    assert errores[2] == 'Línea 4: Se esperaba un objeto {producto_id, delta}'
+    assert errores[3] == 'El producto_id debe ser un entero positivo'
+    
+    despues = stock_por_producto(app)
+    assert despues == {1: antes[1] + 4, 2: antes[2], 3: antes[3] - 1}
+
+
+@pytest.mark.parametrize('stock_modo', MODOS)
+def test_sincronizacion_de_10000_movimientos(crear_app, stock_modo):
+    app = crear_app(STOCK_MODO=stock_modo, STOCK_COMPACTAR_INTERVALO=0)
+    poblar_catalogo(app, productos=PRODUCTOS)
+    antes = stock_por_producto(app)
+    aleatorio = random.Random(7)
+    movimientos = [
+        {'producto_id': aleatorio.randint(1, PRODUCTOS), 'delta': aleatorio.randint(1, 5)}
+        for _ in range(MOVIMIENTOS)
+    ]
+    
+    with sentencias_sql(app) as sentencias:
+        respuesta = enviar_ndjson(app.test_client(), [json.dumps(m) for m in movimientos])
+    
+    assert respuesta.status_code == 200, respuesta.get_json()
+    assert respuesta.get_json()['data']['aplicados'] == MOVIMIENTOS
+    assert len(sentencias) <= MAX_SENTENCIAS, len(sentencias)
+    esperado = dict(antes)
+    for movimiento in movimientos:
+        esperado[movimiento['producto_id']] += movimiento['delta']
+    assert stock_por_producto(app) == esperado
@@ -0,0 +1,109 @@
+"""
+Búsqueda de productos con el índice en memoria: el índice se construye en un hilo
+de fondo y, mientras tanto, las búsquedas se responden con LIKE sin esperar la carga.
+Los productos borrados sin pasar por este worker no ocupan lugares del resultado
+"""
+import threading
+from sqlalchemy import delete
+from app.data.database import db
+from app.data.models.producto_model import ProductoModel
+from tests.conftest import poblar_catalogo
+
+
+def buscador_de_productos(app):
+    return next(b for b in app.extensions['buscadores'] if b.modelo.__tablename__ == 'productos')
+
+
+def nombres(respuesta) -> list:
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return [p['nombre'] for p in respuesta.get_json()['data']]
+
+
+def ids(respuesta) -> list:
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return [p['id'] for p in respuesta.get_json()['data']]
+
+
+def test_busqueda_no_espera_la_construccion_del_indice(crear_app):
+    app = crear_app(BUSQUEDA_INDICE_EN_SEGUNDO_PLANO=True)
+    poblar_catalogo(app, productos=50)
+    buscador = buscador_de_productos(app)
+    # La carga inicial queda detenida hasta que la prueba la libere
+    liberar = threading.Event()
+    cargar = buscador.indice.cargar
+    
+    def cargar_lento(documentos):
+        liberar.wait(10)
+        cargar(documentos)
+    
+    buscador.indice.cargar = cargar_lento
+    cliente = app.test_client()
+    
+    durante_la_carga = nombres(cliente.get('/api/productos/buscar?q=Aceite'))
+    
+    assert durante_la_carga and all('Aceite' in nombre for nombre in durante_la_carga)
+    assert len(buscador.indice) == 0
+    liberar.set()
+    with app.app_context():
+        buscador.sincronizar()  # espera a que el hilo termine (comparten el lock)
+    assert len(buscador.indice) == 50
+    con_indice = nombres(cliente.get('/api/productos/buscar?q=aceite'))
+    assert sorted(con_indice) == sorted(durante_la_carga)
+
+
+def test_busqueda_con_el_indice_construido(app):
+    # Sin segundo plano (TestingConfig) la primera búsqueda construye el índice
+    poblar_catalogo(app, productos=50)
+    
+    resultado = nombres(app.test_client().get('/api/productos/buscar?q=aceite oliva'))
+    
+    assert resultado and all('Aceite de oliva' in nombre for nombre in resultado)
+
+
+def test_busqueda_durante_la_carga_compara_por_comienzo_de_palabra(crear_app):
+    app = crear_app(BUSQUEDA_INDICE_EN_SEGUNDO_PLANO=True)
+    poblar_catalogo(app, productos=50)
+    buscador = buscador_de_productos(app)
+    liberar = threading.Event()
+    cargar = buscador.indice.cargar
+    
+    def cargar_lento(documentos):
+        liberar.wait(10)
+        cargar(documentos)
+    
+    buscador.indice.cargar = cargar_lento
+    cliente = app.test_client()
+    try:
+        # "liva" está dentro de "oliva" pero no es el comienzo de ninguna palabra
+        assert nombres(cliente.get('/api/productos/buscar?q=liva')) == []
+        assert nombres(cliente.get('/api/productos/buscar?q=oliv'))
+    finally:
+        liberar.set()
+
+
+def test_productos_borrados_por_otro_worker_no_ocupan_el_limite(app):
+    poblar_catalogo(app, productos=200)
+    cliente = app.test_client()
+    primeros = ids(cliente.get('/api/productos/buscar?q=pro&limite=5'))
+    assert len(primeros) == 5
+    # Otro worker borra los mejores resultados: este índice no se entera
+    with app.app_context():
+        db.session.execute(delete(ProductoModel).where(ProductoModel.id.in_(primeros)))
+        db.session.commit()
+    
+    resultado = ids(cliente.get('/api/productos/buscar?q=pro&limite=5'))
+    
+    assert len(resultado) == 5 and not set(resultado) & set(primeros)
+    assert len(buscador_de_productos(app).indice) == 195
+
+
+def test_productos_eliminados_con_su_categoria_no_aparecen(app):
+    poblar_catalogo(app, productos=200)
+    cliente = app.test_client()
+    assert ids(cliente.get('/api/productos/buscar?q=laptop&limite=50'))
+    
+    assert cliente.delete('/api/categorias/1').status_code == 200
+    
+    assert ids(cliente.get('/api/productos/buscar?q=laptop&limite=50')) == []
+    # La búsqueda quitó del índice los IDs que encontró borrados
+    assert buscador_de_productos(app).indice.buscar('laptop', 50) == []
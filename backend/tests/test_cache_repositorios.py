@@ -0,0 +1,87 @@
+"""
+Caché de lecturas de categorías y proveedores: invalidación al terminar la transacción,
+lecturas sin validador directas a la base y contadores de aciertos/fallos en /metrics
+"""
+from sqlalchemy import update
+from app.data.cache import CacheLRU
+from app.data.database import db
+from app.data.models.categoria_model import CategoriaModel
+from app.data.repositories.cache_repositories import CategoriaRepositoryCache
+from app.data.repositories.categoria_repository import CategoriaRepository
+from tests.conftest import poblar_catalogo
+
+
+def test_carga_concurrente_con_una_invalidacion_no_se_guarda():
+    cache = CacheLRU()
+    
+    def cargar_e_invalidar():
+        # Otra petición escribe (e invalida) mientras esta carga el valor previo
+        cache.invalidar()
+        return 'previo'
+    
+    assert cache.obtener_o_cargar('clave', cargar_e_invalidar) == 'previo'
+    assert cache.obtener_o_cargar('clave', lambda: 'nuevo') == 'nuevo'
+
+
+def test_escritura_confirmada_invalida_la_cache(app):
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    cache = app.extensions['cache_repositorios']['categorias']
+    cliente.get('/api/categorias/1')
+    
+    respuesta = cliente.put('/api/categorias/1', json={'nombre': 'Renombrada', 'descripcion': 'Nueva'})
+    
+    assert respuesta.status_code == 200
+    assert cache.estadisticas()['entradas'] == 0
+    assert cliente.get('/api/categorias/1').get_json()['data']['nombre'] == 'Renombrada'
+
+
+def test_aciertos_y_fallos_en_metrics(crear_app):
+    app = crear_app(METRICAS_HABILITADAS=True)
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    
+    cliente.get('/api/proveedores/1')
+    cliente.get('/api/proveedores/1')
+    
+    metricas = cliente.get('/metrics').get_data(as_text=True)
+    assert 'inventario_cache_consultas_total{cache="proveedores",resultado="acierto"}' in metricas
+    assert 'inventario_cache_consultas_total{cache="proveedores",resultado="fallo"}' in metricas
+
+
+def test_otro_worker_actualiza_y_no_se_envia_el_cuerpo_anterior_con_el_etag_nuevo(crear_app):
+    # Dos aplicaciones sobre la misma base: cada una con su caché, como dos workers
+    worker_a = crear_app()
+    worker_b = crear_app()
+    poblar_catalogo(worker_a, productos=5)
+    cliente_a = worker_a.test_client()
+    for ruta in ('/api/categorias/1', '/api/categorias/'):
+        cliente_a.get(ruta)
+    
+    respuesta = worker_b.test_client().put('/api/categorias/1', json={'nombre': 'Desde B', 'descripcion': ''})
+    assert respuesta.status_code == 200
+    
+    detalle = cliente_a.get('/api/categorias/1')
+    assert detalle.get_json()['data']['nombre'] == 'Desde B'
+    assert detalle.headers['ETag'] == worker_b.test_client().get('/api/categorias/1').headers['ETag']
+    listado = cliente_a.get('/api/categorias/')
+    assert 'Desde B' in [c['nombre'] for c in listado.get_json()['data']]
+
+
+def test_lectura_sin_validador_no_usa_la_cache(app):
+    poblar_catalogo(app, productos=5)
+    cache = app.extensions['cache_repositorios']['categorias']
+    repositorio = CategoriaRepositoryCache(CategoriaRepository(), cache)
+    with app.app_context():
+        repositorio.obtener_por_id(1)
+        repositorio.obtener_todos()
+        assert cache.estadisticas()['entradas'] == 0
+        # Otro worker renombra la categoría: sin validador se lee directo de la base
+        db.session.execute(update(CategoriaModel).where(CategoriaModel.id == 1).values(nombre='Desde B'))
+        db.session.commit()
+        assert repositorio.obtener_por_id(1).nombre == 'Desde B'
+    
+    with app.app_context():
+        repositorio.obtener_version(1)
+        repositorio.obtener_por_id(1)
+        assert cache.estadisticas()['entradas'] == 1
@@ -0,0 +1,124 @@
+"""
+Control de concurrencia optimista: PUT con If-Match (ETag del detalle)
+Dos ediciones con la misma versión leída: una se aplica y la otra recibe 412
+"""
+import threading
+import pytest
+from tests.conftest import poblar_catalogo, sentencias_sql
+
+PRODUCTO = {'nombre': 'Editado', 'descripcion': '', 'precio': 12.5, 'stock': 40, 'stock_minimo': 5,
+            'categoria_id': 1, 'proveedor_id': 1}
+PROVEEDOR = {'nombre': 'Editado', 'contacto': 'Ana Pérez', 'telefono': '999888777',
+             'email': 'ventas@prueba.com', 'direccion': 'Av. Lima 123'}
+RECURSOS = [
+    ('/api/productos/1', PRODUCTO),
+    ('/api/categorias/1', {'nombre': 'Editada', 'descripcion': ''}),
+    ('/api/proveedores/1', PROVEEDOR),
+]
+
+
+def puts_simultaneos(app, ruta: str, cuerpo: dict, etag: str, cantidad: int = 2) -> list:
+    """Envía `cantidad` PUT con el mismo If-Match a la vez; retorna los códigos de estado"""
+    estados = []
+    candado = threading.Lock()
+    barrera = threading.Barrier(cantidad)
+    
+    def editar(numero: int):
+        cliente = app.test_client()
+        barrera.wait()
+        respuesta = cliente.put(ruta, json={**cuerpo, 'nombre': f"{cuerpo['nombre']} {numero}"},
+                                headers={'If-Match': etag})
+        with candado:
+            estados.append(respuesta.status_code)
+    
+    hilos = [threading.Thread(target=editar, args=(i,)) for i in range(cantidad)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return estados
+
+
+@pytest.mark.parametrize('ruta, cuerpo', RECURSOS)
+def test_dos_put_concurrentes_con_la_misma_version(crear_app, ruta, cuerpo):
+    # Con el detector de consultas: ninguna sentencia espera más que el umbral de consulta lenta
+    app = crear_app()
+    poblar_catalogo(app, productos=5)
+    etag = app.test_client().get(ruta).headers['ETag']
+    
+    with sentencias_sql(app) as sentencias:
+        estados = puts_simultaneos(app, ruta, cuerpo, etag)
+    
+    assert sorted(estados) == [200, 412]
+    # Camino optimista: un UPDATE por PUT, sin bloqueos previos ni reintentos, y una lectura
+    # de la versión (el ETag nuevo del que gana, la causa del 412 del que pierde)
+    assert sorted(sql.split()[0].upper() for sql, _ in sentencias) == ['SELECT', 'SELECT', 'UPDATE', 'UPDATE']
+    assert not any('FOR UPDATE' in sql.upper() for sql, _ in sentencias)
+
+
+
+@pytest.mark.parametrize('ruta, cuerpo', RECURSOS)
+def test_etag_del_put_es_el_del_detalle(crear_app, ruta, cuerpo):
+    app = crear_app()
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    etag = cliente.get(ruta).headers['ETag']
+    
+    respuesta = cliente.put(ruta, json=cuerpo, headers={'If-Match': etag})
+    
+    assert respuesta.status_code == 200
+    etag_nuevo = respuesta.headers['ETag']
+    assert etag_nuevo != etag and not etag_nuevo.startswith('W/')
+    # El detalle siguiente tiene el mismo ETag: el cliente no necesita volver a leerlo
+    assert cliente.get(ruta, headers={'If-None-Match': etag_nuevo}).status_code == 304
+    # y sirve como If-Match de la siguiente edición
+    assert cliente.put(ruta, json={**cuerpo, 'nombre': 'Otra vez'},
+                       headers={'If-Match': etag_nuevo}).status_code == 200
+    assert cliente.put(ruta, json=cuerpo, headers={'If-Match': etag_nuevo}).status_code == 412
+
+def test_if_match_de_un_worker_con_cache_desactualizada(crear_app):
+    # Dos aplicaciones sobre la misma base: cada una con su caché, como dos workers
+    worker_a = crear_app()
+    worker_b = crear_app()
+    poblar_catalogo(worker_a, productos=5)
+    cliente_a = worker_a.test_client()
+    etag_leido = cliente_a.get('/api/categorias/1').headers['ETag']
+    
+    assert worker_b.test_client().put('/api/categorias/1', json={'nombre': 'Desde B', 'descripcion': ''},
+                                      headers={'If-Match': etag_leido}).status_code == 200
+    
+    # El worker A ya no entrega el cuerpo anterior con el ETag nuevo
+    detalle = cliente_a.get('/api/categorias/1')
+    assert detalle.get_json()['data']['nombre'] == 'Desde B'
+    # y una edición basada en la lectura anterior se rechaza
+    respuesta = cliente_a.put('/api/categorias/1', json={'nombre': 'Desde A', 'descripcion': ''},
+                              headers={'If-Match': etag_leido})
+    assert respuesta.status_code == 412
+    assert cliente_a.put('/api/categorias/1', json={'nombre': 'Desde A', 'descripcion': ''},
+                         headers={'If-Match': detalle.headers['ETag']}).status_code == 200
+
+
+def test_put_en_modo_libro_rechaza_un_stock_distinto_del_actual(crear_app):
+    app = crear_app(STOCK_MODO='libro', STOCK_COMPACTAR_INTERVALO=0)
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    detalle = cliente.get('/api/productos/1')
+    leido = detalle.get_json()['data']['stock']
+    
+    # Un ajuste registrado después de la lectura del formulario: la versión no cambia
+    assert cliente.post('/api/productos/1/stock', json={'delta': 7}).status_code == 200
+    respuesta = cliente.put('/api/productos/1', json={**PRODUCTO, 'stock': leido},
+                            headers={'If-Match': detalle.headers['ETag']})
+    
+    assert respuesta.status_code == 409
+    assert '/api/productos/1/stock' in respuesta.get_json()['error']
+    actual = cliente.get('/api/productos/1').get_json()['data']
+    assert actual['stock'] == leido + 7
+    assert actual['nombre'] != PRODUCTO['nombre']
+    
+    # Con el stock actual la edición se aplica y el stock queda igual
+    respuesta = cliente.put('/api/productos/1', json={**PRODUCTO, 'stock': leido + 7},
+                            headers={'If-Match': detalle.headers['ETag']})
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()['data']['stock'] == leido + 7
+    assert cliente.get('/api/productos/1').get_json()['data']['nombre'] == PRODUCTO['nombre']
@@ -0,0 +1,77 @@
+"""
+Consultas SQL por petición de lectura: la cantidad no depende de cuántas filas haya
+(los nombres de categoría y proveedor llegan con JOIN, sin una consulta por producto)
+"""
+from datetime import datetime
+import pytest
+from sqlalchemy import insert
+from app.data.database import db
+from app.data.models.categoria_model import CategoriaModel
+from app.data.models.proveedor_model import ProveedorModel
+from app.data.models.producto_model import ProductoModel
+from tests.conftest import poblar_catalogo, sentencias_sql
+
+RUTAS = [
+    '/api/productos/',
+    '/api/productos/?limit=1000',
+    '/api/productos/?fields=id,nombre,categoria_nombre,proveedor_nombre',
+    '/api/productos/1',
+    '/api/productos/bajo-stock',
+    '/api/dashboard/resumen',
+    '/api/categorias/',
+    '/api/categorias/?limit=50',
+    '/api/categorias/1',
+    '/api/proveedores/',
+    '/api/proveedores/?fields=id,nombre',
+    '/api/proveedores/1',
+]
+
+
+def agregar_filas(app, productos: int, categorias: int, proveedores: int):
+    """Agrega categorías y proveedores nuevos y productos repartidos entre todos ellos"""
+    ahora = datetime.utcnow()
+    with app.app_context():
+        inicio_categorias = db.session.query(db.func.max(CategoriaModel.id)).scalar()
+        inicio_proveedores = db.session.query(db.func.max(ProveedorModel.id)).scalar()
+        db.session.execute(insert(CategoriaModel.__table__), [
+            {'nombre': f'Categoría extra {i}', 'descripcion': '', 'fecha_creacion': ahora, 'fecha_actualizacion': ahora}
+            for i in range(categorias)
+        ])
+        db.session.execute(insert(ProveedorModel.__table__), [
+            {'nombre': f'Proveedor extra {i}', 'contacto': 'Ana Pérez', 'telefono': '999888777',
+             'email': f'ventas{i}@extra.com', 'direccion': 'Av. Lima 123',
+             'fecha_creacion': ahora, 'fecha_actualizacion': ahora}
+            for i in range(proveedores)
+        ])
+        db.session.execute(insert(ProductoModel.__table__), [
+            {'nombre': f'Producto extra {i}', 'descripcion': '', 'precio': 10.0,
+             'cantidad_stock': i % 20, 'stock_minimo': 10,
+             'categoria_id': inicio_categorias + 1 + i % categorias,
+             'proveedor_id': inicio_proveedores + 1 + i % proveedores,
+             'fecha_creacion': ahora, 'fecha_actualizacion': ahora}
+            for i in range(productos)
+        ])
+        db.session.commit()
+        db.session.remove()
+
+
+def consultas_de(app, ruta: str) -> int:
+    """Sentencias SQL que ejecuta una petición GET (sin If-None-Match ni caché de repositorios)"""
+    for cache in app.extensions['cache_repositorios'].values():
+        cache.invalidar()
+    cliente = app.test_client()
+    with sentencias_sql(app) as sentencias:
+        respuesta = cliente.get(ruta)
+    assert respuesta.status_code == 200, respuesta.get_json()
+    return len(sentencias)
+
+
+@pytest.mark.parametrize('ruta', RUTAS)
+def test_consultas_constantes_al_crecer_el_catalogo(app, ruta):
+    poblar_catalogo(app, productos=20, categorias=3, proveedores=3)
+    con_pocas_filas = consultas_de(app, ruta)
+    
+    agregar_filas(app, productos=600, categorias=30, proveedores=30)
+    con_muchas_filas = consultas_de(app, ruta)
+    
+    assert con_muchas_filas == con_pocas_filas
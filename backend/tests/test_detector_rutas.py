@@ -0,0 +1,85 @@
+"""
+Todas las rutas de los blueprints pasan por el detector de N+1 y consultas lentas
+
+Con create_app('testing') el detector lanza ConsultasSospechosasError; además se
+falla ante cualquier warning del log y se revisan las sentencias emitidas al consumir
+el cuerpo completo (las exportaciones en streaming terminan después de after_request).
+Una ruta nueva sin caso en PETICIONES hace fallar la prueba
+"""
+import logging
+from collections import Counter
+import pytest
+from tests.conftest import poblar_catalogo, sentencias_sql
+from app.web.detector_consultas import normalizar_sql
+
+PRODUCTOS = 60
+MAX_REPETICIONES = 3
+
+PRODUCTO = {'nombre': 'Producto de prueba', 'descripcion': 'Detector', 'precio': 10.5, 'stock': 30,
+            'stock_minimo': 5, 'categoria_id': 1, 'proveedor_id': 1}
+PROVEEDOR = {'nombre': 'Proveedor de prueba', 'contacto': 'Ana Pérez', 'telefono': '999888777',
+             'email': 'ventas@prueba.com', 'direccion': 'Av. Lima 123'}
+CSV_IMPORTACION = 'nombre,descripcion,precio,stock,stock_minimo,categoria_id,proveedor_id\n' + ''.join(
+    f'Importado {i},Fila {i},{i + 1}.5,{i},5,{i % 3 + 1},{i % 3 + 1}\n' for i in range(20)
+)
+
+# (endpoint, método, URL, argumentos del cliente, estado esperado), en orden de ejecución:
+# las escrituras crean la categoría y el proveedor 4 y el producto PRODUCTOS + 1, y los
+# DELETE del final los eliminan
+PETICIONES = [
+    ('categoria_api.listar', 'GET', '/api/categorias/', {}, 200),
+    ('categoria_api.listar', 'GET', '/api/categorias/?limit=2&fields=id,nombre', {}, 200),
+    ('categoria_api.obtener', 'GET', '/api/categorias/1', {}, 200),
+    ('proveedor_api.listar', 'GET', '/api/proveedores/', {}, 200),
+    ('proveedor_api.buscar', 'GET', '/api/proveedores/buscar?q=a', {}, 200),
+    ('proveedor_api.obtener', 'GET', '/api/proveedores/1', {}, 200),
+    ('producto_api.listar', 'GET', '/api/productos/', {}, 200),
+    ('producto_api.listar', 'GET', '/api/productos/?limit=20&fields=id,nombre,categoria_nombre', {}, 200),
+    ('producto_api.buscar', 'GET', '/api/productos/buscar?q=a', {}, 200),
+    ('producto_api.obtener', 'GET', '/api/productos/1', {}, 200),
+    ('producto_api.bajo_stock', 'GET', '/api/productos/bajo-stock', {}, 200),
+    ('producto_api.exportar', 'GET', '/api/productos/export', {}, 200),
+    ('producto_api.exportar', 'GET', '/api/productos/export?format=ndjson', {}, 200),
+    ('dashboard_api.resumen', 'GET', '/api/dashboard/resumen', {}, 200),
+    ('categoria_api.crear', 'POST', '/api/categorias/', {'json': {'nombre': 'Nueva', 'descripcion': ''}}, 201),
+    ('proveedor_api.crear', 'POST', '/api/proveedores/', {'json': PROVEEDOR}, 201),
+    ('producto_api.crear', 'POST', '/api/productos/', {'json': PRODUCTO}, 201),
+    ('categoria_api.actualizar', 'PUT', '/api/categorias/4', {'json': {'nombre': 'Editada', 'descripcion': ''}}, 200),
+    ('proveedor_api.actualizar', 'PUT', '/api/proveedores/4', {'json': {**PROVEEDOR, 'nombre': 'Editado'}}, 200),
+    ('producto_api.actualizar', 'PUT', f'/api/productos/{PRODUCTOS + 1}',
+     {'json': {**PRODUCTO, 'nombre': 'Editado'}}, 200),
+    ('producto_api.ajustar_stock', 'POST', '/api/productos/1/stock', {'json': {'delta': 1}}, 200),
+    ('producto_api.ajustar_stock_lote', 'POST', '/api/productos/ajustes/lote',
+     {'json': [{'producto_id': i % 10 + 1, 'delta': 1} for i in range(30)]}, 200),
+    ('producto_api.importar', 'POST', '/api/productos/importar',
+     {'data': CSV_IMPORTACION, 'content_type': 'text/csv'}, 200),
+    ('producto_api.eliminar', 'DELETE', f'/api/productos/{PRODUCTOS + 1}', {}, 200),
+    ('categoria_api.eliminar', 'DELETE', '/api/categorias/4', {}, 200),
+    ('proveedor_api.eliminar', 'DELETE', '/api/proveedores/4', {}, 200),
+]
+
+
+def formas_repetidas(sentencias) -> dict:
+    """Formas de sentencia que se repiten más de MAX_REPETICIONES veces (sin contar executemany)"""
+    conteo = Counter(normalizar_sql(s) for s, parametros in sentencias if not isinstance(parametros, list))
+    return {forma: veces for forma, veces in conteo.items() if veces > MAX_REPETICIONES}
+
+
+@pytest.mark.parametrize('stock_modo', ['directo', 'libro'])
+def test_todas_las_rutas_pasan_el_detector(crear_app, caplog, stock_modo):
+    app = crear_app(DETECTOR_CONSULTAS_MAX_REPETICIONES=MAX_REPETICIONES, STOCK_MODO=stock_modo,
+                    STOCK_COMPACTAR_INTERVALO=0)
+    poblar_catalogo(app, productos=PRODUCTOS)
+    cliente = app.test_client()
+    endpoints = {regla.endpoint for regla in app.url_map.iter_rules() if '.' in regla.endpoint}
+    assert endpoints == {endpoint for endpoint, *_ in PETICIONES}, 'Agregar un caso para cada ruta nueva'
+    
+    caplog.set_level(logging.WARNING)
+    for endpoint, metodo, url, argumentos, estado in PETICIONES:
+        with sentencias_sql(app) as sentencias:
+            respuesta = cliente.open(url, method=metodo, **argumentos)
+            respuesta.get_data()
+        
+        assert respuesta.status_code == estado, (metodo, url, respuesta.get_data(as_text=True))
+        assert formas_repetidas(sentencias) == {}, (metodo, url)
+    assert [r.getMessage() for r in caplog.records] == []
@@ -0,0 +1,46 @@
+"""
+ETag de los listados: cambia con cada edición aunque la fecha de modificación
+no cambie (DATETIME de MySQL guarda segundos: dos ediciones en el mismo segundo)
+"""
+import pytest
+from sqlalchemy import update
+from app.data.database import db
+from app.data.models.categoria_model import CategoriaModel
+from app.data.models.proveedor_model import ProveedorModel
+from app.data.models.producto_model import ProductoModel
+from tests.conftest import poblar_catalogo
+
+CASOS = [
+    ('/api/productos/', ProductoModel),
+    ('/api/productos/', CategoriaModel),
+    ('/api/productos/', ProveedorModel),
+    ('/api/categorias/', CategoriaModel),
+    ('/api/proveedores/', ProveedorModel),
+]
+
+
+def editar_en_el_mismo_segundo(app, modelo):
+    """Edita la fila 1 como lo haría un PUT, pero sin mover fecha_actualizacion"""
+    with app.app_context():
+        db.session.execute(
+            update(modelo).where(modelo.id == 1).values(
+                nombre=modelo.nombre + ' (editado)',
+                version=modelo.version + 1,
+                fecha_actualizacion=modelo.fecha_actualizacion
+            )
+        )
+        db.session.commit()
+        db.session.remove()
+
+
+@pytest.mark.parametrize('ruta, modelo', CASOS)
+def test_etag_cambia_con_ediciones_en_el_mismo_segundo(app, ruta, modelo):
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    etag = cliente.get(ruta).headers['ETag']
+    
+    editar_en_el_mismo_segundo(app, modelo)
+    respuesta = cliente.get(ruta, headers={'If-None-Match': etag})
+    
+    assert respuesta.status_code == 200
+    assert respuesta.headers['ETag'] != etag
@@ -0,0 +1,63 @@
+"""
+Planes de ejecución: las consultas filtradas por deficit, categoria_id y
+fecha_actualizacion usan sus índices en lugar de recorrer la tabla
+
+Se ejecuta EXPLAIN sobre las mismas sentencias (texto y parámetros) que envía la
+aplicación. En PostgreSQL se desactiva el recorrido secuencial para que el plan
+no dependa del tamaño de la tabla de prueba
+"""
+from app.data.busqueda.buscadores import BuscadorMemoria
+from app.data.database import db
+from app.data.models.producto_model import ProductoModel
+from app.data.repositories.producto_repository import ProductoRepository
+from tests.conftest import poblar_catalogo, sentencias_sql
+
+
+def plan_de(app, sentencia: str, parametros) -> str:
+    """Plan de ejecución de una sentencia capturada, como texto"""
+    with app.app_context():
+        with db.engine.connect() as conexion:
+            dialecto = conexion.dialect.name
+            if dialecto == 'sqlite':
+                prefijo = 'EXPLAIN QUERY PLAN '
+            else:
+                prefijo = 'EXPLAIN '
+                if dialecto == 'postgresql':
+                    conexion.exec_driver_sql('SET enable_seqscan = off')
+            filas = conexion.exec_driver_sql(prefijo + sentencia, parametros).fetchall()
+    return '\n'.join(' '.join(str(valor) for valor in fila) for fila in filas)
+
+
+def sentencia_con(sentencias, fragmento: str):
+    """Primera sentencia capturada que contiene el fragmento"""
+    return next((s, p) for s, p in sentencias if fragmento in s)
+
+
+def test_bajo_stock_usa_el_indice_de_deficit(app):
+    poblar_catalogo(app, productos=200)
+    with sentencias_sql(app) as sentencias:
+        assert app.test_client().get('/api/productos/bajo-stock').status_code == 200
+    
+    assert 'ix_productos_deficit' in plan_de(app, *sentencia_con(sentencias, 'deficit >='))
+
+
+def test_productos_por_categoria_usa_el_indice_de_categoria(app):
+    poblar_catalogo(app, productos=200)
+    with app.app_context():
+        with sentencias_sql(app) as sentencias:
+            ProductoRepository().obtener_por_categoria(2)
+        db.session.remove()
+    
+    assert 'ix_productos_categoria_id' in plan_de(app, *sentencia_con(sentencias, 'categoria_id ='))
+
+
+def test_sincronizacion_del_buscador_usa_el_indice_de_fecha(app):
+    poblar_catalogo(app, productos=200)
+    buscador = BuscadorMemoria(ProductoModel, [('nombre', 1.0)])
+    with app.app_context():
+        buscador.sincronizar()
+        with sentencias_sql(app) as sentencias:
+            buscador.sincronizar()
+        db.session.remove()
+    
+    assert 'ix_productos_fecha_actualizacion' in plan_de(app, *sentencia_con(sentencias, 'fecha_actualizacion >='))
@@ -0,0 +1,161 @@
+"""
+Ajustes de stock concurrentes por HTTP (POST /api/productos/<id>/stock)
+Varios hilos ajustan el mismo producto a la vez: el stock final debe ser el inicial
+más los ajustes aceptados (sin actualizaciones perdidas) y nunca quedar negativo, con
+el stock en la fila del producto (directo) y en el libro de movimientos (libro)
+
+El rendimiento se comprueba con el escenario de benchmarks/stock_concurrente.py acortado:
+un piso de ajustes por segundo que detecta una serialización o un bloqueo nuevo
+"""
+import os
+import random
+import threading
+import pytest
+from benchmarks import stock_concurrente
+from sqlalchemy import func, select
+from app.data.database import db
+from app.data.models.movimiento_stock_model import MovimientoStockArchivadoModel, MovimientoStockModel
+from tests.conftest import poblar_catalogo, sentencias_sql
+
+MODOS = ['directo', 'libro']
+
+STOCK_INICIAL = 20
+HILOS = 8
+AJUSTES_POR_HILO = 25
+
+# Piso de ajustes/s del escenario de benchmarks/stock_concurrente.py (8 hilos, 1 producto
+# caliente, 1 s). Referencia: unos 400 ajustes/s en SQLite y 480-570 en PostgreSQL 16 en
+# 1 CPU; el piso deja margen para máquinas de CI lentas
+AJUSTES_POR_SEGUNDO_MINIMO = 50
+
+
+def ajustar_en_paralelo(app, producto_id: int) -> dict:
+    """Cada hilo envía ajustes de -1 (mayoría) y +1; retorna los deltas aceptados y los errores"""
+    aceptados = []
+    errores = []
+    candado = threading.Lock()
+    barrera = threading.Barrier(HILOS)
+    
+    def trabajador(semilla: int):
+        aleatorio = random.Random(semilla)
+        cliente = app.test_client()
+        propios = []
+        barrera.wait()
+        for _ in range(AJUSTES_POR_HILO):
+            delta = 1 if aleatorio.random() < 0.3 else -1
+            try:
+                respuesta = cliente.post(f'/api/productos/{producto_id}/stock', json={'delta': delta})
+            except Exception as e:
+                with candado:
+                    errores.append(repr(e))
+                continue
+            if respuesta.status_code == 200:
+                propios.append(delta)
+            elif respuesta.get_json()['error'] != 'Stock insuficiente para realizar la operación':
+                with candado:
+                    errores.append(respuesta.get_json()['error'])
+        with candado:
+            aceptados.extend(propios)
+    
+    hilos = [threading.Thread(target=trabajador, args=(i,)) for i in range(HILOS)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    return {'aceptados': aceptados, 'errores': errores}
+
+
+def stock_de(app, producto_id: int) -> int:
+    return app.test_client().get(f'/api/productos/{producto_id}').get_json()['data']['stock']
+
+
+@pytest.mark.parametrize('stock_modo', MODOS)
+def test_ajustes_concurrentes_sin_perdidas_ni_stock_negativo(crear_app, stock_modo):
+    # Sin detector de consultas: la espera por el bloqueo de la fila cuenta como consulta lenta
+    app = crear_app(DETECTOR_CONSULTAS=False, STOCK_MODO=stock_modo, STOCK_COMPACTAR_INTERVALO=0)
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    actual = stock_de(app, 1)
+    assert cliente.post('/api/productos/1/stock', json={'delta': STOCK_INICIAL - actual}).status_code == 200
+    
+    resultado = ajustar_en_paralelo(app, 1)
+    
+    assert resultado['errores'] == []
+    final = stock_de(app, 1)
+    # Sin actualizaciones perdidas: cada ajuste aceptado quedó aplicado
+    assert final == STOCK_INICIAL + sum(resultado['aceptados'])
+    assert final >= 0
+    # La mayoría de los hilos descuenta: la regla de stock no negativo tuvo que rechazar ajustes
+    assert len(resultado['aceptados']) < HILOS * AJUSTES_POR_HILO
+
+
+@pytest.mark.parametrize('stock_modo', MODOS)
+def test_ajuste_que_dejaria_stock_negativo_se_rechaza(crear_app, stock_modo):
+    app = crear_app(STOCK_MODO=stock_modo, STOCK_COMPACTAR_INTERVALO=0)
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    actual = stock_de(app, 1)
+    
+    respuesta = cliente.post('/api/productos/1/stock', json={'delta': -(actual + 1)})
+    
+    assert respuesta.status_code == 400
+    assert stock_de(app, 1) == actual
+    assert cliente.post('/api/productos/999/stock', json={'delta': 1}).status_code == 404
+
+
+def test_descuento_con_cupo_disponible_no_bloquea_ni_suma_pendientes(crear_app):
+    app = crear_app(STOCK_MODO='libro', STOCK_COMPACTAR_INTERVALO=0, STOCK_CUPOS=4)
+    poblar_catalogo(app, productos=5)
+    cliente = app.test_client()
+    # El primer descuento reparte el stock en los cupos (camino con bloqueo)
+    assert cliente.post('/api/productos/1/stock', json={'delta': 100}).status_code == 200
+    assert cliente.post('/api/productos/1/stock', json={'delta': -1}).status_code == 200
+    
+    with sentencias_sql(app) as sentencias:
+        assert cliente.post('/api/productos/1/stock', json={'delta': -1}).status_code == 200
+    
+    # Un UPDATE condicional del cupo y el INSERT del movimiento: sin FOR UPDATE ni SUM
+    assert [sql.split()[:3] for sql, _ in sentencias] == [
+        ['UPDATE', 'stock_cupos', 'SET'], ['INSERT', 'INTO', 'movimientos_stock']
+    ]
+
+
+def contar(app, modelo, producto_id: int) -> int:
+    with app.app_context():
+        cantidad = db.session.execute(
+            select(func.count()).select_from(modelo).where(modelo.producto_id == producto_id)
+        ).scalar()
+        db.session.remove()
+    return cantidad
+
+
+def test_eliminar_producto_o_categoria_archiva_sus_movimientos(crear_app):
+    app = crear_app(STOCK_MODO='libro', STOCK_COMPACTAR_INTERVALO=0)
+    poblar_catalogo(app, productos=6)
+    cliente = app.test_client()
+    for producto_id in (1, 2):
+        for delta in (5, -2):
+            assert cliente.post(f'/api/productos/{producto_id}/stock', json={'delta': delta}).status_code == 200
+    categoria_id = cliente.get('/api/productos/2').get_json()['data']['categoria_id']
+    
+    assert cliente.delete('/api/productos/1').status_code == 200
+    assert cliente.delete(f'/api/categorias/{categoria_id}').status_code == 200
+    
+    for producto_id in (1, 2):
+        assert contar(app, MovimientoStockModel, producto_id) == 0
+        assert contar(app, MovimientoStockArchivadoModel, producto_id) == 2
+
+
+@pytest.mark.parametrize('stock_modo', MODOS)
+def test_escenario_de_benchmark_supera_el_piso_de_ajustes_por_segundo(tmp_path, monkeypatch, stock_modo):
+    # benchmarks.stock_concurrente.crear_app cambia DATABASE_URL: monkeypatch lo restaura
+    url = os.environ.get('TEST_DATABASE_URL') or f"sqlite:///{tmp_path / 'stock.db'}"
+    monkeypatch.setenv('DATABASE_URL', url)
+    app = stock_concurrente.crear_app(url, stock_modo, HILOS, latencia_ms=0)
+    stock_concurrente.preparar_datos(app, productos=20, calientes=1)
+    
+    medicion = stock_concurrente.medir(app, stock_modo, HILOS, duracion=1, calientes=1)
+    
+    assert medicion['errores'] == 0
+    assert medicion['consistente']
+    assert medicion['ajustes_por_segundo'] >= AJUSTES_POR_SEGUNDO_MINIMO, medicion
@@ -0,0 +1,49 @@
+"""
+La variante ASGI (API_MODO=async) no arranca con opciones que solo implementa la WSGI
+
+Cada opción activa se rechaza por separado y el mensaje la nombra; con todas desactivadas
+(los valores por defecto de asgi.py) se arma la aplicación
+"""
+import pytest
+from run import create_app
+
+pytest.importorskip('quart')
+pytest.importorskip('aiosqlite')
+
+# Configuración que la variante ASGI admite
+SOPORTADA = {
+    'API_MODO': 'async',
+    'STOCK_MODO': 'directo',
+    'BUSQUEDA_BACKEND': 'ninguno',
+    'OPERACIONES_LOTE_HABILITADAS': False,
+    'METRICAS_HABILITADAS': False,
+    'DETECTOR_CONSULTAS': False,
+    'CACHE_REPOSITORIOS_MAX_ENTRADAS': 0,
+    'REPLICA_DATABASE_URL': None
+}
+
+
+@pytest.mark.parametrize('opcion, valor', [
+    ('STOCK_MODO', 'libro'),
+    ('BUSQUEDA_BACKEND', 'memoria'),
+    ('BUSQUEDA_BACKEND', 'fulltext'),
+    ('OPERACIONES_LOTE_HABILITADAS', True),
+    ('METRICAS_HABILITADAS', True),
+    ('DETECTOR_CONSULTAS', True),
+    ('CACHE_REPOSITORIOS_MAX_ENTRADAS', 1024),
+    ('REPLICA_DATABASE_URL', 'sqlite:///replica.db')
+])
+def test_async_rechaza_opciones_solo_wsgi(tmp_path, opcion, valor):
+    configuracion = {**SOPORTADA, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'inventario.db'}",
+                     opcion: valor}
+    
+    with pytest.raises(RuntimeError, match=f'La variante ASGI no soporta: {opcion}'):
+        create_app('testing', configuracion)
+
+
+def test_async_arranca_sin_opciones_solo_wsgi(tmp_path):
+    app = create_app('testing', {**SOPORTADA, 'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'inventario.db'}"})
+    
+    rutas = {regla.rule for regla in app.url_map.iter_rules()}
+    assert '/api/productos/<int:id>/stock' in rutas
+    assert not {'/api/productos/importar', '/api/productos/export', '/api/productos/ajustes/lote'} & rutas
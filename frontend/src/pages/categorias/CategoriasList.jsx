@@ -11,6 +11,7 @@ const CategoriasList = () => {
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
   const [editingId, setEditingId] = useState(null);
+  const [editingVersion, setEditingVersion] = useState(null);
   const [formData, setFormData] = useState({ nombre: '', descripcion: '' });
 
   useEffect(() => {
@@ -35,21 +36,26 @@ const CategoriasList = () => {
     e.preventDefault();
     try {
       if (editingId) {
-        await categoriasAPI.update(editingId, formData);
+        await categoriasAPI.update(editingId, formData, editingVersion);
       } else {
         await categoriasAPI.create(formData);
       }
-      setShowForm(false);
-      setEditingId(null);
-      setFormData({ nombre: '', descripcion: '' });
+      handleCancel();
       fetchCategorias();
     } catch (err) {
+      if (err.response?.status === 412) {
+        alert('Otro usuario modificó esta categoría. Se recargó la lista; vuelve a editarla.');
+        handleCancel();
+        fetchCategorias();
+        return;
+      }
       alert('Error al guardar categoría');
     }
   };
 
   const handleEdit = (categoria) => {
     setEditingId(categoria.id);
+    setEditingVersion(categoria.version);
     setFormData({ nombre: categoria.nombre, descripcion: categoria.descripcion });
     setShowForm(true);
   };
@@ -68,6 +74,7 @@ const CategoriasList = () => {
   const handleCancel = () => {
     setShowForm(false);
     setEditingId(null);
+    setEditingVersion(null);
     setFormData({ nombre: '', descripcion: '' });
   };
 
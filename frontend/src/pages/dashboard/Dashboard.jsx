@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import { motionTokens } from '../../utils/motionTokens';
-import { productosAPI, categoriasAPI, proveedoresAPI } from '../../services/api';
+import { dashboardAPI } from '../../services/api';
 import Card from '../../components/Card';
 import Button from '../../components/Button';
 import './Dashboard.css';
@@ -24,18 +24,15 @@ const Dashboard = () => {
   const fetchStats = async () => {
     try {
       setLoading(true);
-      const [productosRes, categoriasRes, proveedoresRes, bajoStockRes] = await Promise.all([
-        productosAPI.getAll(),
-        categoriasAPI.getAll(),
-        proveedoresAPI.getAll(),
-        productosAPI.getBajoStock()
-      ]);
+      // Los indicadores se calculan en el servidor con agregados SQL
+      const response = await dashboardAPI.getResumen();
+      const resumen = response.data.data || {};
 
       setStats({
-        totalProductos: productosRes.data.data?.length || 0,
-        productosBajoStock: bajoStockRes.data.data?.length || 0,
-        totalCategorias: categoriasRes.data.data?.length || 0,
-        totalProveedores: proveedoresRes.data.data?.length || 0
+        totalProductos: resumen.total_productos || 0,
+        productosBajoStock: resumen.productos_bajo_stock || 0,
+        totalCategorias: resumen.total_categorias || 0,
+        totalProveedores: resumen.total_proveedores || 0
       });
     } catch (err) {
       console.error('Error al cargar estadísticas:', err);
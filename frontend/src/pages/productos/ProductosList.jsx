@@ -24,6 +24,7 @@ const ProductosList = () => {
   const [error, setError] = useState(null);
   const [showForm, setShowForm] = useState(false);
   const [editingId, setEditingId] = useState(null);
+  const [editingVersion, setEditingVersion] = useState(null);
   const [detailId, setDetailId] = useState(null);
   const [formData, setFormData] = useState(emptyForm);
 
@@ -78,13 +79,19 @@ const ProductosList = () => {
         proveedor_id: parseInt(formData.proveedor_id)
       };
       if (editingId) {
-        await productosAPI.update(editingId, payload);
+        await productosAPI.update(editingId, payload, editingVersion);
       } else {
         await productosAPI.create(payload);
       }
       handleCancel();
       fetchProductos();
     } catch (err) {
+      if (err.response?.status === 412) {
+        alert('Otro usuario modificó este producto. Se recargó la lista; vuelve a editarlo.');
+        handleCancel();
+        fetchProductos();
+        return;
+      }
       alert('Error al guardar producto');
       console.error(err);
     }
@@ -92,6 +99,7 @@ const ProductosList = () => {
 
   const handleEdit = (producto) => {
     setEditingId(producto.id);
+    setEditingVersion(producto.version);
     setDetailId(null);
     setFormData({
       nombre: producto.nombre,
@@ -120,6 +128,7 @@ const ProductosList = () => {
   const handleCancel = () => {
     setShowForm(false);
     setEditingId(null);
+    setEditingVersion(null);
     setFormData(emptyForm);
   };
 
@@ -11,6 +11,7 @@ const ProveedoresList = () => {
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
   const [editingId, setEditingId] = useState(null);
+  const [editingVersion, setEditingVersion] = useState(null);
   const [formData, setFormData] = useState({
     nombre: '',
     contacto: '',
@@ -41,15 +42,19 @@ const ProveedoresList = () => {
     e.preventDefault();
     try {
       if (editingId) {
-        await proveedoresAPI.update(editingId, formData);
+        await proveedoresAPI.update(editingId, formData, editingVersion);
       } else {
         await proveedoresAPI.create(formData);
       }
-      setShowForm(false);
-      setEditingId(null);
-      resetForm();
+      handleCancel();
       fetchProveedores();
     } catch (err) {
+      if (err.response?.status === 412) {
+        alert('Otro usuario modificó este proveedor. Se recargó la lista; vuelve a editarlo.');
+        handleCancel();
+        fetchProveedores();
+        return;
+      }
       alert('Error al guardar proveedor');
     }
   };
@@ -66,6 +71,7 @@ const ProveedoresList = () => {
 
   const handleEdit = (proveedor) => {
     setEditingId(proveedor.id);
+    setEditingVersion(proveedor.version);
     setFormData({
       nombre: proveedor.nombre,
       contacto: proveedor.contacto,
@@ -90,6 +96,7 @@ const ProveedoresList = () => {
   const handleCancel = () => {
     setShowForm(false);
     setEditingId(null);
+    setEditingVersion(null);
     resetForm();
   };
 
@@ -19,13 +19,16 @@ api.interceptors.response.use(
   }
 );
 
+// If-Match con la versión leída: si otro usuario modificó el registro, el backend responde 412
+const conVersion = (version) => (version != null ? { headers: { 'If-Match': `"${version}"` } } : undefined);
+
 // ========== PRODUCTOS ==========
 export const productosAPI = {
   getAll: () => api.get('/productos/'),
   getById: (id) => api.get(`/productos/${id}`),
   getBajoStock: () => api.get('/productos/bajo-stock'),
   create: (data) => api.post('/productos/', data),
-  update: (id, data) => api.put(`/productos/${id}`, data),
+  update: (id, data, version) => api.put(`/productos/${id}`, data, conVersion(version)),
   delete: (id) => api.delete(`/productos/${id}`),
 };
 
@@ -34,7 +37,7 @@ export const categoriasAPI = {
   getAll: () => api.get('/categorias/'),
   getById: (id) => api.get(`/categorias/${id}`),
   create: (data) => api.post('/categorias/', data),
-  update: (id, data) => api.put(`/categorias/${id}`, data),
+  update: (id, data, version) => api.put(`/categorias/${id}`, data, conVersion(version)),
   delete: (id) => api.delete(`/categorias/${id}`),
 };
 
@@ -43,8 +46,13 @@ export const proveedoresAPI = {
   getAll: () => api.get('/proveedores/'),
   getById: (id) => api.get(`/proveedores/${id}`),
   create: (data) => api.post('/proveedores/', data),
-  update: (id, data) => api.put(`/proveedores/${id}`, data),
+  update: (id, data, version) => api.put(`/proveedores/${id}`, data, conVersion(version)),
   delete: (id) => api.delete(`/proveedores/${id}`),
 };
 
+// ========== DASHBOARD ==========
+export const dashboardAPI = {
+  getResumen: () => api.get('/dashboard/resumen'),
+};
+
 export default api;